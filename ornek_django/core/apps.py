@@ -0,0 +1,19 @@
+# Django uygulama konfigürasyonu için gerekli sınıfı import ediyoruz
+from django.apps import AppConfig
+
+# =============================================================================
+# CORE UYGULAMASI KONFİGÜRASYON SINIFI
+# =============================================================================
+#
+# 'core' projenin ayar paketidir; model içermez. INSTALLED_APPS listesine
+# eklenmesinin tek amacı, proje genelindeki sinyal alıcılarını (örn. SQLite
+# bağlantı ayarları, core/db.py; replika yükü, core/routers.py; SQL
+# metrikleri, core/metrics.py) uygulama yüklenirken kaydetmektir.
+# =============================================================================
+
+class CoreConfig(AppConfig):
+    name = 'core'
+
+    # Veritabanı bağlantı sinyallerinin alıcılarını kaydediyoruz
+    def ready(self):
+        from . import db, metrics, routers  # noqa: F401
@@ -42,9 +42,32 @@ from django.core.asgi import get_asgi_application
 # aksi takdirde 'core.settings' değerini varsayılan olarak atar
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
+# Üretim veritabanı profilinde (DJANGO_DB_PROFILE=production) kalıcı
+# bağlantılar kapatılır: ASGI'de senkron kod istek başına farklı iş
+# parçacıklarında çalışabilir ve CONN_MAX_AGE ile açık kalan bağlantılar
+# iş parçacığı başına birikir (bkz. settings.py)
+os.environ.setdefault('DJANGO_DB_CONN_MAX_AGE', '0')
+
 # ASGI uygulamasını oluşturuyoruz
 # Bu, Django'nun ASGI sunucuları (uvicorn, daphne, hypercorn vb.) tarafından
 # kullanılacak olan ana uygulama nesnesidir
 # get_asgi_application() fonksiyonu, Django'nun ASGI uygulamasını döndürür
 # ve bu uygulama, HTTP isteklerini Django'nun request/response döngüsüne yönlendirir
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Uygulamalar (INSTALLED_APPS) get_asgi_application() ile yüklendikten
+# sonra import edilmelidir
+from products.live import PATH as LIVE_STOCK_PATH, LiveStockApp  # noqa: E402
+
+# Canlı stok akışı (SSE): Uzun süre açık kalan binlerce bağlantı Django'nun
+# istek döngüsüne (middleware, view, thread pool) girmeden doğrudan event
+# loop'ta bekler (bkz. products/live.py)
+live_stock_application = LiveStockApp()
+
+
+# Adrese göre yönlendirme; lifespan ve diğer tüm istekler Django'ya gider
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] == LIVE_STOCK_PATH:
+        await live_stock_application(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -0,0 +1,327 @@
+# Abonelik kuyrukları ve iş parçacıkları arası teslim için standart kütüphaneler
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+# redis: Çok worker'lı kurulumlarda mesajların tüm süreçlere dağıtılması
+# için (opsiyonel bağımlılık, sadece RedisBackend kullanır)
+# Kurulum: pip install redis
+try:
+    import redis
+    import redis.asyncio
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# DJANGO CORE BROKER.PY YAYIN / ABONELİK (PUB/SUB) DOSYASI
+# =============================================================================
+#
+# Bu dosya, süreç içi (in-process) yayın / abonelik altyapısını tanımlar.
+# Senkron kod (model kayıt kancaları, view'lar) bir konuya (topic) mesaj
+# yayınlar; ASGI tarafındaki uzun süreli bağlantılar (SSE) abone oldukları
+# konuların mesajlarını alır (bkz. products/live.py).
+#
+# Abonelikler:
+# - Her abonenin kendi sınırlı (bounded) kuyruğu vardır (BROKER_QUEUE_SIZE)
+# - Bekleyen abone iş parçacığı tutmaz; event loop'ta bir Future ile bekler
+#   (10.000 boşta bağlantı = 10.000 küçük nesne, 10.000 thread değil)
+# - Geri basınç (backpressure): Yavaş tüketicinin kuyruğu dolarsa bellek
+#   büyütülmez ve yayıncı beklemez; kuyruk boşaltılır ve abone "geride
+#   kaldı" (lagged) olarak işaretlenir. Abone güncel durumu kaynaktan
+#   yeniden okuyarak (anlık görüntü) devam eder
+#
+# Teslim:
+# - publish() herhangi bir iş parçacığından çağrılabilir; mesajlar abonenin
+#   event loop'una call_soon_threadsafe ile (loop başına tek çağrı) aktarılır
+#
+# Arka uçlar (BROKER['BACKEND']):
+# - LocalBackend (varsayılan): Mesajlar sadece bu süreçteki abonelere gider;
+#   tek worker'lı kurulumlar ve testler için
+# - RedisBackend: Mesajlar Redis PUBLISH ile tüm worker'lara dağıtılır; her
+#   worker kendi abonelerine teslim eder. Redis bağlantısı koparsa aradaki
+#   mesajlar kaçmış olabileceği için tüm aboneler geride kaldı sayılır
+# Yeni arka uç: publish(topic, message) ve start(loop) metodları olan,
+# __init__(broker, **OPTIONS) imzalı bir sınıf
+#
+# Mesajlar JSON'a çevrilebilir sözlükler olmalıdır (RedisBackend JSON ile taşır).
+#
+# Ayarlar (settings.py):
+# - BROKER: {'BACKEND': 'core.broker.LocalBackend', 'OPTIONS': {...}}
+# - BROKER_QUEUE_SIZE: Abone başına en fazla bekleyen mesaj
+#
+# Bu dosyada tanımlananlar:
+# - Subscription: Sınırlı kuyruklu abonelik
+# - Broker: Konu -> abone eşlemesi, yayın ve teslim
+# - LocalBackend / RedisBackend: Arka uçlar
+# - get_broker(): Ayarlardan oluşturulan süreç başına tek broker
+# =============================================================================
+
+
+# =============================================================================
+# ABONELİK
+# =============================================================================
+#
+# Metodlar (close() hariç) abonenin event loop'unda çağrılır; başka iş
+# parçacıklarından gelen mesajlar Broker.deliver() ile loop'a aktarılır.
+
+class Subscription:
+    def __init__(self, topics, maxsize, loop):
+        self.topics = frozenset(topics)
+        self.maxsize = maxsize
+        self.loop = loop
+        self.lagged = False
+        self.closed = False
+        self._messages = deque()
+        self._waiter = None
+
+    def put(self, message):
+        if self.closed:
+            return
+        if len(self._messages) >= self.maxsize:
+            # Yavaş tüketici: Birikenler atılır, abone yeniden senkronize olur
+            self._messages.clear()
+            self.lagged = True
+        else:
+            self._messages.append(message)
+        self._wake()
+
+    def mark_lagged(self):
+        self._messages.clear()
+        self.lagged = True
+        self._wake()
+
+    def _wake(self):
+        _resolve(self._waiter, True)
+
+    async def wait(self, timeout=None):
+        """
+        Mesaj, geride kalma veya kapanma olursa True; timeout dolarsa False
+        """
+        if self._messages or self.lagged or self.closed:
+            return True
+        # asyncio.wait_for yerine doğrudan zamanlayıcı: on binlerce abonede
+        # her uyanmada oluşturulan ek görev / callback maliyeti belirgindir
+        self._waiter = self.loop.create_future()
+        timer = None
+        if timeout is not None:
+            timer = self.loop.call_later(timeout, _resolve, self._waiter, False)
+        try:
+            return await self._waiter
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._waiter = None
+
+    def drain(self):
+        """
+        Bekleyen mesajlar ve geride kalma bayrağı: (mesajlar, lagged)
+        lagged True ise mesajlar eksiktir; güncel durum kaynaktan okunmalıdır
+        """
+        messages = list(self._messages)
+        self._messages.clear()
+        lagged, self.lagged = self.lagged, False
+        return messages, lagged
+
+    # Herhangi bir iş parçacığından çağrılabilir
+    def close(self):
+        self.closed = True
+        self.loop.call_soon_threadsafe(self._wake)
+
+
+def _resolve(future, result):
+    if future is not None and not future.done():
+        future.set_result(result)
+
+
+# =============================================================================
+# BROKER
+# =============================================================================
+
+class Broker:
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self.backend = None
+        self._lock = threading.Lock()
+        self._topics = {}
+
+    # Abone olunan event loop'ta çağrılır
+    def subscribe(self, topics, maxsize=None):
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(topics, maxsize or self.queue_size, loop)
+        with self._lock:
+            for topic in subscription.topics:
+                self._topics.setdefault(topic, set()).add(subscription)
+        self.backend.start(loop)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for topic in subscription.topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._topics[topic]
+        subscription.close()
+
+    def subscriber_count(self, topic=None):
+        with self._lock:
+            if topic is None:
+                return len(set().union(*self._topics.values()))
+            return len(self._topics.get(topic, ()))
+
+    # Yayıncı, mesajı hazırlamanın maliyetinden kaçınmak için sorar
+    # Dağıtık arka uçta diğer worker'ların aboneleri bilinmez: her zaman True
+    def has_subscribers(self, topics):
+        if self.backend.distributed:
+            return True
+        with self._lock:
+            return any(topic in self._topics for topic in topics)
+
+    def publish(self, topic, message):
+        self.backend.publish(topic, message)
+
+    # Arka uç tarafından çağrılır (herhangi bir iş parçacığından)
+    def deliver(self, topic, message):
+        with self._lock:
+            subscribers = list(self._topics.get(topic, ()))
+        self._dispatch(subscribers, Subscription.put, message)
+
+    # Mesaj kaybı olasılığında (örn. Redis bağlantısı koptu) tüm aboneler
+    # güncel durumu yeniden okur
+    def resync_all(self):
+        with self._lock:
+            subscribers = list(set().union(*self._topics.values()))
+        self._dispatch(subscribers, Subscription.mark_lagged)
+
+    def _dispatch(self, subscribers, method, *args):
+        by_loop = {}
+        for subscription in subscribers:
+            by_loop.setdefault(subscription.loop, []).append(subscription)
+        for loop, group in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_call_each, group, method, args)
+            except RuntimeError:
+                # Loop kapanmış (worker kapanıyor); abonelik zaten bitmiştir
+                pass
+
+
+def _call_each(subscriptions, method, args):
+    for subscription in subscriptions:
+        method(subscription, *args)
+
+
+# =============================================================================
+# ARKA UÇLAR
+# =============================================================================
+
+class LocalBackend:
+    """
+    Sadece bu süreçteki abonelere teslim eder
+    """
+
+    distributed = False
+
+    def __init__(self, broker):
+        self.broker = broker
+
+    def publish(self, topic, message):
+        self.broker.deliver(topic, message)
+
+    def start(self, loop):
+        pass
+
+
+class RedisBackend:
+    """
+    Redis PUBLISH / PSUBSCRIBE ile tüm worker'lara dağıtır
+    OPTIONS: {'url': 'redis://localhost:6379/0', 'prefix': 'broker:'}
+    """
+
+    distributed = True
+
+    # Bağlantı koparsa yeniden denemeden önce beklenen süre (saniye)
+    reconnect_delay = 1
+
+    def __init__(self, broker, url='redis://localhost:6379/0', prefix='broker:'):
+        if redis is None:
+            raise ImproperlyConfigured('RedisBackend için redis paketi gereklidir: pip install redis')
+        self.broker = broker
+        self.url = url
+        self.prefix = prefix
+        # Senkron istemci: publish() kayıt kancalarından (senkron kod) çağrılır
+        self._client = redis.Redis.from_url(url)
+        self._listeners = {}
+
+    def publish(self, topic, message):
+        self._client.publish(self.prefix + topic, json.dumps(message, cls=DjangoJSONEncoder))
+
+    # Her event loop için tek bir dinleyici görevi (PSUBSCRIBE prefix*)
+    def start(self, loop):
+        if loop not in self._listeners:
+            self._listeners[loop] = loop.create_task(self._listen())
+
+    async def _listen(self):
+        connected_before = False
+        while True:
+            client = redis.asyncio.Redis.from_url(self.url)
+            try:
+                pubsub = client.pubsub()
+                await pubsub.psubscribe(self.prefix + '*')
+                if connected_before:
+                    self.broker.resync_all()
+                connected_before = True
+                async for message in pubsub.listen():
+                    if message['type'] != 'pmessage':
+                        continue
+                    topic = message['channel'].decode()[len(self.prefix):]
+                    self.broker.deliver(topic, json.loads(message['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Redis aboneliği koptu; %s sn sonra yeniden bağlanılacak', self.reconnect_delay)
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                await client.aclose()
+
+
+# =============================================================================
+# SÜREÇ BAŞINA BROKER
+# =============================================================================
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    BROKER ayarındaki arka uçla oluşturulan broker (ilk çağrıda)
+    """
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                config = getattr(settings, 'BROKER', {})
+                broker = Broker(queue_size=getattr(settings, 'BROKER_QUEUE_SIZE', 100))
+                backend_class = import_string(config.get('BACKEND', 'core.broker.LocalBackend'))
+                broker.backend = backend_class(broker, **config.get('OPTIONS', {}))
+                _broker = broker
+    return _broker
+
+
+@receiver(setting_changed, dispatch_uid='core_broker_reset')
+def reset_broker(setting, **kwargs):
+    global _broker
+    if setting in ('BROKER', 'BROKER_QUEUE_SIZE'):
+        _broker = None
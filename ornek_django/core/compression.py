@@ -0,0 +1,246 @@
+# gzip / deflate sıkıştırması için standart kütüphaneler
+import gzip
+import zlib
+
+from django.conf import settings
+
+# brotli: JSON için gzip'ten ~%15-25 daha küçük çıktı (opsiyonel bağımlılık)
+# Kurulum: pip install brotli
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# zstandard: gzip'e yakın oran, çok daha hızlı sıkıştırma (opsiyonel bağımlılık)
+# Kurulum: pip install zstandard
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# =============================================================================
+# DJANGO CORE COMPRESSION.PY YANIT SIKIŞTIRMA DOSYASI
+# =============================================================================
+#
+# Bu dosya, API yanıtlarının Accept-Encoding başlığına göre sıkıştırılmasını
+# sağlar. 1.000 satırlık bir ürün sayfası JSON olarak ~150 KB iken gzip ile
+# ~15 KB'a iner; yavaş bağlantılarda yanıt süresinin çoğu aktarımdır.
+#
+# Desteklenen kodlamalar (sunucu tercih sırası COMPRESSION_ENCODINGS):
+# - br   : brotli paketi kuruluysa
+# - zstd : zstandard paketi kuruluysa
+# - gzip : Her zaman (standart kütüphane)
+# İstemci birden fazlasını kabul ediyorsa q değeri yüksek olan, eşitlikte
+# sunucunun tercih sırasındaki ilk kodlama seçilir.
+#
+# Ayarlar (settings.py):
+# - COMPRESSION_ENABLED: False ise middleware ve önbellek entegrasyonu kapalı
+# - COMPRESSION_ENCODINGS: Sunucunun kodlama tercih sırası
+# - COMPRESSION_MIN_SIZE: Bu boyuttan (byte) küçük gövdeler sıkıştırılmaz
+#   (küçük yanıtlarda kazanç, CPU maliyetinden ve başlık yükünden azdır)
+# - COMPRESSION_CONTENT_TYPES: Sıkıştırılan medya tipleri (izin listesi)
+# - COMPRESSION_LEVELS: Kodlama başına seviye ({'gzip': 6, ...})
+#
+# Akış (streaming) yanıtlar (export endpoint'i) parça parça sıkıştırılır;
+# her parça flush edilir, böylece istemci ilk satırları beklemeden alır.
+#
+# Önbellek entegrasyonu (products/cache.py):
+# - Yanıt önbelleğe yazılırken gövdenin sıkıştırılmış halleri de bir kez
+#   üretilir (precompress) ve gövdeyle birlikte saklanır
+# - Önbellekten dönen yanıt bu hazır gövdeleri 'precompressed' özelliğinde
+#   taşır; middleware yeniden sıkıştırmak yerine uygun olanı seçer
+#
+# Güvenlik notu: İzin listesinde varsayılan olarak HTML yoktur. CSRF token'ı
+# içeren HTML sayfalarının sıkıştırılması BREACH saldırısına açıktır
+# (Browsable API sayfaları bu yüzden sıkıştırılmaz).
+#
+# Bu dosyada tanımlananlar:
+# - negotiate_encoding(): Accept-Encoding başlığından kodlama seçimi
+# - compress() / precompress(): Tek seferlik sıkıştırma
+# - compress_stream() / acompress_stream(): Akış yanıtlarının parça parça sıkıştırılması
+# - CompressionMiddleware (core/middleware.py) bu yardımcıları kullanır
+# =============================================================================
+
+
+# =============================================================================
+# KODLAYICILAR (CODEC)
+# =============================================================================
+#
+# Her kodlayıcı iki şekilde kullanılır:
+# - compress(data, level): Tüm gövdeyi bir kerede sıkıştırır
+# - stream(level): compress(parça) / finish() metodlu akış nesnesi döndürür
+
+class GzipCodec:
+    default_level = 6
+
+    class Stream:
+        def __init__(self, level):
+            # wbits 16 + MAX_WBITS: gzip başlığı ve CRC ile
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+        def compress(self, chunk):
+            return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        def finish(self):
+            return self._compressor.flush()
+
+    def compress(self, data, level):
+        return gzip.compress(data, compresslevel=level, mtime=0)
+
+    def stream(self, level):
+        return self.Stream(level)
+
+
+class BrotliCodec:
+    default_level = 5
+
+    class Stream:
+        def __init__(self, level):
+            self._compressor = brotli.Compressor(quality=level)
+
+        def compress(self, chunk):
+            return self._compressor.process(chunk) + self._compressor.flush()
+
+        def finish(self):
+            return self._compressor.finish()
+
+    def compress(self, data, level):
+        return brotli.compress(data, quality=level)
+
+    def stream(self, level):
+        return self.Stream(level)
+
+
+class ZstdCodec:
+    default_level = 3
+
+    class Stream:
+        def __init__(self, level):
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+        def compress(self, chunk):
+            return (
+                self._compressor.compress(chunk)
+                + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            )
+
+        def finish(self):
+            return self._compressor.flush()
+
+    def compress(self, data, level):
+        return zstandard.ZstdCompressor(level=level).compress(data)
+
+    def stream(self, level):
+        return self.Stream(level)
+
+
+# Kurulu kütüphanelere göre kullanılabilir kodlayıcılar
+CODECS = {'gzip': GzipCodec()}
+if brotli is not None:
+    CODECS['br'] = BrotliCodec()
+if zstandard is not None:
+    CODECS['zstd'] = ZstdCodec()
+
+
+# =============================================================================
+# AYARLAR VE KODLAMA SEÇİMİ
+# =============================================================================
+
+def compression_enabled():
+    return getattr(settings, 'COMPRESSION_ENABLED', False)
+
+
+# Sunucu tercih sırasına göre, kurulu olan kodlamalar
+def available_encodings():
+    return [
+        encoding for encoding in getattr(settings, 'COMPRESSION_ENCODINGS', ('br', 'zstd', 'gzip'))
+        if encoding in CODECS
+    ]
+
+
+def _level(encoding):
+    return getattr(settings, 'COMPRESSION_LEVELS', {}).get(encoding, CODECS[encoding].default_level)
+
+
+# Medya tipi izin listesinde mi ('application/json; charset=utf-8' -> 'application/json')
+def is_compressible(content_type):
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    return media_type in getattr(settings, 'COMPRESSION_CONTENT_TYPES', ())
+
+
+# Accept-Encoding başlığı -> {kodlama: q değeri}
+def parse_accept_encoding(header):
+    qualities = {}
+    for item in header.split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+    return qualities
+
+
+def negotiate_encoding(header, encodings=None):
+    """
+    İstemcinin kabul ettiği (q > 0) kodlamalardan en uygununu seçer
+    Uygun kodlama yoksa None (yanıt sıkıştırılmadan gönderilir)
+    """
+    qualities = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in available_encodings() if encodings is None else encodings:
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(encoding, data, level=None):
+    return CODECS[encoding].compress(data, _level(encoding) if level is None else level)
+
+
+def precompress(content, content_type):
+    """
+    Önbelleğe yazılacak gövdenin tüm kodlamalardaki sıkıştırılmış halleri
+    Sıkıştırma kapalıysa veya gövde uygun değilse boş sözlük
+    """
+    if (
+        not compression_enabled()
+        or not is_compressible(content_type)
+        or len(content) < getattr(settings, 'COMPRESSION_MIN_SIZE', 0)
+    ):
+        return {}
+    variants = {}
+    for encoding in available_encodings():
+        body = compress(encoding, content)
+        # Kazanç sağlamayan kodlama saklanmaz; middleware gövdeyi olduğu gibi gönderir
+        if len(body) < len(content):
+            variants[encoding] = body
+    return variants
+
+
+# Akış yanıtının parçalarını sıkıştırır; her parça flush edilir
+def compress_stream(chunks, encoding):
+    stream = CODECS[encoding].stream(_level(encoding))
+    for chunk in chunks:
+        data = stream.compress(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+# ASGI altında async iterator döndüren akış yanıtları için
+async def acompress_stream(chunks, encoding):
+    stream = CODECS[encoding].stream(_level(encoding))
+    async for chunk in chunks:
+        data = stream.compress(chunk)
+        if data:
+            yield data
+    yield stream.finish()
@@ -0,0 +1,59 @@
+# Django veritabanı bağlantı sinyali ve ayarları
+# connection_created: Her yeni veritabanı bağlantısı açıldığında gönderilir
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# =============================================================================
+# DJANGO CORE DB.PY VERİTABANI BAĞLANTI AYARLARI DOSYASI
+# =============================================================================
+#
+# Bu dosya, her yeni SQLite bağlantısına settings.SQLITE_PRAGMAS içindeki
+# PRAGMA ayarlarını uygular.
+#
+# Sorun:
+# - SQLite varsayılan olarak rollback journal kullanır; bir yazma işlemi
+#   sürerken okuyucular da beklemek zorunda kalır
+# - Eşzamanlı yazmalarda "database is locked" hataları görülür
+# - Her istekte yeni bağlantı açılır ve sayfa önbelleği (cache) boşa gider
+#
+# Çözüm:
+# - journal_mode=WAL: Okuyucular yazıcıyı, yazıcı okuyucuları beklemez
+# - synchronous=NORMAL: WAL ile güvenli; her commit'te fsync yapılmaz
+#   (elektrik kesintisinde son commit'ler kaybolabilir, veritabanı bozulmaz)
+# - busy_timeout: Kilit varsa hemen hata vermek yerine bekler (ms)
+# - mmap_size / cache_size / temp_store: Okumalar için bellek kullanımı
+# - Kalıcı bağlantılar: DATABASES['default']['CONN_MAX_AGE'] ve
+#   CONN_HEALTH_CHECKS (settings.py); pragma'lar bağlantı başına bir kez çalışır
+#
+# Pragma'lar ve kalıcı bağlantılar sadece üretim profilinde açıktır
+# (DJANGO_DB_PROFILE=production, settings.py); geliştirme profilinde
+# SQLITE_PRAGMAS boştur.
+#
+# Not: journal_mode=WAL veritabanı dosyasına kalıcı olarak yazılır;
+# db.sqlite3-wal ve db.sqlite3-shm dosyaları oluşur. Bellekteki (test)
+# veritabanlarında WAL desteklenmez, SQLite 'memory' modunda kalır.
+# =============================================================================
+
+
+# PRAGMA değerleri sorguya parametre olarak verilemez; sadece sayı ve
+# basit kelimelere (WAL, NORMAL, MEMORY...) izin verilir
+def _pragma_value(value):
+    value = str(value)
+    if not value.lstrip('-').isalnum():
+        raise ValueError('Geçersiz PRAGMA değeri: %r' % value)
+    return value
+
+
+# Yeni açılan her SQLite bağlantısına pragma'ları uygular
+# Sorgular doğrudan sqlite3 bağlantısında çalıştırılır; böylece
+# connection.queries listesine ve execute_wrapper'lara girmezler
+@receiver(connection_created, dispatch_uid='core_sqlite_pragmas')
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None) or {}
+    for name, value in pragmas.items():
+        if not name.isidentifier():
+            raise ValueError('Geçersiz PRAGMA adı: %r' % name)
+        connection.connection.execute('PRAGMA %s = %s' % (name, _pragma_value(value)))
@@ -0,0 +1,49 @@
+# SQLite çevrimiçi yedekleme (backup) API'si için standart kütüphane
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# =============================================================================
+# SYNC_REPLICAS YÖNETİM KOMUTU
+# =============================================================================
+#
+# Yerel geliştirmede okuma replikası olarak kullanılan SQLite dosyalarını
+# birincil veritabanından (db.sqlite3) kopyalar. Kopyalama SQLite'ın
+# backup API'si ile yapılır; birincil veritabanı kullanımdayken de tutarlı
+# bir anlık görüntü (snapshot) alınır.
+#
+# Replikalar bu komut tekrar çalıştırılana kadar birincilin gerisinde kalır;
+# bu, gerçek replikasyon gecikmesini (replication lag) taklit eder.
+#
+# Kullanım:
+#   DJANGO_SQLITE_REPLICAS=2 python manage.py sync_replicas
+# =============================================================================
+
+
+class Command(BaseCommand):
+    help = 'SQLite okuma replikalarını birincil veritabanından kopyalar'
+
+    def handle(self, *args, **options):
+        replicas = getattr(settings, 'DATABASE_REPLICAS', [])
+        if not replicas:
+            raise CommandError(
+                'Tanımlı replika yok. Örnek: DJANGO_SQLITE_REPLICAS=2 python manage.py sync_replicas'
+            )
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError('Bu komut sadece SQLite replikaları için yazılmıştır.')
+
+        primary.ensure_connection()
+        for alias in replicas:
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError('%s bir SQLite bağlantısı değil.' % alias)
+            # Replika üzerinde açık bağlantı kalmasın; kopya onun yerine geçer
+            connections[alias].close()
+            target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            self.stdout.write('%s -> %s' % (DEFAULT_DB_ALIAS, connections[alias].settings_dict['NAME']))
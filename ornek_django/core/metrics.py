@@ -0,0 +1,316 @@
+# Ölçüm, histogram ve eşzamanlılık için standart kütüphaneler
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# DJANGO CORE METRICS.PY İSTEK METRİKLERİ DOSYASI
+# =============================================================================
+#
+# Bu dosya, her istek için süre, veritabanı maliyeti ve yanıt boyutu
+# metriklerini process içinde toplar ve Prometheus metin formatında sunar.
+#
+# Toplanan metrikler (view ve HTTP metodu etiketleriyle):
+# - http_request_duration_seconds: İsteğin toplam süresi (wall time)
+# - http_request_db_duration_seconds: SQL sorgularında geçen süre
+# - http_request_db_queries: SQL sorgusu sayısı
+# - http_request_render_duration_seconds: Yanıt gövdesinin JSON'a kodlanma
+#   süresi (renderer); serializer'ların to_representation süresi dahil
+#   değildir, o süre view süresi içinde kalır
+# - http_response_size_bytes: Yanıt gövdesi boyutu (akış yanıtları hariç)
+# - http_request_n_plus_one_total: N+1 şüphesi taşıyan istek sayısı
+#
+# Tasarım (üretimde açık kalabilecek düşük maliyet):
+# - Histogramlar HDR tarzıdır: Değer aralığı logaritmik oktavlara, her oktav
+#   sabit sayıda alt kovaya bölünür. Kayıt O(1)'dir, bellek değer sayısından
+#   bağımsızdır, göreli hata ~%3'tür (SUB_BUCKET_BITS = 5)
+# - SQL sorguları, her bağlantıya bir kez eklenen execute_wrapper ile sayılır;
+#   istek dışındaki sorgularda (yönetim komutları) sadece bir ContextVar okunur
+# - Metrikler worker process başınadır; çok process'li kurulumda Prometheus
+#   her worker'ı ayrı hedef olarak toplar
+#
+# N+1 tespiti (settings.METRICS_N_PLUS_ONE_THRESHOLD):
+# - Aynı parametreli SQL bir istekte eşik kadar veya daha fazla çalışırsa
+#   (örn. döngü içinde ilişkili nesne okumak) sayaç artar ve uyarı loglanır
+#
+# Bu dosyada tanımlananlar:
+# - Histogram: HDR tarzı histogram
+# - MetricsRegistry / registry: View başına metrikler
+# - RequestMetrics / collecting() / measure_rendering(): İstek başına ölçüm
+# - metrics_view: GET /metrics (Prometheus metin formatı)
+# =============================================================================
+
+
+# =============================================================================
+# HDR TARZI HİSTOGRAM
+# =============================================================================
+
+# Oktav başına 2**SUB_BUCKET_BITS kova (5 bit: 32 kova, ~%3 göreli hata)
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+
+
+# Pozitif tam sayı değerin kova numarası
+# 0..31 tam değerler; sonrası her oktavda 16 kova
+def bucket_index(value):
+    if value < SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + (value >> shift) - SUB_BUCKET_HALF
+
+
+# Kovadaki en büyük değer (kova numarasının tersi)
+def bucket_upper_bound(index):
+    if index < SUB_BUCKET_COUNT:
+        return index
+    shift, offset = divmod(index - SUB_BUCKET_COUNT, SUB_BUCKET_HALF)
+    shift += 1
+    return ((offset + SUB_BUCKET_HALF + 1) << shift) - 1
+
+
+class Histogram:
+    """
+    HDR tarzı histogram; değerler tam sayı birimlerde tutulur
+    (örn. süreler mikrosaniye, boyutlar bayt)
+    """
+
+    def __init__(self, unit=1):
+        # Dışarıya verilen değer = tam sayı değer / unit (örn. 1e6: saniye)
+        self.unit = unit
+        self.counts = Counter()
+        self.count = 0
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def record(self, value):
+        value = max(0, int(value))
+        index = bucket_index(value)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+
+    # Yüzdelik değer (kovanın üst sınırı; gerçek değerden en fazla ~%3 büyük)
+    def percentile(self, percent):
+        with self.lock:
+            items = sorted(self.counts.items())
+            count = self.count
+        if not count:
+            return 0
+        target = max(1, count * percent / 100)
+        seen = 0
+        for index, bucket_count in items:
+            seen += bucket_count
+            if seen >= target:
+                return bucket_upper_bound(index) / self.unit
+        return bucket_upper_bound(items[-1][0]) / self.unit
+
+    # Prometheus kovaları: sınırlar (unit cinsinden) için kümülatif sayılar
+    # Sınırın üzerine taşan bir HDR kovası bir sonraki sınıra sayılır
+    def cumulative(self, bounds):
+        with self.lock:
+            items = sorted(self.counts.items())
+        result = []
+        seen = 0
+        position = 0
+        for bound in bounds:
+            limit = bound * self.unit
+            while position < len(items) and bucket_upper_bound(items[position][0]) <= limit:
+                seen += items[position][1]
+                position += 1
+            result.append(seen)
+        return result
+
+
+# =============================================================================
+# METRİK KAYDI
+# =============================================================================
+
+# (metrik adı, açıklama, birim çarpanı, Prometheus kova sınırları)
+HISTOGRAMS = [
+    ('http_request_duration_seconds', 'İstek süresi', 1e6,
+     (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)),
+    ('http_request_db_duration_seconds', 'SQL sorgularında geçen süre', 1e6,
+     (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)),
+    ('http_request_db_queries', 'SQL sorgusu sayısı', 1,
+     (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)),
+    ('http_request_render_duration_seconds', 'Yanıt gövdesinin kodlanma (render) süresi', 1e6,
+     (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)),
+    ('http_response_size_bytes', 'Yanıt gövdesi boyutu', 1,
+     (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)),
+]
+N_PLUS_ONE_METRIC = 'http_request_n_plus_one_total'
+
+
+class MetricsRegistry:
+    """
+    (view, metod) etiketleri başına histogram ve sayaçlar
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.n_plus_one = Counter()
+        self.lock = threading.Lock()
+
+    def get_histograms(self, labels):
+        histograms = self.histograms.get(labels)
+        if histograms is None:
+            with self.lock:
+                histograms = self.histograms.setdefault(
+                    labels, {name: Histogram(unit) for name, _, unit, _ in HISTOGRAMS}
+                )
+        return histograms
+
+    def observe(self, view, method, request_metrics, duration, size):
+        histograms = self.get_histograms((view, method))
+        histograms['http_request_duration_seconds'].record(duration * 1e6)
+        histograms['http_request_db_duration_seconds'].record(request_metrics.db_time * 1e6)
+        histograms['http_request_db_queries'].record(request_metrics.queries)
+        if request_metrics.render_time:
+            histograms['http_request_render_duration_seconds'].record(request_metrics.render_time * 1e6)
+        if size is not None:
+            histograms['http_response_size_bytes'].record(size)
+
+        threshold = getattr(settings, 'METRICS_N_PLUS_ONE_THRESHOLD', 0)
+        if threshold:
+            sql, repeats = request_metrics.most_repeated()
+            if repeats >= threshold:
+                with self.lock:
+                    self.n_plus_one[(view, method)] += 1
+                logger.warning('Olası N+1: %s %s aynı sorguyu %d kez çalıştırdı: %s', method, view, repeats, sql)
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.n_plus_one = Counter()
+
+    # Prometheus metin formatı (text/plain; version=0.0.4)
+    def render(self):
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+            n_plus_one = sorted(self.n_plus_one.items())
+        lines = []
+        for name, help_text, _, bounds in HISTOGRAMS:
+            lines.append('# HELP %s %s' % (name, help_text))
+            lines.append('# TYPE %s histogram' % name)
+            for (view, method), by_name in histograms:
+                histogram = by_name[name]
+                if not histogram.count:
+                    continue
+                labels = 'view="%s",method="%s"' % (_escape(view), method)
+                for bound, count in zip(bounds, histogram.cumulative(bounds)):
+                    lines.append('%s_bucket{%s,le="%s"} %d' % (name, labels, _format(bound), count))
+                lines.append('%s_bucket{%s,le="+Inf"} %d' % (name, labels, histogram.count))
+                lines.append('%s_sum{%s} %s' % (name, labels, _format(histogram.total / histogram.unit)))
+                lines.append('%s_count{%s} %d' % (name, labels, histogram.count))
+        lines.append('# HELP %s Aynı SQL\'i eşikten fazla çalıştıran istek sayısı' % N_PLUS_ONE_METRIC)
+        lines.append('# TYPE %s counter' % N_PLUS_ONE_METRIC)
+        for (view, method), count in n_plus_one:
+            lines.append('%s{view="%s",method="%s"} %d' % (N_PLUS_ONE_METRIC, _escape(view), method, count))
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+# Process genelindeki metrik kaydı
+registry = MetricsRegistry()
+
+
+# =============================================================================
+# İSTEK BAŞINA ÖLÇÜM
+# =============================================================================
+
+class RequestMetrics:
+    def __init__(self, track_sql=False):
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        # N+1 tespiti açıksa SQL metni başına çalışma sayısı
+        self.sql_counts = Counter() if track_sql else None
+
+    def most_repeated(self):
+        if not self.sql_counts:
+            return None, 0
+        return self.sql_counts.most_common(1)[0]
+
+
+_current = ContextVar('request_metrics', default=None)
+
+
+# Bloğun süresince yeni bir istek ölçümü etkinleştirir
+@contextmanager
+def collecting():
+    request_metrics = RequestMetrics(track_sql=bool(getattr(settings, 'METRICS_N_PLUS_ONE_THRESHOLD', 0)))
+    token = _current.set(request_metrics)
+    try:
+        yield request_metrics
+    finally:
+        _current.reset(token)
+
+
+# Yanıt kodlama süresini etkin istek ölçümüne ekler (renderer'lar kullanır)
+@contextmanager
+def measure_rendering():
+    request_metrics = _current.get()
+    if request_metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        request_metrics.render_time += time.perf_counter() - started
+
+
+def _record_query(execute, sql, params, many, context):
+    request_metrics = _current.get()
+    if request_metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        request_metrics.db_time += time.perf_counter() - started
+        request_metrics.queries += 1
+        if request_metrics.sql_counts is not None:
+            request_metrics.sql_counts[sql] += 1
+
+
+# Her yeni bağlantıya sorgu ölçümü eklenir (sync_to_async iş parçacıkları dahil;
+# asgiref ContextVar değerlerini iş parçacığına taşır)
+@receiver(connection_created, dispatch_uid='core_metrics_queries')
+def track_queries(sender, connection, **kwargs):
+    # Aynı DatabaseWrapper yeniden bağlandığında (CONN_MAX_AGE) sinyal tekrar
+    # gelir; execute_wrappers listesi ise korunur, sarmalayıcı bir kez eklenir
+    if getattr(settings, 'METRICS_ENABLED', True) and _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+# =============================================================================
+# /metrics ENDPOINT'İ
+# =============================================================================
+
+# Prometheus'un topladığı metin çıktısı
+# Not: Üretimde bu yol sadece iç ağdan erişilebilir olmalıdır (reverse proxy)
+def metrics_view(request):
+    """
+    İstek metrikleri (Prometheus metin formatı)
+    """
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,214 @@
+# İstek süresini ölçmek için
+import time
+
+# Middleware'in hem senkron hem async view'larla çalışması için yardımcılar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+
+from django.utils.cache import patch_vary_headers
+
+from . import compression, metrics
+from .routers import routing_state
+
+# =============================================================================
+# DJANGO CORE MIDDLEWARE.PY DOSYASI
+# =============================================================================
+#
+# Bu dosya, proje geneli middleware sınıflarını tanımlar.
+# Middleware'ler hem senkron (WSGI) hem async (ASGI) isteklerde çalışır;
+# async view'lar araya sync_to_async geçişi eklenmeden çağrılır.
+#
+# Bu dosyada tanımlanan middleware'ler:
+# - MetricsMiddleware: İstek süresi / SQL / yanıt boyutu metrikleri (core/metrics.py)
+# - ReadYourWritesMiddleware: Okuma replikası yönlendirmesi (core/routers.py)
+# - CompressionMiddleware: gzip / brotli / zstd yanıt sıkıştırması (core/compression.py)
+# =============================================================================
+
+
+# =============================================================================
+# METRİK MIDDLEWARE
+# =============================================================================
+#
+# Her isteği çözümlenen view'a (ProductListCreateAPIView, UserViewSet...)
+# göre etiketleyip core.metrics.registry'ye kaydeder. Diğer middleware'lerin
+# süresi de ölçüme girsin diye MIDDLEWARE listesinin başına eklenir.
+#
+# - METRICS_ENABLED = False ile tamamen kapatılır
+# - /metrics endpoint'inin kendisi ölçülmez
+# - URL ile eşleşmeyen istekler (404) 'unresolved' olarak etiketlenir
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    # Etiket sayısı sınırlı kalsın diye diğer metodlar 'OTHER' olarak kaydedilir
+    methods = frozenset(('GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'))
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    # View sınıfının adı; fonksiyon view'larda fonksiyon adı
+    def get_view_name(self, request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unresolved'
+        func = match.func
+        view = getattr(func, 'view_class', None) or getattr(func, 'cls', None) or func
+        return getattr(view, '__name__', match.view_name or 'unknown')
+
+    def observe(self, request, response, request_metrics, started):
+        duration = time.perf_counter() - started
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.func is metrics.metrics_view:
+            return
+        size = None if response.streaming else len(response.content)
+        method = request.method if request.method in self.methods else 'OTHER'
+        metrics.registry.observe(self.get_view_name(request), method, request_metrics, duration, size)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        started = time.perf_counter()
+        with metrics.collecting() as request_metrics:
+            response = self.get_response(request)
+        self.observe(request, response, request_metrics, started)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        started = time.perf_counter()
+        with metrics.collecting() as request_metrics:
+            response = await self.get_response(request)
+        self.observe(request, response, request_metrics, started)
+        return response
+
+
+# =============================================================================
+# READ-YOUR-WRITES MIDDLEWARE
+# =============================================================================
+#
+# Replikalar birincil veritabanının gerisinden gelir (replication lag).
+# Bir istemci ürün oluşturup hemen listeyi isterse, liste replikadan
+# okunduğunda yeni ürün görünmeyebilir. Bu middleware:
+# - Her istek için bir yönlendirme durumu (RoutingState) açar
+# - Güvenli olmayan istekleri (POST, PUT, PATCH, DELETE) birincile sabitler
+# - İstekte yazma yapıldıysa yanıta kısa ömürlü bir çerez ekler
+#   (DATABASE_PRIMARY_COOKIE, DATABASE_PRIMARY_PIN_SECONDS saniye)
+# - Çerezi taşıyan istemcinin sonraki okumaları da birincilden yapılır
+#
+# settings.py'da ROUTER ile birlikte etkinleştirilir:
+# MIDDLEWARE = [..., 'core.middleware.ReadYourWritesMiddleware', ...]
+class ReadYourWritesMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.cookie_name = getattr(settings, 'DATABASE_PRIMARY_COOKIE', 'use_primary')
+        self.pin_seconds = getattr(settings, 'DATABASE_PRIMARY_PIN_SECONDS', 5)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def is_pinned(self, request):
+        return request.method not in self.safe_methods or self.cookie_name in request.COOKIES
+
+    def process_response(self, request, response, state):
+        if state.wrote:
+            response.set_cookie(
+                self.cookie_name, '1', max_age=self.pin_seconds, httponly=True, samesite='Lax'
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with routing_state(pinned=self.is_pinned(request)) as state:
+            response = self.get_response(request)
+        return self.process_response(request, response, state)
+
+    async def __acall__(self, request):
+        with routing_state(pinned=self.is_pinned(request)) as state:
+            response = await self.get_response(request)
+        return self.process_response(request, response, state)
+
+
+# =============================================================================
+# SIKIŞTIRMA MIDDLEWARE
+# =============================================================================
+#
+# Django'nun GZipMiddleware'inden farkları:
+# - brotli / zstd desteği ve q değerine göre kodlama seçimi
+# - Medya tipi izin listesi ve ayarlanabilir boyut eşiği
+# - Önbellekteki hazır sıkıştırılmış gövdelerin kullanılması (products/cache.py)
+#
+# Gövdeyi okuyan/değiştiren middleware'lerden sonra çalışması için
+# MIDDLEWARE listesinin başına yakın eklenir. MetricsMiddleware daha dışta
+# kaldığı için yanıt boyutu metriği sıkıştırılmış (ağdaki) boyutu ölçer.
+class CompressionMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = compression.compression_enabled()
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 0)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def process_response(self, request, response):
+        if (
+            response.has_header('Content-Encoding')
+            or response.status_code in (204, 304)
+            or not compression.is_compressible(response.get('Content-Type', ''))
+        ):
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        # Yanıt artık Accept-Encoding'e göre değişir (vekil önbellekler için)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = compression.negotiate_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compression.acompress_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compression.compress_stream(response.streaming_content, encoding)
+            # Sıkıştırılmış boyut önceden bilinmez
+            del response['Content-Length']
+        else:
+            body = getattr(response, 'precompressed', {}).get(encoding)
+            if body is None:
+                body = compression.compress(encoding, response.content)
+                # Sıkıştırma kazanç sağlamıyorsa orijinal gövde gönderilir
+                if len(body) >= len(response.content):
+                    return response
+            response.content = body
+            response['Content-Length'] = str(len(body))
+
+        # Gövde değiştiği için güçlü ETag zayıf ETag'e çevrilir (RFC 9110 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        return self.process_response(request, response) if self.enabled else response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self.process_response(request, response) if self.enabled else response
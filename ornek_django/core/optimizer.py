@@ -0,0 +1,273 @@
+# Plan kaydı için logging
+import logging
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+
+# Django REST Framework alan sınıfları
+from rest_framework import permissions, relations, serializers
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# DJANGO CORE OPTIMIZER.PY SORGU OPTİMİZASYONU DOSYASI
+# =============================================================================
+#
+# Bu dosya, serializer'ın alan ağacına bakarak view'ın queryset'ine gerekli
+# select_related / prefetch_related / only() çağrılarını otomatik ekleyen
+# mixin'i tanımlar.
+#
+# Sorun:
+# - İlişkili alan içeren her yeni ModelSerializer, queryset elle
+#   ayarlanmazsa satır başına ek sorgu (N+1) üretir
+# - İstenmeyen kolonlar (?fields= ile seyreltilmiş yanıtlar) yine de okunur
+#
+# Kurallar (serializer alanı -> queryset):
+# - Model kolonu (name, price...)            -> only('name', 'price')
+# - Tek nesne ilişkisi, sadece pk/link       -> only('category_id')
+# - Tek nesne ilişkisi, __str__ / iç içe     -> select_related('category')
+#   serializer                                  + only('category__name', ...)
+# - Çoklu ilişki (M2M, ters FK)              -> Prefetch('tags', queryset=...)
+#   (iç içe serializer'ın planı alt queryset'e uygulanır)
+# - source='a.b' gibi noktalı kaynaklar      -> select_related('a') ...
+# - SerializerMethodField, property gibi     -> O seviyede only() uygulanmaz
+#   modelde karşılığı olmayan alanlar           (tüm kolonlar okunur)
+#
+# Sadece güvenli (GET / HEAD / OPTIONS) isteklerde uygulanır; güncellemede
+# eksik kolonlu (deferred) nesneler kaydedilmez. View queryset'e kendisi
+# values() veya only() uygulamışsa kolon seçimine dokunulmaz.
+#
+# Hata ayıklama: QUERY_OPTIMIZER_DEBUG = True (veya view'da
+# query_optimizer_debug = True) ise seçilen plan 'core.optimizer'
+# logger'ı ile INFO seviyesinde yazılır.
+#
+# Kullanım:
+#   class OrderListAPIView(QueryOptimizerMixin, generics.ListAPIView):
+#       queryset = Order.objects.all()
+#       serializer_class = OrderSerializer
+# =============================================================================
+
+
+# Bir model ve serializer için sorgu planı
+class QueryPlan:
+    def __init__(self, model):
+        self.model = model
+        # Okunacak alan adları; None ise kolon seçimi yapılmaz (tüm kolonlar)
+        self.only = {model._meta.pk.name}
+        self.select_related = []
+        # Prefetch yolu -> ilişkili modelin planı
+        self.prefetch = {}
+
+    def add_column(self, name):
+        if self.only is not None:
+            self.only.add(name)
+
+    def load_all_columns(self):
+        self.only = None
+
+    # Aynı ilişkiyi kullanan iki alan (örn. groups ve group_ids) tek
+    # Prefetch'te birleşir; Django aynı yola iki farklı queryset kabul etmez
+    def merge(self, other):
+        if self.only is None or other.only is None:
+            self.only = None
+        else:
+            self.only |= other.only
+        self.select_related.extend(other.select_related)
+        for lookup, plan in other.prefetch.items():
+            self.add_prefetch(lookup, plan)
+
+    def add_prefetch(self, lookup, plan):
+        if lookup in self.prefetch:
+            self.prefetch[lookup].merge(plan)
+        else:
+            self.prefetch[lookup] = plan
+
+    def prefetch_querysets(self):
+        return [
+            Prefetch(lookup, queryset=plan.apply(plan.model._default_manager.all()))
+            for lookup, plan in self.prefetch.items()
+        ]
+
+    def apply(self, queryset, columns=True):
+        if self.select_related:
+            queryset = queryset.select_related(*dict.fromkeys(self.select_related))
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*self.prefetch_querysets())
+        if columns and self.only is not None:
+            queryset = queryset.only(*sorted(self.only))
+        return queryset
+
+    def describe(self):
+        return {
+            'model': self.model._meta.label,
+            'only': sorted(self.only) if self.only is not None else '*',
+            'select_related': list(dict.fromkeys(self.select_related)),
+            'prefetch_related': {
+                item.prefetch_through: str(item.queryset.query) for item in self.prefetch_querysets()
+            },
+        }
+
+
+# İç içe serializer alanı ise serializer'ı (many=True ise child'ı) döndürür
+def _nested_serializer(field):
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    if isinstance(field, serializers.BaseSerializer):
+        return field
+    return None
+
+
+def _field_name(model, name):
+    return model._meta.pk.name if name == 'pk' else model._meta.get_field(name).name
+
+
+# Noktalı kaynağı ('category.parent.name') model alanlarına çözümler
+# Aradaki adımlar tek nesne ilişkisi olmalıdır; çözülemezse None
+def _resolve_source(model, source):
+    path = []
+    names = source.split('.')
+    for index, name in enumerate(names):
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        path.append(model_field)
+        if index < len(names) - 1:
+            if not model_field.is_relation or model_field.many_to_many or model_field.one_to_many:
+                return None
+            model = model_field.related_model
+    return path
+
+
+# İlişkili nesne için sadece FK kolonu yeterli mi (pk veya pk ile link)
+def _needs_pk_only(field, model_field):
+    return (
+        model_field.concrete
+        and isinstance(field, relations.RelatedField)
+        and field.use_pk_only_optimization()
+        and getattr(field, 'lookup_field', 'pk') in ('pk', model_field.related_model._meta.pk.name)
+    )
+
+
+# Çoklu ilişki için Prefetch'e verilecek alt plan
+def _related_plan(field, nested, model_field):
+    related_model = model_field.related_model
+    if nested is not None:
+        plan = build_plan(nested, related_model)
+    else:
+        plan = QueryPlan(related_model)
+        child = getattr(field, 'child_relation', field)
+        if isinstance(child, relations.RelatedField) and child.use_pk_only_optimization():
+            plan.add_column(_field_name(related_model, getattr(child, 'lookup_field', 'pk')))
+        else:
+            plan.load_all_columns()
+    if model_field.one_to_many:
+        # Prefetch sonuçları ters FK kolonuyla ana nesnelere eşleştirilir
+        plan.add_column(model_field.field.name)
+    return plan
+
+
+def build_plan(serializer, model):
+    """
+    Serializer alanlarından model için sorgu planı (QueryPlan) üretir
+    """
+    plan = QueryPlan(model)
+    _collect(serializer, model, plan, '')
+    return plan
+
+
+# prefix: select_related ile katılan ilişkinin yolu ('category__')
+def _collect(serializer, model, plan, prefix):
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        nested = _nested_serializer(field)
+
+        # source='*': Nesnenin kendisi (url kimlik alanı veya aynı modelin
+        # alanlarını kullanan iç içe serializer)
+        if field.source == '*':
+            if nested is not None:
+                _collect(nested, model, plan, prefix)
+            elif isinstance(field, relations.HyperlinkedIdentityField):
+                plan.add_column(prefix + _field_name(model, field.lookup_field))
+            else:
+                plan.load_all_columns()
+            continue
+
+        path = _resolve_source(model, field.source)
+        if path is None:
+            # Modelde karşılığı olmayan kaynak (property, metod...)
+            plan.load_all_columns()
+            continue
+
+        # Noktalı kaynakta aradaki ilişkiler JOIN ile okunur
+        *joins, model_field = path
+        lookup = prefix
+        for join in joins:
+            if join.concrete:
+                plan.add_column(lookup + join.name)
+            plan.select_related.append(lookup + join.name)
+            lookup += join.name + '__'
+        name = lookup + model_field.name
+
+        if not model_field.is_relation:
+            plan.add_column(name)
+        elif model_field.many_to_many or model_field.one_to_many:
+            # Çoklu ilişki: sayfa başına tek ek sorgu
+            plan.add_column(lookup + _field_name(model_field.model, 'pk'))
+            plan.add_prefetch(name, _related_plan(field, nested, model_field))
+        elif nested is None and _needs_pk_only(field, model_field):
+            # Sadece pk / link: FK kolonu yeterli, JOIN yok
+            plan.add_column(name)
+        else:
+            # Tek nesne ilişkisi (__str__ veya iç içe serializer): JOIN
+            related_model = model_field.related_model
+            if model_field.concrete:
+                plan.add_column(name)
+            plan.select_related.append(name)
+            plan.add_column(name + '__' + related_model._meta.pk.name)
+            if nested is not None:
+                _collect(nested, related_model, plan, name + '__')
+            else:
+                for related_field in related_model._meta.concrete_fields:
+                    plan.add_column(name + '__' + related_field.name)
+
+
+# =============================================================================
+# VIEW MIXIN'İ
+# =============================================================================
+class QueryOptimizerMixin:
+    """
+    get_queryset() sonucuna serializer'dan çıkarılan sorgu planını uygular
+    Generic view'lar ve viewset'lerle kullanılır
+    """
+
+    # None: settings.QUERY_OPTIMIZER_DEBUG kullanılır
+    query_optimizer_debug = None
+
+    def get_query_plan(self):
+        serializer = self.get_serializer()
+        return build_plan(serializer, self.get_serializer_class().Meta.model)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return queryset
+        # values() satırlarında ilişki ve kolon seçimi view'a aittir
+        if queryset._fields is not None:
+            return queryset
+
+        plan = self.get_query_plan()
+        # View only()/defer() uyguladıysa kolon seçimi değiştirilmez
+        deferred_names, _ = queryset.query.deferred_loading
+        columns = not deferred_names
+        queryset = plan.apply(queryset, columns=columns)
+
+        debug = self.query_optimizer_debug
+        if debug is None:
+            debug = getattr(settings, 'QUERY_OPTIMIZER_DEBUG', False)
+        if debug:
+            logger.info('%s sorgu planı: %s', type(self).__name__, plan.describe())
+        return queryset
@@ -0,0 +1,185 @@
+# Okuma replikası seçimi için standart kütüphaneler
+import itertools
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# =============================================================================
+# DJANGO CORE ROUTERS.PY VERİTABANI YÖNLENDİRİCİSİ DOSYASI
+# =============================================================================
+#
+# Bu dosya, okuma sorgularını replika veritabanlarına, yazma sorgularını
+# birincil (primary / 'default') veritabanına yönlendiren router'ı tanımlar.
+# View kodu değişmez; Django her sorguda router'a hangi veritabanının
+# kullanılacağını sorar (settings.DATABASE_ROUTERS).
+#
+# Kurallar:
+# - Yazma (save, update, delete, bulk_*) her zaman 'default'
+# - Okuma sadece şu durumlarda replikaya gider:
+#   - Model DATABASE_REPLICA_APPS içindeki bir uygulamaya aittir (örn. products)
+#   - İstek ReadYourWritesMiddleware tarafından yönetilmektedir
+#   - İstek güvenli (GET / HEAD / OPTIONS) bir istektir
+#   - Bu istekte henüz DATABASE_REPLICA_APPS modellerine yazma yapılmamıştır
+#   - İstemci yakın zamanda yazma yapmamıştır (çerez, core/middleware.py)
+#   - 'default' üzerinde açık bir transaction (atomic) yoktur
+# - Diğer tüm durumlarda (yönetim komutları, shell, testler) 'default'
+#
+# Replika seçimi istek başına bir kez yapılır (DATABASE_REPLICA_STRATEGY):
+# - 'round_robin': Replikalar sırayla kullanılır
+# - 'least_loaded': O anda en az sorgu çalıştıran replika seçilir
+#   (eşitlik durumunda sırayla)
+#
+# Bu dosyada tanımlananlar:
+# - ReadReplicaRouter: Django veritabanı router'ı
+# - routing_state() / get_routing_state() / use_primary(): İstek başına yönlendirme durumu
+# =============================================================================
+
+
+# İstek başına yönlendirme durumu
+# ContextVar, hem iş parçacıklarında (WSGI) hem de async görevlerde (ASGI)
+# her isteğin kendi durumunu görmesini sağlar
+class RoutingState:
+    def __init__(self, pinned=False):
+        # True ise bu istekteki tüm okumalar 'default'tan yapılır
+        self.pinned = pinned
+        # Bu istekte yazma yapıldı mı (middleware çerezi buna göre ekler)
+        self.wrote = False
+        # Bu istekte seçilen replika; bir isteğin tüm okumaları aynı
+        # replikadan yapılır (ETag ve liste aynı anlık görüntüden gelsin)
+        self.replica = None
+
+
+_routing_state = ContextVar('db_routing_state', default=None)
+
+
+# Bloğun süresince yeni bir yönlendirme durumu etkinleştirir
+@contextmanager
+def routing_state(pinned=False):
+    state = RoutingState(pinned)
+    token = _routing_state.set(state)
+    try:
+        yield state
+    finally:
+        _routing_state.reset(token)
+
+
+# Etkin yönlendirme durumu (middleware dışında None)
+# Önbellek katmanı (products/cache.py) sabitlenmiş istekleri ve replika
+# okumalarını buradan ayırt eder
+def get_routing_state():
+    return _routing_state.get()
+
+
+# Bloğun süresince okumaları birincil veritabanına sabitler
+# Örnek: with use_primary(): Product.objects.get(pk=pk)
+@contextmanager
+def use_primary():
+    state = _routing_state.get()
+    if state is None or state.pinned:
+        yield
+        return
+    state.pinned = True
+    try:
+        yield
+    finally:
+        # Blok içinde yazma yapıldıysa istek birincilde kalır
+        state.pinned = state.wrote
+
+
+# =============================================================================
+# REPLİKA YÜKÜ
+# =============================================================================
+#
+# least_loaded stratejisi için her replikada o anda çalışan sorgu sayısı
+# Replika bağlantıları açılırken sorguları sayan bir execute_wrapper eklenir
+
+_active_queries = Counter()
+_active_lock = threading.Lock()
+
+
+def _count_queries(execute, sql, params, many, context):
+    alias = context['connection'].alias
+    with _active_lock:
+        _active_queries[alias] += 1
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        with _active_lock:
+            _active_queries[alias] -= 1
+
+
+# Yeniden bağlanmada (CONN_MAX_AGE) sinyal tekrar gelir; sarmalayıcı bir kez eklenir
+@receiver(connection_created, dispatch_uid='core_replica_load')
+def track_replica_load(sender, connection, **kwargs):
+    if (
+        connection.alias in getattr(settings, 'DATABASE_REPLICAS', ())
+        and _count_queries not in connection.execute_wrappers
+    ):
+        connection.execute_wrappers.append(_count_queries)
+
+
+# =============================================================================
+# ROUTER
+# =============================================================================
+class ReadReplicaRouter:
+    """
+    Okumaları replikalara, yazmaları birincil veritabanına yönlendirir
+    settings.DATABASE_ROUTERS = ['core.routers.ReadReplicaRouter']
+    """
+
+    def __init__(self):
+        self._cycle = itertools.count()
+
+    def get_replicas(self):
+        return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+    def choose_replica(self, replicas):
+        start = next(self._cycle)
+        ordered = [replicas[(start + index) % len(replicas)] for index in range(len(replicas))]
+        if getattr(settings, 'DATABASE_REPLICA_STRATEGY', 'round_robin') == 'least_loaded':
+            # min() eşitlikte ilk elemanı seçer; sıra döndüğü için yük dağılır
+            return min(ordered, key=lambda alias: _active_queries[alias])
+        return ordered[0]
+
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        replicas = self.get_replicas()
+        if (
+            state is None
+            or state.pinned
+            or not replicas
+            or model._meta.app_label not in getattr(settings, 'DATABASE_REPLICA_APPS', ())
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        if state.replica is None:
+            state.replica = self.choose_replica(replicas)
+        return state.replica
+
+    # Yazmadan sonra aynı istekteki okumalar da birincilden yapılır
+    # Sadece replikadan okunan uygulamalar sabitler; oturum kaydı veya
+    # last_login gibi yazmalar isteği ve istemciyi birincile bağlamaz
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None and model._meta.app_label in getattr(settings, 'DATABASE_REPLICA_APPS', ()):
+            state.pinned = state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    # Replikalar birincilin kopyasıdır; nesneler arasında ilişki kurulabilir
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *self.get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    # Migration'lar sadece birincilde çalışır; replikalar ondan kopyalanır
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in self.get_replicas():
+            return False
+        return None
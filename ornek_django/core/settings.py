@@ -30,9 +30,15 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 # Bu dosya, Django projenizin davranışını tamamen kontrol eder.
 # =============================================================================
 
+# Ortam değişkenlerini okumak için os modülü
+import os
+
 # Path modülünü import ediyoruz - modern dosya yolu işlemleri için
 from pathlib import Path
 
+# Geçersiz ortam değişkeni değerlerini açık bir hata ile bildirmek için
+from django.core.exceptions import ImproperlyConfigured
+
 # Proje kök dizinini belirliyoruz
 # __file__ mevcut dosyanın yolunu verir
 # .resolve() sembolik linkleri çözer
@@ -79,13 +85,27 @@ INSTALLED_APPS = [
     'rest_framework',              # Django REST Framework
 
     # Kendi uygulamalarınız
+    'core',                        # Proje geneli ayarlar (SQLite pragma'ları, replika router'ı)
     'products',                    # Ürünler uygulaması
 ]
 
 # Django REST Framework ayarları
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',  # Sayfalama sınıfı
-    'PAGE_SIZE': 10  # Her sayfada gösterilecek öğe sayısı
+    'PAGE_SIZE': 10,  # Her sayfada gösterilecek öğe sayısı
+
+    # JSON renderer / parser: orjson kuruluysa hızlı yol, değilse stdlib json
+    # Standart DRF davranışına dönmek için bu satırları
+    # 'rest_framework.renderers.JSONRenderer' / 'rest_framework.parsers.JSONParser' yapın
+    'DEFAULT_RENDERER_CLASSES': [
+        'products.renderers.FastJSONRenderer',         # Hızlı JSON çıktısı
+        'rest_framework.renderers.BrowsableAPIRenderer',  # Tarayıcıda gezilebilir API
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'products.parsers.FastJSONParser',             # Hızlı JSON girdisi
+        'rest_framework.parsers.FormParser',           # HTML form verisi
+        'rest_framework.parsers.MultiPartParser',      # Dosya yükleme / multipart
+    ],
 }
 
 # =============================================================================
@@ -95,7 +115,10 @@ REST_FRAMEWORK = {
 # Middleware'ler, her HTTP isteğinde çalışan ara yazılımlardır
 # Sıralama önemlidir - yukarıdan aşağıya doğru çalışır
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',                       # İstek metrikleri (/metrics)
     'django.middleware.security.SecurityMiddleware',           # Güvenlik middleware'i
+    'core.middleware.CompressionMiddleware',                   # gzip / brotli / zstd sıkıştırma
+    'core.middleware.ReadYourWritesMiddleware',                # Okuma replikası / birincil seçimi
     'django.contrib.sessions.middleware.SessionMiddleware',    # Oturum yönetimi
     'django.middleware.common.CommonMiddleware',               # Genel middleware
     'django.middleware.csrf.CsrfViewMiddleware',               # CSRF koruması
@@ -137,6 +160,8 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # =============================================================================
 
 # Veritabanı ayarları
+# Geliştirme ortamında SQLite'ın varsayılan davranışı kullanılır; depodaki
+# db.sqlite3 dosyası yönetim komutlarıyla WAL moduna çevrilmez
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',  # SQLite veritabanı motoru
@@ -144,6 +169,222 @@ DATABASES = {
     }
 }
 
+# Her yeni SQLite bağlantısında çalıştırılan PRAGMA ayarları (core/db.py)
+# Geliştirme profilinde boştur; üretim profili aşağıda doldurur
+SQLITE_PRAGMAS = {}
+
+# Üretim profili (eşzamanlı okuma/yazma için), sadece açıkça seçilirse:
+#   DJANGO_DB_PROFILE=production gunicorn core.wsgi
+# - CONN_MAX_AGE: Bağlantı istekler arasında bu kadar saniye açık tutulur
+#   (0: her istekte yeni bağlantı, None: süresiz)
+#   DJANGO_DB_CONN_MAX_AGE ile değiştirilebilir; ASGI'de her istek farklı bir
+#   iş parçacığında çalışabildiğinden kalıcı bağlantılar iş parçacığı başına
+#   birikir, bu yüzden core/asgi.py varsayılanı 0 yapar
+# - CONN_HEALTH_CHECKS: Kalıcı bağlantı yeniden kullanılmadan önce kontrol edilir;
+#   kopmuş bağlantı yerine yenisi açılır
+# - transaction_mode IMMEDIATE: Yazma kilidi transaction başında alınır;
+#   okuma kilidinden yazmaya geçişte busy_timeout'u atlayan
+#   "database is locked" hataları önlenir
+# - timeout: sqlite3 modülünün kilit bekleme süresi (saniye)
+# Karşılaştırma: python manage.py benchmark_sqlite (profil seçiminden bağımsız)
+SQLITE_PRODUCTION_DATABASE = {
+    'CONN_MAX_AGE': int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', '600')),
+    'CONN_HEALTH_CHECKS': True,
+    'OPTIONS': {
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': 5,
+    },
+}
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',        # Okuyucular ve yazıcı birbirini beklemez
+    'synchronous': 'NORMAL',      # WAL ile güvenli, commit başına fsync yok
+    'busy_timeout': 5000,         # Kilit için en fazla 5 saniye bekle (ms)
+    'cache_size': -64000,         # Sayfa önbelleği: 64 MB (negatif değer KB)
+    'mmap_size': 268435456,       # 256 MB bellek eşlemeli (memory-mapped) okuma
+    'temp_store': 'MEMORY',       # Geçici tablolar / sıralamalar bellekte
+}
+
+# 'development' (varsayılan) veya 'production'
+DATABASE_PROFILE = os.environ.get('DJANGO_DB_PROFILE', 'development')
+if DATABASE_PROFILE == 'production':
+    DATABASES['default'].update(SQLITE_PRODUCTION_DATABASE)
+    SQLITE_PRAGMAS = dict(SQLITE_PRODUCTION_PRAGMAS)
+elif DATABASE_PROFILE != 'development':
+    raise ImproperlyConfigured('DJANGO_DB_PROFILE: "development" veya "production" olmalıdır')
+
+# =============================================================================
+# OKUMA REPLİKALARI (core/routers.py)
+# =============================================================================
+#
+# Ürün endpoint'lerinin okuma sorguları replika veritabanlarına, yazmalar
+# ve yazma sonrası istekler birincil ('default') veritabanına gider.
+#
+# Yerelde denemek için replikalar db.sqlite3'ün dosya kopyalarıdır:
+#   DJANGO_SQLITE_REPLICAS=2 python manage.py sync_replicas
+#   DJANGO_SQLITE_REPLICAS=2 python manage.py runserver
+# Gerçek kurulumda DATABASES içine replika bağlantıları (örn. PostgreSQL
+# streaming replication) eklenir ve adları DATABASE_REPLICAS'a yazılır.
+# TEST MIRROR: Testlerde replika sorguları 'default' test veritabanına gider
+
+DATABASE_ROUTERS = ['core.routers.ReadReplicaRouter']
+
+# Okumaların dağıtılacağı replika bağlantı adları
+DATABASE_REPLICAS = []
+for _index in range(1, int(os.environ.get('DJANGO_SQLITE_REPLICAS', '0')) + 1):
+    DATABASES['replica%d' % _index] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / ('db.replica%d.sqlite3' % _index),
+        'OPTIONS': dict(DATABASES['default'].get('OPTIONS', {})),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append('replica%d' % _index)
+
+# Replika seçimi: 'round_robin' (sırayla) veya 'least_loaded' (en az aktif sorgu)
+DATABASE_REPLICA_STRATEGY = 'round_robin'
+
+# Okumaları replikalara gidebilecek uygulamalar
+# (auth, sessions gibi uygulamalar her zaman birincili kullanır)
+DATABASE_REPLICA_APPS = ['products']
+
+# Yazma yapan istemcinin sonraki istekleri bu süre boyunca birincilden okur
+# (read-your-writes); süre, replikaların en fazla gecikmesinden uzun olmalıdır
+DATABASE_PRIMARY_COOKIE = 'use_primary'
+DATABASE_PRIMARY_PIN_SECONDS = 5
+
+# =============================================================================
+# İSTEK METRİKLERİ (core/metrics.py)
+# =============================================================================
+
+# View başına süre, SQL süresi / sayısı, kodlama süresi ve yanıt boyutu
+# histogramları; Prometheus metin formatında /metrics adresinden okunur
+METRICS_ENABLED = True
+
+# Aynı SQL bir istekte bu kadar veya daha fazla çalışırsa N+1 olarak
+# işaretlenir ve 'core.metrics' logger'ı ile uyarı yazılır (0: kapalı)
+METRICS_N_PLUS_ONE_THRESHOLD = 10
+
+# =============================================================================
+# KATALOG İSTATİSTİKLERİ (products/stats.py)
+# =============================================================================
+
+# /api/products/stats/ fiyat dağılımının aralık sınırları (artan sırada)
+# [0, 10), [10, 50), ... [5000, ∞); değiştirildikten sonra
+# python manage.py rebuild_product_stats çalıştırılmalıdır
+PRODUCT_STATS_PRICE_BUCKETS = ['10', '50', '100', '500', '1000', '5000']
+
+# =============================================================================
+# DEĞİŞİKLİK AKIŞI (products/changes.py)
+# =============================================================================
+
+# Bu günden eski değişiklik kayıtları prune_product_changes ile silinir;
+# daha eski cursor'la gelen istemci 410 alır ve tam senkronizasyon yapar
+PRODUCT_CHANGES_RETENTION_DAYS = 30
+
+# Long-poll / SSE bekleyenlerinin diğer worker'ların yazmalarını görmek
+# için veritabanını kontrol etme aralığı (saniye); aynı süreçteki yazmalar
+# bekleyenleri hemen uyandırır
+PRODUCT_CHANGES_POLL_INTERVAL = 2
+
+# =============================================================================
+# YAYIN / ABONELİK VE CANLI STOK AKIŞI (core/broker.py, products/live.py)
+# =============================================================================
+
+# Mesajların abonelere ulaştırılma yolu:
+# - core.broker.LocalBackend: Sadece bu süreçteki aboneler (tek worker)
+# - core.broker.RedisBackend: Tüm worker'lar (pip install redis)
+#   OPTIONS: {'url': 'redis://localhost:6379/0', 'prefix': 'broker:'}
+BROKER = {
+    'BACKEND': 'core.broker.LocalBackend',
+    'OPTIONS': {},
+}
+
+# Abone başına en fazla bekleyen mesaj; dolarsa birikenler atılır ve
+# istemciye güncel anlık görüntü gönderilir (geri basınç)
+BROKER_QUEUE_SIZE = 100
+
+# /api/products/live/?ids=... ile bir bağlantıda izlenebilecek en fazla ürün
+LIVE_STOCK_MAX_IDS = 100
+
+# Boşta bağlantıların vekil sunucularda kapanmaması için yorum satırı
+# gönderme aralığı (saniye)
+LIVE_STOCK_HEARTBEAT = 15
+
+# =============================================================================
+# TEST ALTYAPISI (products/testing.py)
+# =============================================================================
+
+# Büyük test verisinin SQLite anlık görüntü dosyaları; şema, seed veya fabrika
+# kodu değişince yeni dosya üretilir ve aynı adın eski dosyaları silinir
+TEST_SNAPSHOT_DIR = os.environ.get('DJANGO_TEST_SNAPSHOT_DIR', BASE_DIR / '.test_snapshots')
+
+# =============================================================================
+# YANIT SIKIŞTIRMA (core/compression.py)
+# =============================================================================
+
+# Accept-Encoding'e göre API yanıtlarının sıkıştırılması
+COMPRESSION_ENABLED = True
+
+# Sunucunun tercih sırası; kurulu olmayanlar (brotli, zstandard) atlanır
+COMPRESSION_ENCODINGS = ['br', 'zstd', 'gzip']
+
+# Kodlama başına sıkıştırma seviyesi (hız / oran dengesi)
+COMPRESSION_LEVELS = {'gzip': 6, 'br': 5, 'zstd': 3}
+
+# Bu boyuttan (byte) küçük yanıtlar olduğu gibi gönderilir
+COMPRESSION_MIN_SIZE = 1024
+
+# Sıkıştırılan medya tipleri; HTML (Browsable API) BREACH riski nedeniyle yok
+COMPRESSION_CONTENT_TYPES = [
+    'application/json',
+    'application/x-ndjson',
+    'text/csv',
+    'text/plain',
+]
+
+# =============================================================================
+# SORGU OPTİMİZASYONU (core/optimizer.py)
+# =============================================================================
+
+# True ise QueryOptimizerMixin kullanan view'lar serializer'dan çıkarılan
+# select_related / prefetch_related / only() planını 'core.optimizer'
+# logger'ı ile yazar
+QUERY_OPTIMIZER_DEBUG = False
+
+# =============================================================================
+# ÖNBELLEK (CACHE) AYARLARI
+# =============================================================================
+
+# Django önbellek bağlantıları
+# 'products': Ürün listesi ve detay yanıtlarının önbelleği (products/cache.py)
+#   - BACKEND: locmem varsayılandır; çok process'li kurulumlarda redis/memcached
+#     ile değiştirilebilir (örn. 'django.core.cache.backends.redis.RedisCache')
+#   - TIMEOUT: Kayıtların yaşam süresi (saniye)
+#   - MAX_ENTRIES: En fazla kayıt sayısı; locmem, sınır aşıldığında en az
+#     kullanılan (LRU) kayıtları siler
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'products': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'products',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+}
+
+# Ürün API'si yanıt önbelleğinin kullanacağı CACHES bağlantısı
+PRODUCT_CACHE_ALIAS = 'products'
+
+# Ürün listesi ve detay endpoint'leri için async view'lar (products/async_views.py)
+# - True: ASGI sunucusunda (uvicorn, daphne) istekler event loop'ta işlenir,
+#   veritabanı beklerken aynı worker başka istekleri karşılayabilir
+# - False: Senkron view'lar (WSGI / runserver için uygundur)
+# Karşılaştırma: python manage.py benchmark_async
+PRODUCTS_ASYNC_VIEWS = False
+
 # =============================================================================
 # ŞİFRE DOĞRULAMA AYARLARI
 # =============================================================================
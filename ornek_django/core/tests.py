@@ -0,0 +1,330 @@
+# Django test framework'ü
+import asyncio
+import gzip
+import threading
+from unittest import mock
+
+from django.contrib.auth.models import Group, User
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework import generics, serializers
+
+from products.cache import get_product_cache
+from products.models import Product
+
+from . import compression, metrics
+from .broker import Broker, LocalBackend, get_broker
+from .middleware import ReadYourWritesMiddleware
+from .optimizer import QueryOptimizerMixin, build_plan
+from .routers import ReadReplicaRouter, routing_state
+
+# =============================================================================
+# DJANGO CORE TESTS.PY TEST DOSYASI
+# =============================================================================
+#
+# Proje geneli altyapının (core/db.py, core/routers.py, core/metrics.py,
+# core/optimizer.py, core/compression.py, core/broker.py) testleri
+# =============================================================================
+
+
+# Yeni SQLite bağlantılarına settings.SQLITE_PRAGMAS uygulanmalı
+class SQLitePragmaTest(TestCase):
+
+    @override_settings(SQLITE_PRAGMAS={'synchronous': 'NORMAL', 'busy_timeout': 1234, 'temp_store': 'MEMORY'})
+    def test_pragmas_applied_on_new_connection(self):
+        """Her yeni bağlantı pragma'ları bir kez çalıştırmalı"""
+        wrapper = connection.copy()
+        wrapper.ensure_connection()
+        try:
+            values = [wrapper.connection.execute('PRAGMA %s' % name).fetchone()[0]
+                      for name in ('synchronous', 'busy_timeout', 'temp_store')]
+        finally:
+            wrapper.close()
+        self.assertEqual(values, [1, 1234, 2])
+
+    @override_settings(SQLITE_PRAGMAS={'journal_mode': 'WAL; DROP TABLE x'})
+    def test_invalid_values_are_rejected(self):
+        """PRAGMA değerleri SQL'e gömüldüğü için sadece basit değerler kabul edilmeli"""
+        wrapper = connection.copy()
+        with self.assertRaises(ValueError):
+            wrapper.ensure_connection()
+        wrapper.close()
+
+
+# Okumalar replikalara, yazmalar ve yazma sonrası okumalar birincile gitmeli
+@override_settings(DATABASE_REPLICAS=['replica1', 'replica2'], DATABASE_REPLICA_APPS=['products'])
+# SimpleTestCase: TestCase her testi bir transaction içinde çalıştırdığı için
+# router orada her zaman birincili seçer
+class ReadReplicaRouterTest(SimpleTestCase):
+
+    def setUp(self):
+        self.router = ReadReplicaRouter()
+
+    def test_reads_are_spread_and_sticky_per_request(self):
+        """Her istek bir replika seçmeli; istek içindeki okumalar aynı replikada kalmalı"""
+        self.assertEqual(self.router.db_for_read(Product), 'default')
+        chosen = []
+        for _ in range(2):
+            with routing_state():
+                first = self.router.db_for_read(Product)
+                self.assertEqual(self.router.db_for_read(Product), first)
+                self.assertEqual(self.router.db_for_read(User), 'default')
+                chosen.append(first)
+        self.assertEqual(sorted(chosen), ['replica1', 'replica2'])
+
+    def test_writes_and_transactions_use_primary(self):
+        """Yazmadan sonra ve atomic blok içinde okumalar birincilden yapılmalı"""
+        with routing_state() as state:
+            with mock.patch.object(connection, 'in_atomic_block', True):
+                self.assertEqual(self.router.db_for_read(Product), 'default')
+            self.assertEqual(self.router.db_for_write(Product), 'default')
+            self.assertTrue(state.wrote)
+            self.assertEqual(self.router.db_for_read(Product), 'default')
+
+    def test_middleware_pins_following_requests(self):
+        """Yazma yapan istemci çerezle sonraki isteklerde birincile sabitlenmeli"""
+        def write_view(request):
+            self.router.db_for_write(Product)
+            return HttpResponse()
+
+        def read_view(request):
+            return HttpResponse(self.router.db_for_read(Product))
+
+        factory = RequestFactory()
+        response = ReadYourWritesMiddleware(write_view)(factory.post('/api/products/'))
+        self.assertEqual(response.cookies['use_primary']['max-age'], 5)
+
+        request = factory.get('/api/products/')
+        self.assertIn(ReadYourWritesMiddleware(read_view)(request).content, [b'replica1', b'replica2'])
+        request.COOKIES['use_primary'] = '1'
+        self.assertEqual(ReadYourWritesMiddleware(read_view)(request).content, b'default')
+
+    def test_writes_outside_replica_apps_do_not_pin(self):
+        """Oturum veya last_login yazması isteği ve istemciyi birincile sabitlememeli"""
+        def session_view(request):
+            self.router.db_for_write(Session)
+            self.router.db_for_write(User)
+            return HttpResponse(self.router.db_for_read(Product))
+
+        response = ReadYourWritesMiddleware(session_view)(RequestFactory().get('/api/products/'))
+        self.assertNotIn('use_primary', response.cookies)
+        self.assertIn(response.content, [b'replica1', b'replica2'])
+
+
+# İstek metrikleri ve /metrics çıktısı
+class MetricsTest(TestCase):
+
+    def setUp(self):
+        metrics.registry.reset()
+
+    def test_histogram_precision(self):
+        """HDR histogram yüzdelikleri ~%3 hata ile doğru olmalı"""
+        histogram = metrics.Histogram()
+        for value in range(1, 10001):
+            histogram.record(value)
+        for percent, expected in [(50, 5000), (99, 9900), (100, 10000)]:
+            self.assertAlmostEqual(histogram.percentile(percent), expected, delta=expected * 0.035)
+        self.assertEqual(histogram.cumulative([31, 20000]), [31, 10000])
+
+    def test_request_metrics_are_exported(self):
+        """İstekler view adıyla etiketlenmeli; SQL sayısı ve boyut kaydedilmeli"""
+        Product.objects.create(name='Kalem', price='5.00', stock=1)
+        response = self.client.get('/api/products/')
+        body = self.client.get('/metrics').content.decode()
+        labels = 'view="ProductListCreateAPIView",method="GET"'
+        self.assertIn('http_request_duration_seconds_count{%s} 1' % labels, body)
+        self.assertIn('http_response_size_bytes_sum{%s} %d' % (labels, len(response.content)), body)
+        self.assertIn('http_request_render_duration_seconds_count{%s} 1' % labels, body)
+        self.assertRegex(body, r'http_request_db_queries_sum\{%s\} [1-9]' % labels)
+        self.assertNotIn('metrics_view', body)
+
+    def test_reconnect_does_not_duplicate_wrapper(self):
+        """Yeniden bağlanmada (connection_created) sorgular iki kez sayılmamalı"""
+        connection.ensure_connection()
+        metrics.track_queries(sender=None, connection=connection)
+        self.assertEqual(connection.execute_wrappers.count(metrics._record_query), 1)
+        with metrics.collecting() as request_metrics:
+            Product.objects.count()
+        self.assertEqual(request_metrics.queries, 1)
+
+    @override_settings(METRICS_N_PLUS_ONE_THRESHOLD=3)
+    def test_n_plus_one_is_flagged(self):
+        """Aynı SQL eşik kadar tekrarlanırsa N+1 sayacı artmalı"""
+        with metrics.collecting() as request_metrics:
+            for product in [Product.objects.create(name=str(i), price='1.00') for i in range(3)]:
+                Product.objects.get(pk=product.pk)
+        with self.assertLogs('core.metrics', 'WARNING'):
+            metrics.registry.observe('ProductView', 'GET', request_metrics, 0.01, 10)
+        self.assertIn(
+            'http_request_n_plus_one_total{view="ProductView",method="GET"} 1', metrics.registry.render()
+        )
+
+
+# Serializer'dan sorgu planı çıkarılması (core/optimizer.py)
+class GroupNameSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Group
+        fields = ['name']
+
+
+class UserGroupsSerializer(serializers.ModelSerializer):
+    groups = GroupNameSerializer(many=True, read_only=True)
+    group_ids = serializers.PrimaryKeyRelatedField(source='groups', many=True, read_only=True)
+    label = serializers.CharField(source='get_full_name', read_only=True)
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'groups', 'group_ids', 'label']
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class UserListAPIView(QueryOptimizerMixin, generics.ListAPIView):
+    queryset = User.objects.order_by('pk')
+    serializer_class = UserGroupsSerializer
+    pagination_class = None
+    query_optimizer_debug = True
+
+
+class QueryOptimizerTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        group = Group.objects.create(name='editor')
+        for index in range(5):
+            User.objects.create(username='user%d' % index).groups.add(group)
+
+    def test_plan_follows_serializer_fields(self):
+        """Kolonlar only(), iç içe ve pk ilişkileri Prefetch ile yüklenmeli"""
+        plan = build_plan(UserGroupsSerializer(fields=['id', 'username', 'groups']), User)
+        description = plan.describe()
+        self.assertEqual(description['only'], ['id', 'username'])
+        self.assertIn('"auth_group"."name"', description['prefetch_related']['groups'])
+
+        # Modelde karşılığı olmayan kaynak (get_full_name) tüm kolonları gerektirir
+        self.assertEqual(build_plan(UserGroupsSerializer(), User).describe()['only'], '*')
+
+    def test_list_view_avoids_n_plus_one(self):
+        """Liste, kullanıcı sayısından bağımsız sabit sayıda sorgu çalıştırmalı"""
+        request = RequestFactory().get('/users/')
+        view = UserListAPIView.as_view()
+        with self.assertLogs('core.optimizer', 'INFO'), self.assertNumQueries(2):
+            response = view(request)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(response.data[0]['groups'], [{'name': 'editor'}])
+
+
+# Yanıt sıkıştırması (core/compression.py, CompressionMiddleware)
+class CompressionTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Product.objects.bulk_create(
+            Product(name='Ürün %d' % index, price='10.00', stock=index) for index in range(50)
+        )
+
+    def setUp(self):
+        get_product_cache().clear()
+
+    def test_negotiation(self):
+        """q değeri yüksek olan, eşitlikte sunucunun tercih ettiği kodlama seçilmeli"""
+        self.assertEqual(compression.negotiate_encoding('gzip, br', ['br', 'gzip']), 'br')
+        self.assertEqual(compression.negotiate_encoding('gzip;q=1.0, br;q=0.5', ['br', 'gzip']), 'gzip')
+        self.assertEqual(compression.negotiate_encoding('*;q=0.1', ['gzip']), 'gzip')
+        self.assertIsNone(compression.negotiate_encoding('gzip;q=0, deflate', ['gzip']))
+        self.assertIsNone(compression.negotiate_encoding('', ['gzip']))
+
+    def test_cached_body_is_compressed_once(self):
+        """Liste sıkıştırılmalı; önbellekten dönen yanıtlar yeniden sıkıştırılmamalı"""
+        plain = self.client.get('/api/products/', {'page_size': 50})
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertIn('Accept-Encoding', plain['Vary'])
+        get_product_cache().clear()
+
+        codec = compression.CODECS['gzip']
+        with mock.patch.object(codec, 'compress', wraps=codec.compress) as compress:
+            first = self.client.get('/api/products/', {'page_size': 50}, HTTP_ACCEPT_ENCODING='gzip')
+            second = self.client.get('/api/products/', {'page_size': 50}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        for response in (first, second):
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertEqual(gzip.decompress(response.content), plain.content)
+            self.assertTrue(response['ETag'].startswith('W/'))
+
+    def test_small_and_unlisted_responses_are_not_compressed(self):
+        """Eşikten küçük ve izin listesinde olmayan yanıtlar olduğu gibi gönderilmeli"""
+        pk = Product.objects.values_list('pk', flat=True)[0]
+        small = self.client.get('/api/products/%d/' % pk, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', small)
+        html = self.client.get('/api/products/', {'page_size': 50}, HTTP_ACCEPT='text/html',
+                               HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', html)
+
+    def test_streaming_export_is_compressed_in_chunks(self):
+        """Export akışı parça parça sıkıştırılmalı ve tam olarak açılabilmeli"""
+        plain = b''.join(self.client.get('/api/products/export/').streaming_content)
+        response = self.client.get('/api/products/export/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), plain)
+
+
+# Abonelik kuyrukları sınırlı olmalı; yayın her iş parçacığından yapılabilmeli
+class BrokerTest(SimpleTestCase):
+
+    def make_broker(self, queue_size=3):
+        broker = Broker(queue_size=queue_size)
+        broker.backend = LocalBackend(broker)
+        return broker
+
+    async def test_slow_subscriber_is_marked_lagged(self):
+        """Kuyruk dolunca birikenler atılmalı ve abone geride kaldı sayılmalı"""
+        broker = self.make_broker()
+        slow = broker.subscribe(['a'])
+        other = broker.subscribe(['b'])
+        for index in range(5):
+            broker.publish('a', {'n': index})
+        broker.publish('b', {'n': 0})
+        await asyncio.sleep(0)
+
+        self.assertEqual(slow.drain(), ([{'n': 4}], True))
+        self.assertEqual(slow.drain(), ([], False))
+        self.assertEqual(other.drain(), ([{'n': 0}], False))
+        self.assertFalse(await slow.wait(0.01))
+
+        broker.unsubscribe(slow)
+        self.assertFalse(broker.has_subscribers(['a']))
+        self.assertTrue(await slow.wait(1))
+        self.assertEqual(broker.subscriber_count(), 1)
+
+    async def test_publish_from_another_thread_wakes_subscriber(self):
+        """Başka iş parçacığından yapılan yayın bekleyen aboneyi uyandırmalı"""
+        broker = self.make_broker()
+        subscription = broker.subscribe(['a'])
+        waiting = asyncio.ensure_future(subscription.wait(5))
+        await asyncio.sleep(0)
+        thread = threading.Thread(target=broker.publish, args=('a', {'n': 1}))
+        thread.start()
+        self.assertTrue(await asyncio.wait_for(waiting, 1))
+        thread.join()
+        self.assertEqual(subscription.drain(), ([{'n': 1}], False))
+
+    def test_backend_is_configurable(self):
+        """BROKER ayarı değişince yeni arka uçla yeni broker oluşturulmalı"""
+        with override_settings(BROKER={'BACKEND': 'core.tests.RecordingBackend'}, BROKER_QUEUE_SIZE=7):
+            broker = get_broker()
+            self.assertIsInstance(broker.backend, RecordingBackend)
+            self.assertEqual(broker.queue_size, 7)
+            self.assertTrue(broker.has_subscribers(['x']))
+        self.assertIsInstance(get_broker().backend, LocalBackend)
+
+
+class RecordingBackend(LocalBackend):
+    distributed = True
@@ -49,6 +49,9 @@ from django.urls import path, include
 # Bu, ana sayfa için kullanılacak view fonksiyonudur
 from products.views import home_view
 
+# Prometheus metrikleri (core/metrics.py)
+from core.metrics import metrics_view
+
 # =============================================================================
 # URL DESENLERİ TANIMLAMASI
 # =============================================================================
@@ -74,4 +77,9 @@ urlpatterns = [
     # Bu, REST API endpoint'lerini organize etmek için kullanılır
     # Örnek: /api/products/, /api/products/1/ gibi
     path('api/', include('products.urls')),
+
+    # İstek metrikleri (Prometheus metin formatı)
+    # /metrics adresi Prometheus tarafından periyodik olarak okunur
+    # View başına süre, SQL sayısı/süresi ve yanıt boyutu histogramları
+    path('metrics', metrics_view, name='metrics'),
 ]
@@ -41,6 +41,12 @@ class ProductsConfig(AppConfig):
     # Örnek: 'products.models', 'products.views' gibi
     name = 'products'
 
+    # Uygulama yüklendiğinde sinyal alıcılarını (receiver) kaydediyoruz
+    # products.signals modülü import edildiğinde @receiver ile işaretli
+    # fonksiyonlar ilgili sinyallere bağlanır (önbellek geçersiz kılma vb.)
+    def ready(self):
+        from . import signals  # noqa: F401
+
     # =============================================================================
     # OPSİYONEL AYARLAR (Şu anda kullanılmıyor)
     # =============================================================================
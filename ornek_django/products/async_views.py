@@ -0,0 +1,383 @@
+# Async (coroutine) fonksiyon kontrolü ve senkron koda köprü
+import asyncio
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+# Django REST Framework bileşenleri
+# Async view'lar DRF'nin istek ayrıştırma, kimlik doğrulama, izin, filtre,
+# sayfalama ve serializer altyapısını aynen kullanır; sadece veritabanı
+# erişimi ve istek akışı (dispatch) async olarak yeniden yazılmıştır
+from rest_framework import generics, status
+from rest_framework.exceptions import NotAcceptable, NotFound, ValidationError
+from rest_framework.response import Response
+
+from . import changes
+from .exceptions import ChangeCursorExpired
+from .models import Product
+from .renderers import EventStreamRenderer, FastJSONRenderer
+from .serializers import ProductReadSerializer, ProductSerializer
+from .signals import products_changed
+from .views import ProductListCreateAPIView, ProductRetrieveUpdateDestroyAPIView
+
+# =============================================================================
+# DJANGO PRODUCTS ASYNC_VIEWS.PY ASYNC VIEW DOSYASI
+# =============================================================================
+#
+# Bu dosya, ürün listesi ve detay endpoint'lerinin async (ASGI-native)
+# sürümlerini tanımlar.
+#
+# Sorun:
+# - uvicorn / daphne gibi ASGI sunucularında senkron view'lar
+#   sync_to_async(thread_sensitive=True) ile TEK bir iş parçacığında
+#   sırayla çalıştırılır; bir worker aynı anda sadece bir istek işler
+#
+# Çözüm:
+# - dispatch() ve GET/POST/PUT/PATCH/DELETE işleyicileri async'tir
+# - Veritabanı erişimi Django'nun async ORM'i ile yapılır
+#   (aiterator / aget / acreate / asave / adelete / aaggregate)
+# - Bekleme (I/O) sırasında event loop diğer istekleri işlemeye devam eder
+#
+# Sözleşme (contract) senkron view'larla aynıdır:
+# - Aynı URL'ler, filtreler, sıralama, ?fields=, cursor ve ?page=N modları
+# - Aynı JSON gövdesi, hata formatı, ETag / 304 ve önbellek (X-Cache)
+# - Fark: Sadece JSON render edilir (Browsable API senkron view'larda kalır)
+#
+# Etkinleştirme (settings.py):
+#   PRODUCTS_ASYNC_VIEWS = True
+# Karşılaştırma:
+#   python manage.py benchmark_async
+#
+# Bu dosyada tanımlanan view'lar:
+# - AsyncProductListCreateAPIView: GET (liste), POST (oluştur)
+# - AsyncProductRetrieveUpdateDestroyAPIView: GET, PUT, PATCH, DELETE
+# - ProductChangesAPIView: Değişiklik akışı (long-poll ve SSE); her zaman
+#   async çalışır, PRODUCTS_ASYNC_VIEWS ayarından bağımsızdır
+# =============================================================================
+
+
+# =============================================================================
+# ASYNC İSTEK AKIŞI
+# =============================================================================
+
+# APIView.dispatch() işleminin async karşılığı
+# Django, işleyicileri async olan view'ları event loop'ta doğrudan çalıştırır
+class AsyncAPIViewMixin:
+    renderer_classes = [FastJSONRenderer]
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+
+        # Oturum kullanıcısı async olarak yüklenir; DRF'nin SessionAuthentication
+        # sınıfı request.user'a senkron eriştiği için sonuç önceden atanır
+        if hasattr(request, 'auser'):
+            request.user = await request.auser()
+
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            self.initial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        # Yanıt burada render edilir; aksi halde Django render() işlemini
+        # ayrı bir iş parçacığında (sync_to_async) yapar
+        if hasattr(self.response, 'render'):
+            self.response.render()
+        return self.response
+
+    async def options(self, request, *args, **kwargs):
+        return super().options(request, *args, **kwargs)
+
+    # GET istekleri aget() zinciri ile işlenir:
+    # ConditionalGetMixin.aget -> CachedResponseMixin.aget -> alt sınıfın aget()'i
+    async def get(self, request, *args, **kwargs):
+        return await self.aget(request, *args, **kwargs)
+
+    # GenericAPIView.get_object() işleminin async karşılığı
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError):
+            raise NotFound('No %s matches the given query.' % queryset.model._meta.object_name)
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+# aget() zincirinin son halkası: liste
+# Bu sınıf MRO'da APIView'dan sonra gelir; ConditionalGetMixin ve
+# CachedResponseMixin'in super().aget() çağrıları buraya ulaşır
+class AsyncListModelMixin:
+    async def aget(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = self.paginator
+
+        if hasattr(paginator, 'get_page_queryset'):
+            # Keyset sayfalama: sorgu tembel olarak hazırlanır, async okunur
+            page_queryset = paginator.get_page_queryset(queryset, request, view=self)
+            if page_queryset is None:
+                page = None
+            else:
+                page = paginator.build_page([row async for row in page_queryset.aiterator()])
+        else:
+            # Eski ?page=N modu: Django Paginator'ın async sürümü yoktur
+            page = await sync_to_async(paginator.paginate_queryset)(queryset, request, view=self)
+
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([row async for row in queryset.aiterator()], many=True)
+        return Response(serializer.data)
+
+
+class AsyncCreateModelMixin:
+    async def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        model = serializer.Meta.model
+        serializer.instance = await model.objects.acreate(**serializer.validated_data)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+
+# aget() zincirinin son halkası: detay
+class AsyncRetrieveModelMixin:
+    async def aget(self, request, *args, **kwargs):
+        serializer = self.get_serializer(await self.aget_object())
+        return Response(serializer.data)
+
+
+class AsyncUpdateModelMixin:
+    async def put(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        for attr, value in serializer.validated_data.items():
+            setattr(instance, attr, value)
+        await instance.asave()
+        return Response(serializer.data)
+
+    async def patch(self, request, *args, **kwargs):
+        kwargs['partial'] = True
+        return await self.put(request, *args, **kwargs)
+
+
+class AsyncDestroyModelMixin:
+    async def delete(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        pk = instance.pk
+        await instance.adelete()
+        # Senkron dinleyiciler (on_commit) asend() ile ORM'in iş parçacığında çalışır
+        await products_changed.asend(sender=Product, action='delete', pks=[pk])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# =============================================================================
+# ASYNC ÜRÜN VIEW'LARI
+# =============================================================================
+#
+# Senkron view'lardan türetilir; queryset, filtreler, sayfalama, serializer
+# seçimi, ETag ve önbellek ayarları aynen devralınır.
+#
+# Sınıf sırası (MRO) önemlidir:
+# - post/put/patch/delete mixin'leri senkron view'dan ÖNCE gelir
+#   (generics.*APIView'ın senkron metodlarını ezmek için)
+# - aget() zincirini bitiren liste/detay mixin'leri senkron view'dan SONRA
+#   gelir (ConditionalGetMixin ve CachedResponseMixin önce çalışsın diye)
+
+class AsyncProductListCreateAPIView(
+    AsyncAPIViewMixin, AsyncCreateModelMixin, ProductListCreateAPIView, AsyncListModelMixin
+):
+    """
+    Ürün listeleme ve oluşturma endpointi (async)
+    GET /api/products/ - Liste (keyset/cursor veya ?page=N)
+    POST /api/products/ - Yeni ürün oluşturur
+    """
+
+
+class AsyncProductRetrieveUpdateDestroyAPIView(
+    AsyncAPIViewMixin,
+    AsyncUpdateModelMixin,
+    AsyncDestroyModelMixin,
+    ProductRetrieveUpdateDestroyAPIView,
+    AsyncRetrieveModelMixin,
+):
+    """
+    Tek ürün endpointi (async)
+    GET /api/products/<id>/ - Ürün detayı
+    PUT/PATCH /api/products/<id>/ - Ürün güncelleme
+    DELETE /api/products/<id>/ - Ürün silme
+    """
+
+
+# =============================================================================
+# DEĞİŞİKLİK AKIŞI (CHANGE FEED)
+# =============================================================================
+#
+# Kenar önbellekleri ve arama indeksleyicileri son senkronizasyonlarından
+# bu yana değişen ürünleri alır (products/changes.py). Üç mod vardır:
+# - Normal: Cursor'dan sonraki ilk parti hemen döner
+# - Long-poll (?wait=N): Değişiklik yoksa en fazla N saniye beklenir
+# - SSE (Accept: text/event-stream): Bağlantı açık kalır, her değişiklik
+#   bir olay olarak gönderilir (sadece ASGI sunucusunda)
+#
+# Bekleyen istekler iş parçacığı tutmaz; event loop'ta bir Future ile
+# bekler. Bu süreçteki yazmalar bekleyenleri hemen uyandırır; diğer
+# worker'ların yazmaları PRODUCT_CHANGES_POLL_INTERVAL saniyede bir
+# veritabanı kontrol edilerek alınır.
+#
+# Yanıt:
+# {
+#     "results": [
+#         {"seq": 41, "id": 7, "action": "update", "data": {...ürün...}},
+#         {"seq": 42, "id": 9, "action": "delete", "data": null}
+#     ],
+#     "cursor": 42,        <- Sonraki isteğin since değeri
+#     "has_more": false    <- true ise hemen tekrar istenmelidir
+# }
+# data: Ürünün okuma anındaki hali; ürün silinmişse null
+
+class ProductChangesAPIView(AsyncAPIViewMixin, generics.GenericAPIView):
+    """
+    Ürün değişiklik akışı (delta senkronizasyonu)
+    GET /api/products/changes/?since=<cursor> - Cursor'dan sonraki değişiklikler
+    GET /api/products/changes/?since=<cursor>&wait=25 - Değişiklik yoksa 25 sn bekler (long-poll)
+    GET /api/products/changes/?since=<cursor> (Accept: text/event-stream) - SSE akışı
+    """
+
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    renderer_classes = [FastJSONRenderer, EventStreamRenderer]
+    pagination_class = None
+    filter_backends = []
+
+    # Parti başına en fazla kayıt (?limit=N ile değiştirilebilir)
+    limit = 500
+    max_limit = 5000
+
+    # Long-poll için izin verilen en uzun bekleme (saniye)
+    max_wait = 30
+
+    # SSE: Boşta bağlantıya yorum satırı gönderme aralığı (saniye) ve
+    # istemcinin yeniden bağlanmadan önce bekleyeceği süre (milisaniye)
+    heartbeat = 15
+    retry = 2000
+
+    # Mümkünse hızlı okuma serializer'ı kullanılır (bkz. ProductReadSerializer)
+    def get_serializer_class(self):
+        if ProductReadSerializer.is_supported():
+            return ProductReadSerializer
+        return super().get_serializer_class()
+
+    def get_poll_interval(self):
+        return getattr(settings, 'PRODUCT_CHANGES_POLL_INTERVAL', 2)
+
+    def get_int_param(self, name, value, maximum=None):
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise ValidationError({name: ['Geçerli bir tam sayı girin.']})
+        if value < 0:
+            raise ValidationError({name: ['Negatif olamaz.']})
+        if maximum is not None and value > maximum:
+            raise ValidationError({name: ['En fazla %d olabilir.' % maximum]})
+        return value
+
+    # SSE istemcisi yeniden bağlandığında son olayın id'si (seq)
+    # Last-Event-ID başlığıyla gelir
+    def get_since(self):
+        value = self.request.query_params.get('since', self.request.headers.get('Last-Event-ID', 0))
+        return self.get_int_param('since', value)
+
+    def get_limit(self):
+        return max(1, self.get_int_param('limit', self.request.query_params.get('limit', self.limit), self.max_limit))
+
+    def get_wait(self):
+        return self.get_int_param('wait', self.request.query_params.get('wait', 0), self.max_wait)
+
+    # Bir parti okur ve serialize eder (senkron; sync_to_async ile çağrılır)
+    def load(self, since, limit, check=False):
+        using = self.get_queryset().db
+        if check and changes.is_expired(since, using):
+            raise ChangeCursorExpired(changes.latest(using))
+        entries, cursor, has_more = changes.read(since, limit, using)
+
+        ids = [product_id for seq, product_id, action in entries if action != 'delete']
+        queryset = self.get_queryset().filter(pk__in=ids).order_by()
+        if issubclass(self.get_serializer_class(), ProductReadSerializer):
+            rows = queryset.values(*ProductReadSerializer.get_source_fields())
+        else:
+            rows = queryset
+        products = {row['id']: row for row in self.get_serializer(rows, many=True).data}
+        return {
+            'results': [
+                {'seq': seq, 'id': product_id, 'action': action, 'data': products.get(product_id)}
+                for seq, product_id, action in entries
+            ],
+            'cursor': cursor,
+            'has_more': has_more,
+        }
+
+    async def aget(self, request, *args, **kwargs):
+        since, limit = self.get_since(), self.get_limit()
+        stream = isinstance(request.accepted_renderer, EventStreamRenderer)
+        if stream and not isinstance(request._request, ASGIRequest):
+            # WSGI akışı bir iş parçacığını bağlantı süresince tutar
+            raise NotAcceptable('SSE akışı sadece ASGI sunucusunda desteklenir; ?wait= kullanın.')
+        wait = 0 if stream else self.get_wait()
+
+        # Bildirim sürümü okumadan ÖNCE alınır; okuma ile bekleme arasında
+        # gelen değişiklik kaçırılmaz
+        version = changes.notifier.version
+        batch = await sync_to_async(self.load)(since, limit, check=True)
+        if stream:
+            response = StreamingHttpResponse(
+                self.event_stream(batch, version, limit),
+                content_type='%s; charset=%s' % (EventStreamRenderer.media_type, EventStreamRenderer.charset),
+            )
+            response['Cache-Control'] = 'no-cache'
+            # nginx gibi vekil sunucuların olayları tamponlamaması için
+            response['X-Accel-Buffering'] = 'no'
+            return response
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        while not batch['results'] and loop.time() < deadline:
+            await changes.notifier.wait(version, min(deadline - loop.time(), self.get_poll_interval()))
+            version = changes.notifier.version
+            batch = await sync_to_async(self.load)(since, limit)
+        return Response(batch)
+
+    async def event_stream(self, batch, version, limit):
+        renderer = EventStreamRenderer()
+        loop = asyncio.get_running_loop()
+        yield renderer.encode_retry(self.retry)
+        last_sent = loop.time()
+        while True:
+            for entry in batch['results']:
+                yield renderer.encode_event(entry, event='change', id=entry['seq'])
+                last_sent = loop.time()
+            if not batch['has_more']:
+                await changes.notifier.wait(version, self.get_poll_interval())
+                if loop.time() - last_sent >= self.heartbeat:
+                    yield renderer.encode_comment('keep-alive')
+                    last_sent = loop.time()
+            version = changes.notifier.version
+            batch = await sync_to_async(self.load)(batch['cursor'], limit)
@@ -0,0 +1,376 @@
+# Örnek veri üretimi, ölçüm ve bağlam yöneticisi (context manager) için standart kütüphaneler
+import asyncio
+import decimal
+import json
+import math
+import random
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection, transaction
+from django.test import Client, RequestFactory
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from .models import Product
+
+# =============================================================================
+# DJANGO PRODUCTS BENCHMARKS.PY ÖLÇÜM YARDIMCILARI DOSYASI
+# =============================================================================
+#
+# Bu dosya, performans ölçen yönetim komutlarının (benchmark_*) ortak
+# yardımcılarını tanımlar:
+# - Gerçek veritabanına dokunmadan geçici bir test veritabanı açmak
+# - Bu veritabanına hızlıca (bulk_create) örnek ürün eklemek
+# - Ürün önbelleğini kapatarak view + veritabanı maliyetini ölçmek
+# - Gecikme listesinden yüzdelik (p50 / p99) değerleri hesaplamak
+# - İstekleri test client, WSGI ve ASGI uygulamasına vermek (HTTP sunucusu
+#   ve soket olmadan, süreç içinde)
+# - Senaryo setini (liste, detay, oluşturma, güncelleme, silme) ölçmek ve
+#   sonuçları önceki bir ölçümle karşılaştırmak (benchmark_api komutu)
+#
+# Bu dosyada tanımlanan yardımcılar:
+# - benchmark_database(): Geçici test veritabanı (bellekte veya dosyada)
+# - seed_products(): Örnek ürün ekleme
+# - without_product_cache(): Ürün önbelleğini DummyCache ile değiştirme
+# - percentile(): Yüzdelik hesaplama
+# - parse_scale(): '1k' / '100k' / '1m' gibi ölçek değerleri
+# - wsgi_request() / asgi_request(): Tek isteği WSGI / ASGI uygulamasına verir
+# - Transport'lar ve run_scenarios(): Senaryo ölçümü
+# - compare_results(): Gerileme (regression) kontrolü
+# =============================================================================
+
+
+# Ölçüm süresince geçici bir test veritabanı oluşturur ve sonunda siler
+# SQLite'ta bu veritabanı varsayılan olarak bellektedir (shared cache); farklı
+# iş parçacıkları (sync_to_async) aynı veritabanını görür
+# name verilirse veritabanı bu dosyada oluşturulur (WAL gibi dosya modları için)
+@contextmanager
+def benchmark_database(name=None, verbosity=0):
+    old_name = connection.settings_dict['NAME']
+    test_settings = connection.settings_dict['TEST']
+    old_test_name = test_settings.get('NAME')
+    if name is not None:
+        test_settings['NAME'] = name
+    try:
+        connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+        try:
+            yield connection
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+    finally:
+        test_settings['NAME'] = old_test_name
+
+
+# Veritabanına count adet örnek ürün ekler
+# Not: created_at (auto_now_add) tüm satırlarda aynıdır; sıralama id ile kararlıdır
+# SQLite'ta satırlar tek bir INSERT ... SELECT ile veritabanı içinde üretilir
+# (özyinelemeli CTE); 1M satır bulk_create'in aksine Python nesnesi
+# oluşturmadan saniyeler içinde eklenir. Değerler bulk_create yolu ile aynıdır.
+def seed_products(count, batch_size=1000):
+    if connection.vendor == 'sqlite':
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                'WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < %s) '
+                'INSERT INTO {table} (name, price, stock, created_at, updated_at) '
+                "SELECT 'Ürün ' || n, printf('%%d.%%02d', n %% 5000, n %% 100), n %% 250, %s, %s "
+                'FROM seq'.format(table=connection.ops.quote_name(Product._meta.db_table)),
+                [count, now, now],
+            )
+        return
+    Product.objects.bulk_create(
+        (
+            Product(
+                name='Ürün %d' % index,
+                price=decimal.Decimal('%d.%02d' % (index % 5000, index % 100)),
+                stock=index % 250,
+            )
+            for index in range(1, count + 1)
+        ),
+        batch_size=batch_size,
+    )
+
+
+# Ürün yanıt önbelleğini (products/cache.py) ölçüm süresince devre dışı bırakır
+# Aksi halde aynı URL'ye yapılan tekrar istekler önbellekten döner
+@contextmanager
+def without_product_cache(alias='benchmark-dummy'):
+    caches = dict(settings.CACHES)
+    caches[alias] = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+    with override_settings(CACHES=caches, PRODUCT_CACHE_ALIAS=alias):
+        yield
+
+
+# Sıralı olmayan değer listesinden yüzdelik değer (nearest-rank yöntemi)
+# Örnek: percentile(gecikmeler, 99) -> p99
+def percentile(values, percent):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, math.ceil(len(ordered) * percent / 100) - 1)
+    return ordered[index]
+
+
+# Ölçek değeri: '1k' -> 1000, '100k' -> 100000, '1m' -> 1000000, '2500' -> 2500
+def parse_scale(value):
+    value = str(value).strip().lower()
+    multiplier = {'k': 10 ** 3, 'm': 10 ** 6}.get(value[-1:], 1)
+    number = value[:-1] if multiplier > 1 else value
+    return int(float(number) * multiplier)
+
+
+# =============================================================================
+# İSTEK GÖNDERİMİ (TRANSPORT)
+# =============================================================================
+#
+# Aynı senaryo üç farklı yoldan ölçülür:
+# - client: django.test.Client (middleware dahil, WSGI ortamı taklit edilir)
+# - wsgi: WSGIHandler (gerçek WSGI sunucusunun çağırdığı uygulama)
+# - asgi: core.asgi ile aynı ASGI uygulaması (tek event loop)
+# Her transport send(method, path, body) -> (durum kodu, gövde) sağlar.
+
+
+# Tek bir isteği WSGI uygulamasına verir; WSGI sunucusu gibi yanıtı kapatır
+# (close() request_finished sinyalini, dolayısıyla bağlantı kapatmayı tetikler)
+def wsgi_request(handler, environ):
+    status = []
+    response = handler(environ, lambda code, headers: status.append(code))
+    content = b''.join(response)
+    response.close()
+    return int(status[0].split()[0]), content
+
+
+# Tek bir isteği ASGI uygulamasına verir; (durum kodu, gövde) döndürür
+async def asgi_request(app, method, url, body=b'', headers=()):
+    parts = urlsplit(url)
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': parts.path,
+        'raw_path': parts.path.encode(),
+        'query_string': parts.query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'localhost'), (b'accept', b'application/json'), *headers],
+        'client': ('127.0.0.1', 0),
+        'server': ('localhost', 80),
+    }
+    disconnected = asyncio.Event()
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    status = []
+    chunks = []
+
+    # İlk çağrıda istek gövdesi, sonra bağlantı kopana kadar bekleme
+    async def receive():
+        if messages:
+            return messages.pop()
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+        elif message['type'] == 'http.response.body':
+            chunks.append(message.get('body', b''))
+
+    await app(scope, receive, send)
+    disconnected.set()
+    return status[0], b''.join(chunks)
+
+
+class ClientTransport:
+    def __init__(self):
+        self.client = Client(HTTP_HOST='localhost', HTTP_ACCEPT='application/json')
+
+    def send(self, method, path, body=None):
+        response = self.client.generic(method, path, body or '', content_type='application/json')
+        return response.status_code, response.content
+
+    def close(self):
+        pass
+
+
+class WSGITransport:
+    def __init__(self):
+        self.handler = WSGIHandler()
+        self.factory = RequestFactory(HTTP_HOST='localhost', HTTP_ACCEPT='application/json')
+
+    def send(self, method, path, body=None):
+        request = self.factory.generic(method, path, body or '', content_type='application/json')
+        return wsgi_request(self.handler, request.environ)
+
+    def close(self):
+        pass
+
+
+class ASGITransport:
+    def __init__(self):
+        self.app = get_asgi_application()
+        self.loop = asyncio.new_event_loop()
+
+    def send(self, method, path, body=None):
+        body = (body or '').encode()
+        headers = [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+        return self.loop.run_until_complete(asgi_request(self.app, method, path, body, headers))
+
+    def close(self):
+        self.loop.close()
+
+
+TRANSPORTS = {
+    'client': ClientTransport,
+    'wsgi': WSGITransport,
+    'asgi': ASGITransport,
+}
+
+
+# =============================================================================
+# SENARYOLAR
+# =============================================================================
+#
+# Her senaryo (method, path, gövde, beklenen durum kodu) üretir. Rastgele
+# seçimler sabit tohumlu (seed) random.Random ile yapılır; aynı ölçek ve
+# tohumla her çalıştırma aynı istek dizisini gönderir.
+# Sıra önemlidir: delete, create senaryosunun oluşturduğu ürünleri siler;
+# böylece tablo boyutu ölçümler boyunca sabit kalır.
+
+SCENARIOS = ('list_cursor', 'list_page', 'detail', 'stats', 'create', 'update', 'delete')
+
+
+class ScenarioState:
+    def __init__(self, seed, page_size, pk_range):
+        self.rnd = random.Random(seed)
+        self.page_size = page_size
+        # Başlangıçta var olan ürünlerin id aralığı (detay / güncelleme için)
+        self.pk_range = pk_range
+        # create senaryosunun oluşturduğu, delete senaryosunun sileceği id'ler
+        self.created = []
+
+    def random_pk(self):
+        return self.rnd.randint(*self.pk_range)
+
+    def build(self, scenario):
+        if scenario == 'list_cursor':
+            return 'GET', '/api/products/?page_size=%d' % self.page_size, None, 200
+        if scenario == 'list_page':
+            rows = self.pk_range[1] - self.pk_range[0] + 1
+            page = self.rnd.randint(1, max(1, min(100, rows // self.page_size)))
+            return 'GET', '/api/products/?pagination=page&page_size=%d&page=%d' % (self.page_size, page), None, 200
+        if scenario == 'detail':
+            return 'GET', '/api/products/%d/' % self.random_pk(), None, 200
+        if scenario == 'stats':
+            return 'GET', '/api/products/stats/', None, 200
+        if scenario == 'create':
+            body = {'name': 'Ölçüm %d' % self.rnd.randrange(10 ** 6), 'price': '9.99', 'stock': 3}
+            return 'POST', '/api/products/', json.dumps(body), 201
+        if scenario == 'update':
+            body = {'stock': self.rnd.randrange(1000)}
+            return 'PATCH', '/api/products/%d/' % self.random_pk(), json.dumps(body), 200
+        if scenario == 'delete':
+            return 'DELETE', '/api/products/%d/' % self.created.pop(), None, 204
+        raise ValueError('Bilinmeyen senaryo: %s' % scenario)
+
+    def record(self, scenario, content):
+        if scenario == 'create':
+            self.created.append(json.loads(content)['id'])
+
+
+# Bir senaryonun ölçüm sonucu
+def summarize(latencies, elapsed, errors):
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def run_scenarios(transport, scenarios, iterations, warmup=10, seed=0, page_size=20):
+    """
+    Senaryoları sırayla ölçer; {senaryo: {'rps', 'p50_ms', 'p99_ms', ...}}
+    Her senaryo önce warmup kadar ölçülmeden çalıştırılır (bağlantı, import,
+    URL çözümleme ve sorgu planı önbellekleri ölçüme girmesin)
+    """
+    pks = Product.objects.order_by('pk').values_list('pk', flat=True)
+    state = ScenarioState(seed, page_size, (pks.first(), pks.last()))
+    results = {}
+    for scenario in scenarios:
+        # delete senaryosu için ölçüm ve ısınma sayısı kadar ürün gerekir
+        if scenario == 'delete':
+            while len(state.created) < iterations + warmup:
+                method, path, body, expected = state.build('create')
+                status, content = transport.send(method, path, body)
+                if status != expected:
+                    raise RuntimeError('Silinecek ürün oluşturulamadı: %s %s' % (status, content[:200]))
+                state.record('create', content)
+        for _ in range(warmup):
+            method, path, body, expected = state.build(scenario)
+            status, content = transport.send(method, path, body)
+            if status == expected:
+                state.record(scenario, content)
+
+        latencies = []
+        errors = 0
+        started = time.perf_counter()
+        for _ in range(iterations):
+            method, path, body, expected = state.build(scenario)
+            request_started = time.perf_counter()
+            status, content = transport.send(method, path, body)
+            latencies.append(time.perf_counter() - request_started)
+            if status != expected:
+                errors += 1
+            else:
+                state.record(scenario, content)
+        results[scenario] = summarize(latencies, time.perf_counter() - started, errors)
+    return results
+
+
+# =============================================================================
+# KARŞILAŞTIRMA
+# =============================================================================
+#
+# Yüksek olması iyi olan (rps) ve düşük olması iyi olan (p50_ms, p99_ms)
+# metrikler ayrı yönlerde kontrol edilir. Eşik orandır: 0.10 -> %10.
+
+HIGHER_IS_BETTER = ('rps',)
+LOWER_IS_BETTER = ('p50_ms', 'p99_ms')
+
+
+def compare_results(baseline, current, threshold):
+    """
+    İki sonuç dosyasını ({'results': {transport: {senaryo: metrikler}}})
+    karşılaştırır; eşiği aşan gerilemeleri liste olarak döndürür
+    Sadece iki dosyada da olan transport / senaryo / metrikler karşılaştırılır
+    """
+    regressions = []
+    for transport, scenarios in current['results'].items():
+        for scenario, metrics in scenarios.items():
+            old = baseline['results'].get(transport, {}).get(scenario)
+            if old is None:
+                continue
+            for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+                before, after = old.get(metric), metrics.get(metric)
+                if not before or after is None:
+                    continue
+                change = (after - before) / before
+                if metric in HIGHER_IS_BETTER:
+                    change = -change
+                if change > threshold:
+                    regressions.append({
+                        'transport': transport, 'scenario': scenario, 'metric': metric,
+                        'baseline': before, 'current': after, 'change': round(change, 4),
+                    })
+            if metrics.get('errors', 0) > old.get('errors', 0):
+                regressions.append({
+                    'transport': transport, 'scenario': scenario, 'metric': 'errors',
+                    'baseline': old.get('errors', 0), 'current': metrics['errors'], 'change': None,
+                })
+    return regressions
@@ -0,0 +1,239 @@
+# Önbellek anahtarlarını kısaltmak (hash) ve nesil (generation) değerleri üretmek için
+import hashlib
+import time
+from urllib.parse import urlencode
+
+# Django önbellek (cache) altyapısı
+# caches: settings.CACHES içinde tanımlı önbellek bağlantıları
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+# Önbelleğe yazılan gövdelerin sıkıştırılmış halleri (core/compression.py)
+from core.compression import precompress
+# Read-your-writes için istek başına yönlendirme durumu (core/routers.py)
+from core.routers import get_routing_state
+
+# =============================================================================
+# DJANGO PRODUCTS CACHE.PY ÖNBELLEK DOSYASI
+# =============================================================================
+#
+# Bu dosya, ürün listesi ve detay yanıtları için önbellek katmanını tanımlar.
+# Trafiğin büyük kısmı okuma olduğundan, aynı satırları her istekte
+# veritabanından okuyup yeniden serialize etmek yerine render edilmiş
+# yanıt gövdesi önbellekte saklanır.
+#
+# Önbellek Ayarları (settings.py):
+# - PRODUCT_CACHE_ALIAS: Kullanılacak CACHES bağlantısı (varsayılan 'products')
+# - CACHES['products']['BACKEND']: locmem, redis, memcached... (değiştirilebilir)
+# - CACHES['products']['TIMEOUT']: Kayıtların yaşam süresi (TTL, saniye)
+# - CACHES['products']['OPTIONS']['MAX_ENTRIES']: LRU boyut sınırı
+#
+# Anahtar Yapısı:
+# - Detay: products:detail:<detay_nesli>:<id>
+# - Liste: products:list:<liste_nesli>:<sha1(host + sıralı query parametreleri)>
+# - Her anahtarın değeri {medya_tipi: (gövde, content_type, sıkıştırılmış)}
+#   sözlüğüdür; sıkıştırılmış: {'gzip': gövde, 'br': gövde, ...}
+#
+# Sıkıştırma (core/compression.py):
+# - Gövde önbelleğe yazılırken her kodlama için bir kez sıkıştırılır
+# - Önbellekten dönen yanıtlar hazır gövdeleri taşır; CompressionMiddleware
+#   her istekte yeniden sıkıştırmak yerine istemcinin kodlamasını seçer
+#
+# Geçersiz Kılma (Invalidation):
+# - Bir ürün değiştiğinde sadece o ürünün detay anahtarı silinir
+# - Liste nesli (generation) bir artırılır; eski liste anahtarları bir daha
+#   okunmaz ve TTL / LRU ile kendiliğinden temizlenir
+# - Hangi satırların değiştiği bilinmiyorsa (filtre ile toplu işlem)
+#   detay nesli de artırılır
+# - Tetikleyici: products.signals.products_changed sinyali; geçersiz kılma
+#   transaction commit edildikten sonra yapılır (transaction.on_commit)
+#
+# Okuma Replikaları (core/routers.py):
+# - Birincile sabitlenmiş istekler (yazma yapan istemci, core/middleware.py)
+#   önbelleği hiç kullanmaz; okumalar birincilden yapılır
+# - Son yazmadan sonraki DATABASE_PRIMARY_PIN_SECONDS süresince replikadan
+#   üretilen yanıtlar önbelleğe yazılmaz; replika henüz geride olabilir ve
+#   eski veri yeni neslin anahtarına yazılırsa yazan istemci bile onu görürdü
+#
+# Bu dosyada tanımlananlar:
+# - invalidate_products: Değişen ürünler için önbelleği geçersiz kılar
+# - CachedListMixin / CachedDetailMixin: View'lara önbellek ekleyen mixin'ler
+# =============================================================================
+
+# Nesil sayaçlarının önbellekteki anahtarları
+LIST_GENERATION_KEY = 'products:list:generation'
+DETAIL_GENERATION_KEY = 'products:detail:generation'
+# Son geçersiz kılmadan sonra replika gecikme penceresi boyunca bulunan anahtar
+RECENT_WRITE_KEY = 'products:recent_write'
+
+
+# Ayarlarda seçilen önbellek bağlantısını döndürür
+def get_product_cache():
+    return caches[getattr(settings, 'PRODUCT_CACHE_ALIAS', 'default')]
+
+
+# Yeni nesil değeri
+# Sayaç LRU ile silinirse 1'den başlamak yerine zaman damgasıyla yeniden
+# oluşturulur; böylece eski neslin anahtarları yanlışlıkla tekrar okunmaz
+def _new_generation():
+    return time.time_ns() // 1000
+
+
+# Liste ve detay nesillerini tek bir önbellek çağrısıyla okur
+def get_generations(cache):
+    generations = cache.get_many([LIST_GENERATION_KEY, DETAIL_GENERATION_KEY])
+    missing = _missing_generations(generations)
+    if missing:
+        cache.set_many(missing, timeout=None)
+        generations.update(missing)
+    return generations
+
+
+# get_generations() ile aynı işi önbelleğin async API'si ile yapar
+async def aget_generations(cache):
+    generations = await cache.aget_many([LIST_GENERATION_KEY, DETAIL_GENERATION_KEY])
+    missing = _missing_generations(generations)
+    if missing:
+        await cache.aset_many(missing, timeout=None)
+        generations.update(missing)
+    return generations
+
+
+def _missing_generations(generations):
+    return {
+        key: _new_generation()
+        for key in (LIST_GENERATION_KEY, DETAIL_GENERATION_KEY)
+        if key not in generations
+    }
+
+
+def _bump_generation(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_generation(), timeout=None)
+
+
+# Host dahil mutlak yol ve sıralı query parametreleri
+# (sayfalama linkleri mutlak URL olduğu için host da dahil edilir)
+# Liste önbellek anahtarı ve liste ETag'i (products/conditional.py) bu değerden üretilir
+def request_url(request):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    return '%s?%s' % (request.build_absolute_uri(request.path), query)
+
+
+def detail_cache_key(generation, pk):
+    return 'products:detail:%s:%s' % (generation, pk)
+
+
+# Değişen ürünler için önbelleği geçersiz kılar
+# pks: Değişen ürün id'leri (bilinmiyorsa None)
+# detail: False ise detay anahtarları silinmez (yeni oluşturulan ürünler)
+def invalidate_products(pks, detail=True):
+    cache = get_product_cache()
+    if pks is None:
+        _bump_generation(cache, DETAIL_GENERATION_KEY)
+    elif detail and pks:
+        generation = get_generations(cache)[DETAIL_GENERATION_KEY]
+        cache.delete_many([detail_cache_key(generation, pk) for pk in pks])
+    _bump_generation(cache, LIST_GENERATION_KEY)
+    cache.set(RECENT_WRITE_KEY, True, timeout=getattr(settings, 'DATABASE_PRIMARY_PIN_SECONDS', 5))
+
+
+# Bu istekteki okumalar, son yazmanın üzerinden replika gecikme penceresi
+# geçmeden bir replikadan mı yapıldı?
+# Böyle bir yanıt yeni nesle ait olsa da eski veri içerebilir
+def is_stale_replica_read(cache, state):
+    return state is not None and state.replica is not None and cache.get(RECENT_WRITE_KEY) is not None
+
+
+# =============================================================================
+# VIEW MIXIN'LERİ
+# =============================================================================
+
+# GET isteklerini önbellekten yanıtlayan temel mixin
+# Sadece JSON yanıtları önbelleğe alınır; Browsable API (HTML) yanıtları
+# kullanıcıya ve CSRF token'ına göre değiştiği için her seferinde üretilir
+# Async view'lar (products/async_views.py) aynı adımları aget() ile izler
+class CachedResponseMixin:
+    cache_formats = ('json',)
+
+    # Önbellek atlanır: JSON dışındaki formatlar ve birincile sabitlenmiş
+    # istekler (yazan istemci başka istemcilerin replikadan ürettiği yanıtı görmemeli)
+    def bypass_cache(self, request):
+        state = get_routing_state()
+        return request.accepted_renderer.format not in self.cache_formats or (state is not None and state.pinned)
+
+    # Varsayılan anahtar: liste nesli + host ve sıralı query parametreleri
+    # Tek nesneyi gösteren view'lar daha hassas bir anahtar üretir (bkz. CachedDetailMixin)
+    def get_cache_key(self, generations):
+        digest = hashlib.sha1(request_url(self.request).encode()).hexdigest()
+        return 'products:list:%s:%s' % (generations[LIST_GENERATION_KEY], digest)
+
+    def build_cached_response(self, entry, variant):
+        content, content_type, *compressed = entry[variant]
+        response = HttpResponse(content, content_type=content_type)
+        response.precompressed = compressed[0] if compressed else {}
+        response['X-Cache'] = 'HIT'
+        return response
+
+    # Yanıt render edildikten sonra gövdesi önbelleğe yazılır
+    def store_on_render(self, response, cache, key, entry, variant):
+        if response.status_code == 200:
+            state = get_routing_state()
+
+            def store(rendered):
+                if is_stale_replica_read(cache, state):
+                    return
+                content_type = rendered['Content-Type']
+                rendered.precompressed = precompress(rendered.content, content_type)
+                entry[variant] = (rendered.content, content_type, rendered.precompressed)
+                cache.set(key, entry)
+
+            response.add_post_render_callback(store)
+            response['X-Cache'] = 'MISS'
+        return response
+
+    def get(self, request, *args, **kwargs):
+        if self.bypass_cache(request):
+            return super().get(request, *args, **kwargs)
+
+        # Nesiller veritabanı sorgusundan ÖNCE okunur: sorgu sırasında bir
+        # yazma olursa yanıt eski nesle kaydedilir ve bir daha okunmaz
+        cache = get_product_cache()
+        key = self.get_cache_key(get_generations(cache))
+        variant = request.accepted_media_type
+        entry = cache.get(key) or {}
+        if variant in entry:
+            return self.build_cached_response(entry, variant)
+
+        response = super().get(request, *args, **kwargs)
+        return self.store_on_render(response, cache, key, entry, variant)
+
+    async def aget(self, request, *args, **kwargs):
+        if self.bypass_cache(request):
+            return await super().aget(request, *args, **kwargs)
+
+        cache = get_product_cache()
+        key = self.get_cache_key(await aget_generations(cache))
+        variant = request.accepted_media_type
+        entry = await cache.aget(key) or {}
+        if variant in entry:
+            return self.build_cached_response(entry, variant)
+
+        response = await super().aget(request, *args, **kwargs)
+        return self.store_on_render(response, cache, key, entry, variant)
+
+
+# Liste yanıtları: anahtar, sayfa/cursor dahil tüm query parametrelerine bağlıdır
+# (CachedResponseMixin'in varsayılan anahtarı)
+class CachedListMixin(CachedResponseMixin):
+    pass
+
+
+# Detay yanıtları: anahtar, URL'deki ürün id'sine bağlıdır
+class CachedDetailMixin(CachedResponseMixin):
+    def get_cache_key(self, generations):
+        pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        return detail_cache_key(generations[DETAIL_GENERATION_KEY], pk)
@@ -0,0 +1,219 @@
+# Long-poll / SSE bekleyenlerini uyandırmak için standart kütüphaneler
+import asyncio
+import threading
+
+from django.db import connections
+
+# =============================================================================
+# DJANGO PRODUCTS CHANGES.PY DEĞİŞİKLİK AKIŞI (CHANGE FEED) DOSYASI
+# =============================================================================
+#
+# Bu dosya, /api/products/changes/ endpoint'inin okuduğu ekleme-yalnız
+# (append-only) değişiklik kaydını tanımlar. Kenar önbellekleri ve arama
+# indeksleyicileri değişiklikleri bulmak için tüm kataloğu yeniden indirmek
+# yerine son senkronizasyonlarından (cursor) bu yana değişen ürünleri alır.
+#
+# Veritabanı Nesneleri (0006_product_changes migration'ı ile oluşturulur;
+# migration DDL'i RunSQL olarak içerir, bu dosyayı import etmez):
+# - products_product_changes: (seq, product_id, action, changed_at)
+#   - seq: AUTOINCREMENT; silinen (budanan) satırların numarası tekrar
+#     kullanılmaz, cursor her zaman ileri gider
+#   - action: 'create', 'update' veya 'delete' (silinen ürün = tombstone)
+# - products_product_changes_ai / _au / _ad tetikleyicileri
+#   - bulk_create, QuerySet.update(), QuerySet.delete(), F() ile stok
+#     güncellemeleri ve ham SQL dahil her yazma işleminde çalışır
+#   - Kayıt, yazmayla aynı transaction'da eklenir; rollback kaydı da siler
+#
+# Okuma:
+# - Sadece seq > cursor olan satırlar PRIMARY KEY aralığından okunur
+# - Bir parti (batch) içinde aynı ürünün birden fazla kaydı varsa sadece
+#   sonuncusu döner (ürünün güncel hali gönderildiği için aradakiler
+#   gereksizdir); cursor yine partinin son seq değeridir
+# - Ürün verisi değişiklik anındaki değil, okuma anındaki haldir
+#
+# Budama (prune_product_changes komutu):
+# - PRODUCT_CHANGES_RETENTION_DAYS gününden eski kayıtlar silinir
+# - Cursor'ı budanan aralıkta kalan istemci 410 Gone alır; tam
+#   senkronizasyon için /api/products/export/ kullanır (yanıttaki
+#   X-Change-Cursor başlığı akışa kaldığı yerden devam etmek içindir)
+#
+# Bekleme (long-poll / SSE):
+# - notifier, products_changed sinyali (transaction commit'inden sonra)
+#   ile bu süreçteki bekleyen istekleri hemen uyandırır
+# - Diğer süreçlerin (worker) yazmaları için bekleyenler ayrıca
+#   PRODUCT_CHANGES_POLL_INTERVAL saniyede bir veritabanını kontrol eder
+#
+# Not: Django, SQLite'ta bazı şema değişikliklerinde (AlterField vb.)
+# tabloyu yeniden oluşturur ve tablonun tetikleyicileri silinir. Böyle bir
+# migration'dan sonra install() yeniden çalıştırılmalıdır (bkz. products/search.py).
+# =============================================================================
+
+CHANGES_TABLE = 'products_product_changes'
+CONTENT_TABLE = 'products_product'
+
+ACTIONS = ('create', 'update', 'delete')
+
+
+# =============================================================================
+# ŞEMA (TABLO YENİDEN OLUŞTURULDUKTAN SONRA TETİKLEYİCİLERİ KURMAK İÇİN)
+# =============================================================================
+
+def _log_sql(row, action):
+    return "INSERT INTO {changes}(product_id, action) VALUES ({row}.id, '{action}');".format(
+        changes=CHANGES_TABLE, row=row, action=action,
+    )
+
+
+def _schema_sql():
+    return [
+        (
+            'CREATE TABLE IF NOT EXISTS {changes} ('
+            'seq INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'product_id INTEGER NOT NULL, '
+            'action TEXT NOT NULL, '
+            "changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')))"
+        ).format(changes=CHANGES_TABLE),
+        'CREATE TRIGGER IF NOT EXISTS {changes}_ai AFTER INSERT ON {content} BEGIN {log} END'.format(
+            changes=CHANGES_TABLE, content=CONTENT_TABLE, log=_log_sql('new', 'create'),
+        ),
+        'CREATE TRIGGER IF NOT EXISTS {changes}_au AFTER UPDATE ON {content} BEGIN {log} END'.format(
+            changes=CHANGES_TABLE, content=CONTENT_TABLE, log=_log_sql('new', 'update'),
+        ),
+        'CREATE TRIGGER IF NOT EXISTS {changes}_ad AFTER DELETE ON {content} BEGIN {log} END'.format(
+            changes=CHANGES_TABLE, content=CONTENT_TABLE, log=_log_sql('old', 'delete'),
+        ),
+    ]
+
+
+# Tabloyu ve tetikleyicileri oluşturur (tekrar çalıştırılabilir)
+# Sadece SQLite'ta çalışır; diğer veritabanlarında hiçbir şey yapmaz
+def install(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for sql in _schema_sql():
+            cursor.execute(sql)
+
+
+def uninstall(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for suffix in ('ai', 'au', 'ad'):
+            cursor.execute('DROP TRIGGER IF EXISTS %s_%s' % (CHANGES_TABLE, suffix))
+        cursor.execute('DROP TABLE IF EXISTS %s' % CHANGES_TABLE)
+
+
+# =============================================================================
+# OKUMA VE BUDAMA
+# =============================================================================
+
+def latest(using='default'):
+    """
+    Verilen son seq (akışın şu anki cursor'ı); kayıt yoksa 0
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = %s', [CHANGES_TABLE])
+        row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def is_expired(since, using='default'):
+    """
+    Cursor'dan sonraki kayıtların bir kısmı budanmışsa veya cursor bu
+    veritabanında hiç verilmemişse (ileri tarihli) True
+    """
+    last = latest(using)
+    if since > last:
+        return True
+    with connections[using].cursor() as cursor:
+        cursor.execute('SELECT MIN(seq) FROM %s' % CHANGES_TABLE)
+        first = cursor.fetchone()[0]
+    # Tablo boşsa bir sonraki kayıt last + 1 olacaktır
+    return since + 1 < (last + 1 if first is None else first)
+
+
+def read(since, limit, using='default'):
+    """
+    seq > since olan en fazla limit kaydı okur
+    Dönüş: ([(seq, product_id, action), ...], cursor, has_more)
+    Aynı ürünün kayıtlarından sadece sonuncusu döner (seq sırasıyla)
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT seq, product_id, action FROM {changes} WHERE seq > %s ORDER BY seq LIMIT %s'.format(
+                changes=CHANGES_TABLE,
+            ),
+            [since, limit + 1],
+        )
+        rows = cursor.fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows:
+        return [], since, False
+    last = {product_id: (seq, product_id, action) for seq, product_id, action in rows}
+    return sorted(last.values()), rows[-1][0], has_more
+
+
+# changed_at değeri before'dan eski kayıtları siler; silinen satır sayısı
+def prune(before, using='default'):
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'DELETE FROM {changes} WHERE changed_at < %s'.format(changes=CHANGES_TABLE),
+            [connection.ops.adapt_datetimefield_value(before)],
+        )
+        return cursor.rowcount
+
+
+# =============================================================================
+# BEKLEYENLERİ UYANDIRMA
+# =============================================================================
+
+class ChangeNotifier:
+    """
+    Bu süreçte değişiklik bekleyen long-poll / SSE isteklerini uyandırır
+    Her istek bir Future ile bekler; iş parçacığı tutulmaz
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters = set()
+        # Her bildirimde artar; bekleyen, veritabanını okumadan önce bu
+        # değeri alır ve okuma ile bekleme arasındaki bildirimi kaçırmaz
+        self.version = 0
+
+    def notify(self):
+        with self._lock:
+            self.version += 1
+            waiters, self._waiters = self._waiters, set()
+        for loop, future in waiters:
+            # notify() başka bir iş parçacığından (senkron view) çağrılabilir
+            loop.call_soon_threadsafe(_resolve, future)
+
+    async def wait(self, version, timeout):
+        """
+        version'dan sonra bildirim gelirse True, timeout dolarsa False
+        """
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        with self._lock:
+            if self.version != version:
+                return True
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1], timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+notifier = ChangeNotifier()
@@ -0,0 +1,143 @@
+# ETag değerini üretmek için hash fonksiyonu
+import hashlib
+
+# Django'nun koşullu istek (conditional request) yardımcıları
+# get_conditional_response: If-None-Match / If-Modified-Since başlıklarını
+#   değerlendirir, gerekiyorsa 304 Not Modified yanıtı döndürür
+# http_date: Zaman damgasını HTTP tarih formatına çevirir
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+from core.routers import get_routing_state
+
+# Liste doğrulayıcısı önbellek neslinden üretilir (products/cache.py)
+from .cache import (
+    LIST_GENERATION_KEY, aget_generations, get_generations, get_product_cache, is_stale_replica_read, request_url,
+)
+
+# =============================================================================
+# DJANGO PRODUCTS CONDITIONAL.PY KOŞULLU GET DOSYASI
+# =============================================================================
+#
+# Bu dosya, ürün endpoint'leri için koşullu GET desteğini tanımlar.
+# Mobil istemciler aynı ürünü birkaç saniyede bir sorgular; veri
+# değişmediyse tüm gövdeyi tekrar göndermek yerine 304 Not Modified
+# döndürülür.
+#
+# Akış:
+# 1. Ucuz bir işlemle doğrulayıcılar (validators) hesaplanır
+#    - Detay: Sadece updated_at kolonu (birincil anahtar ile tek satır)
+#    - Liste: Önbellekteki liste nesli (veritabanı sorgusu yok)
+# 2. İstemcinin gönderdiği If-None-Match / If-Modified-Since ile karşılaştırılır
+# 3. Eşleşirse serialize etmeden ve önbelleğe bakmadan 304 döndürülür
+# 4. Eşleşmezse normal yanıta ETag (ve detayda Last-Modified) başlığı eklenir
+#
+# ETag'ler güçlüdür (strong) ve temsil biçimine (JSON, HTML...) göre farklıdır.
+#
+# Liste neden Last-Modified göndermez?
+# - Bir ürün silindiğinde kalan satırların MAX(updated_at) değeri değişmez;
+#   If-Modified-Since silmeden sonra da 304 döndürürdü
+# - MAX / COUNT her GET'te filtrelenmiş tabloyu tarar (önbellek isabetinde bile)
+# - Liste nesli her ekleme / güncelleme / silmede commit sonrası artırılır;
+#   bu yüzden listeler için sadece ETag (If-None-Match / If-Match) kullanılır
+# - Nesil veritabanı anlık görüntüsüne bağlı değildir: son yazmadan hemen
+#   sonra geride kalmış bir replikadan üretilen listeye ETag verilmez
+#
+# Okuma replikaları (core/routers.py): Doğrulayıcı sorgusu gövdeyle aynı
+# veritabanından yapılır; birincile sabitlenmiş istekte ikisi de birincildir.
+#
+# Bu dosyada tanımlanan mixin'ler:
+# - ConditionalListMixin: Liste endpoint'i için
+# - ConditionalDetailMixin: Detay endpoint'i için
+# =============================================================================
+
+
+# Koşullu GET işlemini yapan temel mixin
+# Async view'lar (products/async_views.py) aynı adımları aget() ile izler
+class ConditionalGetMixin:
+
+    # Alt sınıflar (etag_kaynağı, son_değişiklik_datetime) döndürür
+    # Doğrulayıcı hesaplanamıyorsa (örn. ürün yok) (None, None) döndürülür
+    def get_validators(self):
+        raise NotImplementedError
+
+    # get_validators() ile aynı sonucu async ORM ile üretir
+    async def aget_validators(self):
+        raise NotImplementedError
+
+    # ETag'i üretir ve istemcinin başlıklarıyla karşılaştırır
+    # Dönüş: (etag, zaman_damgası, 304/412 yanıtı veya None)
+    def evaluate_conditions(self, request, source, last_modified):
+        # Aynı veri farklı formatlarda (JSON / Browsable API) farklı gövde
+        # üretir; bu yüzden medya tipi de ETag'e dahil edilir
+        source = '%s|%s' % (source, request.accepted_media_type)
+        etag = quote_etag(hashlib.sha1(source.encode()).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return etag, timestamp, get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+    def set_validator_headers(self, response, etag, timestamp):
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        source, last_modified = self.get_validators()
+        if source is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, timestamp, response = self.evaluate_conditions(request, source, last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return self.set_validator_headers(response, etag, timestamp)
+
+    async def aget(self, request, *args, **kwargs):
+        source, last_modified = await self.aget_validators()
+        if source is None:
+            return await super().aget(request, *args, **kwargs)
+
+        etag, timestamp, response = self.evaluate_conditions(request, source, last_modified)
+        if response is None:
+            response = await super().aget(request, *args, **kwargs)
+        return self.set_validator_headers(response, etag, timestamp)
+
+
+# Liste: ETag kaynağı liste nesli + URL'dir (önbellek anahtarıyla aynı girdiler)
+# Nesil, products_changed sinyaliyle her değişiklikte artırılır (products/signals.py)
+# Zaman damgası döndürülmez; If-Modified-Since listeler için değerlendirilmez
+class ConditionalListMixin(ConditionalGetMixin):
+    def build_list_source(self, generations):
+        return '%s|%s' % (generations[LIST_GENERATION_KEY], request_url(self.request)), None
+
+    def get_validators(self):
+        return self.build_list_source(get_generations(get_product_cache()))
+
+    async def aget_validators(self):
+        return self.build_list_source(await aget_generations(get_product_cache()))
+
+    # Eski olabilecek gövdeye yeni neslin ETag'i verilirse istemci onu
+    # bir sonraki yazmaya kadar 304 ile tutmaya devam ederdi
+    def set_validator_headers(self, response, etag, timestamp):
+        if is_stale_replica_read(get_product_cache(), get_routing_state()):
+            return response
+        return super().set_validator_headers(response, etag, timestamp)
+
+
+# Detay: Sadece updated_at kolonu okunur (tam satır ve serialize yok)
+class ConditionalDetailMixin(ConditionalGetMixin):
+    def get_validator_queryset(self):
+        pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        return self.get_queryset().filter(pk=pk).values_list('updated_at', flat=True)
+
+    def build_detail_source(self, updated_at):
+        if updated_at is None:
+            return None, None
+        pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        return '%s|%s' % (pk, updated_at.isoformat()), updated_at
+
+    def get_validators(self):
+        return self.build_detail_source(self.get_validator_queryset().first())
+
+    async def aget_validators(self):
+        return self.build_detail_source(await self.get_validator_queryset().afirst())
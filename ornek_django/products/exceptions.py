@@ -0,0 +1,66 @@
+# Django REST Framework'ün API hata sınıfı ve HTTP durum kodları
+# APIException: Özel API hataları için temel sınıf
+# DRF, bu sınıftan türeyen hataları yakalayıp uygun JSON yanıtına çevirir
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# =============================================================================
+# DJANGO PRODUCTS EXCEPTIONS.PY DOSYASI
+# =============================================================================
+#
+# Bu dosya, products API'sine özel hata sınıflarını tanımlar.
+# View içinde bu hatalardan biri fırlatıldığında DRF, status_code ve
+# detail bilgisini kullanarak otomatik bir JSON hata yanıtı oluşturur.
+#
+# Bu dosyada tanımlanan hatalar:
+# - InsufficientStock: Stok rezervasyonu için yeterli stok yok (409 Conflict)
+# - ExcessRelease: İade edilen miktar ayrılmış miktarı aşıyor (409 Conflict)
+# - ChangeCursorExpired: Değişiklik akışı cursor'ı artık geçerli değil (410 Gone)
+# =============================================================================
+
+
+# Yetersiz stok hatası
+# Rezervasyon isteğindeki ürünlerden en az birinin stoğu yetmediğinde fırlatılır
+# 409 Conflict: İstek geçerli ama kaynağın mevcut durumu ile çakışıyor
+class InsufficientStock(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Yetersiz stok.'
+    default_code = 'insufficient_stock'
+
+    # lines: [{'id': 5, 'requested': 3, 'available': 1}, ...]
+    # APIException detail içindeki değerleri metne çevirdiği için satırları
+    # sayısal tipleri korunacak şekilde doğrudan yanıt gövdesine koyuyoruz
+    def __init__(self, lines):
+        super().__init__()
+        self.detail = {'detail': self.default_detail, 'lines': lines}
+
+
+# Fazla iade hatası
+# İade isteğindeki ürünlerden en az birinde, iade edilen miktar o ürün için
+# ayrılmış ve henüz iade edilmemiş miktardan (StockReservation) büyük olduğunda
+# fırlatılır; aksi halde iade stoğu hiç var olmamış bir miktarla şişirirdi
+# 409 Conflict: İade, ürünün mevcut rezervasyon durumu ile çakışıyor
+class ExcessRelease(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'İade miktarı ayrılmış stoğu aşıyor.'
+    default_code = 'excess_release'
+
+    # lines: [{'id': 5, 'requested': 3, 'reserved': 1}, ...]
+    def __init__(self, lines):
+        super().__init__()
+        self.detail = {'detail': self.default_detail, 'lines': lines}
+
+
+# Değişiklik akışı cursor'ı geçersiz
+# Cursor'dan sonraki kayıtlar budanmış veya cursor bu veritabanında hiç
+# verilmemiş; istemci tam senkronizasyon yapmalıdır (/api/products/export/)
+# 410 Gone: Kaynak (cursor'dan sonraki değişiklik geçmişi) artık yok
+class ChangeCursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'Cursor artık geçerli değil; tam senkronizasyon gerekli.'
+    default_code = 'cursor_expired'
+
+    # cursor: Tam senkronizasyondan sonra kullanılabilecek güncel cursor
+    def __init__(self, cursor):
+        super().__init__()
+        self.detail = {'detail': self.default_detail, 'cursor': cursor}
@@ -0,0 +1,166 @@
+# Django REST Framework filtreleme altyapısı
+# BaseFilterBackend: Tüm filtre sınıflarının türetildiği temel sınıf
+# OrderingFilter: ?ordering= parametresini işleyen hazır sıralama filtresi
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import BooleanField
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils import timezone
+
+# =============================================================================
+# DJANGO PRODUCTS FILTERS.PY DOSYASI
+# =============================================================================
+#
+# Bu dosya, ürün listesi için sunucu tarafı filtreleme ve sıralama
+# sınıflarını tanımlar. İstemciler tüm sayfaları indirip yerelde süzmek
+# yerine sadece ihtiyaç duydukları satırları ister.
+#
+# Her parametre, products_product tablosundaki bir indeksi kullanan
+# bir SQL koşuluna dönüşür (bkz. Product.Meta.indexes):
+#
+# Parametre            SQL koşulu                          İndeks
+# -------------------  ----------------------------------  ----------------------
+# price_min=10         price >= 10                         product_price_idx
+# price_max=100        price <= 100                        product_price_idx
+# in_stock=true        stock > 0                           product_in_stock_idx
+# created_after=...    created_at >= ...                   product_created_id_idx
+# created_before=...   created_at < ...                    product_created_id_idx
+# name=Kal             name >= 'Kal' AND name < 'Kam'      product_name_idx
+# ordering=-price      ORDER BY price DESC, id DESC        product_price_idx
+#
+# Not: name filtresi büyük/küçük harfe duyarlı bir ön ek aramasıdır.
+# LIKE 'Kal%' (startswith) SQLite'ta büyük/küçük harf duyarsız çalıştığı
+# için indeksi kullanamaz; bu yüzden aralık sorgusu kullanılır.
+#
+# Bu dosyada tanımlanan sınıflar:
+# - ProductFilterBackend: Fiyat, stok, tarih ve isim filtreleri
+# - ProductOrderingFilter: Sadece indeksli alanlara izin veren sıralama filtresi
+# =============================================================================
+
+
+# Ön ek için [başlangıç, bitiş) aralığını döndürür
+# Örnek: 'Kal' -> ('Kal', 'Kam'); son karakter bir artırılır
+def prefix_range(prefix):
+    end = prefix.rstrip(chr(0x10FFFF))
+    if not end:
+        return prefix, None
+    return prefix, end[:-1] + chr(ord(end[-1]) + 1)
+
+
+# =============================================================================
+# FİLTRE SINIFI
+# =============================================================================
+class ProductFilterBackend(BaseFilterBackend):
+    """
+    Ürün listesi filtreleri
+    GET /api/products/?price_min=10&price_max=100
+    GET /api/products/?in_stock=true
+    GET /api/products/?created_after=2024-01-01&created_before=2024-02-01
+    GET /api/products/?name=Kal
+    """
+
+    # Parametre adı -> (model alanı, lookup)
+    range_params = {
+        'price_min': ('price', 'gte'),
+        'price_max': ('price', 'lte'),
+        'created_after': ('created_at', 'gte'),
+        'created_before': ('created_at', 'lt'),
+    }
+    in_stock_param = 'in_stock'
+    name_param = 'name'
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        opts = queryset.model._meta
+        filters = {}
+        errors = {}
+
+        for param, (name, lookup) in self.range_params.items():
+            value = params.get(param)
+            if not value:
+                continue
+            try:
+                value = opts.get_field(name).to_python(value)
+            except DjangoValidationError as exc:
+                errors[param] = exc.messages
+                continue
+            # Sadece tarih verilirse (2024-01-01) etkin saat dilimindeki gece yarısı
+            if hasattr(value, 'tzinfo') and timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            filters['%s__%s' % (name, lookup)] = value
+
+        value = params.get(self.in_stock_param)
+        if value:
+            try:
+                in_stock = BooleanField().to_internal_value(value)
+            except ValidationError as exc:
+                errors[self.in_stock_param] = exc.detail
+            else:
+                # stock > 0 koşulu kısmi indeksin (partial index) koşuluyla aynıdır
+                filters['stock__gt' if in_stock else 'stock__lte'] = 0
+
+        prefix = params.get(self.name_param)
+        if prefix:
+            start, end = prefix_range(prefix)
+            filters['name__gte'] = start
+            if end is not None:
+                filters['name__lt'] = end
+
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(**filters)
+
+    # OpenAPI şeması için parametre açıklamaları
+    def get_schema_operation_parameters(self, view):
+        params = [
+            ('price_min', 'string', 'En düşük fiyat (dahil)'),
+            ('price_max', 'string', 'En yüksek fiyat (dahil)'),
+            ('created_after', 'string', 'Bu tarihten sonra oluşturulanlar (dahil)'),
+            ('created_before', 'string', 'Bu tarihten önce oluşturulanlar'),
+            ('in_stock', 'boolean', 'Sadece stokta olan (true) veya olmayan (false) ürünler'),
+            ('name', 'string', 'İsim ön eki (büyük/küçük harfe duyarlı)'),
+        ]
+        return [
+            {
+                'name': name,
+                'required': False,
+                'in': 'query',
+                'description': description,
+                'schema': {'type': schema_type},
+            }
+            for name, schema_type, description in params
+        ]
+
+
+# =============================================================================
+# SIRALAMA SINIFI
+# =============================================================================
+#
+# DRF'nin OrderingFilter'ı geçersiz alanları sessizce yok sayar ve birden
+# fazla alanla sıralamaya izin verir. Bu sınıf ise:
+# - Sadece view.ordering_fields içindeki (indeksli) tek bir alana izin verir
+# - Geçersiz değerlerde 400 Bad Request döndürür
+# - Kararlı sıralama için aynı yönde id ekler (price DESC, id DESC);
+#   SQLite indeksleri rowid'i içerdiği için bu sıralama da indeksten okunur
+# - Keyset sayfalama (ProductKeysetPagination) aynı sıralamayı kullanır
+class ProductOrderingFilter(OrderingFilter):
+    tiebreaker = 'id'
+
+    def get_ordering(self, request, queryset, view):
+        param = request.query_params.get(self.ordering_param)
+        if not param:
+            return self.get_default_ordering(view)
+
+        valid_fields = [item[0] for item in self.get_valid_fields(queryset, view, {'request': request})]
+        term = param.strip()
+        name = term.lstrip('-')
+        if ',' in term or term.count('-') > 1 or name not in valid_fields:
+            options = ', '.join('%s, -%s' % (field, field) for field in valid_fields)
+            raise ValidationError({
+                self.ordering_param: ['Geçersiz sıralama "%s". Seçenekler: %s' % (param, options)]
+            })
+
+        if name in (self.tiebreaker, 'pk'):
+            return (term,)
+        return (term, ('-' if term.startswith('-') else '') + self.tiebreaker)
@@ -0,0 +1,185 @@
+# ETag üretimi için standart kütüphaneler
+import hashlib
+import threading
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseNotModified
+from django.urls import URLPattern, URLResolver, get_resolver, get_urlconf
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+
+# Kodlayıcılar ve Accept-Encoding seçimi (core/compression.py)
+from core import compression
+
+# =============================================================================
+# DJANGO PRODUCTS LANDING.PY ANA SAYFA DOSYASI
+# =============================================================================
+#
+# Bu dosya, kök URL'deki (/) ana sayfanın önceden hazırlanmış (precomputed)
+# yanıtlarını yönetir. Ana sayfa yük dengeleyici sağlık kontrolleri ve
+# arama motoru botları tarafından sürekli istenir; içeriği ise sadece
+# kod (URL desenleri) değiştiğinde değişir.
+#
+# Sayfa süreç başına bir kez üretilir ve bellekte tutulur:
+# - Endpoint listesi kayıtlı URL desenlerinden otomatik çıkarılır
+#   (açıklama: view sınıfının/fonksiyonunun docstring'inin ilk satırı)
+# - Gövde bir kez kurulu tüm kodlamalarla (gzip; varsa brotli, zstd) en
+#   yüksek seviyede sıkıştırılır (core/compression.py)
+# - ETag gövdenin özetidir; If-None-Match eşleşirse 304 döndürülür
+# - Accept-Encoding'e göre hazır gövdelerden biri seçilir
+#
+# Sonraki isteklerde maliyet bir sözlük okuması ve başlık karşılaştırmasıdır;
+# veritabanı sorgusu, şablon render'ı veya sıkıştırma yapılmaz.
+#
+# ROOT_URLCONF veya TEMPLATES değişirse (testlerde override_settings)
+# önbellek temizlenir.
+#
+# Bu dosyada tanımlananlar:
+# - PrecomputedPage: Sıkıştırılmış varyantları ve ETag'i tutan yanıt
+# - get_endpoints(): URL desenlerinden endpoint listesi
+# - cached_page(): Sayfayı ilk istekte üretip bellekte tutar
+# =============================================================================
+
+
+# =============================================================================
+# ÖNCEDEN HAZIRLANMIŞ YANIT
+# =============================================================================
+class PrecomputedPage:
+    # Tarayıcılar ve vekil sunucular sayfayı bu süre boyunca yeniden istemez
+    max_age = 300
+
+    # Sayfa bir kez sıkıştırıldığı için en yüksek seviyeler kullanılır
+    levels = {'br': 11, 'zstd': 19, 'gzip': 9}
+
+    def __init__(self, content, content_type='text/html; charset=utf-8'):
+        if isinstance(content, str):
+            content = content.encode()
+        self.content_type = content_type
+        # Tüm varyantlar aynı içeriği taşır; zayıf (W/) ETag ortak kullanılır
+        self.etag = 'W/"%s"' % hashlib.sha1(content).hexdigest()
+        self.identity = content
+        self.variants = {}
+        for encoding in compression.available_encodings():
+            body = compression.compress(encoding, content, self.levels.get(encoding))
+            # Sıkıştırılmış gövde daha küçük değilse saklanmaz
+            if len(body) < len(content):
+                self.variants[encoding] = body
+
+    def finalize(self, response):
+        response['ETag'] = self.etag
+        patch_vary_headers(response, ('Accept-Encoding',))
+        patch_cache_control(response, public=True, max_age=self.max_age)
+        return response
+
+    def response(self, request):
+        etags = parse_etags(request.headers.get('If-None-Match', ''))
+        # If-None-Match zayıf karşılaştırma kullanır (RFC 9110 13.1.2)
+        if '*' in etags or self.etag.removeprefix('W/') in (tag.removeprefix('W/') for tag in etags):
+            return self.finalize(HttpResponseNotModified())
+
+        encoding = compression.negotiate_encoding(
+            request.headers.get('Accept-Encoding', ''), encodings=list(self.variants)
+        )
+        body = self.variants[encoding] if encoding else self.identity
+        response = HttpResponse(body, content_type=self.content_type)
+        # Content-Encoding olan yanıtlar CompressionMiddleware tarafından atlanır
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['Content-Length'] = len(body)
+        return self.finalize(response)
+
+
+# =============================================================================
+# ENDPOINT LİSTESİ
+# =============================================================================
+
+# Alt desenleri listelenmeyen (tek satır gösterilen) namespace'ler
+NAMESPACE_DESCRIPTIONS = {
+    'admin': 'Admin Paneli',
+}
+
+# Ana sayfanın kendisi listede gösterilmez
+EXCLUDED_NAMES = {'home'}
+
+
+# View'ın docstring'inin ilk dolu satırı
+def _describe(callback):
+    view = getattr(callback, 'view_class', None) or getattr(callback, 'cls', None) or callback
+    for line in (view.__doc__ or '').splitlines():
+        if line.strip():
+            return line.strip()
+    return ''
+
+
+# Class-based view'ın desteklediği HTTP metodları (OPTIONS/HEAD hariç)
+def _methods(callback):
+    view = getattr(callback, 'view_class', None) or getattr(callback, 'cls', None)
+    if view is None:
+        return []
+    return [
+        method.upper() for method in view.http_method_names
+        if method not in ('options', 'head') and hasattr(view, method)
+    ]
+
+
+def _walk(patterns, prefix):
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace in NAMESPACE_DESCRIPTIONS:
+                yield {
+                    'url': '/' + route,
+                    'link': True,
+                    'description': NAMESPACE_DESCRIPTIONS[pattern.namespace],
+                    'methods': [],
+                }
+            else:
+                yield from _walk(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern) and pattern.name not in EXCLUDED_NAMES:
+            yield {
+                'url': '/' + route,
+                # Parametreli desenler (<int:pk>) tıklanabilir bağlantı değildir
+                'link': '<' not in route,
+                'description': _describe(pattern.callback),
+                'methods': _methods(pattern.callback),
+            }
+
+
+def get_endpoints(urlconf=None):
+    """
+    Kayıtlı URL desenlerinden ana sayfada gösterilecek endpoint listesi
+    """
+    return list(_walk(get_resolver(urlconf).url_patterns, ''))
+
+
+# =============================================================================
+# SAYFA ÖNBELLEĞİ
+# =============================================================================
+#
+# Sayfalar (ad, urlconf) anahtarıyla süreç belleğinde tutulur. İlk istek
+# sayfayı üretir; aynı anda gelen istekler kilit ile bekler ve hazır
+# sayfayı kullanır.
+
+_pages = {}
+_pages_lock = threading.Lock()
+
+
+def cached_page(name, build):
+    """
+    build(endpoints) ile üretilen HTML'i PrecomputedPage olarak önbellekler
+    """
+    key = (name, get_urlconf())
+    page = _pages.get(key)
+    if page is None:
+        with _pages_lock:
+            page = _pages.get(key)
+            if page is None:
+                page = _pages[key] = PrecomputedPage(build(get_endpoints(key[1])))
+    return page
+
+
+@receiver(setting_changed, dispatch_uid='products_landing_pages')
+def clear_pages(setting, **kwargs):
+    if setting in ('ROOT_URLCONF', 'TEMPLATES'):
+        _pages.clear()
@@ -0,0 +1,317 @@
+# Bağlantı kopmasını izlemek için standart kütüphaneler
+import asyncio
+from io import BytesIO
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signals
+from django.core.exceptions import DisallowedHost
+from django.core.handlers.asgi import ASGIRequest
+from django.http import QueryDict
+
+from core.broker import get_broker
+
+from .models import Product
+from .renderers import EventStreamRenderer
+
+# =============================================================================
+# DJANGO PRODUCTS LIVE.PY CANLI STOK AKIŞI DOSYASI
+# =============================================================================
+#
+# Bu dosya, /api/products/live/ Server-Sent Events (SSE) endpoint'ini
+# tanımlar. Mağaza sayfaları stok göstermek için /api/products/<pk>/
+# adresini sürekli yoklamak yerine ürün id'lerine abone olur; stok veya
+# fiyat değişince yeni değer sunucudan gönderilir.
+#
+# Kullanım:
+#   GET /api/products/live/?ids=1,2,3
+#   Accept: text/event-stream
+#
+# Olaylar:
+# - stock: {"id": 1, "stock": 3, "price": "5.00"}
+#   - Bağlantı açılınca her ürünün güncel hali (anlık görüntü)
+#   - Sonra sadece stok veya fiyatı değişen ürünler
+# - delete: {"id": 1} (ürün silindi veya hiç yok)
+# - ": keep-alive" yorum satırları (LIVE_STOCK_HEARTBEAT saniyede bir)
+#
+# Mimari:
+# - Yayın: products_changed sinyali (save, delete ve toplu işlemler)
+#   transaction commit edildikten sonra publish_products() çağırır; değişen
+#   ürünler tek sorguyla okunup 'product:<id>' konularına yayınlanır
+#   (bkz. core/broker.py). Filtre ile yapılan toplu işlemlerde (pks=None)
+#   hangi ürünlerin değiştiği bilinmediği için tüm abonelere yeniden
+#   senkronizasyon mesajı gider
+# - Abone: LiveStockApp, Django'nun istek / view döngüsünü kullanmayan ham
+#   bir ASGI uygulamasıdır; core/asgi.py bu adresi doğrudan ona yönlendirir
+#   - Bağlantı başına iş parçacığı yoktur; boşta bağlantı event loop'ta bir
+#     Future ve bir zamanlayıcı ile bekler
+#   - Veritabanına sadece anlık görüntü için (bağlantı açılışında ve abone
+#     geride kaldığında) thread pool üzerinden gidilir; aynı anda gelen
+#     okumalar tek sorguda birleştirilir (SnapshotBatcher)
+# - Geri basınç: Yavaş istemcinin kuyruğu dolarsa (BROKER_QUEUE_SIZE)
+#   birikmiş mesajlar atılır ve istemciye güncel anlık görüntü gönderilir;
+#   istemci ara değerleri kaçırabilir ama son değeri her zaman alır
+#
+# Çok worker'lı kurulum:
+# - Yazma başka bir worker'da olursa mesaj sadece BROKER['BACKEND']
+#   RedisBackend ise bu worker'daki abonelere ulaşır
+#
+# Not: Endpoint sadece ASGI sunucusunda (uvicorn core.asgi:application vb.)
+# vardır; WSGI (runserver, gunicorn sync) altında 404 döner.
+#
+# Ayarlar (settings.py):
+# - LIVE_STOCK_MAX_IDS: Bir bağlantıda abone olunabilecek en fazla ürün
+# - LIVE_STOCK_HEARTBEAT: Boşta bağlantıda yorum satırı aralığı (saniye)
+# =============================================================================
+
+# core/asgi.py bu adresi LiveStockApp'e yönlendirir
+PATH = '/api/products/live/'
+
+# Filtre ile yapılan toplu işlemlerden sonra tüm abonelerin anlık görüntüyü
+# yeniden okuması için
+RESYNC_TOPIC = 'product:*'
+
+# Tek sorguda okunan en fazla id (SQLite parametre sınırının altında)
+SNAPSHOT_BATCH_SIZE = 900
+
+
+def product_topic(pk):
+    return 'product:%s' % pk
+
+
+# =============================================================================
+# YAYIN (KAYIT KANCALARI TARAFINDAN ÇAĞRILIR)
+# =============================================================================
+
+def publish_products(pks, action):
+    """
+    Değişen ürünlerin güncel stok ve fiyatını abonelere yayınlar
+    Commit'ten sonra çağrılır (bkz. products/signals.py)
+    """
+    broker = get_broker()
+    if pks is None:
+        broker.publish(RESYNC_TOPIC, {'resync': True})
+        return
+
+    # Abonesi olmayan ürünler için sorgu yapılmaz (çoğu yazmada durum budur)
+    topics = {pk: product_topic(pk) for pk in pks}
+    if not broker.has_subscribers(topics.values()):
+        return
+
+    if action == 'delete':
+        for pk, topic in topics.items():
+            broker.publish(topic, {'id': pk, 'deleted': True})
+        return
+
+    for pk, message in read_products(topics).items():
+        broker.publish(topics[pk], message)
+
+
+# =============================================================================
+# ANLIK GÖRÜNTÜ OKUMA
+# =============================================================================
+
+# id -> stok mesajı; olmayan ürünler sonuçta yer almaz
+def read_products(ids):
+    ids = list(ids)
+    rows = {}
+    for start in range(0, len(ids), SNAPSHOT_BATCH_SIZE):
+        queryset = Product.objects.filter(pk__in=ids[start:start + SNAPSHOT_BATCH_SIZE])
+        for pk, stock, price in queryset.values_list('id', 'stock', 'price'):
+            rows[pk] = {'id': pk, 'stock': stock, 'price': str(price)}
+    return rows
+
+
+# Bağlantının yaşam döngüsü (CONN_MAX_AGE ile kapatma vb.) Django
+# istekleriyle aynı olsun diye okuma istek sinyalleri arasında yapılır
+def load_products(ids):
+    signals.request_started.send(sender=LiveStockApp)
+    try:
+        return read_products(ids)
+    finally:
+        signals.request_finished.send(sender=LiveStockApp)
+
+
+class SnapshotBatcher:
+    """
+    Aynı anda bağlanan isteklerin anlık görüntü okumalarını birleştirir
+    Worker yeniden başlayınca binlerce istemci aynı anda yeniden bağlanır;
+    her biri için ayrı thread pool çağrısı ve sorgu yerine, bir okuma
+    sürerken gelenler bir sonraki tek okumada toplanır
+    """
+
+    def __init__(self, load=load_products):
+        self.load_rows = load
+        self._loop = None
+        # Sonraki okumaya girecek (id kümesi, sonuç Future'ı)
+        self._pending = None
+        self._running = False
+
+    async def load(self, ids):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Testlerde her async test kendi event loop'unda çalışır
+            self._loop, self._pending, self._running = loop, None, False
+        if self._pending is None:
+            self._pending = (set(), loop.create_future())
+            if not self._running:
+                # Aynı turda (tick) gelen istekler de bu okumaya katılır
+                loop.call_soon(self._start)
+        pending_ids, future = self._pending
+        pending_ids.update(ids)
+        # Bekleyen istemci ayrılırsa (iptal) diğerlerinin sonucu etkilenmez
+        return await asyncio.shield(future)
+
+    def _start(self):
+        batch, self._pending = self._pending, None
+        self._running = True
+        self._loop.create_task(self._run(batch))
+
+    async def _run(self, batch):
+        ids, future = batch
+        try:
+            future.set_result(await sync_to_async(self.load_rows)(sorted(ids)))
+        except Exception as exc:
+            future.set_exception(exc)
+        finally:
+            self._running = False
+            if self._pending is not None:
+                self._start()
+
+
+# =============================================================================
+# ASGI UYGULAMASI
+# =============================================================================
+
+class BadRequest(Exception):
+    pass
+
+
+class LiveStockApp:
+    """
+    /api/products/live/?ids=1,2,3 SSE akışı (ham ASGI uygulaması)
+    """
+
+    # Tarayıcının bağlantı koptuğunda yeniden denemeden önce bekleyeceği süre
+    retry = 2000
+
+    def __init__(self):
+        self.renderer = EventStreamRenderer()
+        self.snapshots = SnapshotBatcher()
+
+    async def __call__(self, scope, receive, send):
+        if scope['method'] != 'GET':
+            await self.send_error(send, 405, 'Sadece GET desteklenir.', [(b'allow', b'GET')])
+            return
+        try:
+            self.validate_host(scope)
+            ids = self.parse_ids(scope)
+        except BadRequest as exc:
+            await self.send_error(send, 400, str(exc))
+            return
+
+        broker = get_broker()
+        subscription = broker.subscribe([product_topic(pk) for pk in ids] + [RESYNC_TOPIC])
+        watcher = asyncio.ensure_future(self.watch_disconnect(receive, subscription))
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream; charset=utf-8'),
+                    (b'cache-control', b'no-cache'),
+                    # nginx'in yanıtı tamponlayıp olayları geciktirmemesi için
+                    (b'x-accel-buffering', b'no'),
+                ],
+            })
+            await self.stream(send, ids, subscription)
+        except OSError:
+            # İstemci yazma sırasında ayrıldı (sunucuya göre ClientDisconnected vb.)
+            pass
+        finally:
+            watcher.cancel()
+            broker.unsubscribe(subscription)
+
+    async def stream(self, send, ids, subscription):
+        # Ürün başına gönderilen son (stock, price); aynı değer tekrar gönderilmez
+        sent = {}
+        await self.write(send, self.renderer.encode_retry(self.retry))
+        await self.send_snapshot(send, ids, sent)
+
+        heartbeat = getattr(settings, 'LIVE_STOCK_HEARTBEAT', 15)
+        while True:
+            if not await subscription.wait(heartbeat):
+                await self.write(send, self.renderer.encode_comment('keep-alive'))
+                continue
+            if subscription.closed:
+                return
+            messages, lagged = subscription.drain()
+            if lagged or any(message.get('resync') for message in messages):
+                await self.send_snapshot(send, ids, sent)
+                continue
+
+            # Aynı ürünün birden fazla mesajı varsa sadece sonuncusu gönderilir
+            latest = {message['id']: message for message in messages}
+            await self.write(send, ''.join(self.encode(message, sent) for message in latest.values()))
+
+    async def send_snapshot(self, send, ids, sent):
+        # Sonuç diğer bağlantıların ürünlerini de içerebilir
+        rows = await self.snapshots.load(ids)
+        messages = [rows.get(pk, {'id': pk, 'deleted': True}) for pk in ids]
+        sent.clear()
+        await self.write(send, ''.join(self.encode(message, sent) for message in messages))
+
+    def encode(self, message, sent):
+        pk = message['id']
+        if message.get('deleted'):
+            state = None
+        else:
+            state = (message['stock'], message['price'])
+        if pk in sent and sent[pk] == state:
+            return ''
+        sent[pk] = state
+        if state is None:
+            return self.renderer.encode_event({'id': pk}, event='delete')
+        return self.renderer.encode_event(message, event='stock')
+
+    async def write(self, send, text):
+        if text:
+            await send({'type': 'http.response.body', 'body': text.encode(), 'more_body': True})
+
+    async def watch_disconnect(self, receive, subscription):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        subscription.close()
+
+    # =========================================================================
+    # İSTEK DOĞRULAMA
+    # =========================================================================
+
+    # ALLOWED_HOSTS kontrolü Django istekleriyle aynı kurallarla yapılır
+    def validate_host(self, scope):
+        try:
+            ASGIRequest(scope, BytesIO()).get_host()
+        except DisallowedHost as exc:
+            raise BadRequest(str(exc))
+
+    def parse_ids(self, scope):
+        value = QueryDict(scope.get('query_string', b'').decode('latin-1')).get('ids', '')
+        try:
+            ids = list(dict.fromkeys(int(part) for part in value.split(',') if part.strip()))
+        except ValueError:
+            raise BadRequest('ids virgülle ayrılmış ürün id\'leri olmalıdır.')
+        max_ids = getattr(settings, 'LIVE_STOCK_MAX_IDS', 100)
+        if not ids:
+            raise BadRequest('En az bir ürün id\'si gereklidir (?ids=1,2,3).')
+        if len(ids) > max_ids:
+            raise BadRequest('En fazla %d ürüne abone olunabilir.' % max_ids)
+        return ids
+
+    async def send_error(self, send, status, detail, headers=()):
+        body = self.renderer.encode_event({'detail': detail}, event='error').encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'text/event-stream; charset=utf-8'), *headers],
+        })
+        await send({'type': 'http.response.body', 'body': body})
@@ -0,0 +1,191 @@
+# Sonuç dosyası ve ortam bilgisi için standart kütüphaneler
+import json
+import platform
+import sqlite3
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+
+from products.benchmarks import (
+    SCENARIOS,
+    TRANSPORTS,
+    benchmark_database,
+    compare_results,
+    parse_scale,
+    run_scenarios,
+    seed_products,
+    without_product_cache,
+)
+
+# =============================================================================
+# BENCHMARK_API YÖNETİM KOMUTU
+# =============================================================================
+#
+# Ürün API'sinin tekrarlanabilir performans ölçümü. Geçici bir test
+# veritabanına istenen ölçekte ürün eklenir ve her transport (test client,
+# WSGI, ASGI) için senaryolar sırayla ölçülür:
+# - list_cursor: GET /api/products/ (keyset / cursor sayfalama)
+# - list_page:   GET /api/products/?pagination=page&page=N (sayfa numarası)
+# - detail:      GET /api/products/<id>/
+# - stats:       GET /api/products/stats/ (özet tabloları)
+# - create:      POST /api/products/
+# - update:      PATCH /api/products/<id>/
+# - delete:      DELETE /api/products/<id>/ (create'in eklediği ürünler)
+#
+# Her senaryo için req/s, p50 ve p99 gecikmesi (ms) ve hatalı yanıt sayısı
+# raporlanır. İstekler sıralı gönderilir (eşzamanlılık 1); eşzamanlı yük
+# için benchmark_async ve benchmark_sqlite komutları kullanılır.
+#
+# Sonuçlar --output ile JSON olarak yazılır. --compare ile önceki bir
+# sonuç dosyası verilirse, --threshold oranından fazla gerileyen metrikler
+# listelenir ve komut hata koduyla (CI'da başarısız) biter.
+#
+# Notlar:
+# - db.sqlite3 değişmez; ürün önbelleği (products/cache.py) varsayılan
+#   olarak kapatılır (--cache ile açık bırakılır)
+# - HTTP sunucusu ve soket kullanılmaz; WSGI / ASGI uygulamaları süreç
+#   içinde doğrudan çağrılır (ağ maliyeti ölçüme girmez)
+# - Karşılaştırılan iki dosya aynı makinede, aynı ölçek ve tohumla
+#   üretilmelidir; meta bölümü bunun kontrolü için yazılır
+#
+# Kullanım:
+#   python manage.py benchmark_api --scale 1k --output baseline.json
+#   python manage.py benchmark_api --scale 1k --compare baseline.json --threshold 0.15
+#   python manage.py benchmark_api --scale 100k --transports wsgi,asgi --scenarios detail,list_cursor
+# =============================================================================
+
+
+class Command(BaseCommand):
+    help = 'Ürün API senaryolarını ölçer, sonuçları JSON olarak yazar ve gerilemeleri kontrol eder'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', default='1k', help='Ürün sayısı: 1k, 100k, 1m veya tam sayı')
+        parser.add_argument('--iterations', type=int, default=200, help='Senaryo başına ölçülen istek sayısı')
+        parser.add_argument('--warmup', type=int, default=10, help='Senaryo başına ölçülmeyen ısınma isteği')
+        parser.add_argument('--page-size', type=int, default=20, help='Liste senaryolarının sayfa boyutu')
+        parser.add_argument('--seed', type=int, default=0, help='Rastgele seçimlerin tohumu')
+        parser.add_argument(
+            '--transports', default=','.join(TRANSPORTS),
+            help='Virgülle ayrılmış transport listesi (%s)' % ', '.join(TRANSPORTS),
+        )
+        parser.add_argument(
+            '--scenarios', default=','.join(SCENARIOS),
+            help='Virgülle ayrılmış senaryo listesi (%s)' % ', '.join(SCENARIOS),
+        )
+        parser.add_argument('--cache', action='store_true', help='Ürün yanıt önbelleğini açık bırak')
+        parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+        parser.add_argument('--compare', help='Karşılaştırılacak önceki sonuç dosyası (JSON)')
+        parser.add_argument(
+            '--threshold', type=float, default=0.10,
+            help='Gerileme eşiği (oran): 0.10 -> req/s %%10 düşerse veya p50/p99 %%10 artarsa hata',
+        )
+
+    def parse_list(self, value, choices, option):
+        items = [item.strip() for item in value.split(',') if item.strip()]
+        invalid = [item for item in items if item not in choices]
+        if invalid or not items:
+            raise CommandError('%s geçersiz: %s (seçenekler: %s)' % (option, value, ', '.join(choices)))
+        # Senaryolar her zaman tanımlı sırayla çalışır (delete, create'ten sonra)
+        return [item for item in choices if item in items]
+
+    def get_meta(self, options, rows):
+        return {
+            'created': timezone.now().isoformat(),
+            'rows': rows,
+            'iterations': options['iterations'],
+            'warmup': options['warmup'],
+            'page_size': options['page_size'],
+            'seed': options['seed'],
+            'cache': options['cache'],
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'sqlite': sqlite3.sqlite_version if connection.vendor == 'sqlite' else None,
+            'machine': platform.machine(),
+        }
+
+    def report(self, transport, scenario, metrics):
+        self.stdout.write(
+            '%-6s %-12s %9.1f req/s   p50: %8.2f ms   p99: %8.2f ms%s'
+            % (
+                transport, scenario, metrics['rps'], metrics['p50_ms'], metrics['p99_ms'],
+                '   HATA: %d' % metrics['errors'] if metrics['errors'] else '',
+            )
+        )
+
+    def measure(self, options, transports, scenarios):
+        results = {}
+        for name in transports:
+            transport = TRANSPORTS[name]()
+            try:
+                results[name] = run_scenarios(
+                    transport, scenarios, options['iterations'], warmup=options['warmup'],
+                    seed=options['seed'], page_size=options['page_size'],
+                )
+            finally:
+                transport.close()
+                # ASGI senkron view'ları ayrı iş parçacığında çalıştırır; o
+                # bağlantılar transport değişmeden kapatılır
+                connections.close_all()
+            for scenario, metrics in results[name].items():
+                self.report(name, scenario, metrics)
+        return results
+
+    def handle(self, *args, **options):
+        try:
+            rows = parse_scale(options['scale'])
+        except ValueError:
+            raise CommandError('--scale geçersiz: %s (örn. 1k, 100k, 1m, 2500)' % options['scale'])
+        if rows < 1:
+            raise CommandError('--scale en az 1 olmalıdır.')
+        transports = self.parse_list(options['transports'], list(TRANSPORTS), '--transports')
+        scenarios = self.parse_list(options['scenarios'], list(SCENARIOS), '--scenarios')
+
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as file:
+                    baseline = json.load(file)
+            except (OSError, ValueError) as exc:
+                raise CommandError('Karşılaştırma dosyası okunamadı: %s' % exc)
+
+        self.stdout.write(
+            '%d ürün, senaryo başına %d istek, transport: %s'
+            % (rows, options['iterations'], ', '.join(transports))
+        )
+        with benchmark_database():
+            seed_products(rows)
+            if options['cache']:
+                results = self.measure(options, transports, scenarios)
+            else:
+                with without_product_cache():
+                    results = self.measure(options, transports, scenarios)
+            output = {'meta': self.get_meta(options, rows), 'results': results}
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(output, file, indent=2, ensure_ascii=False)
+            self.stdout.write('Sonuçlar yazıldı: %s' % options['output'])
+
+        if baseline is None:
+            return
+        for key in ('rows', 'page_size', 'seed', 'cache', 'database'):
+            if baseline.get('meta', {}).get(key) != output['meta'][key]:
+                self.stderr.write(
+                    'Uyarı: %s farklı (önceki: %s, şimdiki: %s); sonuçlar doğrudan karşılaştırılamayabilir'
+                    % (key, baseline.get('meta', {}).get(key), output['meta'][key])
+                )
+        regressions = compare_results(baseline, output, options['threshold'])
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(
+                'Gerileme yok (eşik: %%%.0f)' % (options['threshold'] * 100)
+            ))
+            return
+        for item in regressions:
+            self.stdout.write(self.style.ERROR(
+                '%(transport)s %(scenario)s %(metric)s: %(baseline)s -> %(current)s' % item
+                + (' (%+.1f%%)' % (item['change'] * 100) if item['change'] is not None else '')
+            ))
+        raise CommandError('%d metrik eşiği aştı' % len(regressions))
@@ -0,0 +1,154 @@
+# Eşzamanlı istek üretimi ve ölçüm için standart kütüphaneler
+import asyncio
+import time
+import types
+
+# Django yönetim komutu ve ASGI altyapısı
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+from django.urls import include, path
+
+from products.async_views import AsyncProductListCreateAPIView, AsyncProductRetrieveUpdateDestroyAPIView
+from products.benchmarks import (
+    asgi_request, benchmark_database, percentile, seed_products, without_product_cache,
+)
+from products.views import ProductListCreateAPIView, ProductRetrieveUpdateDestroyAPIView
+
+# =============================================================================
+# BENCHMARK_ASYNC YÖNETİM KOMUTU
+# =============================================================================
+#
+# Senkron ve async ürün view'larını aynı ASGI uygulaması (core.asgi) üzerinde,
+# farklı eşzamanlılık seviyelerinde karşılaştırır. HTTP sunucusu kullanılmaz;
+# istekler doğrudan ASGI uygulamasına (tek worker, tek event loop) verilir.
+#
+# Ölçülenler (her mod ve eşzamanlılık seviyesi için):
+# - req/s: Saniyedeki tamamlanan istek sayısı
+# - p50 / p99: İstek gecikmesi (ms)
+# Worker'ın taşıyabildiği eşzamanlılık, req/s'nin düşmeden ve p99'un
+# eşzamanlılıkla orantısız büyümeden kaldığı en yüksek seviyedir
+#
+# Notlar:
+# - Geçici bir test veritabanı kullanılır; db.sqlite3 değişmez
+# - Ürün önbelleği kapatılır; her istek view + veritabanı maliyetini öder
+# - Django'nun async ORM'i sorguları hâlâ tek bir senkron iş parçacığında
+#   (sync_to_async) çalıştırır. --latency ile her sorguya ağ gecikmesi
+#   eklendiğinde bu iş parçacığı her iki modda da darboğazdır; async view'ların
+#   kazancı, sorgu dışındaki işlerin (istek ayrıştırma, serialize, render)
+#   event loop'ta bu beklemeyle örtüşmesinden gelir
+#
+# Kullanım:
+#   python manage.py benchmark_async
+#   python manage.py benchmark_async --concurrency 1,10,50 --requests 500
+#   python manage.py benchmark_async --url "/api/products/?page_size=50" --latency 2
+# =============================================================================
+
+
+# Sadece ürün liste/detay endpoint'lerini içeren URL modülü oluşturur
+# ROOT_URLCONF bu modülle değiştirilerek senkron / async view'lar seçilir
+def build_urlconf(name, list_view, detail_view):
+    products = types.ModuleType('%s_products' % name)
+    products.urlpatterns = [
+        path('products/', list_view.as_view()),
+        path('products/<int:pk>/', detail_view.as_view()),
+    ]
+    module = types.ModuleType(name)
+    module.urlpatterns = [path('api/', include(products))]
+    return module
+
+
+URLCONFS = {
+    'sync': build_urlconf('benchmark_sync_urls', ProductListCreateAPIView, ProductRetrieveUpdateDestroyAPIView),
+    'async': build_urlconf(
+        'benchmark_async_urls', AsyncProductListCreateAPIView, AsyncProductRetrieveUpdateDestroyAPIView
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = 'Senkron ve async ürün view\'larını ASGI üzerinde eşzamanlı yük altında karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=2000, help='Test veritabanındaki ürün sayısı')
+        parser.add_argument('--requests', type=int, default=300, help='Her ölçümdeki istek sayısı')
+        parser.add_argument(
+            '--concurrency', default='1,10,50',
+            help='Virgülle ayrılmış eşzamanlılık seviyeleri (aynı anda açık istek sayısı)',
+        )
+        parser.add_argument('--url', default='/api/products/?page_size=20', help='İstek yapılacak URL')
+        parser.add_argument(
+            '--latency', type=float, default=0,
+            help='Her SQL sorgusuna eklenecek yapay gecikme (ms); uzak veritabanını taklit eder',
+        )
+
+    # Tek bir GET isteğini ASGI uygulamasına verir; (durum kodu, süre) döndürür
+    async def request(self, app, url):
+        started = time.perf_counter()
+        status, _ = await asgi_request(app, 'GET', url)
+        return status, time.perf_counter() - started
+
+    # total adet isteği en fazla concurrency kadarı aynı anda açık olacak şekilde gönderir
+    async def run_load(self, app, url, total, concurrency):
+        queue = iter(range(total))
+        results = []
+
+        async def worker():
+            for _ in queue:
+                results.append(await self.request(app, url))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return results, time.perf_counter() - started
+
+    def report(self, mode, concurrency, results, elapsed):
+        errors = sum(1 for status, _ in results if status != 200)
+        latencies = [duration for _, duration in results]
+        self.stdout.write(
+            '%-6s eşzamanlılık: %4d  %8.1f req/s   p50: %7.2f ms   p99: %7.2f ms%s'
+            % (
+                mode, concurrency, len(results) / elapsed,
+                percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000,
+                '   HATA: %d' % errors if errors else '',
+            )
+        )
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(value) for value in options['concurrency'].split(',')]
+        except ValueError:
+            raise CommandError('--concurrency virgülle ayrılmış tam sayılar olmalıdır (örn. 1,10,50)')
+
+        latency = options['latency'] / 1000
+
+        # Yapay gecikme her bağlantıya (sync_to_async iş parçacığı dahil) eklenir
+        def delay(execute, sql, params, many, context):
+            time.sleep(latency)
+            return execute(sql, params, many, context)
+
+        def add_delay(sender, connection, **kwargs):
+            if delay not in connection.execute_wrappers:
+                connection.execute_wrappers.append(delay)
+
+        app = get_asgi_application()
+        with benchmark_database(), without_product_cache():
+            seed_products(options['products'])
+            if latency:
+                connection_created.connect(add_delay, dispatch_uid='benchmark_async_latency')
+            self.stdout.write(
+                '%d ürün, %d istek, URL: %s, sorgu gecikmesi: %.1f ms'
+                % (options['products'], options['requests'], options['url'], options['latency'])
+            )
+            try:
+                for mode, urlconf in URLCONFS.items():
+                    with override_settings(ROOT_URLCONF=urlconf):
+                        # Isınma: bağlantı, URL çözümleme ve import maliyetleri ölçüme girmesin
+                        asyncio.run(self.run_load(app, options['url'], 5, 1))
+                        for concurrency in levels:
+                            results, elapsed = asyncio.run(
+                                self.run_load(app, options['url'], options['requests'], concurrency)
+                            )
+                            self.report(mode, concurrency, results, elapsed)
+            finally:
+                connection_created.disconnect(dispatch_uid='benchmark_async_latency')
@@ -0,0 +1,123 @@
+# Ölçüm ve örnek veri üretimi için standart kütüphaneler
+import datetime
+import decimal
+import io
+import timeit
+
+# Django yönetim komutu altyapısı
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+# DRF'nin standart JSON renderer / parser'ı (karşılaştırma için)
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from products import parsers, renderers
+from products.models import Product
+from products.parsers import FastJSONParser
+from products.renderers import FastJSONRenderer
+from products.serializers import ProductReadSerializer, ProductSerializer
+
+# =============================================================================
+# BENCHMARK_JSON YÖNETİM KOMUTU
+# =============================================================================
+#
+# Standart JSONRenderer / JSONParser ile FastJSONRenderer / FastJSONParser'ı
+# ürün verisi üzerinde karşılaştırır. Veritabanı kullanılmaz; ürünler
+# bellekte oluşturulur, böylece sadece JSON kodlama maliyeti ölçülür.
+#
+# Senaryolar:
+# - serialized: ProductSerializer çıktısı (Decimal / datetime zaten metin)
+# - raw: values() satırları (Decimal ve datetime nesneleri renderer'a gelir)
+#   Not: Standart JSONEncoder ham Decimal'i float yazar; hızlı renderer
+#   COERCE_DECIMAL_TO_STRING ayarına uyar ve metin olarak yazar
+# - parse: Aynı ürün listesinin JSON gövdesinden geri okunması
+# - serializer: ProductSerializer ile ProductReadSerializer (renderer'dan önce)
+# - serializer-raw: ProductReadSerializer'ın values() satırlarıyla çalışması
+#   (liste view'larının hızlı yolu, products/views.py)
+#
+# Kullanım:
+#   python manage.py benchmark_json
+#   python manage.py benchmark_json --rows 1000 --repeat 50
+# =============================================================================
+
+
+class Command(BaseCommand):
+    help = 'Standart ve hızlı JSON renderer/parser performansını karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Yanıttaki ürün sayısı')
+        parser.add_argument('--repeat', type=int, default=200, help='Her ölçümün tekrar sayısı')
+
+    # Bellekte örnek ürün satırları (values() çıktısı gibi) üretir
+    def build_rows(self, count):
+        now = timezone.now()
+        return [
+            {
+                'id': index,
+                'name': 'Ürün %d' % index,
+                'price': decimal.Decimal('%d.%02d' % (index % 5000, index % 100)),
+                'stock': index % 250,
+                'created_at': now - datetime.timedelta(minutes=index),
+                'updated_at': now,
+            }
+            for index in range(1, count + 1)
+        ]
+
+    # Fonksiyonun tek çağrı süresini milisaniye olarak döndürür (en iyi 3 ölçüm)
+    def measure(self, func, repeat):
+        return min(timeit.repeat(func, number=repeat, repeat=3)) / repeat * 1000
+
+    def report(self, name, baseline, fast, repeat):
+        base_ms = self.measure(baseline, repeat)
+        fast_ms = self.measure(fast, repeat)
+        self.stdout.write(
+            '%-14s standart: %8.3f ms   hızlı: %8.3f ms   %5.1fx'
+            % (name, base_ms, fast_ms, base_ms / fast_ms)
+        )
+
+    def handle(self, *args, **options):
+        rows = self.build_rows(options['rows'])
+        repeat = options['repeat']
+        serialized = ProductSerializer([Product(**row) for row in rows], many=True).data
+
+        baseline, fast = JSONRenderer(), FastJSONRenderer()
+        body = baseline.render(serialized)
+        # Hızlı renderer, standart renderer ile birebir aynı çıktıyı üretmelidir
+        if fast.render(serialized) != body:
+            self.stderr.write(self.style.ERROR('Çıktılar farklı: serialized'))
+
+        self.stdout.write(
+            'orjson: %s | %d ürün, %d tekrar'
+            % ('kurulu' if renderers.orjson else 'kurulu değil', len(rows), repeat)
+        )
+        self.report('serialized', lambda: baseline.render(serialized), lambda: fast.render(serialized), repeat)
+        self.report('raw', lambda: baseline.render(rows), lambda: fast.render(rows), repeat)
+
+        # Parser karşılaştırması: her çağrı için yeni bir akış (stream) gerekir
+        json_parser, fast_parser = JSONParser(), FastJSONParser()
+        self.report(
+            'parse',
+            lambda: json_parser.parse(io.BytesIO(body)),
+            lambda: fast_parser.parse(io.BytesIO(body)),
+            repeat,
+        )
+
+        # Serializer karşılaştırması: ikisi de aynı listeyi üretmelidir
+        instances = [Product(**row) for row in rows]
+        if ProductReadSerializer(instances, many=True).data != serialized:
+            self.stderr.write(self.style.ERROR('Çıktılar farklı: serializer'))
+        self.report(
+            'serializer',
+            lambda: ProductSerializer(instances, many=True).data,
+            lambda: ProductReadSerializer(instances, many=True).data,
+            repeat,
+        )
+        self.report(
+            'serializer-raw',
+            lambda: ProductSerializer(instances, many=True).data,
+            lambda: ProductReadSerializer(rows, many=True).data,
+            repeat,
+        )
+        if parsers.orjson is None:
+            self.stdout.write('orjson kurulu değil: hızlı sınıflar standart yola düşer (pip install orjson)')
@@ -0,0 +1,162 @@
+# Eşzamanlı yük üretimi ve ölçüm için standart kütüphaneler
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+
+# Django yönetim komutu, WSGI altyapısı ve veritabanı bağlantıları
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from products.benchmarks import (
+    benchmark_database, percentile, seed_products, wsgi_request, without_product_cache,
+)
+
+# =============================================================================
+# BENCHMARK_SQLITE YÖNETİM KOMUTU
+# =============================================================================
+#
+# SQLite'ın varsayılan ayarlarıyla settings.py'daki üretim profilini
+# (WAL, pragma'lar, kalıcı bağlantılar, IMMEDIATE transaction) eşzamanlı
+# okuma + yazma yükü altında karşılaştırır. DJANGO_DB_PROFILE ile hangi
+# profilin seçili olduğundan bağımsızdır.
+#
+# Her profil için:
+# - Geçici bir dosyada yeni bir test veritabanı oluşturulur (WAL bellekteki
+#   veritabanlarında çalışmaz; db.sqlite3 değişmez)
+# - --threads kadar iş parçacığı, --duration saniye boyunca istek gönderir
+#   - Okuma: GET --url (varsayılan: ürün listesi)
+#   - Yazma: POST /api/products/ (--write-ratio oranında)
+# - İstekler WSGIHandler üzerinden gider; böylece CONN_MAX_AGE ile bağlantının
+#   istek sonunda kapatılıp kapatılmaması (request_finished) da ölçüme girer
+# - Ürün önbelleği kapatılır
+#
+# Profiller:
+# - varsayılan: Rollback journal, pragma yok, CONN_MAX_AGE=0, DEFERRED transaction
+# - ayarlı: settings.SQLITE_PRODUCTION_DATABASE ve SQLITE_PRODUCTION_PRAGMAS
+#
+# Raporlanan "kilit" sütunu, "database is locked" gibi veritabanı
+# hatalarıyla 500 dönen istek sayısıdır.
+#
+# Kullanım:
+#   python manage.py benchmark_sqlite
+#   python manage.py benchmark_sqlite --threads 16 --duration 10 --write-ratio 0.5
+# =============================================================================
+
+
+class Command(BaseCommand):
+    help = 'SQLite varsayılan ayarları ile üretim profilini eşzamanlı okuma/yazma yükünde karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=2000, help='Başlangıçtaki ürün sayısı')
+        parser.add_argument('--threads', type=int, default=8, help='Eşzamanlı istemci sayısı')
+        parser.add_argument('--duration', type=float, default=5, help='Her profilin ölçüm süresi (saniye)')
+        parser.add_argument('--write-ratio', type=float, default=0.2, help='Yazma isteklerinin oranı (0-1)')
+        parser.add_argument('--url', default='/api/products/?page_size=20', help='Okuma isteği URL\'i')
+
+    # Karşılaştırılan profiller: (ad, DATABASES ayarları, SQLITE_PRAGMAS)
+    def get_profiles(self):
+        production = settings.SQLITE_PRODUCTION_DATABASE
+        tuned = {
+            'CONN_MAX_AGE': production['CONN_MAX_AGE'],
+            'CONN_HEALTH_CHECKS': production['CONN_HEALTH_CHECKS'],
+            'OPTIONS': dict(production['OPTIONS']),
+        }
+        default = {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'OPTIONS': {}}
+        return [
+            ('varsayılan', default, {}),
+            ('ayarlı', tuned, dict(settings.SQLITE_PRODUCTION_PRAGMAS)),
+        ]
+
+    # Tek bir isteği WSGI uygulamasına verir; durum kodunu döndürür
+    def request(self, handler, request):
+        return wsgi_request(handler, request.environ)[0]
+
+    # Bir iş parçacığının yük döngüsü; sonuçlar results listesine eklenir
+    def worker(self, handler, options, deadline, seed, results):
+        factory = RequestFactory(HTTP_HOST='localhost')
+        rnd = random.Random(seed)
+        try:
+            while time.perf_counter() < deadline:
+                write = rnd.random() < options['write_ratio']
+                if write:
+                    request = factory.post(
+                        '/api/products/',
+                        {'name': 'Yük %d' % rnd.randrange(10 ** 6), 'price': '9.99', 'stock': 3},
+                        content_type='application/json',
+                    )
+                else:
+                    request = factory.get(options['url'])
+                started = time.perf_counter()
+                status = self.request(handler, request)
+                results.append((write, status, time.perf_counter() - started))
+        finally:
+            connections.close_all()
+
+    def run_profile(self, options, path):
+        with benchmark_database(name=path):
+            seed_products(options['products'])
+            handler = WSGIHandler()
+            deadline = time.perf_counter() + options['duration']
+            results = []
+            threads = [
+                threading.Thread(target=self.worker, args=(handler, options, deadline, seed, results))
+                for seed in range(options['threads'])
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                journal_mode = cursor.fetchone()[0]
+        return results, journal_mode
+
+    def report(self, name, journal_mode, results, duration):
+        line = '%-10s %-7s' % (name, journal_mode)
+        for label, write, ok in (('okuma', False, 200), ('yazma', True, 201)):
+            latencies = [elapsed for is_write, status, elapsed in results if is_write is write and status == ok]
+            errors = sum(1 for is_write, status, _ in results if is_write is write and status != ok)
+            if latencies:
+                line += '  %s: %7.1f/s p50 %6.1f ms p99 %7.1f ms kilit %4d' % (
+                    label, len(latencies) / duration,
+                    percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000, errors,
+                )
+            else:
+                line += '  %s: başarılı istek yok, kilit %4d' % (label, errors)
+        self.stdout.write(line)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Bu komut sadece SQLite için yazılmıştır.')
+
+        self.stdout.write(
+            '%d ürün, %d iş parçacığı, %.0f sn, yazma oranı %.0f%%, okuma URL: %s'
+            % (options['products'], options['threads'], options['duration'],
+               options['write_ratio'] * 100, options['url'])
+        )
+        settings_dict = connection.settings_dict
+        saved = {key: settings_dict[key] for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS', 'OPTIONS')}
+        # Kilit hataları 500 olarak sayılır; her biri için log basılmasın
+        request_logger = logging.getLogger('django.request')
+        old_level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        try:
+            with tempfile.TemporaryDirectory() as directory, without_product_cache():
+                for index, (name, database, pragmas) in enumerate(self.get_profiles()):
+                    # settings_dict tüm iş parçacıklarının bağlantıları tarafından paylaşılır
+                    settings_dict.update(database)
+                    with override_settings(SQLITE_PRAGMAS=pragmas):
+                        results, journal_mode = self.run_profile(
+                            options, os.path.join(directory, 'benchmark_%d.sqlite3' % index)
+                        )
+                    self.report(name, journal_mode, results, options['duration'])
+        finally:
+            settings_dict.update(saved)
+            request_logger.setLevel(old_level)
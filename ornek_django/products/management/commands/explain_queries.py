@@ -0,0 +1,175 @@
+# Cursor konumunu (JSON listesi) üretmek için
+import json
+# LIMIT içeren sorguları tanımak için
+import re
+
+# Django yönetim komutu altyapısı ve veritabanı yardımcıları
+# CaptureQueriesContext: Bir kod bloğunda çalışan SQL sorgularını yakalar
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+
+from rest_framework.pagination import Cursor
+from rest_framework.test import APIRequestFactory
+
+from products.benchmarks import benchmark_database, seed_products, without_product_cache
+from products.pagination import ProductKeysetPagination
+
+# =============================================================================
+# EXPLAIN_QUERIES YÖNETİM KOMUTU
+# =============================================================================
+#
+# API'nin liste / filtre / sıralama / sayfalama kombinasyonları için çalıştırdığı
+# SQL sorgularını yakalar ve her birinin SQLite sorgu planını
+# (EXPLAIN QUERY PLAN) yazdırır.
+#
+# Sorgular gerçek veritabanında değil, --rows kadar örnek ürünle doldurulmuş
+# geçici bir test veritabanında çalıştırılır (products/benchmarks.py).
+# Boş bir tabloda planlar gerçek yükü yansıtmaz ve komut canlı veriyi okumaz.
+#
+# Kontroller:
+# - "SCAN <tablo>": Tablo veya indeks baştan sona okunur -> HATA
+#   "USING INDEX" / "USING COVERING INDEX" de taramadır (örn. COUNT(*))
+#   İstisna: Sorguda LIMIT varsa ve sıralama geçici b-tree ile yapılmıyorsa
+#   tarama indeks sırasıyla ilerler ve LIMIT'e ulaşınca durur
+#   (full_scan_allowed içindeki senaryolar da hata vermez)
+# - "USE TEMP B-TREE FOR ORDER BY": Sıralama indeksten gelmiyor -> UYARI
+#
+# Herhangi bir sorgu tam tablo taramasına düşerse komut hata koduyla
+# biter; CI içinde indeks gerilemelerini yakalamak için kullanılabilir.
+#
+# Kullanım:
+#   python manage.py explain_queries
+#   python manage.py explain_queries --rows 100000
+#   python manage.py explain_queries --verbosity 2   (SQL metinlerini de yazdırır)
+# =============================================================================
+
+
+class Command(BaseCommand):
+    help = 'Ürün API sorgularının planlarını gösterir, tam tablo taramasında hata verir'
+
+    # Tam taramanın beklenen davranış olduğu senaryolar
+    # - Export: Tüm tabloyu bilerek okur
+    # - Liste: sayfa numaralı: COUNT(*) tüm satırları sayar (eski mod,
+    #   bkz. products/pagination.py); varsayılan keyset modu COUNT çalıştırmaz
+    full_scan_allowed = {'Export', 'Liste: sayfa numaralı'}
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=10000, help='Geçici veritabanına eklenecek örnek ürün sayısı',
+        )
+
+    # (açıklama, URL, query parametreleri) üçlüleri
+    def get_url_cases(self):
+        now = timezone.now().isoformat()
+        return [
+            ('Liste: ilk sayfa', '/api/products/', {}),
+            ('Liste: sonraki sayfa (cursor)', self.cursor_url(now, reverse=False), {}),
+            ('Liste: önceki sayfa (cursor)', self.cursor_url(now, reverse=True), {}),
+            ('Liste: sayfa numaralı', '/api/products/', {'pagination': 'page', 'page': 1}),
+            ('Detay', '/api/products/1/', {}),
+            ('Export', '/api/products/export/', {'format': 'ndjson'}),
+            ('Filtre: isim ön eki', '/api/products/', {'name': 'Kal'}),
+            ('Filtre: fiyat aralığı', '/api/products/', {'price_min': 10, 'price_max': 100}),
+            ('Filtre: stokta olanlar', '/api/products/', {'in_stock': 'true'}),
+            ('Filtre: tarih aralığı', '/api/products/', {
+                'created_after': '2024-01-01', 'created_before': '2024-02-01',
+            }),
+            ('Filtre: isim + stok', '/api/products/', {'name': 'Kal', 'in_stock': 'true'}),
+            ('Sıralama: fiyat', '/api/products/', {'ordering': 'price'}),
+            ('Sıralama: -fiyat', '/api/products/', {'ordering': '-price'}),
+            ('Sıralama: isim', '/api/products/', {'ordering': 'name'}),
+            ('Sıralama: id', '/api/products/', {'ordering': '-id'}),
+            ('Sıralama: fiyat + fiyat aralığı', '/api/products/', {
+                'ordering': 'price', 'price_min': 10, 'price_max': 100,
+            }),
+            ('Seyrek alanlar', '/api/products/', {'fields': 'id,name', 'ordering': 'name'}),
+            ('Arama', '/api/products/search/', {'q': 'kalem'}),
+            ('Arama: yazım hatası', '/api/products/search/', {'q': 'kalme'}),
+        ]
+
+    # Liste endpoint'i için örnek bir keyset cursor URL'i üretir
+    def cursor_url(self, created_at, reverse):
+        paginator = ProductKeysetPagination()
+        paginator.base_url = '/api/products/'
+        position = json.dumps([created_at, '1'], separators=(',', ':'))
+        return paginator.encode_cursor(Cursor(offset=0, reverse=reverse, position=position))
+
+    # URL'i view üzerinden çalıştırır (akış yanıtları da tüketilir)
+    def run_url(self, url, params):
+        request = APIRequestFactory().get(url, params, HTTP_HOST='localhost')
+        match = resolve(request.path_info)
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        if response.streaming:
+            b''.join(response.streaming_content)
+
+    # Yakalanan SELECT sorgularının planlarını döndürür
+    def explain(self, queries):
+        plans = []
+        with connection.cursor() as cursor:
+            for query in queries:
+                sql = query['sql']
+                if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+                    continue
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                plans.append((sql, [row[-1] for row in cursor.fetchall()]))
+        return plans
+
+    # Plandaki SCAN satırı tüm tabloyu / indeksi okuyor mu?
+    # LIMIT'li ve sıralaması indeksten gelen sorgularda tarama erken durur
+    def is_full_scan(self, sql, plan, detail):
+        if not detail.startswith('SCAN'):
+            return False
+        # Sabit satırlar ve FTS5 sanal tablosu (kendi indeksini kullanır)
+        if 'CONSTANT' in detail or 'VIRTUAL TABLE' in detail:
+            return False
+        stops_at_limit = re.search(r'\bLIMIT\b', sql, re.IGNORECASE) is not None
+        sorts_in_memory = any('TEMP B-TREE' in line for line in plan)
+        return not stops_at_limit or sorts_in_memory
+
+    # Senaryoları geçici veritabanında, önbellek kapalıyken çalıştırır
+    # (önbellekten dönen yanıtlar hiç sorgu çalıştırmaz)
+    def collect_plans(self):
+        cases = []
+        with without_product_cache('explain_queries'):
+            for name, url, params in self.get_url_cases():
+                with CaptureQueriesContext(connection) as captured:
+                    self.run_url(url, params)
+                cases.append((name, self.explain(captured.captured_queries)))
+        return cases
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Bu komut sadece SQLite (EXPLAIN QUERY PLAN) için yazılmıştır.')
+
+        with benchmark_database():
+            seed_products(options['rows'])
+            cases = self.collect_plans()
+
+        failures = []
+        for name, plans in cases:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for sql, plan in plans:
+                if options['verbosity'] > 1:
+                    self.stdout.write('  %s' % sql)
+                for detail in plan:
+                    full_scan = self.is_full_scan(sql, plan, detail)
+                    if full_scan and name in self.full_scan_allowed:
+                        self.stdout.write('  %s  (beklenen)' % detail)
+                    elif full_scan:
+                        failures.append(name)
+                        self.stdout.write(self.style.ERROR('  %s  <- tam tablo taraması' % detail))
+                    elif 'TEMP B-TREE' in detail:
+                        self.stdout.write(self.style.WARNING('  %s' % detail))
+                    else:
+                        self.stdout.write('  %s' % detail)
+
+        if failures:
+            raise CommandError('Tam tablo taraması yapan sorgular: %s' % ', '.join(sorted(set(failures))))
+        self.stdout.write(self.style.SUCCESS(
+            '%d senaryonun hiçbiri tam tablo taraması yapmıyor (%d ürün).' % (len(cases), options['rows'])
+        ))
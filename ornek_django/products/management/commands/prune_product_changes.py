@@ -0,0 +1,53 @@
+# Saklama süresi hesabı için
+from datetime import timedelta
+
+# Django yönetim komutu altyapısı
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from products import changes
+
+# =============================================================================
+# PRUNE_PRODUCT_CHANGES YÖNETİM KOMUTU
+# =============================================================================
+#
+# Ürün değişiklik kaydından (products/changes.py) saklama süresini aşan
+# satırları siler. Kayıt her yazmada bir satır büyür; bu komut cron ile
+# düzenli (örn. günlük) çalıştırılmalıdır.
+#
+# Cursor'ı silinen aralıkta kalan istemciler /api/products/changes/
+# isteğinde 410 Gone alır ve /api/products/export/ ile tam senkronizasyon
+# yapar. Saklama süresi, en seyrek senkronize olan istemcinin aralığından
+# uzun tutulmalıdır.
+#
+# Kullanım:
+#   python manage.py prune_product_changes
+#   python manage.py prune_product_changes --days 7
+# =============================================================================
+
+
+class Command(BaseCommand):
+    help = 'Saklama süresini aşan ürün değişiklik kayıtlarını siler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Veritabanı bağlantısı')
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'PRODUCT_CHANGES_RETENTION_DAYS', 30),
+            help='Bu günden eski kayıtlar silinir (varsayılan: PRODUCT_CHANGES_RETENTION_DAYS)',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError('Değişiklik kaydı sadece SQLite için tanımlıdır.')
+        if options['days'] < 0:
+            raise CommandError('--days negatif olamaz.')
+
+        before = timezone.now() - timedelta(days=options['days'])
+        deleted = changes.prune(before, using=connection.alias)
+        self.stdout.write(self.style.SUCCESS(
+            '%d değişiklik kaydı silindi (%s öncesi), güncel cursor: %d'
+            % (deleted, before.isoformat(timespec='seconds'), changes.latest(connection.alias))
+        ))
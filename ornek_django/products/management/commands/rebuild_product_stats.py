@@ -0,0 +1,82 @@
+# Süre ölçümü için
+import time
+
+# Django yönetim komutu altyapısı
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from products import stats
+
+# =============================================================================
+# REBUILD_PRODUCT_STATS YÖNETİM KOMUTU
+# =============================================================================
+#
+# Katalog istatistiklerinin özet tablolarını (products/stats.py)
+# products_product tablosundan baştan hesaplar.
+#
+# Ne zaman kullanılır?
+# - PRODUCT_STATS_PRICE_BUCKETS ayarı değiştiğinde (tetikleyiciler yeni
+#   sınırlarla yeniden kurulur)
+# - Tetikleyiciler devre dışıyken (örn. ham SQL ile) veri yüklendiğinde
+# - Tabloyu yeniden oluşturan bir migration tetikleyicileri sildiğinde
+#
+# Adımlar (tek transaction içinde):
+# 1. Özet tabloları yoksa oluşturulur, tetikleyiciler yeniden kurulur
+# 2. Toplamlar, fiyat aralıkları ve günlük sayılar tablo taranarak yazılır
+#
+# --check: Hiçbir şey yazmaz; özetleri tablo taramasıyla hesaplanan
+# değerlerle karşılaştırır, fark varsa listeler ve hata koduyla biter
+#
+# Kullanım:
+#   python manage.py rebuild_product_stats
+#   python manage.py rebuild_product_stats --check
+# =============================================================================
+
+
+class Command(BaseCommand):
+    help = 'Katalog istatistiklerinin özet tablolarını yeniden oluşturur'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Veritabanı bağlantısı')
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Özetleri yazmadan tablo taramasıyla karşılaştır',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError('Özet tabloları sadece SQLite için tanımlıdır.')
+
+        if options['check']:
+            self.check_stats(connection.alias)
+            return
+
+        started = time.perf_counter()
+        with transaction.atomic(using=connection.alias):
+            stats.install(connection)
+            stats.rebuild(connection)
+        summary = stats.read(using=connection.alias)
+
+        self.stdout.write(self.style.SUCCESS(
+            'İstatistikler yeniden oluşturuldu: %d ürün, %d gün, %.2f sn'
+            % (summary['count'], len(summary['created_per_day']), time.perf_counter() - started)
+        ))
+
+    def check_stats(self, using):
+        # İki okuma aynı anlık görüntüden yapılsın diye tek transaction
+        with transaction.atomic(using=using):
+            stored = stats.read(using=using)
+            expected = stats.compute(using=using)
+        differences = [key for key in expected if stored[key] != expected[key]]
+        if not differences:
+            self.stdout.write(self.style.SUCCESS('İstatistikler güncel: %d ürün' % expected['count']))
+            return
+        for key in differences:
+            self.stdout.write(self.style.ERROR(
+                '%s: özet %s, gerçek %s' % (key, stored[key], expected[key])
+            ))
+        raise CommandError(
+            '%d alan farklı; python manage.py rebuild_product_stats ile yeniden oluşturun'
+            % len(differences)
+        )
@@ -0,0 +1,53 @@
+# Süre ölçümü için
+import time
+
+# Django yönetim komutu altyapısı
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from products import search
+
+# =============================================================================
+# REBUILD_SEARCH_INDEX YÖNETİM KOMUTU
+# =============================================================================
+#
+# Ürün arama indeksini (FTS5) products_product tablosundan baştan oluşturur.
+#
+# Ne zaman kullanılır?
+# - Tetikleyiciler devre dışıyken (örn. ham SQL ile) büyük veri yüklendiğinde
+# - Tabloyu yeniden oluşturan bir migration tetikleyicileri sildiğinde
+# - İndeks parçalandığında (çok sayıda küçük yazmadan sonra) birleştirmek için
+#
+# Adımlar (tek transaction içinde):
+# 1. FTS tablosu, kelime listesi ve tetikleyiciler yoksa oluşturulur
+# 2. 'rebuild': İndeks içerik tablosundan toplu olarak yeniden yazılır
+# 3. 'optimize': İndeks parçaları tek bir b-tree'de birleştirilir
+#
+# Kullanım:
+#   python manage.py rebuild_search_index
+# =============================================================================
+
+
+class Command(BaseCommand):
+    help = 'Ürün tam metin arama indeksini (FTS5) yeniden oluşturur'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Veritabanı bağlantısı')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError('Ürün arama indeksi sadece SQLite (FTS5) için tanımlıdır.')
+
+        started = time.perf_counter()
+        with transaction.atomic(using=connection.alias):
+            search.install(connection)
+            search.rebuild(connection)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM %s' % search.VOCAB_TABLE)
+            terms = cursor.fetchone()[0]
+
+        self.stdout.write(self.style.SUCCESS(
+            'Arama indeksi yeniden oluşturuldu: %d kelime, %.2f sn'
+            % (terms, time.perf_counter() - started)
+        ))
@@ -0,0 +1,53 @@
+from django.db import migrations
+
+
+# FTS5 sanal tabloları sadece SQLite'ta vardır; diğer veritabanlarında atlanır
+class SQLiteRunSQL(migrations.RunSQL):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'sqlite':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'sqlite':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+# FTS tablosu, kelime listesi ve tetikleyiciler migration'a sabitlenmiştir;
+# products/search.py'deki sonraki değişiklikler bu migration'ı etkilemez
+# (indeks rebuild_search_index komutuyla yeniden kurulabilir)
+# Mevcut ürünler indekse 'rebuild' ile eklenir
+SEARCH_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_product_fts USING fts5(name, "
+    "content='products_product', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_product_fts_vocab USING fts5vocab('products_product_fts', 'row')",
+    "INSERT INTO products_product_fts(products_product_fts, rank) VALUES ('rank', 'bm25(1.0)')",
+    'CREATE TRIGGER IF NOT EXISTS products_product_fts_ai AFTER INSERT ON products_product BEGIN '
+    'INSERT INTO products_product_fts(rowid, name) VALUES (new.id, new.name); END',
+    'CREATE TRIGGER IF NOT EXISTS products_product_fts_ad AFTER DELETE ON products_product BEGIN '
+    "INSERT INTO products_product_fts(products_product_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+    'CREATE TRIGGER IF NOT EXISTS products_product_fts_au AFTER UPDATE OF name ON products_product BEGIN '
+    "INSERT INTO products_product_fts(products_product_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+    'INSERT INTO products_product_fts(rowid, name) VALUES (new.id, new.name); END',
+    "INSERT INTO products_product_fts(products_product_fts) VALUES ('rebuild')",
+    "INSERT INTO products_product_fts(products_product_fts) VALUES ('optimize')",
+]
+
+REVERSE_SQL = [
+    'DROP TRIGGER IF EXISTS products_product_fts_ai',
+    'DROP TRIGGER IF EXISTS products_product_fts_ad',
+    'DROP TRIGGER IF EXISTS products_product_fts_au',
+    'DROP TABLE IF EXISTS products_product_fts_vocab',
+    'DROP TABLE IF EXISTS products_product_fts',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_indexes'),
+    ]
+
+    operations = [
+        SQLiteRunSQL(SEARCH_SQL, REVERSE_SQL),
+    ]
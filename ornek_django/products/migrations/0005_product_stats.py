@@ -0,0 +1,109 @@
+from django.db import migrations
+
+
+# Özet tabloları ve tetikleyiciler SQLite'a özeldir; diğer veritabanlarında atlanır
+class SQLiteRunSQL(migrations.RunSQL):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'sqlite':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'sqlite':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+# Özet tabloları ve tetikleyiciler migration'a sabitlenmiştir; products/stats.py'deki
+# sonraki değişiklikler bu migration'ı etkilemez
+# Fiyat aralıkları varsayılan sınırlarla (10, 50, 100, 500, 1000, 5000) kurulur;
+# PRODUCT_STATS_PRICE_BUCKETS değiştirilirse rebuild_product_stats komutu
+# tetikleyicileri güncel sınırlarla yeniden kurar
+# Mevcut ürünlerin özetleri son üç sorguyla hesaplanır
+OLD_BUCKET = (
+    'CASE WHEN old.price < 10 THEN 0 WHEN old.price < 50 THEN 1 WHEN old.price < 100 THEN 2 '
+    'WHEN old.price < 500 THEN 3 WHEN old.price < 1000 THEN 4 WHEN old.price < 5000 THEN 5 ELSE 6 END'
+)
+NEW_BUCKET = OLD_BUCKET.replace('old.', 'new.')
+ROW_BUCKET = OLD_BUCKET.replace('old.', '')
+
+STATS_SQL = [
+    'CREATE TABLE IF NOT EXISTS products_product_stats ('
+    'id INTEGER PRIMARY KEY CHECK (id = 1), '
+    'product_count INTEGER NOT NULL DEFAULT 0, '
+    'total_stock INTEGER NOT NULL DEFAULT 0, '
+    'out_of_stock INTEGER NOT NULL DEFAULT 0, '
+    'inventory_value_cents INTEGER NOT NULL DEFAULT 0, '
+    "price_buckets TEXT NOT NULL DEFAULT '')",
+    'CREATE TABLE IF NOT EXISTS products_product_stats_price ('
+    'bucket INTEGER PRIMARY KEY, product_count INTEGER NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS products_product_stats_daily ('
+    'day TEXT PRIMARY KEY, product_count INTEGER NOT NULL) WITHOUT ROWID',
+    'INSERT OR IGNORE INTO products_product_stats(id) VALUES (1)',
+    'CREATE TRIGGER products_product_stats_ai AFTER INSERT ON products_product BEGIN '
+    'UPDATE products_product_stats SET product_count = product_count + 1, '
+    'total_stock = total_stock + new.stock, out_of_stock = out_of_stock + (new.stock <= 0), '
+    'inventory_value_cents = inventory_value_cents + CAST(ROUND(new.price * 100) AS INTEGER) * new.stock '
+    'WHERE id = 1; '
+    'INSERT INTO products_product_stats_price(bucket, product_count) VALUES (' + NEW_BUCKET + ', 1) '
+    'ON CONFLICT(bucket) DO UPDATE SET product_count = product_count + 1; '
+    'INSERT INTO products_product_stats_daily(day, product_count) VALUES (date(new.created_at), 1) '
+    'ON CONFLICT(day) DO UPDATE SET product_count = product_count + 1; END',
+    'CREATE TRIGGER products_product_stats_ad AFTER DELETE ON products_product BEGIN '
+    'UPDATE products_product_stats SET product_count = product_count - 1, '
+    'total_stock = total_stock - old.stock, out_of_stock = out_of_stock - (old.stock <= 0), '
+    'inventory_value_cents = inventory_value_cents - CAST(ROUND(old.price * 100) AS INTEGER) * old.stock '
+    'WHERE id = 1; '
+    'UPDATE products_product_stats_price SET product_count = product_count - 1 WHERE bucket = ' + OLD_BUCKET + '; '
+    'UPDATE products_product_stats_daily SET product_count = product_count - 1 WHERE day = date(old.created_at); '
+    'DELETE FROM products_product_stats_daily WHERE day = date(old.created_at) AND product_count <= 0; END',
+    'CREATE TRIGGER products_product_stats_au AFTER UPDATE OF price, stock ON products_product '
+    'WHEN old.price IS NOT new.price OR old.stock IS NOT new.stock BEGIN '
+    'UPDATE products_product_stats SET total_stock = total_stock - old.stock, '
+    'out_of_stock = out_of_stock - (old.stock <= 0), '
+    'inventory_value_cents = inventory_value_cents - CAST(ROUND(old.price * 100) AS INTEGER) * old.stock '
+    'WHERE id = 1; '
+    'UPDATE products_product_stats SET total_stock = total_stock + new.stock, '
+    'out_of_stock = out_of_stock + (new.stock <= 0), '
+    'inventory_value_cents = inventory_value_cents + CAST(ROUND(new.price * 100) AS INTEGER) * new.stock '
+    'WHERE id = 1; END',
+    'CREATE TRIGGER products_product_stats_au_price AFTER UPDATE OF price ON products_product '
+    'WHEN (' + OLD_BUCKET + ') != (' + NEW_BUCKET + ') BEGIN '
+    'UPDATE products_product_stats_price SET product_count = product_count - 1 WHERE bucket = ' + OLD_BUCKET + '; '
+    'INSERT INTO products_product_stats_price(bucket, product_count) VALUES (' + NEW_BUCKET + ', 1) '
+    'ON CONFLICT(bucket) DO UPDATE SET product_count = product_count + 1; END',
+    'CREATE TRIGGER products_product_stats_au_day AFTER UPDATE OF created_at ON products_product '
+    'WHEN date(old.created_at) IS NOT date(new.created_at) BEGIN '
+    'UPDATE products_product_stats_daily SET product_count = product_count - 1 WHERE day = date(old.created_at); '
+    'DELETE FROM products_product_stats_daily WHERE day = date(old.created_at) AND product_count <= 0; '
+    'INSERT INTO products_product_stats_daily(day, product_count) VALUES (date(new.created_at), 1) '
+    'ON CONFLICT(day) DO UPDATE SET product_count = product_count + 1; END',
+    'UPDATE products_product_stats SET (product_count, total_stock, out_of_stock, inventory_value_cents) = ('
+    'SELECT COUNT(*), COALESCE(SUM(stock), 0), COALESCE(SUM((p.stock <= 0)), 0), '
+    'COALESCE(SUM(CAST(ROUND(p.price * 100) AS INTEGER) * stock), 0) FROM products_product AS p), '
+    "price_buckets = '10,50,100,500,1000,5000' WHERE id = 1",
+    'INSERT INTO products_product_stats_price(bucket, product_count) '
+    'SELECT ' + ROW_BUCKET + ', COUNT(*) FROM products_product GROUP BY 1',
+    'INSERT INTO products_product_stats_daily(day, product_count) '
+    'SELECT date(created_at), COUNT(*) FROM products_product GROUP BY 1',
+]
+
+REVERSE_SQL = [
+    'DROP TRIGGER IF EXISTS products_product_stats_ai',
+    'DROP TRIGGER IF EXISTS products_product_stats_ad',
+    'DROP TRIGGER IF EXISTS products_product_stats_au',
+    'DROP TRIGGER IF EXISTS products_product_stats_au_price',
+    'DROP TRIGGER IF EXISTS products_product_stats_au_day',
+    'DROP TABLE IF EXISTS products_product_stats_daily',
+    'DROP TABLE IF EXISTS products_product_stats_price',
+    'DROP TABLE IF EXISTS products_product_stats',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_search'),
+    ]
+
+    operations = [
+        SQLiteRunSQL(STATS_SQL, REVERSE_SQL),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations
+
+
+# Değişiklik kaydı tetikleyicileri SQLite'a özeldir; diğer veritabanlarında atlanır
+class SQLiteRunSQL(migrations.RunSQL):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'sqlite':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'sqlite':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+# Değişiklik kaydı ve tetikleyiciler migration'a sabitlenmiştir;
+# products/changes.py'deki sonraki değişiklikler bu migration'ı etkilemez
+# Mevcut ürünler akışa 'create' olarak eklenir (son sorgu); böylece cursor
+# 0'dan okuyan istemci tüm kataloğu alır
+CHANGES_SQL = [
+    'CREATE TABLE IF NOT EXISTS products_product_changes ('
+    'seq INTEGER PRIMARY KEY AUTOINCREMENT, '
+    'product_id INTEGER NOT NULL, '
+    'action TEXT NOT NULL, '
+    "changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')))",
+    'CREATE TRIGGER IF NOT EXISTS products_product_changes_ai AFTER INSERT ON products_product BEGIN '
+    "INSERT INTO products_product_changes(product_id, action) VALUES (new.id, 'create'); END",
+    'CREATE TRIGGER IF NOT EXISTS products_product_changes_au AFTER UPDATE ON products_product BEGIN '
+    "INSERT INTO products_product_changes(product_id, action) VALUES (new.id, 'update'); END",
+    'CREATE TRIGGER IF NOT EXISTS products_product_changes_ad AFTER DELETE ON products_product BEGIN '
+    "INSERT INTO products_product_changes(product_id, action) VALUES (old.id, 'delete'); END",
+    "INSERT INTO products_product_changes(product_id, action) SELECT id, 'create' FROM products_product ORDER BY id",
+]
+
+REVERSE_SQL = [
+    'DROP TRIGGER IF EXISTS products_product_changes_ai',
+    'DROP TRIGGER IF EXISTS products_product_changes_au',
+    'DROP TRIGGER IF EXISTS products_product_changes_ad',
+    'DROP TABLE IF EXISTS products_product_changes',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_product_stats'),
+    ]
+
+    operations = [
+        SQLiteRunSQL(CHANGES_SQL, REVERSE_SQL),
+    ]
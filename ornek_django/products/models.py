@@ -20,6 +20,7 @@ from django.db import models
 #
 # Bu dosyada tanımlanan modeller:
 # - Product: Ürün bilgilerini saklayan ana model
+# - StockReservation: Ürün başına ayrılmış (henüz iade edilmemiş) stok miktarı
 # =============================================================================
 
 # =============================================================================
@@ -61,6 +62,43 @@ class Product(models.Model):
     # Değiştirilemez (sadece oluşturulma anında set edilir)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Son güncellenme tarihi alanı
+    # auto_now=True: Nesne her save() edildiğinde otomatik olarak şu anki tarih/saat atanır
+    # db_index=True: Değişiklik tarihine göre sıralama / aralık sorguları için indeks
+    # Detay endpoint'inin ETag / Last-Modified başlıkları (koşullu GET, 304 Not Modified)
+    # bu alandan üretilir (liste ETag'i önbellek neslinden gelir, bkz. products/conditional.py)
+    # Not: QuerySet.update() ve bulk_update() auto_now alanını doldurmaz;
+    # bu yollarla yapılan güncellemelerde updated_at açıkça verilmelidir
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    # =============================================================================
+    # META SINIFI (SIRALAMA VE İNDEKSLER)
+    # =============================================================================
+
+    class Meta:
+        # Varsayılan sıralama: En yeni ürünler önce
+        # id ikinci anahtar olarak eklenir; aynı created_at değerine sahip
+        # satırlar her sorguda aynı sırada döner (kararlı sayfalama)
+        ordering = ['-created_at', '-id']
+
+        # İndeksler, API'nin gerçekten kullandığı erişim desenlerine göre seçildi
+        # Sorgu planları: python manage.py explain_queries
+        indexes = [
+            # Liste ve keyset sayfalama: ORDER BY created_at DESC, id DESC
+            models.Index(fields=['-created_at', '-id'], name='product_created_id_idx'),
+            # İsim ön ek araması: name >= 'abc' AND name < 'abd' (aralık sorgusu)
+            models.Index(fields=['name'], name='product_name_idx'),
+            # Fiyat aralığı filtresi: price BETWEEN x AND y
+            models.Index(fields=['price'], name='product_price_idx'),
+            # Stoktaki ürünler: Sadece stock > 0 olan satırları içeren kısmi
+            # (partial) indeks; varsayılan sıralama ile aynı kolonlar
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(stock__gt=0),
+                name='product_in_stock_idx',
+            ),
+        ]
+
     # =============================================================================
     # MODEL METODLARI
     # =============================================================================
@@ -81,7 +119,6 @@ class Product(models.Model):
     # class Meta:
     #     verbose_name = 'Ürün'
     #     verbose_name_plural = 'Ürünler'
-    #     ordering = ['-created_at']  # Varsayılan sıralama
     #     db_table = 'custom_products'  # Özel tablo adı
     #
     # # Özel metodlar
@@ -100,4 +137,27 @@ class Product(models.Model):
     # # Dosya alanları
     # image = models.ImageField(upload_to='products/', blank=True)
     # file = models.FileField(upload_to='documents/', blank=True)
-    # =============================================================================
\ No newline at end of file
+    # =============================================================================
+
+
+# =============================================================================
+# STOK REZERVASYONU MODEL SINIFI
+# =============================================================================
+#
+# /api/products/<id>/reserve/ ile ayrılan ve henüz /release/ ile iade
+# edilmeyen toplam miktar (products/views.py ProductStockAPIView).
+# İade bu miktarla sınırlıdır: ayrılmamış stok iade edilerek ürünün stoğu
+# şişirilemez. Ürün tablosuna kolon eklemek yerine ayrı bir tablo
+# kullanılır; ürün tablosundaki tetikleyiciler (arama, istatistik,
+# değişiklik kaydı) rezervasyon işlemlerinden etkilenmez.
+class StockReservation(models.Model):
+    # Ürün başına tek satır; ürün silinince rezervasyonu da silinir
+    product = models.OneToOneField(
+        Product, on_delete=models.CASCADE, primary_key=True, related_name='reservation'
+    )
+
+    # Ayrılmış ve henüz iade edilmemiş miktar
+    quantity = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return '%s: %d' % (self.product_id, self.quantity)
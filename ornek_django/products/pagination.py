@@ -0,0 +1,267 @@
+# JSON, cursor konumunu (birden fazla alan değeri) tek bir metne çevirmek için kullanılır
+import json
+
+# Django REST Framework sayfalama sınıfları ve yardımcıları
+# CursorPagination: Opak cursor üreten temel sınıf (base64 kodlama, link üretimi)
+# Cursor: (offset, reverse, position) üçlüsünü tutan namedtuple
+# PageNumberPagination: Eski ?page=N sayfalama modu (geriye dönük uyumluluk için)
+# ValidationError: Bozuk cursor için 400 Bad Request (DRF'nin varsayılanı 404 NotFound)
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+
+# Django ORM'de OR/AND koşulları oluşturmak için Q nesnesi
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+
+# =============================================================================
+# DJANGO PRODUCTS PAGINATION.PY SAYFALAMA DOSYASI
+# =============================================================================
+#
+# Bu dosya, products API'si için sayfalama sınıflarını tanımlar.
+#
+# Neden Keyset (Cursor) Sayfalama?
+# - PageNumberPagination her istekte SELECT COUNT(*) çalıştırır
+# - ?page=N için veritabanı OFFSET ile N*PAGE_SIZE satırı okuyup atar
+# - Sayfa derinleştikçe sorgu yavaşlar (OFFSET taraması)
+#
+# Keyset sayfalama ise son görülen satırın sıralama anahtarını
+# (created_at, id) cursor içinde saklar ve bir sonraki sayfayı
+# "WHERE (created_at, id) < (x, y) ORDER BY created_at DESC, id DESC LIMIT n"
+# şeklinde indeks üzerinden doğrudan bulur. COUNT ve OFFSET yoktur,
+# bu yüzden sayfa gecikmesi derinlikten bağımsız olarak sabit kalır.
+#
+# Bu dosyada tanımlanan sınıflar:
+# - ProductKeysetPagination: (created_at, id) üzerinde gerçek keyset sayfalama
+# - ProductSearchPagination: Arama sonuçları için (rank, id) keyset sayfalama
+# - ProductPageNumberPagination: Eski ?page=N modu
+# =============================================================================
+
+
+# =============================================================================
+# YARDIMCI FONKSİYONLAR
+# =============================================================================
+
+# Sıralama ifadesini (örn. '-created_at') alan adı ve yön bilgisine ayırır
+# Dönüş: ('created_at', True) -> True azalan (DESC) sıralama demektir
+def _split_ordering(ordering):
+    return ordering.lstrip('-'), ordering.startswith('-')
+
+
+# Sıralama ifadelerinin yönünü tersine çevirir
+# Önceki sayfaya giderken sorgu ters yönde çalıştırılır
+def _invert_ordering(ordering):
+    return tuple(
+        field[1:] if field.startswith('-') else '-' + field
+        for field in ordering
+    )
+
+
+# Keyset filtresini oluşturur
+# Örnek: ordering=('-created_at', '-id'), values=(t, 42) için:
+#   created_at <= t AND (created_at < t OR (created_at = t AND id < 42))
+# İlk koşul (aralık başlangıcı) veritabanının indekse doğrudan
+# "seek" yapmasını sağlar; OR kısmı sadece eşit değerli satırları ayıklar.
+def build_keyset_filter(ordering, values):
+    first_field, first_descending = _split_ordering(ordering[0])
+    seek = Q(**{first_field + ('__lte' if first_descending else '__gte'): values[0]})
+
+    after = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name, descending = _split_ordering(field)
+        after |= equal & Q(**{name + ('__lt' if descending else '__gt'): value})
+        equal &= Q(**{name: value})
+    return seek & after
+
+
+# =============================================================================
+# KEYSET SAYFALAMA SINIFI
+# =============================================================================
+#
+# DRF'nin CursorPagination sınıfı sadece ilk sıralama alanını cursor'a
+# yazar ve eşit değerler için OFFSET kullanır. Bu sınıf ise sıralamadaki
+# tüm alanların değerlerini cursor'a yazar; (created_at, id) ikilisi
+# benzersiz olduğu için OFFSET'e hiç ihtiyaç kalmaz.
+class ProductKeysetPagination(CursorPagination):
+    """
+    (created_at, id) üzerinde keyset sayfalama
+    GET /api/products/ - İlk sayfa (en yeni ürünler)
+    GET /api/products/?cursor=<opak-cursor> - Sonraki/önceki sayfa
+    """
+
+    # Varsayılan sıralama: en yeni ürünler önce, eşitlikte id ile kesin sıra
+    ordering = ('-created_at', '-id')
+
+    # Eşit sıralama değerlerini ayırt etmek için her sıralamanın sonuna eklenen alan
+    tiebreaker = 'id'
+
+    # İstemci sayfa boyutunu ?page_size=N ile değiştirebilir (en fazla 100)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    # Sıralamanın sonunda benzersiz bir alan yoksa 'id' ekliyoruz
+    # Böylece cursor her zaman tek bir satırı işaret eder
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        names = {_split_ordering(field)[0] for field in ordering}
+        if not names & {self.tiebreaker, 'pk'}:
+            ordering += (self.tiebreaker,)
+        return ordering
+
+    # Bozuk, değiştirilmiş veya başka bir sıralamaya ait cursor'lar 400 döndürür
+    # Hata istekte olduğu için DRF'nin 404 NotFound yanıtı yerine
+    # {"cursor": ["Invalid cursor"]} gövdeli bir doğrulama hatası verilir
+    def invalid_cursor(self):
+        return ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+
+    # DRF base64 / query string hatalarında NotFound fırlatır
+    def decode_cursor(self, request):
+        try:
+            return super().decode_cursor(request)
+        except NotFound:
+            raise self.invalid_cursor()
+
+    # Sayfalama işlemi iki adıma ayrılmıştır:
+    # 1. get_page_queryset: Sadece tembel (lazy) queryset'i hazırlar
+    # 2. build_page: Veritabanından gelen satırlarla sayfayı oluşturur
+    # Bu ayrım sayesinde async view'lar sorguyu kendileri çalıştırabilir
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.build_page(list(queryset))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        self.current_position = self.decode_position(queryset, self.cursor)
+
+        # Geriye doğru sayfalarken sorguyu ters sıralamayla çalıştırıyoruz
+        ordering = self.ordering
+        if self.cursor is not None and self.cursor.reverse:
+            ordering = _invert_ordering(ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if self.current_position is not None:
+            queryset = queryset.filter(build_keyset_filter(ordering, self.current_position))
+
+        # Bir sonraki sayfanın varlığını anlamak için fazladan bir satır okuyoruz
+        return queryset[:self.page_size + 1]
+
+    def build_page(self, results):
+        reverse = self.cursor is not None and self.cursor.reverse
+        has_following = len(results) > self.page_size
+        self.page = list(results[:self.page_size])
+        if reverse:
+            self.page.reverse()
+
+        # Cursor'dan gelindiyse o yönde geri dönülebilecek bir sayfa vardır
+        has_current = self.current_position is not None
+        self.has_next = has_current if reverse else has_following
+        self.has_previous = has_following if reverse else has_current
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self.encode_position(self.page[-1]) if self.page else None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.encode_position(self.page[0]) if self.page else None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    # Satırın sıralama alanlarındaki değerlerini JSON listesi olarak kodlar
+    # Satır model nesnesi veya values() ile gelen dict olabilir
+    def encode_position(self, instance):
+        values = []
+        for field in self.ordering:
+            name = _split_ordering(field)[0]
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        return json.dumps(values, separators=(',', ':'))
+
+    # Cursor içindeki JSON listesini model alanlarının Python tiplerine çevirir
+    def decode_position(self, queryset, cursor):
+        if cursor is None or cursor.position is None:
+            return None
+        try:
+            values = json.loads(cursor.position)
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            opts = queryset.model._meta
+            return tuple(
+                (opts.pk if name == 'pk' else opts.get_field(name)).to_python(value)
+                for name, value in zip(
+                    (_split_ordering(field)[0] for field in self.ordering), values
+                )
+            )
+        except (TypeError, ValueError, DjangoValidationError):
+            raise self.invalid_cursor()
+
+
+# =============================================================================
+# ARAMA SONUÇLARI İÇİN KEYSET SAYFALAMA
+# =============================================================================
+#
+# Arama sonuçları BM25 skoruna (rank) göre sıralanır; rank bir model alanı
+# değil, FTS5 sorgusunun ürettiği bir değerdir. Cursor (rank, id) ikilisini
+# saklar ve sonraki sayfa "rank > x OR (rank = x AND id > y)" ile okunur.
+# Link üretimi ve sayfa oluşturma ProductKeysetPagination'dan gelir.
+class ProductSearchPagination(ProductKeysetPagination):
+    """
+    (rank, id) üzerinde keyset sayfalama
+    GET /api/products/search/?q=kalem&cursor=<opak-cursor>
+    """
+    ordering = ('rank', 'id')
+    page_size = 20
+
+    # search: (after, reverse, limit) alan ve {'rank', 'id'} satırları döndüren fonksiyon
+    def paginate_search(self, search, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        self.current_position = self.decode_position(None, self.cursor)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        rows = search(after=self.current_position, reverse=reverse, limit=self.page_size + 1)
+        return self.build_page(rows)
+
+    def encode_position(self, instance):
+        return json.dumps([instance['rank'], instance['id']], separators=(',', ':'))
+
+    def decode_position(self, queryset, cursor):
+        if cursor is None or cursor.position is None:
+            return None
+        try:
+            rank, pk = json.loads(cursor.position)
+            return float(rank), int(pk)
+        except (TypeError, ValueError):
+            raise self.invalid_cursor()
+
+
+# =============================================================================
+# SAYFA NUMARALI SAYFALAMA (GERİYE DÖNÜK UYUMLULUK)
+# =============================================================================
+
+# Eski istemciler için ?page=N modu
+# COUNT(*) ve OFFSET kullandığı için derin sayfalarda yavaştır
+class ProductPageNumberPagination(PageNumberPagination):
+    """
+    Sayfa numaralı sayfalama (eski mod)
+    GET /api/products/?pagination=page&page=2
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,79 @@
+# JSON satırlarını çözmek için Python'un standart json modülü
+import json
+
+# Django REST Framework parser altyapısı
+# BaseParser: Tüm parser sınıflarının türetildiği temel sınıf
+# ParseError: Bozuk istek gövdesi için 400 Bad Request döndüren hata
+# JSONParser: DRF'nin standart (stdlib json tabanlı) JSON parser'ı
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+# orjson: Hızlı JSON kütüphanesi (opsiyonel bağımlılık, bkz. renderers.py)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# =============================================================================
+# DJANGO PRODUCTS PARSERS.PY DOSYASI
+# =============================================================================
+#
+# Bu dosya, products API'sinin ek istek gövdesi formatlarını tanımlar.
+# Parser'lar, HTTP isteğinin gövdesini (body) request.data içinde
+# kullanılabilecek Python verisine dönüştürür. DRF, Content-Type başlığına
+# bakarak hangi parser'ın kullanılacağını seçer.
+#
+# Bu dosyada tanımlanan parser'lar:
+# - FastJSONParser: orjson kullanan hızlı JSON parser'ı (application/json)
+# - NDJSONParser: Satır başına bir JSON nesnesi (application/x-ndjson)
+# =============================================================================
+
+
+# =============================================================================
+# HIZLI JSON PARSER
+# =============================================================================
+class FastJSONParser(JSONParser):
+    """
+    orjson tabanlı hızlı JSON parser (orjson yoksa standart JSONParser)
+    Content-Type: application/json
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        # orjson sadece UTF-8 okur; diğer kodlamalar standart parser'a bırakılır
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        # orjson NaN / Infinity değerlerini zaten reddeder (STRICT_JSON gibi)
+        try:
+            return orjson.loads(stream.read() if stream is not None else b'')
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % exc)
+
+
+# =============================================================================
+# NDJSON PARSER
+# =============================================================================
+class NDJSONParser(BaseParser):
+    """
+    Newline-delimited JSON gövdesini nesne listesine çevirir
+    Content-Type: application/x-ndjson
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+
+        # Gövdeyi satır satır okuyoruz; boş satırlar atlanır
+        rows = []
+        for line_number, line in enumerate(stream, start=1):
+            line = line.decode(encoding).strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as exc:
+                raise ParseError('NDJSON parse error (satır %d) - %s' % (line_number, exc))
+        return rows
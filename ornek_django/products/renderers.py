@@ -0,0 +1,215 @@
+# CSV ve JSON çıktısı üretmek için Python'un standart kütüphaneleri
+import csv
+import decimal
+import io
+import json
+
+# Django REST Framework renderer altyapısı
+# BaseRenderer: Tüm renderer sınıflarının türetildiği temel sınıf
+# JSONRenderer: DRF'nin standart (stdlib json tabanlı) JSON renderer'ı
+# JSONEncoder: Decimal, datetime gibi tipleri JSON'a çeviren DRF encoder'ı
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.metrics import measure_rendering
+
+# orjson: C (Rust) ile yazılmış hızlı JSON kütüphanesi (opsiyonel bağımlılık)
+# Kurulu değilse FastJSONRenderer standart JSONRenderer gibi davranır
+# Kurulum: pip install orjson
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# =============================================================================
+# DJANGO PRODUCTS RENDERERS.PY DOSYASI
+# =============================================================================
+#
+# Bu dosya, products API'sinin ek çıktı formatlarını tanımlar.
+# Renderer'lar, view'ın döndürdüğü Python verisini HTTP yanıt gövdesine
+# (bytes) dönüştürür. DRF, Accept başlığına veya ?format= parametresine
+# bakarak hangi renderer'ın kullanılacağını seçer (content negotiation).
+#
+# Bu dosyada tanımlanan renderer'lar:
+# - FastJSONRenderer: orjson kullanan hızlı JSON renderer'ı (application/json)
+# - NDJSONRenderer: Satır başına bir JSON nesnesi (application/x-ndjson)
+# - CSVRenderer: Virgülle ayrılmış değerler (text/csv)
+# - EventStreamRenderer: Server-Sent Events (text/event-stream)
+#
+# Not: Export endpoint'i büyük veriyi StreamingHttpResponse ile parça parça
+# gönderir; bu durumda render() çağrılmaz, sadece satır kodlama
+# yardımcıları (encode_row, encode_header) kullanılır. render() ise hata
+# yanıtları gibi küçük ve tek parça veriler için kullanılır.
+# =============================================================================
+
+
+# =============================================================================
+# HIZLI JSON RENDERER
+# =============================================================================
+#
+# Büyük liste sayfalarında stdlib json.dumps + DRF JSONEncoder belirgin bir
+# CPU maliyeti oluşturur. orjson kuruluysa bu renderer:
+# - Dict/list/str/int/float/datetime/date/UUID tiplerini C tarafında kodlar
+# - Decimal değerlerini COERCE_DECIMAL_TO_STRING ayarına göre metin olarak yazar
+# - UTC datetime'ları DRF gibi "Z" sonekiyle ISO 8601 formatında yazar
+# - Diğer tipler (lazy string, timedelta, QuerySet...) için DRF encoder'ına düşer
+#
+# Girintili (indent) çıktı istendiğinde veya orjson kurulu değilse standart
+# JSONRenderer kullanılır. Çıktı, DRF'nin kompakt ve UNICODE_JSON çıktısı
+# ile aynıdır.
+#
+# settings.py'da seçmek için:
+# REST_FRAMEWORK = {'DEFAULT_RENDERER_CLASSES': ['products.renderers.FastJSONRenderer', ...]}
+
+# orjson'ın kendisi kodlayamadığı tipler için çağrılan fonksiyon
+def _orjson_default(obj, _encoder=JSONEncoder()):
+    if isinstance(obj, decimal.Decimal):
+        return str(obj) if api_settings.COERCE_DECIMAL_TO_STRING else float(obj)
+    return _encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    orjson tabanlı hızlı JSON renderer (orjson yoksa standart JSONRenderer)
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Kodlama süresi istek metriklerine eklenir (core/metrics.py)
+        with measure_rendering():
+            return self.encode(data, accepted_media_type, renderer_context)
+
+    def encode(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        ret = orjson.dumps(
+            data,
+            default=_orjson_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+        # DRF gibi U+2028 / U+2029 karakterlerini kaçış dizisine çeviriyoruz
+        # (JavaScript'te satır sonu sayılırlar ve <script> içinde sorun çıkarırlar)
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+# =============================================================================
+# NDJSON RENDERER
+# =============================================================================
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON çıktısı
+    ?format=ndjson veya Accept: application/x-ndjson
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    # Export akışında başlık satırı yoktur
+    def encode_header(self, field_names):
+        return ''
+
+    # Tek bir satırı JSON metnine ve satır sonuna çevirir
+    def encode_row(self, row):
+        return json.dumps(row, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(self.encode_row(row) for row in rows).encode(self.charset)
+
+
+# =============================================================================
+# CSV RENDERER
+# =============================================================================
+class CSVRenderer(BaseRenderer):
+    """
+    CSV çıktısı
+    ?format=csv veya Accept: text/csv
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    # csv.writer bir dosya nesnesi bekler; satırı geçici bir
+    # StringIO'ya yazıp içeriğini metin olarak geri alıyoruz
+    def _write(self, values):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(values)
+        return buffer.getvalue()
+
+    def encode_header(self, field_names):
+        self.field_names = list(field_names)
+        return self._write(self.field_names)
+
+    def encode_row(self, row):
+        return self._write([row.get(name) for name in self.field_names])
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        if not rows:
+            return b''
+        output = self.encode_header(rows[0].keys())
+        output += ''.join(self.encode_row(row) for row in rows)
+        return output.encode(self.charset)
+
+
+# =============================================================================
+# SERVER-SENT EVENTS RENDERER
+# =============================================================================
+#
+# Değişiklik akışı (products/changes.py) ASGI'de bağlantıyı açık tutar ve
+# her değişikliği bir olay olarak gönderir:
+#   id: 42
+#   event: change
+#   data: {"seq":42,"id":7,"action":"update","data":{...}}
+# Tarayıcının EventSource'u bağlantı koparsa son id'yi Last-Event-ID
+# başlığıyla göndererek kaldığı yerden devam eder.
+class EventStreamRenderer(BaseRenderer):
+    """
+    Server-Sent Events çıktısı
+    Accept: text/event-stream
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def encode_event(self, data, event=None, id=None):
+        lines = []
+        if id is not None:
+            lines.append('id: %s' % id)
+        if event is not None:
+            lines.append('event: %s' % event)
+        # JSON tek satırdır; data satırı bölünmez
+        lines.append('data: %s' % json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')))
+        return '\n'.join(lines) + '\n\n'
+
+    # İki nokta ile başlayan satırlar istemci tarafından yok sayılır;
+    # boşta bağlantının vekil sunucularda kapanmaması için gönderilir
+    def encode_comment(self, text=''):
+        return ': %s\n\n' % text
+
+    # Yeniden bağlanma bekleme süresi (milisaniye)
+    def encode_retry(self, milliseconds):
+        return 'retry: %d\n\n' % milliseconds
+
+    # Akış dışındaki tek parça yanıtlar (örn. hata) tek bir olay olarak gönderilir
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        response = (renderer_context or {}).get('response')
+        event = 'error' if response is not None and response.status_code >= 400 else None
+        return self.encode_event(data, event=event).encode(self.charset)
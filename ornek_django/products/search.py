@@ -0,0 +1,284 @@
+# Sorgu metnini kelimelere ayırmak ve aksanları kaldırmak için
+import re
+import unicodedata
+
+# Ham SQL çalıştırmak için veritabanı bağlantıları
+from django.db import connections
+
+from .filters import prefix_range
+
+# =============================================================================
+# DJANGO PRODUCTS SEARCH.PY TAM METİN ARAMA DOSYASI
+# =============================================================================
+#
+# Bu dosya, ürün araması için SQLite FTS5 (Full-Text Search) altyapısını
+# tanımlar. name__icontains her sorguda tüm tabloyu tarar (LIKE '%...%');
+# FTS5 ise kelimelerden ürün id'lerine giden ters indeks (inverted index)
+# tutar ve sonuçları BM25 algoritmasıyla alaka düzeyine göre sıralar.
+#
+# Veritabanı Nesneleri (0004_product_search migration'ı ile oluşturulur;
+# migration DDL'in o günkü halini RunSQL olarak içerir, bu dosyayı import etmez):
+# - products_product_fts: FTS5 sanal tablosu (external content)
+#   - Metni kopyalamaz, sadece indeksi tutar; içerik products_product'tan okunur
+#   - unicode61 remove_diacritics 2: "Şeker" -> "seker", "Çay" -> "cay"
+#   - prefix='2 3': 2 ve 3 harflik ön ekler için ek indeks (hızlı "ka*" araması)
+# - products_product_fts_vocab: İndeksteki kelimelerin listesi (fts5vocab)
+#   - Yazım hatası toleransı için aday kelimeler buradan okunur
+# - products_product_fts_ai / _ad / _au tetikleyicileri (trigger)
+#   - INSERT, DELETE ve UPDATE OF name sonrası indeksi günceller
+#   - bulk_create, QuerySet.update() ve QuerySet.delete() dahil her yazma
+#     işleminde çalışır (Django sinyallerinin aksine)
+#
+# Yeni Alan Eklemek (örn. description):
+# - INDEXED_COLUMNS ve COLUMN_WEIGHTS listelerine eklenir
+# - Yeni bir migration'a eski tetikleyicileri silen ve _schema_sql()'in yeni
+#   çıktısını içeren RunSQL yazılır (migration bu modülü import etmemelidir;
+#   sonraki değişiklikler eski migration'ların davranışını değiştirirdi)
+# - python manage.py rebuild_search_index ile indeks doldurulur
+#
+# Not: Django, SQLite'ta bazı şema değişikliklerinde (AlterField vb.)
+# tabloyu yeniden oluşturur ve tablonun tetikleyicileri silinir. Böyle bir
+# migration'dan sonra rebuild_search_index komutu tetikleyicileri yeniden kurar.
+#
+# Sorgu Davranışı:
+# - Her kelime ön ek olarak aranır: "kal kır" -> "kal"* AND "kır"*
+#   (tam eşleşen kelimeler daha yüksek skor alır)
+# - Hiç sonuç yoksa yazım hatası toleransı devreye girer: indeksteki
+#   kelimelerden edit mesafesi 1-2 olan adaylar OR ile aranır
+#   ("kalme" -> "kalem"); ilk harfin doğru yazıldığı varsayılır
+#   (aday aralığı için bkz. fuzzy_candidates)
+# =============================================================================
+
+FTS_TABLE = 'products_product_fts'
+VOCAB_TABLE = 'products_product_fts_vocab'
+CONTENT_TABLE = 'products_product'
+
+# İndekslenen kolonlar ve BM25 ağırlıkları (aynı sırada)
+INDEXED_COLUMNS = ['name']
+COLUMN_WEIGHTS = [1.0]
+
+# Yazım hatası toleransı: kelime uzunluğuna göre izin verilen edit mesafesi
+# ve her kelime için denenecek en fazla aday sayısı
+FUZZY_MIN_LENGTH = 3
+FUZZY_MAX_CANDIDATES = 3
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+# =============================================================================
+# ŞEMA (REBUILD_SEARCH_INDEX KOMUTU TARAFINDAN KULLANILIR)
+# =============================================================================
+
+def _schema_sql():
+    columns = ', '.join(INDEXED_COLUMNS)
+    new_values = ', '.join('new.%s' % column for column in INDEXED_COLUMNS)
+    old_values = ', '.join('old.%s' % column for column in INDEXED_COLUMNS)
+    delete = (
+        "INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old});"
+    ).format(fts=FTS_TABLE, columns=columns, old=old_values)
+    insert = (
+        'INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new});'
+    ).format(fts=FTS_TABLE, columns=columns, new=new_values)
+    return [
+        (
+            "CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, "
+            "content='{content}', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        ).format(fts=FTS_TABLE, columns=columns, content=CONTENT_TABLE),
+        "CREATE VIRTUAL TABLE IF NOT EXISTS {vocab} USING fts5vocab('{fts}', 'row')".format(
+            vocab=VOCAB_TABLE, fts=FTS_TABLE,
+        ),
+        # Varsayılan sıralama fonksiyonu: kolon ağırlıklarıyla BM25
+        "INSERT INTO {fts}({fts}, rank) VALUES ('rank', 'bm25({weights})')".format(
+            fts=FTS_TABLE, weights=', '.join(str(weight) for weight in COLUMN_WEIGHTS),
+        ),
+        'CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {content} BEGIN {insert} END'.format(
+            fts=FTS_TABLE, content=CONTENT_TABLE, insert=insert,
+        ),
+        'CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {content} BEGIN {delete} END'.format(
+            fts=FTS_TABLE, content=CONTENT_TABLE, delete=delete,
+        ),
+        'CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {content} '
+        'BEGIN {delete} {insert} END'.format(
+            fts=FTS_TABLE, columns=columns, content=CONTENT_TABLE, delete=delete, insert=insert,
+        ),
+    ]
+
+
+# FTS tablosunu, kelime listesini ve tetikleyicileri oluşturur (tekrar çalıştırılabilir)
+# Sadece SQLite'ta çalışır; diğer veritabanlarında hiçbir şey yapmaz
+def install(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for sql in _schema_sql():
+            cursor.execute(sql)
+
+
+def uninstall(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for suffix in ('ai', 'ad', 'au'):
+            cursor.execute('DROP TRIGGER IF EXISTS %s_%s' % (FTS_TABLE, suffix))
+        cursor.execute('DROP TABLE IF EXISTS %s' % VOCAB_TABLE)
+        cursor.execute('DROP TABLE IF EXISTS %s' % FTS_TABLE)
+
+
+# İndeksi products_product tablosundan baştan oluşturur ve birleştirir
+def rebuild(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("INSERT INTO {fts}({fts}) VALUES ('rebuild')".format(fts=FTS_TABLE))
+        cursor.execute("INSERT INTO {fts}({fts}) VALUES ('optimize')".format(fts=FTS_TABLE))
+
+
+# =============================================================================
+# SORGU OLUŞTURMA
+# =============================================================================
+
+# Kelimeyi FTS tokenizer'ı gibi normalize eder (küçük harf, aksansız)
+def fold(token):
+    decomposed = unicodedata.normalize('NFKD', token.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(query):
+    return _TOKEN_RE.findall(query)
+
+
+# Kelimeyi FTS5 sözdiziminden kaçırır: çift tırnak içinde, ön ek araması
+def _phrase(token, prefix=True):
+    return '"%s"%s' % (token.replace('"', '""'), '*' if prefix else '')
+
+
+# Her kelime hem tam hem ön ek olarak aranır; tam eşleşmeler BM25 skoruna
+# iki kez katkı verdiği için "kalem" araması "Kalemlik"ten önce "Kalem"i getirir
+def build_match_expression(tokens):
+    return ' AND '.join(
+        '(%s OR %s)' % (_phrase(token, prefix=False), _phrase(token)) for token in tokens
+    )
+
+
+# İki kelime arasındaki edit mesafesi (Damerau-Levenshtein, OSA)
+# Ekleme, silme, değiştirme ve yan yana iki harfin yer değiştirmesi
+# ("kalme" -> "kalem") birer hata sayılır
+# limit aşılırsa erken çıkılır ve limit + 1 döndürülür
+def edit_distance(a, b, limit):
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+# Kelime uzunluğuna göre izin verilen en fazla yazım hatası
+def max_typos(token):
+    return 1 if len(token) <= 5 else 2
+
+
+# İndeksteki kelimelerden yazım hatası toleransıyla adaylar bulur
+# fts5vocab her kelimenin doküman sayısını okurken posting listesini gezer;
+# bu yüzden taranan aralık küçük tutulur. Adaylar:
+# - Sorgu kelimesiyle ilk iki harfi aynı olan ("kalme" -> "ka...")
+# - veya 2. harfi atlanmış / 2-3. harfleri yer değiştirmiş ("klaem" -> "ka...")
+# ve uzunluğu yakın kelimeler arasından seçilir
+def fuzzy_candidates(cursor, token):
+    token = fold(token)
+    if len(token) < FUZZY_MIN_LENGTH:
+        return []
+    limit = max_typos(token)
+    letters = set(token)
+    matches = []
+    for prefix in dict.fromkeys([token[:2], token[0] + token[2]]):
+        start, end = prefix_range(prefix)
+        cursor.execute(
+            'SELECT term, doc FROM {vocab} WHERE term >= %s AND term < %s '
+            'AND length(term) BETWEEN %s AND %s'.format(vocab=VOCAB_TABLE),
+            [start, end, len(token) - limit, len(token) + limit],
+        )
+        for term, doc_count in cursor.fetchall():
+            # Hızlı eleme: Her düzenleme harf kümeleri arasındaki farkı en fazla
+            # 2 artırır; fark 2 * limit'i aşıyorsa mesafe hesaplanmaz
+            if len(letters.symmetric_difference(term)) > 2 * limit:
+                continue
+            distance = edit_distance(token, term, limit)
+            if distance <= limit:
+                matches.append((distance, -doc_count, term))
+    matches.sort()
+    return [term for distance, doc_count, term in matches[:FUZZY_MAX_CANDIDATES]]
+
+
+# =============================================================================
+# ARAMA
+# =============================================================================
+
+def _has_match(cursor, expression):
+    cursor.execute(
+        'SELECT 1 FROM {fts} WHERE {fts} MATCH %s LIMIT 1'.format(fts=FTS_TABLE), [expression]
+    )
+    return cursor.fetchone() is not None
+
+
+# Sorgu metnini FTS5 MATCH ifadesine çevirir
+# Dönüş: (match_ifadesi, öneri)
+# - Doğrudan eşleşme varsa öneri None'dır
+# - Yoksa sadece indekste hiç karşılığı olmayan kelimeler düzeltilir;
+#   yazım hatası toleranslı ifade ve düzeltilmiş sorgu metni döner
+# - Eşleşme yoksa (kelimeler var ama birlikte geçmiyor veya aday
+#   bulunamadı) match_ifadesi None'dır
+def resolve_query(query, using='default'):
+    tokens = tokenize(query)
+    if not tokens:
+        return None, None
+    expression = build_match_expression(tokens)
+    with connections[using].cursor() as cursor:
+        if _has_match(cursor, expression):
+            return expression, None
+
+        parts, suggestion, corrected = [], [], False
+        for token in tokens:
+            single = build_match_expression([token])
+            if _has_match(cursor, single):
+                parts.append(single)
+                suggestion.append(token)
+                continue
+            candidates = fuzzy_candidates(cursor, token)
+            if not candidates:
+                return None, None
+            corrected = True
+            parts.append('(%s)' % ' OR '.join(_phrase(term, prefix=False) for term in candidates))
+            suggestion.append(candidates[0])
+    if not corrected:
+        return None, None
+    return ' AND '.join(parts), ' '.join(suggestion)
+
+
+# Eşleşen ürünleri (rank, id) sırasına göre döndürür
+# rank: BM25 skoru (küçük değer daha alakalı; SQLite negatif değer üretir)
+# after: Bir önceki sayfanın son (rank, id) değeri (keyset sayfalama)
+# reverse: Önceki sayfaya giderken ters yönde okunur
+def search(expression, after=None, reverse=False, limit=20, using='default'):
+    operator, direction = ('<', 'DESC') if reverse else ('>', 'ASC')
+    sql = 'SELECT rank, rowid FROM {fts} WHERE {fts} MATCH %s'.format(fts=FTS_TABLE)
+    params = [expression]
+    if after is not None:
+        sql += ' AND (rank {op} %s OR (rank = %s AND rowid {op} %s))'.format(op=operator)
+        params += [after[0], after[0], after[1]]
+    sql += ' ORDER BY rank {dir}, rowid {dir} LIMIT %s'.format(dir=direction)
+    params.append(limit)
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, params)
+        return [{'rank': rank, 'id': pk} for rank, pk in cursor.fetchall()]
@@ -3,10 +3,27 @@
 # Bu modül, API'lerde veri alışverişini kolaylaştırır
 from rest_framework import serializers
 
+# Hızlı okuma yolunda (ProductReadSerializer) kullanılan tipler ve DRF ayarları
+import datetime
+import decimal
+# Toplu yazmadaki veritabanı hatalarını kaydetmek için
+import logging
+from operator import attrgetter, itemgetter
+
+from django.conf import settings
+from rest_framework.settings import ISO_8601, api_settings
+
+# Toplu yazma işlemlerini parçalar (batch) halinde transaction içinde yapmak için
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
 # Kendi uygulamamızdan Product modelini import ediyoruz
 # Bu model, serializer'ın dönüştüreceği veri kaynağıdır
 from .models import Product
 
+logger = logging.getLogger(__name__)
+
 # =============================================================================
 # DJANGO REST FRAMEWORK SERIALIZERS.PY DOSYASI
 # =============================================================================
@@ -23,9 +40,119 @@ from .models import Product
 # - Nested (iç içe) veri yapılarını yönetme
 #
 # Bu dosyada tanımlanan serializer'lar:
+# - ProductBulkListSerializer: Toplu (bulk) ürün oluşturma / upsert
 # - ProductSerializer: Product modeli için JSON dönüşümü
+# - StockQuantitySerializer / StockOrderSerializer: Stok rezervasyon istekleri
+# - ProductReadSerializer: Liste sayfaları için hızlı, salt okunur serializer
 # =============================================================================
 
+# =============================================================================
+# TOPLU (BULK) LİSTE SERIALIZER SINIFI
+# =============================================================================
+#
+# ProductSerializer(many=True) kullanıldığında DRF bu sınıfı oluşturur.
+# Standart ListSerializer tek bir hatalı satırda tüm listeyi reddeder;
+# bu sınıf ise satırları tek tek doğrular, hatalı satırları raporlar ve
+# geçerli satırları bulk_create ile parçalar halinde veritabanına yazar.
+class ProductBulkListSerializer(serializers.ListSerializer):
+
+    # Veritabanına yazılamayan satırlar için istemciye dönen mesaj
+    write_error_message = 'Kayıt yazılamadı.'
+
+    # Her satırı ayrı ayrı doğrular
+    # Dönüş: (geçerli_satırlar, hatalar)
+    #   - geçerli_satırlar: [(index, validated_data), ...]
+    #   - hatalar: [{'index': 3, 'errors': {...}}, ...]
+    # key_field verilmişse (upsert anahtarı veya güncellenecek satırın id'si),
+    # bu alanın değeri ham satırdan okunur ve zorunludur
+    # (örn. 'id' serializer'da salt okunur olduğu için doğrulamada düşer)
+    def validate_rows(self, key_field=None):
+        model_field = self.child.Meta.model._meta.get_field(key_field) if key_field else None
+        valid, errors = [], []
+        for index, item in enumerate(self.initial_data):
+            try:
+                attrs = self.child.run_validation(item)
+                if model_field is not None:
+                    if not isinstance(item, dict) or item.get(key_field) is None:
+                        raise serializers.ValidationError({key_field: ['Bu alan zorunludur.']})
+                    try:
+                        attrs[model_field.attname] = model_field.to_python(item[key_field])
+                    except DjangoValidationError as exc:
+                        raise serializers.ValidationError({key_field: exc.messages})
+            except serializers.ValidationError as exc:
+                errors.append({'index': index, 'errors': exc.detail})
+            else:
+                valid.append((index, attrs))
+        return valid, errors
+
+    # Geçerli satırları batch_size'lık parçalar halinde yazar
+    # Dönüş: (yazılan_nesneler, hatalar)
+    # Her parça kendi transaction'ı içindedir: bir parçada veritabanı hatası
+    # oluşursa sadece o parçanın satırları hata olarak raporlanır,
+    # diğer parçalar yazılmaya devam eder
+    # Veritabanı hata metni (SQL, kısıt ve tablo adları) istemciye gönderilmez;
+    # sadece loglanır, satırlara sabit bir mesaj döner
+    # upsert_field verilmişse INSERT ... ON CONFLICT(upsert_field) DO UPDATE kullanılır
+    def bulk_save(self, rows, batch_size, upsert_field=None):
+        model = self.child.Meta.model
+        options = {}
+        if upsert_field:
+            options = {
+                'update_conflicts': True,
+                'unique_fields': [upsert_field],
+                # Yazılabilir alanlar + auto_now alanları (updated_at)
+                'update_fields': [
+                    field.name for field in model._meta.concrete_fields
+                    if field.name != upsert_field and (
+                        getattr(field, 'auto_now', False)
+                        or field.name in self.child.fields
+                        and not self.child.fields[field.name].read_only
+                    )
+                ],
+            }
+
+        saved, errors = [], []
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            try:
+                with transaction.atomic():
+                    objs = model.objects.bulk_create(
+                        [model(**attrs) for index, attrs in batch], **options
+                    )
+            except DatabaseError:
+                logger.exception('Toplu yazma başarısız (satır %d-%d)', batch[0][0], batch[-1][0])
+                errors.extend(
+                    {'index': index, 'errors': {'non_field_errors': [self.write_error_message]}}
+                    for index, attrs in batch
+                )
+            else:
+                saved.extend(objs)
+        return saved, errors
+
+    # Kısmi güncellemeleri (partial=True) bulk_update ile yazar
+    # bulk_update tüm nesneler için aynı alan listesini kullandığından satırlar
+    # güncellenen alanlara göre gruplanır; her grup/parça tek bir
+    # UPDATE ... SET x = CASE id WHEN ... END WHERE id IN (...) sorgusudur
+    # Tüm işlem tek bir transaction içindedir
+    # bulk_update auto_now alanlarını doldurmadığı için updated_at açıkça eklenir
+    def bulk_update(self, rows, batch_size):
+        model = self.child.Meta.model
+        pk_name = model._meta.pk.attname
+        now = timezone.now()
+        groups = {}
+        for index, attrs in rows:
+            fields = tuple(sorted(name for name in attrs if name != pk_name))
+            if fields:
+                groups.setdefault(fields + ('updated_at',), []).append(
+                    model(updated_at=now, **attrs)
+                )
+
+        updated = 0
+        with transaction.atomic():
+            for fields, objs in groups.items():
+                updated += model.objects.bulk_update(objs, fields, batch_size=batch_size)
+        return updated
+
 # =============================================================================
 # PRODUCT SERIALIZER SINIFI
 # =============================================================================
@@ -50,6 +177,10 @@ class ProductSerializer(serializers.ModelSerializer):
         # Bu ayar, API response'unda hangi alanların görüneceğini belirler
         fields = '__all__'
 
+        # many=True kullanıldığında oluşturulacak liste serializer'ı
+        # Toplu oluşturma / upsert işlemleri bu sınıf üzerinden yapılır
+        list_serializer_class = ProductBulkListSerializer
+
         # =============================================================================
         # OPSİYONEL META AYARLARI (Şu anda kullanılmıyor)
         # =============================================================================
@@ -73,6 +204,14 @@ class ProductSerializer(serializers.ModelSerializer):
         # }
         # =============================================================================
 
+    # Seyrek alan kümesi (sparse fieldset): fields=['id', 'name'] verilirse
+    # sadece bu alanlar çıktıya yazılır (liste endpoint'inde ?fields=id,name)
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     # =============================================================================
     # OPSİYONEL ÖZEL ALANLAR VE METODLAR (Şu anda kullanılmıyor)
     # =============================================================================
@@ -105,4 +244,227 @@ class ProductSerializer(serializers.ModelSerializer):
     #
     # # Nested serializer örneği (Category modeli varsa)
     # category = CategorySerializer(read_only=True)
-    # =============================================================================
\ No newline at end of file
+    # =============================================================================
+
+
+# =============================================================================
+# STOK REZERVASYON SERIALIZER'LARI
+# =============================================================================
+#
+# Bu serializer'lar model ile ilişkili değildir; sadece rezervasyon
+# isteklerinin gövdesini doğrular.
+
+# Tek ürün için miktar: {"quantity": 2}
+class StockQuantitySerializer(serializers.Serializer):
+    quantity = serializers.IntegerField(min_value=1)
+
+
+# Sipariş satırı: {"id": 5, "quantity": 2}
+class StockLineSerializer(StockQuantitySerializer):
+    id = serializers.IntegerField(min_value=1)
+
+
+# Çok satırlı sipariş: {"lines": [{"id": 5, "quantity": 2}, ...]}
+class StockOrderSerializer(serializers.Serializer):
+    lines = StockLineSerializer(many=True, allow_empty=False)
+
+    # Aynı ürün birden fazla satırda geçiyorsa miktarları topluyoruz
+    # Dönüş: {ürün_id: toplam_miktar}
+    def get_quantities(self):
+        quantities = {}
+        for line in self.validated_data['lines']:
+            quantities[line['id']] = quantities.get(line['id'], 0) + line['quantity']
+        return quantities
+
+
+# =============================================================================
+# KATALOG İSTATİSTİKLERİ SERIALIZER'LARI
+# =============================================================================
+#
+# /api/products/stats/ yanıtının biçimi (products/stats.py read() sonucu).
+# Tutarlar ürün fiyatı gibi iki ondalıklı metin olarak döner.
+
+# Fiyat aralığı: [min, max); ilk aralığın min'i, son aralığın max'ı null
+class PriceBucketSerializer(serializers.Serializer):
+    min = serializers.DecimalField(max_digits=None, decimal_places=2, allow_null=True)
+    max = serializers.DecimalField(max_digits=None, decimal_places=2, allow_null=True)
+    count = serializers.IntegerField()
+
+
+# Gün (UTC) başına oluşturulan ürün sayısı
+class DailyCountSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    count = serializers.IntegerField()
+
+
+class ProductStatsSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    total_stock = serializers.IntegerField()
+    out_of_stock = serializers.IntegerField()
+    inventory_value = serializers.DecimalField(max_digits=None, decimal_places=2)
+    min_price = serializers.DecimalField(max_digits=None, decimal_places=2, allow_null=True)
+    max_price = serializers.DecimalField(max_digits=None, decimal_places=2, allow_null=True)
+    price_buckets = PriceBucketSerializer(many=True)
+    created_per_day = DailyCountSerializer(many=True)
+
+
+# =============================================================================
+# HIZLI OKUMA (READ-ONLY) SERIALIZER'I
+# =============================================================================
+#
+# ModelSerializer her satırın her alanı için ayrı ayrı get_attribute(),
+# None kontrolü ve to_representation() çağırır. 1.000 satırlık bir liste
+# sayfasında bu, binlerce fonksiyon çağrısı ve Decimal/datetime biçimlendirme
+# maliyeti demektir.
+#
+# ProductReadSerializer ise:
+# - ProductSerializer'ın alanlarından bir kez "dönüştürücü" (converter) listesi çıkarır
+# - Satırları values() ile gelen dict'lerden (veya model nesnelerinden) okur
+# - Her satırı tek bir dict comprehension ile oluşturur
+#
+# Çıktı, ProductSerializer ile byte byte aynıdır (bkz. tests.py).
+# ProductSerializer'a model kolonu olmayan bir alan eklenirse (örn.
+# SerializerMethodField) is_supported() False döner ve view'lar normal
+# serializer'a geri döner.
+
+# Alanın DRF to_representation() sonucunu birebir üreten hızlı fonksiyonu döndürür
+# Bilinmeyen alan tipleri veya özel ayarlar için alanın kendi metodu kullanılır
+def _build_converter(field):
+    if type(field) is serializers.IntegerField:
+        return int
+    if type(field) is serializers.BigIntegerField:
+        if getattr(field, 'coerce_to_string', api_settings.COERCE_BIGINT_TO_STRING):
+            return str
+        return int
+    if type(field) is serializers.CharField:
+        return str
+
+    if type(field) is serializers.DecimalField:
+        coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+        if not coerce_to_string or field.localize or field.normalize_output \
+                or field.decimal_places is None:
+            return field.to_representation
+        exponent = decimal.Decimal('.1') ** field.decimal_places
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+        rounding = field.rounding
+        # Veritabanından gelen değerler zaten decimal_places basamaklıdır;
+        # metinde nokta doğru yerdeyse ve basamak sınırı aşılmıyorsa quantize()
+        # değeri değiştirmez ve atlanabilir (diğer durumlar DRF ile aynı yoldan gider)
+        point = -field.decimal_places - 1
+        max_length = field.max_digits + 1 if field.max_digits is not None else None
+
+        def convert_decimal(value):
+            if type(value) is not decimal.Decimal:
+                return field.to_representation(value)
+            text = '{:f}'.format(value)
+            if point < -1 and len(text) > -point and text[point] == '.' \
+                    and (max_length is None or len(text) <= max_length):
+                return text
+            return '{:f}'.format(value.quantize(exponent, rounding=rounding, context=context))
+        return convert_decimal
+
+    if type(field) is serializers.DateTimeField:
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        field_timezone = getattr(field, 'timezone', None) or (
+            field.default_timezone() if settings.USE_TZ else None
+        )
+        if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+            return field.to_representation
+
+        # Hedef saat dilimi UTC ise veritabanından gelen (datetime.timezone.utc)
+        # değerler için astimezone() atlanır; isoformat() zaten '+00:00' ile biter
+        utc_target = field_timezone is datetime.timezone.utc \
+            or getattr(field_timezone, 'key', None) in ('UTC', 'Etc/UTC')
+
+        def convert_datetime(value):
+            if type(value) is not datetime.datetime or value.tzinfo is None:
+                return field.to_representation(value)
+            if utc_target and value.tzinfo is datetime.timezone.utc:
+                return value.isoformat()[:-6] + 'Z'
+            value = value.astimezone(field_timezone).isoformat()
+            if value.endswith('+00:00'):
+                value = value[:-6] + 'Z'
+            return value
+        return convert_datetime
+
+    return field.to_representation
+
+
+# many=True ile kullanıldığında tüm sayfayı tek seferde dönüştürür
+class ProductReadListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        convert = self.child.get_row_converter()
+        return [convert(row) for row in data]
+
+
+class ProductReadSerializer(serializers.BaseSerializer):
+    """
+    Liste sayfaları için salt okunur, hızlı Product serializer'ı
+    ProductSerializer ile aynı alanları, aynı sırada ve aynı formatta üretir
+    """
+
+    # Çıktısı taklit edilen serializer
+    source_serializer_class = ProductSerializer
+
+    class Meta:
+        list_serializer_class = ProductReadListSerializer
+
+    # fields: Seyrek alan kümesi (verilmezse tüm alanlar)
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.field_names = fields
+
+    # Tüm alanlar doğrudan bir model kolonundan okunuyorsa hızlı yol kullanılabilir
+    @classmethod
+    def is_supported(cls):
+        model = cls.source_serializer_class.Meta.model
+        columns = {field.attname for field in model._meta.concrete_fields}
+        columns.add('pk')
+        return all(
+            not field.write_only and len(field.source_attrs) == 1
+            and field.source_attrs[0] in columns
+            for field in cls.source_serializer_class().fields.values()
+        )
+
+    # values() ile seçilecek kolon adları
+    # fields verilirse sadece bu alanların kolonları döndürülür
+    @classmethod
+    def get_source_fields(cls, fields=None):
+        model = cls.source_serializer_class.Meta.model
+        return [
+            model._meta.pk.attname if field.source == 'pk' else field.source
+            for name, field in cls.source_serializer_class().fields.items()
+            if not field.write_only and (fields is None or name in fields)
+        ]
+
+    # Satır dönüştürücüsünü oluşturur
+    # Saat dilimi ve Decimal context'i istek anındaki değerlerle bir kez hesaplanır
+    def get_row_converter(self):
+        model = self.source_serializer_class.Meta.model
+        fields = [
+            (name, field)
+            for name, field in self.source_serializer_class().fields.items()
+            if not field.write_only and (self.field_names is None or name in self.field_names)
+        ]
+        converters = [(name, _build_converter(field)) for name, field in fields]
+        sources = [model._meta.pk.attname if field.source == 'pk' else field.source for name, field in fields]
+
+        # Satırın değerleri tek bir C seviyesi çağrıyla demet (tuple) olarak okunur
+        # (tek alanlı seyrek istekte getter demet değil değerin kendisini döndürür)
+        def getter(read):
+            return (lambda row: (read(row),)) if len(sources) == 1 else read
+        read_dict = getter(itemgetter(*sources)) if sources else (lambda row: ())
+        read_object = getter(attrgetter(*sources)) if sources else (lambda row: ())
+
+        def convert(row):
+            values = read_dict(row) if isinstance(row, dict) else read_object(row)
+            return {
+                name: None if value is None else converter(value)
+                for (name, converter), value in zip(converters, values)
+            }
+        return convert
+
+    def to_representation(self, instance):
+        return self.get_row_converter()(instance)
@@ -0,0 +1,101 @@
+# Geçersiz kılma ve yayın çağrılarını argümanlarıyla on_commit'e vermek için
+from functools import partial
+
+# Django sinyal altyapısı
+# Signal: Özel sinyal tanımlamak için
+# receiver: Bir fonksiyonu sinyale bağlamak için decorator
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import Signal, receiver
+
+from . import changes, live
+from .cache import invalidate_products
+from .models import Product
+
+# =============================================================================
+# DJANGO PRODUCTS SIGNALS.PY DOSYASI
+# =============================================================================
+#
+# Bu dosya, products uygulamasının sinyallerini tanımlar.
+# Sinyaller, bir olay gerçekleştiğinde (örn. ürün kaydedildiğinde) bu olayla
+# ilgilenen kodların gevşek bağlı (loosely coupled) şekilde çalışmasını sağlar.
+#
+# Sorun:
+# - Django'nun post_save / post_delete sinyalleri sadece tek nesne
+#   işlemlerinde (save(), delete()) gönderilir
+# - bulk_create, bulk_update, QuerySet.update() ve F() ile stok
+#   güncellemeleri bu sinyalleri GÖNDERMEZ
+#
+# Çözüm:
+# - products_changed: Ürün satırları değiştiğinde gönderilen tek sinyal
+#   - post_save bu sinyale yönlendirilir
+#   - Silme ve toplu işlem yapan view'lar bu sinyali kendileri gönderir
+#
+# Neden post_delete dinlenmiyor?
+# - Bir modelin post_delete dinleyicisi varsa Django QuerySet.delete()'te
+#   hızlı silmeyi kapatır: her satırı yükler ve satır başına sinyal gönderir
+# - Silme yapan view'lar (detay DELETE, /api/products/bulk/) sinyali
+#   silmeden sonra kendileri gönderir; arama / istatistik / değişiklik
+#   kaydı zaten tetikleyicilerle güncellenir
+# - Önbellek gibi dinleyiciler sadece products_changed'e bağlanır
+#
+# Sinyal argümanları:
+# - action: 'create', 'update' veya 'delete'
+# - pks: Değişen ürünlerin id listesi; filtre ile yapılan toplu
+#   işlemlerde hangi satırların değiştiği bilinmiyorsa None
+#
+# Bu dosya, ProductsConfig.ready() içinde import edilerek yüklenir.
+# =============================================================================
+
+# Ürün satırları değiştiğinde gönderilen sinyal
+products_changed = Signal()
+
+
+# =============================================================================
+# ORM SİNYALLERİNİN YÖNLENDİRİLMESİ
+# =============================================================================
+
+# Product.save() sonrası (API, admin, shell fark etmez)
+@receiver(post_save, sender=Product, dispatch_uid='products_post_save')
+def product_saved(sender, instance, created, **kwargs):
+    products_changed.send(
+        sender=Product, action='create' if created else 'update', pks=[instance.pk]
+    )
+
+
+# =============================================================================
+# ÖNBELLEK GEÇERSİZ KILMA
+# =============================================================================
+
+# Değişen ürünlerin detay önbelleğini siler ve liste önbelleğini eskitir
+# Geçersiz kılma commit'ten sonra yapılır: transaction içinde yapılırsa,
+# commit'ten önce okuyan eşzamanlı bir istek eski veriyi yeni nesle yazar
+# ve yanıt TTL boyunca önbellekte kalırdı
+@receiver(products_changed, sender=Product, dispatch_uid='products_cache_invalidation')
+def invalidate_product_cache(sender, action, pks, **kwargs):
+    # Yeni oluşturulan ürünlerin henüz detay önbelleği olamaz
+    transaction.on_commit(partial(invalidate_products, pks, detail=action != 'create'), robust=True)
+
+
+# =============================================================================
+# DEĞİŞİKLİK AKIŞI BEKLEYENLERİ
+# =============================================================================
+
+# Değişiklik kaydı tetikleyicilerle yazılır (products/changes.py); burada
+# sadece bu süreçte bekleyen long-poll / SSE istekleri uyandırılır.
+# Kayıt commit edilmeden okunamayacağı için bildirim commit'ten sonra yapılır
+@receiver(products_changed, sender=Product, dispatch_uid='products_change_feed')
+def wake_change_feed(sender, **kwargs):
+    transaction.on_commit(changes.notifier.notify)
+
+
+# =============================================================================
+# CANLI STOK AKIŞI
+# =============================================================================
+
+# Açık SSE bağlantılarına (products/live.py) değişen ürünlerin stok ve
+# fiyatı commit'ten sonra gönderilir; yayın hatası (örn. Redis erişilemez)
+# yazma isteğini bozmaz, sadece loglanır (robust=True)
+@receiver(products_changed, sender=Product, dispatch_uid='products_live_stock')
+def publish_live_stock(sender, action, pks, **kwargs):
+    transaction.on_commit(partial(live.publish_products, pks, action), robust=True)
@@ -0,0 +1,367 @@
+import datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Case, Count, DecimalField, F, Max, Min, Q, Sum, Value, When
+from django.db.models.functions import TruncDate
+
+from .models import Product
+
+# =============================================================================
+# DJANGO PRODUCTS STATS.PY KATALOG İSTATİSTİKLERİ DOSYASI
+# =============================================================================
+#
+# Bu dosya, /api/products/stats/ endpoint'inin okuduğu özet (summary)
+# tablolarını tanımlar. Panolar (dashboard) toplam envanter değerini,
+# stokta olmayan ürün sayısını ve fiyat dağılımını /api/products/'un tüm
+# sayfalarını çekerek hesaplamak yerine bu tablolardan okur.
+#
+# Veritabanı Nesneleri (0005_product_stats migration'ı ile varsayılan fiyat
+# aralıklarıyla oluşturulur; migration DDL'i RunSQL olarak içerir, bu dosyayı
+# import etmez):
+# - products_product_stats: Tek satırlık (id = 1) toplamlar
+#   - product_count, total_stock, out_of_stock (stock <= 0)
+#   - inventory_value_cents: SUM(price * stock), kuruş cinsinden tam sayı
+#     (REAL toplamlarında biriken yuvarlama hatası olmaz)
+#   - price_buckets: Tetikleyicilerin kullandığı fiyat aralığı sınırları
+# - products_product_stats_price: Fiyat aralığı (bucket) başına ürün sayısı
+# - products_product_stats_daily: Gün (created_at, UTC) başına oluşturulan ürün sayısı
+# - products_product_stats_ai / _ad / _au / _au_price / _au_day tetikleyicileri
+#   - Her INSERT, DELETE ve UPDATE sonrası sadece değişen satırın katkısını
+#     ekler / çıkarır (artımlı bakım); tablo yeniden taranmaz
+#   - bulk_create, QuerySet.update(), QuerySet.delete(), F() ile stok
+#     güncellemeleri ve ham SQL dahil her yazma işleminde çalışır
+#   - Yazmayla aynı transaction içinde çalışır; rollback özetleri de geri alır
+#
+# Okuma maliyeti ürün sayısından bağımsızdır: bir satır, fiyat aralığı
+# kadar satır ve istenen gün sayısı kadar satır okunur. En düşük / en
+# yüksek fiyat product_price_idx indeksinin iki ucundan okunur.
+#
+# Fiyat aralıkları (PRODUCT_STATS_PRICE_BUCKETS) tetikleyicilerin SQL'ine
+# gömülür. Ayar değişince python manage.py rebuild_product_stats
+# tetikleyicileri yeniden kurar ve özetleri baştan hesaplar. O zamana kadar
+# okunan sayılar, özet tablosunda saklanan eski sınırlarla etiketlenir.
+#
+# Not: Django, SQLite'ta bazı şema değişikliklerinde (AlterField vb.)
+# tabloyu yeniden oluşturur ve tablonun tetikleyicileri silinir. Böyle bir
+# migration'dan sonra rebuild_product_stats komutu çalıştırılmalıdır
+# (bkz. products/search.py).
+#
+# SQLite dışındaki veritabanlarında özet tabloları kurulmaz; read()
+# aynı sonucu ORM aggregate sorgularıyla (tablo taraması) hesaplar.
+# =============================================================================
+
+STATS_TABLE = 'products_product_stats'
+PRICE_TABLE = 'products_product_stats_price'
+DAILY_TABLE = 'products_product_stats_daily'
+CONTENT_TABLE = 'products_product'
+
+TRIGGER_SUFFIXES = ('ai', 'ad', 'au', 'au_price', 'au_day')
+
+# Varsayılan fiyat aralığı sınırları: [0, 10), [10, 50), ... [5000, ∞)
+DEFAULT_PRICE_BUCKETS = ('10', '50', '100', '500', '1000', '5000')
+
+# Satır başına katkı ifadeleri (row: 'new' veya 'old')
+_CENTS = 'CAST(ROUND({row}.price * 100) AS INTEGER)'
+_OUT_OF_STOCK = '({row}.stock <= 0)'
+_DAY = 'date({row}.created_at)'
+
+
+def get_price_buckets():
+    """
+    PRODUCT_STATS_PRICE_BUCKETS ayarındaki artan sıralı sınırlar (Decimal)
+    """
+    bounds = [Decimal(str(bound)) for bound in getattr(
+        settings, 'PRODUCT_STATS_PRICE_BUCKETS', DEFAULT_PRICE_BUCKETS
+    )]
+    if bounds != sorted(set(bounds)):
+        raise ValueError('PRODUCT_STATS_PRICE_BUCKETS artan sırada ve tekrarsız olmalıdır.')
+    return bounds
+
+
+# Fiyatın aralık numarası: sınır sayısı n ise 0..n
+def _bucket_sql(price, bounds):
+    if not bounds:
+        return '0'
+    cases = ' '.join(
+        'WHEN {price} < {bound} THEN {index}'.format(price=price, bound=bound, index=index)
+        for index, bound in enumerate(bounds)
+    )
+    return 'CASE %s ELSE %d END' % (cases, len(bounds))
+
+
+# =============================================================================
+# ŞEMA (REBUILD_PRODUCT_STATS KOMUTU TARAFINDAN KULLANILIR)
+# =============================================================================
+
+def _totals_sql(row, sign, count=True):
+    return (
+        'UPDATE {stats} SET '
+        + ('product_count = product_count {sign} 1, ' if count else '')
+        + 'total_stock = total_stock {sign} {row}.stock, '
+        'out_of_stock = out_of_stock {sign} {oos}, '
+        'inventory_value_cents = inventory_value_cents {sign} {cents} * {row}.stock '
+        'WHERE id = 1;'
+    ).format(
+        stats=STATS_TABLE, sign=sign, row=row,
+        oos=_OUT_OF_STOCK.format(row=row), cents=_CENTS.format(row=row),
+    )
+
+
+def _increment_sql(table, key, value):
+    return (
+        'INSERT INTO {table}({key}, product_count) VALUES ({value}, 1) '
+        'ON CONFLICT({key}) DO UPDATE SET product_count = product_count + 1;'
+    ).format(table=table, key=key, value=value)
+
+
+def _decrement_sql(table, key, value):
+    return 'UPDATE {table} SET product_count = product_count - 1 WHERE {key} = {value};'.format(
+        table=table, key=key, value=value,
+    )
+
+
+# Ürünü kalmayan gün silinir; gün tablosu sadece dolu günleri tutar
+def _daily_cleanup_sql(day):
+    return 'DELETE FROM {daily} WHERE day = {day} AND product_count <= 0;'.format(
+        daily=DAILY_TABLE, day=day,
+    )
+
+
+def _schema_sql(bounds):
+    new_bucket = _bucket_sql('new.price', bounds)
+    old_bucket = _bucket_sql('old.price', bounds)
+    new_day = _DAY.format(row='new')
+    old_day = _DAY.format(row='old')
+    on = 'ON {content}'.format(content=CONTENT_TABLE)
+    return [
+        (
+            'CREATE TABLE IF NOT EXISTS {stats} ('
+            'id INTEGER PRIMARY KEY CHECK (id = 1), '
+            'product_count INTEGER NOT NULL DEFAULT 0, '
+            'total_stock INTEGER NOT NULL DEFAULT 0, '
+            'out_of_stock INTEGER NOT NULL DEFAULT 0, '
+            'inventory_value_cents INTEGER NOT NULL DEFAULT 0, '
+            "price_buckets TEXT NOT NULL DEFAULT '')"
+        ).format(stats=STATS_TABLE),
+        (
+            'CREATE TABLE IF NOT EXISTS {price} ('
+            'bucket INTEGER PRIMARY KEY, product_count INTEGER NOT NULL)'
+        ).format(price=PRICE_TABLE),
+        (
+            'CREATE TABLE IF NOT EXISTS {daily} ('
+            'day TEXT PRIMARY KEY, product_count INTEGER NOT NULL) WITHOUT ROWID'
+        ).format(daily=DAILY_TABLE),
+        'INSERT OR IGNORE INTO {stats}(id) VALUES (1)'.format(stats=STATS_TABLE),
+        'CREATE TRIGGER {stats}_ai AFTER INSERT {on} BEGIN {body} END'.format(
+            stats=STATS_TABLE, on=on, body=' '.join([
+                _totals_sql('new', '+'),
+                _increment_sql(PRICE_TABLE, 'bucket', new_bucket),
+                _increment_sql(DAILY_TABLE, 'day', new_day),
+            ]),
+        ),
+        'CREATE TRIGGER {stats}_ad AFTER DELETE {on} BEGIN {body} END'.format(
+            stats=STATS_TABLE, on=on, body=' '.join([
+                _totals_sql('old', '-'),
+                _decrement_sql(PRICE_TABLE, 'bucket', old_bucket),
+                _decrement_sql(DAILY_TABLE, 'day', old_day),
+                _daily_cleanup_sql(old_day),
+            ]),
+        ),
+        # save() tüm kolonları yazar; WHEN koşulları değişmeyen değerlerde
+        # özet tablolarına yazmayı atlar (stok rezervasyonu sadece toplam
+        # satırını günceller)
+        (
+            'CREATE TRIGGER {stats}_au AFTER UPDATE OF price, stock {on} '
+            'WHEN old.price IS NOT new.price OR old.stock IS NOT new.stock '
+            'BEGIN {old} {new} END'
+        ).format(
+            stats=STATS_TABLE, on=on,
+            old=_totals_sql('old', '-', count=False), new=_totals_sql('new', '+', count=False),
+        ),
+        (
+            'CREATE TRIGGER {stats}_au_price AFTER UPDATE OF price {on} '
+            'WHEN ({old_bucket}) != ({new_bucket}) BEGIN {body} END'
+        ).format(
+            stats=STATS_TABLE, on=on, old_bucket=old_bucket, new_bucket=new_bucket,
+            body=' '.join([
+                _decrement_sql(PRICE_TABLE, 'bucket', old_bucket),
+                _increment_sql(PRICE_TABLE, 'bucket', new_bucket),
+            ]),
+        ),
+        (
+            'CREATE TRIGGER {stats}_au_day AFTER UPDATE OF created_at {on} '
+            'WHEN {old_day} IS NOT {new_day} BEGIN {body} END'
+        ).format(
+            stats=STATS_TABLE, on=on, old_day=old_day, new_day=new_day,
+            body=' '.join([
+                _decrement_sql(DAILY_TABLE, 'day', old_day),
+                _daily_cleanup_sql(old_day),
+                _increment_sql(DAILY_TABLE, 'day', new_day),
+            ]),
+        ),
+    ]
+
+
+# Özet tablolarını ve tetikleyicileri oluşturur (tekrar çalıştırılabilir)
+# Tetikleyiciler her seferinde güncel fiyat aralıklarıyla yeniden kurulur;
+# ardından rebuild() çağrılmalıdır
+# Sadece SQLite'ta çalışır; diğer veritabanlarında hiçbir şey yapmaz
+def install(connection):
+    if connection.vendor != 'sqlite':
+        return
+    bounds = get_price_buckets()
+    with connection.cursor() as cursor:
+        for suffix in TRIGGER_SUFFIXES:
+            cursor.execute('DROP TRIGGER IF EXISTS %s_%s' % (STATS_TABLE, suffix))
+        for sql in _schema_sql(bounds):
+            cursor.execute(sql)
+
+
+def uninstall(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for suffix in TRIGGER_SUFFIXES:
+            cursor.execute('DROP TRIGGER IF EXISTS %s_%s' % (STATS_TABLE, suffix))
+        for table in (DAILY_TABLE, PRICE_TABLE, STATS_TABLE):
+            cursor.execute('DROP TABLE IF EXISTS %s' % table)
+
+
+# Özetleri products_product tablosundan baştan hesaplar (tek tablo taraması
+# başına bir INSERT ... SELECT); install() ile aynı transaction içinde çağrılır
+def rebuild(connection):
+    bounds = get_price_buckets()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'UPDATE {stats} SET (product_count, total_stock, out_of_stock, inventory_value_cents) = ('
+            'SELECT COUNT(*), COALESCE(SUM(stock), 0), COALESCE(SUM({oos}), 0), '
+            'COALESCE(SUM({cents} * stock), 0) FROM {content} AS p), price_buckets = %s '
+            'WHERE id = 1'.format(
+                stats=STATS_TABLE, content=CONTENT_TABLE,
+                oos=_OUT_OF_STOCK.format(row='p'), cents=_CENTS.format(row='p'),
+            ),
+            [','.join(str(bound) for bound in bounds)],
+        )
+        cursor.execute('DELETE FROM %s' % PRICE_TABLE)
+        cursor.execute(
+            'INSERT INTO {price}(bucket, product_count) '
+            'SELECT {bucket}, COUNT(*) FROM {content} GROUP BY 1'.format(
+                price=PRICE_TABLE, content=CONTENT_TABLE, bucket=_bucket_sql('price', bounds),
+            )
+        )
+        cursor.execute('DELETE FROM %s' % DAILY_TABLE)
+        cursor.execute(
+            'INSERT INTO {daily}(day, product_count) '
+            'SELECT date(created_at), COUNT(*) FROM {content} GROUP BY 1'.format(
+                daily=DAILY_TABLE, content=CONTENT_TABLE,
+            )
+        )
+
+
+# =============================================================================
+# OKUMA
+# =============================================================================
+#
+# read() ve compute() aynı yapıyı döndürür:
+# {
+#     'count': 1200, 'total_stock': 53000, 'out_of_stock': 14,
+#     'inventory_value': Decimal('812345.50'),
+#     'min_price': Decimal('0.50'), 'max_price': Decimal('4999.99'),
+#     'price_buckets': [{'min': None, 'max': Decimal('10'), 'count': 120}, ...],
+#     'created_per_day': [{'date': datetime.date(2026, 10, 1), 'count': 35}, ...],
+# }
+
+def _buckets(bounds, counts):
+    edges = [None] + list(bounds) + [None]
+    return [
+        {'min': edges[index], 'max': edges[index + 1], 'count': counts.get(index, 0)}
+        for index in range(len(bounds) + 1)
+    ]
+
+
+def _price(value):
+    return None if value is None else Decimal(str(value)).quantize(Decimal('0.01'))
+
+
+def read(since=None, using='default'):
+    """
+    Özet tablolarından katalog istatistikleri (okuma maliyeti sabit)
+    since: created_per_day bu tarihten (dahil) itibaren döner; None ise tüm günler
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return compute(since=since, using=using)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT product_count, total_stock, out_of_stock, inventory_value_cents, price_buckets, '
+            '(SELECT MIN(price) FROM {content}), (SELECT MAX(price) FROM {content}) '
+            'FROM {stats} WHERE id = 1'.format(stats=STATS_TABLE, content=CONTENT_TABLE)
+        )
+        count, total_stock, out_of_stock, cents, stored_bounds, min_price, max_price = cursor.fetchone()
+        cursor.execute('SELECT bucket, product_count FROM %s' % PRICE_TABLE)
+        counts = dict(cursor.fetchall())
+        cursor.execute(
+            'SELECT day, product_count FROM {daily} WHERE day >= %s ORDER BY day'.format(daily=DAILY_TABLE),
+            [since.isoformat() if since else ''],
+        )
+        days = cursor.fetchall()
+
+    # Sayılar tetikleyicilerin son kurulduğu sınırlara göredir (bkz. dosya başı)
+    bounds = [Decimal(bound) for bound in stored_bounds.split(',') if bound]
+    return {
+        'count': count,
+        'total_stock': total_stock,
+        'out_of_stock': out_of_stock,
+        'inventory_value': Decimal(cents).scaleb(-2),
+        'min_price': _price(min_price),
+        'max_price': _price(max_price),
+        'price_buckets': _buckets(bounds, counts),
+        'created_per_day': [
+            {'date': datetime.date.fromisoformat(day), 'count': day_count}
+            for day, day_count in days if day_count > 0
+        ],
+    }
+
+
+def compute(since=None, using='default'):
+    """
+    Aynı istatistikleri products_product tablosunu tarayarak hesaplar
+    SQLite dışındaki veritabanları ve özetlerin doğrulanması için kullanılır
+    """
+    bounds = get_price_buckets()
+    queryset = Product.objects.using(using).order_by()
+    totals = queryset.aggregate(
+        count=Count('pk'),
+        total_stock=Sum('stock', default=0),
+        out_of_stock=Count('pk', filter=Q(stock__lte=0)),
+        inventory_value=Sum(
+            F('price') * F('stock'), default=Decimal('0'),
+            output_field=DecimalField(max_digits=30, decimal_places=2),
+        ),
+        min_price=Min('price'),
+        max_price=Max('price'),
+    )
+    bucket = Case(
+        *[When(price__lt=bound, then=Value(index)) for index, bound in enumerate(bounds)],
+        default=Value(len(bounds)),
+    )
+    counts = dict(
+        queryset.annotate(bucket=bucket).values('bucket')
+        .annotate(count=Count('pk')).values_list('bucket', 'count')
+    )
+    days = queryset.annotate(day=TruncDate('created_at', tzinfo=datetime.timezone.utc))
+    if since is not None:
+        days = days.filter(day__gte=since)
+    days = days.values('day').annotate(count=Count('pk')).order_by('day').values_list('day', 'count')
+
+    totals.update(
+        inventory_value=_price(totals['inventory_value']),
+        min_price=_price(totals['min_price']),
+        max_price=_price(totals['max_price']),
+        price_buckets=_buckets(bounds, counts),
+        created_per_day=[{'date': day, 'count': day_count} for day, day_count in days],
+    )
+    return totals
@@ -0,0 +1,241 @@
+# Anlık görüntü (snapshot) dosyaları ve anahtarları için standart kütüphaneler
+import hashlib
+import inspect
+import os
+import re
+import sqlite3
+import uuid
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test import TestCase
+
+from .benchmarks import seed_products
+from .models import Product
+
+# =============================================================================
+# DJANGO PRODUCTS TESTING.PY TEST ALTYAPISI DOSYASI
+# =============================================================================
+#
+# Bu dosya, testlerde kullanılan veri fabrikalarını ve büyük test verisini
+# hızlı yükleyen TestCase sınıfını tanımlar.
+#
+# Fabrikalar:
+# - Satırlar tek tek Product.objects.create() yerine bulk_create ile eklenir
+#   (tek INSERT, model sinyali yok)
+# - setUpTestData içinde kullanılır; veri sınıf başına bir kez eklenir ve
+#   her testin sonunda transaction geri alınarak korunur
+#
+# SeededSnapshotTestCase (büyük veri, örn. 100.000 ürün):
+# - seed_database() süreç başına bir kez çalışır; sonuç SQLite backup API'si
+#   ile bellekteki bir kopyaya (memory-backed clone) ve bir dosyaya alınır
+# - Sonraki sınıflar ve sonraki test çalıştırmaları veriyi yeniden üretmez;
+#   kopya sayfa sayfa test veritabanına geri yüklenir (milisaniyeler)
+# - Sınıf bitince test veritabanı sınıftan önceki haline döndürülür;
+#   diğer TestCase'ler boş tablolarla çalışmaya devam eder
+# - Dosya adı şemanın, seed_database() ve veri fabrikalarının (make_product,
+#   seed_products...) kaynak kodunun özetini içerir; model, seed veya
+#   fabrika değişince eski dosya kullanılmaz
+# - Yeni dosya yazılırken aynı adın eski özetli dosyaları silinir
+#   (dizin .gitignore içindedir)
+#
+# Paralel testler (manage.py test --parallel):
+# - Her worker kendi test veritabanı kopyasında çalışır; bellekteki kopyalar
+#   worker'a özeldir
+# - Dosya önce benzersiz geçici bir ada yazılıp os.replace ile taşınır;
+#   aynı anda oluşturan worker'lar yarım dosya okumaz
+#
+# SQLite dışındaki veritabanlarında seed_database() sınıf başına
+# setUpTestData içinde çalışır (anlık görüntü kullanılmaz).
+#
+# Ayarlar (settings.py):
+# - TEST_SNAPSHOT_DIR: Anlık görüntü dosyalarının dizini
+# =============================================================================
+
+
+# =============================================================================
+# FABRİKALAR
+# =============================================================================
+
+# Kaydedilmemiş örnek ürün; index değerlerden türetilir, fields ile ezilir
+def make_product(index=1, **fields):
+    values = {
+        'name': 'Ürün %d' % index,
+        'price': Decimal('%d.%02d' % (index % 5000, index % 100)),
+        'stock': index % 250,
+    }
+    values.update(fields)
+    return Product(**values)
+
+
+def create_products(count, start=1, batch_size=1000, **fields):
+    """
+    count adet ürünü bulk_create ile ekler; oluşturulan nesneleri döndürür
+    Örnek: create_products(50, stock=0)
+    """
+    return Product.objects.bulk_create(
+        [make_product(index, **fields) for index in range(start, start + count)],
+        batch_size=batch_size,
+    )
+
+
+def create_products_from(rows, fields=('name', 'price', 'stock')):
+    """
+    Demetlerden ürün ekler
+    Örnek: create_products_from([('Kalem', '5.00', 3), ('Silgi', '2.50', 7)])
+    """
+    return Product.objects.bulk_create([Product(**dict(zip(fields, row))) for row in rows])
+
+
+# =============================================================================
+# ANLIK GÖRÜNTÜLER (SNAPSHOT)
+# =============================================================================
+
+# Anahtar -> bellekteki SQLite bağlantısı (süreç / worker başına)
+_memory_snapshots = {}
+
+
+def _memory_copy(source):
+    target = sqlite3.connect(':memory:', check_same_thread=False)
+    source.backup(target)
+    return target
+
+
+def _snapshot_dir():
+    return str(getattr(settings, 'TEST_SNAPSHOT_DIR', os.path.join(settings.BASE_DIR, '.test_snapshots')))
+
+
+# seed_database() içinden çağrılan ortak veri fabrikaları
+# Bunlardan birinin kodu değişirse üretilen veri de değişir
+SNAPSHOT_FACTORIES = (make_product, create_products, create_products_from, seed_products)
+
+
+def _snapshot_prefix(test_class):
+    return test_class.snapshot_name or test_class.__name__
+
+
+# Şema + seed kodu + fabrika kodu özeti; biri değişirse yeni anlık görüntü üretilir
+def _snapshot_key(test_class, raw_connection):
+    digest = hashlib.sha1()
+    for (sql,) in raw_connection.execute(
+        'SELECT sql FROM sqlite_master WHERE sql IS NOT NULL ORDER BY type, name'
+    ):
+        digest.update(sql.encode())
+    for source in (test_class.seed_database, *SNAPSHOT_FACTORIES, *test_class.snapshot_factories):
+        digest.update(inspect.getsource(source).encode())
+    return '%s-%s' % (_snapshot_prefix(test_class), digest.hexdigest()[:16])
+
+
+# Aynı ada ait eski özetli anlık görüntüleri (ve yarım kalmış geçici
+# dosyalarını) siler; dosya başka bir worker tarafından silinmiş olabilir
+def _prune_snapshots(test_class, key):
+    directory = _snapshot_dir()
+    pattern = re.compile(
+        r'%s-[0-9a-f]{16}\.sqlite3(\.[0-9a-f]{32}\.tmp)?$' % re.escape(_snapshot_prefix(test_class))
+    )
+    for name in os.listdir(directory):
+        if pattern.match(name) and not name.startswith(key + '.'):
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+
+def _write_snapshot(snapshot, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = '%s.%s.tmp' % (path, uuid.uuid4().hex)
+    target = sqlite3.connect(temporary)
+    try:
+        snapshot.backup(target)
+    finally:
+        target.close()
+    os.replace(temporary, path)
+
+
+class SeededSnapshotTestCase(TestCase):
+    """
+    Büyük test verisini anlık görüntüden yükleyen TestCase
+    Alt sınıflar seed_database() tanımlar; setUpTestData'yı ezen alt sınıflar
+    super().setUpTestData() çağırmalıdır
+    """
+
+    # Anlık görüntü dosyasının adı (varsayılan: sınıf adı); aynı veriyi
+    # kullanan sınıflar aynı adı vererek tek anlık görüntüyü paylaşır
+    snapshot_name = None
+
+    # seed_database()'in kullandığı, SNAPSHOT_FACTORIES dışındaki yardımcılar
+    # (kaynak kodları anlık görüntü anahtarına eklenir)
+    snapshot_factories = ()
+
+    databases = {DEFAULT_DB_ALIAS}
+
+    # Varsayılan: veri eklenmez (boş tablolarla anlık görüntü)
+    @classmethod
+    def seed_database(cls):
+        pass
+
+    @classmethod
+    def get_snapshot(cls, connection):
+        key = _snapshot_key(cls, connection.connection)
+        snapshot = _memory_snapshots.get(key)
+        if snapshot is not None:
+            return snapshot
+
+        path = os.path.join(_snapshot_dir(), key + '.sqlite3')
+        if os.path.exists(path):
+            source = sqlite3.connect(path)
+            try:
+                snapshot = _memory_copy(source)
+            finally:
+                source.close()
+        else:
+            # Veri test veritabanına kalıcı (commit) olarak eklenir ve
+            # kopyalanır; sınıf bitince önceki hali geri yüklenir
+            with transaction.atomic(using=connection.alias):
+                cls.seed_database()
+            snapshot = _memory_copy(connection.connection)
+            _write_snapshot(snapshot, path)
+            _prune_snapshots(cls, key)
+        _memory_snapshots[key] = snapshot
+        return snapshot
+
+    @classmethod
+    def setUpClass(cls):
+        connection = connections[DEFAULT_DB_ALIAS]
+        cls._pristine = None
+        if connection.vendor == 'sqlite':
+            connection.ensure_connection()
+            # Sınıftan önceki hal (diğer TestCase'lerin beklediği boş tablolar)
+            cls._pristine = _memory_copy(connection.connection)
+            try:
+                cls.get_snapshot(connection).backup(connection.connection)
+                super().setUpClass()
+            except Exception:
+                cls._restore_pristine()
+                raise
+        else:
+            super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        if cls._pristine is None:
+            cls.seed_database()
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super().tearDownClass()
+        finally:
+            cls._restore_pristine()
+
+    @classmethod
+    def _restore_pristine(cls):
+        if cls._pristine is None:
+            return
+        connection = connections[DEFAULT_DB_ALIAS]
+        connection.ensure_connection()
+        cls._pristine.backup(connection.connection)
+        cls._pristine.close()
+        cls._pristine = None
@@ -3,6 +3,50 @@
 # Bu sınıf, test veritabanı yönetimi ve test yardımcı metodları sağlar
 from django.test import TestCase
 
+# Eşdeğerlik testlerinde kullanılan modüller
+import asyncio
+import base64
+import contextlib
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest import mock
+from urllib.parse import urlencode
+from zoneinfo import ZoneInfo
+
+from asgiref.sync import sync_to_async
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_delete
+from django.test import AsyncRequestFactory, Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.asgi import application as asgi_application
+from core.broker import get_broker
+from rest_framework.renderers import JSONRenderer
+
+from .benchmarks import SCENARIOS, ClientTransport, compare_results, parse_scale, run_scenarios, seed_products
+from .management.commands.explain_queries import Command as ExplainQueriesCommand
+from .async_views import AsyncProductListCreateAPIView, AsyncProductRetrieveUpdateDestroyAPIView
+from .cache import RECENT_WRITE_KEY, aget_generations, get_product_cache
+from . import changes, stats, testing
+from .signals import products_changed
+from .models import Product, StockReservation
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+from .serializers import ProductReadSerializer, ProductSerializer
+from .testing import SeededSnapshotTestCase, create_products, create_products_from
+from .views import (
+    ProductBulkAPIView, ProductExportAPIView, ProductListCreateAPIView, ProductRetrieveUpdateDestroyAPIView, home_template_view,
+)
+
 # =============================================================================
 # DJANGO TESTS.PY TEST DOSYASI
 # =============================================================================
@@ -166,5 +210,1253 @@ from django.test import TestCase
 
 # Create your tests here.
 # Bu satır, test'lerinizi yazmak için kullanılır.
-# Şu anda boş bırakılmıştır çünkü henüz test'ler yazılmamıştır.
 # Yukarıdaki örnekler, nasıl test yazılacağını göstermektedir.
+
+# =============================================================================
+# HIZLI OKUMA SERIALIZER'I EŞDEĞERLİK TESTLERİ
+# =============================================================================
+
+class ProductReadSerializerTest(TestCase):
+    """ProductReadSerializer, ProductSerializer ile byte byte aynı JSON üretmeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Product.objects.bulk_create([
+            Product(name='Ürün %d ✓' % i, price=Decimal(i) / 7, stock=i % 5)
+            for i in range(50)
+        ] + [
+            Product(name='', price=Decimal('0'), stock=-1),
+            Product(name='"Tırnak" \\ ters', price=Decimal('99999999.99'), stock=2 ** 31),
+        ])
+
+    def assertSameJSON(self, fast_rows, instances):
+        renderer = JSONRenderer()
+        self.assertEqual(
+            renderer.render(ProductReadSerializer(fast_rows, many=True).data),
+            renderer.render(ProductSerializer(instances, many=True).data),
+        )
+
+    def test_values_rows_match_model_serializer(self):
+        """values() satırları ProductSerializer çıktısıyla aynı olmalı"""
+        rows = Product.objects.values(*ProductReadSerializer.get_source_fields())
+        self.assertSameJSON(rows, Product.objects.all())
+
+    def test_model_instances_match_model_serializer(self):
+        """Model nesneleri de aynı çıktıyı üretmeli"""
+        self.assertSameJSON(Product.objects.all(), Product.objects.all())
+
+    def test_active_timezone_is_respected(self):
+        """Etkin saat dilimi değiştiğinde tarih formatı da aynı kalmalı"""
+        with timezone.override('Europe/Istanbul'):
+            rows = Product.objects.values(*ProductReadSerializer.get_source_fields())
+            self.assertSameJSON(rows, Product.objects.all())
+
+    def test_unquantized_values_match_model_serializer(self):
+        """Kısayolların dışındaki değerler (yuvarlanmamış Decimal, UTC dışı tarih) de aynı olmalı"""
+        istanbul = ZoneInfo('Europe/Istanbul')
+        moment = datetime(2024, 3, 1, 12, 30, 15, 123456, tzinfo=istanbul)
+        instances = [
+            Product(id=1, name='a', price=Decimal('5'), stock=1, created_at=moment, updated_at=moment),
+            Product(id=2, name='b', price=Decimal('1.005'), stock=1, created_at=moment, updated_at=moment),
+            Product(id=3, name='c', price=Decimal('-0.50'), stock=1, created_at=moment, updated_at=moment),
+        ]
+        self.assertSameJSON(instances, instances)
+
+    def test_list_endpoint_uses_same_representation(self):
+        """Liste endpoint'inin sonuçları ProductSerializer çıktısıyla aynı olmalı"""
+        response = self.client.get('/api/products/', {'page_size': 100})
+        expected = ProductSerializer(
+            Product.objects.order_by('-created_at', '-id'), many=True
+        ).data
+        self.assertEqual(response.json()['results'], json.loads(JSONRenderer().render(expected)))
+
+
+# Hızlı JSON renderer / parser, standart DRF sınıflarıyla aynı sonucu vermeli
+# (orjson kurulu değilse zaten standart yola düşer)
+class FastJSONTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Product.objects.create(name='Çay \u2028 bardağı', price=Decimal('12.50'), stock=3)
+        Product.objects.create(name='Kalem', price=Decimal('0.99'), stock=0)
+
+    def test_renderer_matches_json_renderer(self):
+        """Serializer çıktısı byte byte aynı render edilmeli"""
+        data = ProductSerializer(Product.objects.all(), many=True).data
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_parser_round_trip(self):
+        """Render edilen gövde aynı veriye geri çözülmeli"""
+        data = ProductSerializer(Product.objects.all(), many=True).data
+        body = FastJSONRenderer().render(data)
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), json.loads(body))
+
+
+# Yanıt önbelleği: ikinci istek önbellekten gelmeli, yazmalar commit'ten
+# sonra sadece ilgili anahtarları geçersiz kılmalı
+class ProductCacheTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kalem, cls.silgi = create_products_from([('Kalem', '5.00', 3), ('Silgi', '2.50', 7)])
+
+    def setUp(self):
+        get_product_cache().clear()
+        self.kalem_url = '/api/products/%d/' % self.kalem.pk
+        self.silgi_url = '/api/products/%d/' % self.silgi.pk
+
+    def cache_status(self, url):
+        return self.client.get(url)['X-Cache']
+
+    def test_hit_after_miss_and_precise_invalidation_on_save(self):
+        """Kaydedilen ürünün detayı ve liste yenilenmeli, diğer detaylar korunmalı"""
+        for url in (self.kalem_url, self.silgi_url, '/api/products/'):
+            self.assertEqual(self.cache_status(url), 'MISS')
+            self.assertEqual(self.cache_status(url), 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.kalem.stock = 9
+            self.kalem.save()
+
+        response = self.client.get(self.kalem_url)
+        self.assertEqual((response['X-Cache'], response.json()['stock']), ('MISS', 9))
+        self.assertEqual(self.cache_status('/api/products/'), 'MISS')
+        self.assertEqual(self.cache_status(self.silgi_url), 'HIT')
+
+    def test_bulk_update_and_delete_invalidate(self):
+        """Toplu güncelleme ve silme sonrası eski yanıtlar dönmemeli"""
+        for url in (self.kalem_url, self.silgi_url, '/api/products/'):
+            self.client.get(url)
+
+        # Yazma ayrı bir istemciden yapılır; yazan istemci çerezle birincile
+        # sabitlenir ve önbelleği kullanmaz (bkz. ProductReplicaCacheTest)
+        writer = Client()
+        with self.captureOnCommitCallbacks(execute=True):
+            writer.patch(
+                '/api/products/bulk/', {'filter': {'stock__lt': 5}, 'values': {'stock': 0}},
+                content_type='application/json',
+            )
+        response = self.client.get(self.kalem_url)
+        self.assertEqual((response['X-Cache'], response.json()['stock']), ('MISS', 0))
+
+        self.client.get('/api/products/')
+        with self.captureOnCommitCallbacks(execute=True):
+            writer.delete('/api/products/bulk/', {'ids': [self.silgi.pk]}, content_type='application/json')
+        self.assertEqual(self.client.get(self.silgi_url).status_code, 404)
+        response = self.client.get('/api/products/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.kalem.pk])
+
+    def test_invalidation_waits_for_commit(self):
+        """Transaction commit edilmeden önbellek geçersiz kılınmamalı"""
+        self.client.get(self.kalem_url)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.kalem.stock = 1
+            self.kalem.save()
+            self.assertEqual(self.cache_status(self.kalem_url), 'HIT')
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.cache_status(self.kalem_url), 'MISS')
+
+
+# Koşullu GET: 200 / 304 / 412 yanıtları ve değişiklik sonrası yeni ETag
+class ProductConditionalGetTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kalem, cls.silgi = create_products_from([('Kalem', '5.00', 3), ('Silgi', '2.50', 7)])
+
+    def setUp(self):
+        get_product_cache().clear()
+        self.kalem_url = '/api/products/%d/' % self.kalem.pk
+
+    def test_list_etag(self):
+        """Liste sadece ETag ile doğrulanır; 304 için veritabanına gidilmez"""
+        response = self.client.get('/api/products/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response['ETag']), (304, etag))
+        self.assertEqual(self.client.get('/api/products/?ordering=price', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertEqual(self.client.get('/api/products/', HTTP_IF_MATCH='"eski"').status_code, 412)
+        self.assertEqual(self.client.get('/api/products/', HTTP_IF_MATCH=etag).status_code, 200)
+
+    def test_list_ignores_if_modified_since(self):
+        """Silme MAX(updated_at) değerini değiştirmez; liste IMS ile 304 dönmemeli"""
+        future = 'Fri, 01 Jan 2100 00:00:00 GMT'
+        self.assertEqual(self.client.get('/api/products/', HTTP_IF_MODIFIED_SINCE=future).status_code, 200)
+
+    def test_delete_invalidates_list_etag(self):
+        """Silinen ürün listeden çıkınca eski ETag eşleşmemeli"""
+        etag = self.client.get('/api/products/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.delete('/api/products/%d/' % self.silgi.pk).status_code, 204)
+
+        response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.kalem.pk])
+
+    def test_detail_etag_and_last_modified(self):
+        """Detay ETag ve Last-Modified ile doğrulanır; güncelleme sonrası 200 dönmeli"""
+        response = self.client.get(self.kalem_url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        self.assertEqual(self.client.get(self.kalem_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(self.kalem_url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        self.assertEqual(self.client.get(self.kalem_url, HTTP_IF_MATCH='"eski"').status_code, 412)
+
+        self.kalem.stock = 9
+        self.kalem.save(update_fields=['stock', 'updated_at'])
+        response = self.client.get(self.kalem_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(self.kalem_url, HTTP_IF_MATCH=etag).status_code, 412)
+
+
+# Read-your-writes: Yazan istemci, başka bir istemcinin geride kalan
+# replikadan önbelleğe yazdığı eski yanıtı görmemeli (core/routers.py)
+# Testte replika olarak 'default' kullanılır; replika gecikmesi, satır
+# güncellemesinin okumadan sonra uygulanmasıyla taklit edilir
+@override_settings(DATABASE_REPLICAS=['default'], DATABASE_REPLICA_APPS=['products'])
+class ProductReplicaCacheTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kalem, = create_products_from([('Kalem', '5.00', 3)])
+
+    def setUp(self):
+        get_product_cache().clear()
+        self.url = '/api/products/%d/' % self.kalem.pk
+        self.reader = Client()
+
+    # TestCase her testi bir transaction içinde çalıştırır; router atomic blok
+    # içinde replikaya gitmediği için bu kontrol istek süresince kapatılır
+    def get(self, client, url):
+        with mock.patch.object(connection, 'in_atomic_block', False):
+            return client.get(url)
+
+    def test_writer_never_gets_stale_replica_response(self):
+        """Yazma -> replikadan eski okuma -> yazanın okuması eski HIT almamalı"""
+        # 1. Yazma birincilde commit edilir ve önbellek geçersiz kılınır
+        with self.captureOnCommitCallbacks(execute=True):
+            products_changed.send(sender=Product, action='update', pks=[self.kalem.pk])
+        self.client.cookies['use_primary'] = '1'
+
+        # 2. Sabitlenmemiş istemci henüz güncellenmemiş replikadan okur
+        response = self.get(self.reader, self.url)
+        self.assertEqual((response['X-Cache'], response.json()['stock']), ('MISS', 3))
+        self.assertNotIn('ETag', self.get(self.reader, '/api/products/'))
+        Product.objects.filter(pk=self.kalem.pk).update(stock=9)
+
+        # 3. Yazan istemci birincilden okur; önbellek kullanılmaz
+        response = self.get(self.client, self.url)
+        self.assertNotIn('X-Cache', response)
+        self.assertEqual(response.json()['stock'], 9)
+        response = self.get(self.client, '/api/products/')
+        self.assertNotIn('X-Cache', response)
+        self.assertIn('ETag', response)
+
+        # Pencere içinde replika yanıtları önbelleğe yazılmaz
+        self.assertEqual(self.get(self.reader, self.url)['X-Cache'], 'MISS')
+        self.assertEqual(self.get(self.reader, self.url)['X-Cache'], 'MISS')
+
+    def test_replica_responses_are_cached_after_pin_window(self):
+        """Replika gecikme penceresi geçtikten sonra önbellek normal çalışmalı"""
+        with self.captureOnCommitCallbacks(execute=True):
+            products_changed.send(sender=Product, action='update', pks=[self.kalem.pk])
+        get_product_cache().delete(RECENT_WRITE_KEY)
+
+        self.assertEqual(self.get(self.reader, self.url)['X-Cache'], 'MISS')
+        self.assertEqual(self.get(self.reader, self.url)['X-Cache'], 'HIT')
+        self.assertIn('ETag', self.get(self.reader, '/api/products/'))
+
+
+# Liste endpoint'i filtreleri, sıralama ve seyrek alan kümesi
+class ProductFilterTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_products_from([
+            ('Kalem', Decimal('5.00'), 3), ('Kalemlik', Decimal('15.00'), 0),
+            ('Kamyon', Decimal('99.99'), 2), ('Silgi', Decimal('5.00'), 7),
+        ])
+
+    def get_names(self, params):
+        response = self.client.get('/api/products/', params)
+        self.assertEqual(response.status_code, 200)
+        return [row['name'] for row in response.json()['results']]
+
+    def test_filters(self):
+        """Filtreler indeksli aralık koşullarına dönüşmeli"""
+        self.assertEqual(sorted(self.get_names({'name': 'Kal'})), ['Kalem', 'Kalemlik'])
+        self.assertEqual(
+            self.get_names({'price_min': '5', 'price_max': '15', 'ordering': 'price'}),
+            ['Kalem', 'Silgi', 'Kalemlik'],
+        )
+        self.assertNotIn('Kalemlik', self.get_names({'in_stock': 'true'}))
+
+    def test_invalid_parameters_are_rejected(self):
+        """Geçersiz sıralama, alan ve filtre değerleri 400 döndürmeli"""
+        for params in [{'ordering': 'stock'}, {'ordering': 'price,name'},
+                       {'fields': 'secret'}, {'price_min': 'abc'}]:
+            self.assertEqual(self.client.get('/api/products/', params).status_code, 400)
+
+    def test_sparse_fields_with_keyset_pagination(self):
+        """Sadece istenen alanlar dönmeli; cursor yine de sıralama alanından üretilmeli"""
+        response = self.client.get(
+            '/api/products/', {'fields': 'id,name', 'ordering': '-price', 'page_size': 2}
+        )
+        page = response.json()
+        self.assertEqual([set(row) for row in page['results']], [{'id', 'name'}] * 2)
+        next_page = self.client.get(page['next']).json()
+        self.assertEqual([row['name'] for row in next_page['results']], ['Silgi', 'Kalem'])
+
+
+# Katalog dışa aktarma: NDJSON / CSV içeriği ve parça parça akış
+class ProductExportTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_products_from([
+            ('Kalem', '5.00', 3), ('Kırmızı, "özel" kalem', '7.50', 0), ('Çok\nsatırlı; ürün', '1.00', 2),
+        ])
+        cls.expected = [
+            json.loads(JSONRenderer().render(ProductSerializer(product).data))
+            for product in Product.objects.order_by('pk')
+        ]
+
+    def export(self, **params):
+        response = self.client.get('/api/products/export/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response
+
+    def test_ndjson_rows_match_serializer(self):
+        """Her satır liste endpoint'iyle aynı JSON nesnesi olmalı"""
+        response = self.export()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="products.ndjson"')
+        body = b''.join(response.streaming_content).decode()
+        self.assertTrue(body.endswith('\n'))
+        self.assertEqual([json.loads(line) for line in body[:-1].split('\n')], self.expected)
+
+    def test_csv_header_and_escaping(self):
+        """Virgül, tırnak ve satır sonu içeren değerler CSV'de doğru kaçırılmalı"""
+        response = self.export(format='csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        body = b''.join(response.streaming_content).decode()
+        self.assertIn('"Kırmızı, ""özel"" kalem"', body)
+        reader = csv.DictReader(io.StringIO(body, newline=''))
+        self.assertEqual(reader.fieldnames, list(self.expected[0]))
+        self.assertEqual(
+            [(row['id'], row['name'], row['price']) for row in reader],
+            [(str(row['id']), row['name'], row['price']) for row in self.expected],
+        )
+
+    def test_ordering_is_rejected_filters_apply(self):
+        """?ordering= sessizce yok sayılmamalı (400); filtreler id sırasıyla uygulanmalı"""
+        for params in ({'ordering': 'price'}, {'ordering': 'price', 'format': 'csv'}):
+            response = self.client.get('/api/products/export/', params)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('ordering', response.content.decode())
+        body = b''.join(self.export(in_stock='true').streaming_content).decode()
+        self.assertEqual(
+            [json.loads(line)['name'] for line in body.splitlines()],
+            [row['name'] for row in self.expected if row['stock'] > 0],
+        )
+
+    def test_rows_are_streamed_in_chunks(self):
+        """Satırlar yanıt oluşturulurken değil, okundukça chunk_size'lık parçalarla üretilmeli"""
+        with mock.patch.object(ProductExportAPIView, 'chunk_size', 2), \
+                mock.patch.object(QuerySet, 'iterator', autospec=True, side_effect=QuerySet.iterator) as iterator:
+            response = self.export(format='csv')
+            iterator.assert_not_called()
+            chunks = list(response.streaming_content)
+        self.assertEqual(iterator.call_args.kwargs, {'chunk_size': 2})
+        self.assertNotIn('Content-Length', response)
+        # Başlık ayrı bir parçadır; 3 satır 2 + 1 olarak gönderilir
+        rows = [list(csv.reader(io.StringIO(chunk.decode(), newline=''))) for chunk in chunks]
+        self.assertEqual([len(chunk) for chunk in rows], [1, 2, 1])
+        self.assertEqual(rows[0][0], list(self.expected[0]))
+
+
+# Toplu ürün işlemleri (/api/products/bulk/)
+class ProductBulkAPITest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kalem, cls.silgi = create_products_from([('Kalem', '5.00', 3), ('Silgi', '2.50', 7)])
+
+    def setUp(self):
+        # products_changed gönderimlerini (action, pks) olarak kaydeder
+        self.signals = []
+
+        def record(sender, action, pks, **kwargs):
+            self.signals.append((action, sorted(pks) if pks is not None else None))
+
+        products_changed.connect(record, sender=Product, weak=False, dispatch_uid='bulk_test')
+        self.addCleanup(products_changed.disconnect, sender=Product, dispatch_uid='bulk_test')
+
+    def send(self, method, data, query='', content_type='application/json'):
+        body = data if isinstance(data, str) else json.dumps(data)
+        return getattr(self.client, method)('/api/products/bulk/' + query, body, content_type=content_type)
+
+    def stock(self):
+        return dict(Product.objects.values_list('name', 'stock'))
+
+    def test_create_json_and_ndjson(self):
+        """JSON dizisi ve NDJSON satırları bulk_create ile yazılmalı"""
+        response = self.send('post', [{'name': 'Defter', 'price': '12.00', 'stock': 4}])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'created': 1, 'failed': 0, 'errors': []})
+
+        ndjson = '{"name":"Cetvel","price":"3.00","stock":1}\n{"name":"Pergel","price":"9.00","stock":0}\n'
+        response = self.send('post', ndjson, content_type='application/x-ndjson')
+        self.assertEqual(response.json()['created'], 2)
+        self.assertEqual(self.stock(), {'Kalem': 3, 'Silgi': 7, 'Defter': 4, 'Cetvel': 1, 'Pergel': 0})
+
+        created = sorted(Product.objects.filter(name__in=['Defter', 'Cetvel', 'Pergel']).values_list('pk', flat=True))
+        self.assertEqual([action for action, pks in self.signals], ['create', 'create'])
+        self.assertEqual(sorted(self.signals[0][1] + self.signals[1][1]), created)
+
+    def test_row_errors_are_reported_per_index(self):
+        """Hatalı satırlar index ile raporlanmalı, geçerli satırlar yine yazılmalı"""
+        response = self.send('post', [
+            {'name': 'Defter', 'price': '12.00', 'stock': 4},
+            {'name': '', 'price': 'abc'},
+            {'name': 'Cetvel', 'price': '3.00', 'stock': 'çok'},
+        ])
+        self.assertEqual(response.status_code, 207)
+        body = response.json()
+        self.assertEqual((body['created'], body['failed']), (1, 2))
+        self.assertEqual([error['index'] for error in body['errors']], [1, 2])
+        self.assertEqual(set(body['errors'][0]['errors']), {'name', 'price'})
+        self.assertEqual(Product.objects.count(), 3)
+
+        response = self.send('post', [{'price': '1.00'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['created'], 0)
+        self.assertEqual(Product.objects.count(), 3)
+        self.assertEqual(len(self.signals), 1)
+
+        self.assertEqual(self.send('post', {'name': 'Defter'}).status_code, 400)
+
+    def test_database_error_text_is_not_returned(self):
+        """Veritabanı hatası loglanmalı; istemciye SQL / kısıt metni değil sabit mesaj dönmeli"""
+        failed = []
+
+        # İlk INSERT parçası kısıt hatası verir, ikincisi yazılır
+        def fail_first_insert(execute, sql, params, many, context):
+            if sql.startswith('INSERT INTO "products_product"') and not failed:
+                failed.append(sql)
+                raise IntegrityError('UNIQUE constraint failed: products_product.id')
+            return execute(sql, params, many, context)
+
+        rows = [{'name': 'Ürün %d' % index, 'price': '1.00', 'stock': 1} for index in range(3)]
+        with connection.execute_wrapper(fail_first_insert), \
+                self.assertLogs('products.serializers', 'ERROR') as logs:
+            response = self.send('post', rows, query='?batch_size=2')
+        self.assertEqual(response.status_code, 207)
+        body = response.json()
+        self.assertEqual((body['created'], body['failed']), (1, 2))
+        self.assertEqual(body['errors'], [
+            {'index': index, 'errors': {'non_field_errors': ['Kayıt yazılamadı.']}} for index in (0, 1)
+        ])
+        self.assertNotIn('UNIQUE', response.content.decode())
+        self.assertIn('UNIQUE constraint failed', logs.output[0])
+
+    def test_upsert_updates_existing_and_inserts_new(self):
+        """?upsert=id mevcut satırı güncellemeli (ON CONFLICT), yenisini eklemeli"""
+        response = self.send('post', [
+            {'id': self.kalem.pk, 'name': 'Kalem', 'price': '6.00', 'stock': 10},
+            {'id': 999, 'name': 'Defter', 'price': '12.00', 'stock': 4},
+            {'name': 'Anahtarsız', 'price': '1.00', 'stock': 1},
+        ], query='?upsert=id')
+        self.assertEqual(response.status_code, 207)
+        body = response.json()
+        self.assertEqual((body['upserted'], body['failed']), (2, 1))
+        self.assertEqual(body['errors'], [{'index': 2, 'errors': {'id': ['Bu alan zorunludur.']}}])
+
+        self.assertEqual(Product.objects.count(), 3)
+        kalem = Product.objects.get(pk=self.kalem.pk)
+        self.assertEqual((kalem.price, kalem.stock), (Decimal('6.00'), 10))
+        self.assertGreater(kalem.updated_at, self.kalem.updated_at)
+        self.assertEqual(Product.objects.get(pk=999).name, 'Defter')
+        self.assertEqual(self.signals, [('update', [self.kalem.pk, 999])])
+
+        response = self.send('post', [], query='?upsert=name')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('upsert', response.json())
+
+    def test_patch_rows_report_unknown_ids(self):
+        """Satır listesinde bulunmayan id'ler satır hatası olmalı, diğerleri güncellenmeli"""
+        response = self.send('patch', [
+            {'id': self.kalem.pk, 'stock': 1}, {'id': 999, 'stock': 2}, {'id': 'x', 'stock': 3}, {'stock': 4},
+        ])
+        self.assertEqual(response.status_code, 207)
+        body = response.json()
+        self.assertEqual((body['updated'], body['failed']), (1, 3))
+        self.assertEqual(body['errors'][0], {'index': 1, 'errors': {'id': ['Ürün bulunamadı.']}})
+        self.assertEqual([error['index'] for error in body['errors']], [1, 2, 3])
+        self.assertEqual(self.stock(), {'Kalem': 1, 'Silgi': 7})
+        self.assertEqual(self.signals, [('update', [self.kalem.pk])])
+
+        response = self.send('patch', [{'id': 999, 'stock': 2}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['updated'], 0)
+        self.assertEqual(len(self.signals), 1)
+
+    def test_patch_values_sends_matched_pks(self):
+        """Filtre ve id formu sinyalde sadece gerçekten güncellenen id'leri bildirmeli"""
+        response = self.send('patch', {'filter': {'stock__lt': 5}, 'values': {'stock': 0}})
+        self.assertEqual(response.json(), {'updated': 1})
+        response = self.send('patch', {'ids': [self.silgi.pk, 999], 'values': {'price': '1.00'}})
+        self.assertEqual(response.json(), {'updated': 1})
+
+        self.assertEqual(self.stock(), {'Kalem': 0, 'Silgi': 7})
+        self.assertEqual(Product.objects.get(pk=self.silgi.pk).price, Decimal('1.00'))
+        self.assertEqual(self.signals, [('update', [self.kalem.pk]), ('update', [self.silgi.pk])])
+        self.assertEqual(self.send('patch', {'filter': {'stock': 99}, 'values': {'stock': 1}}).json(), {'updated': 0})
+        self.assertEqual(len(self.signals), 2)
+
+    def test_delete_reads_only_ids_and_sends_one_signal(self):
+        """Silme sadece id'leri okumalı; bağlı satırlar toplu silinmeli, tek sinyal olmalı"""
+        extra = [product.pk for product in create_products(5, stock=0)]
+        StockReservation.objects.create(product_id=extra[0], quantity=2)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.send('delete', {'filter': {'stock': 0}})
+        self.assertEqual(response.json(), {'deleted': 5})
+        statements = [query['sql'] for query in queries if not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+        self.assertEqual(len(statements), 4)
+        self.assertTrue(statements[0].startswith('SELECT "products_product"."id" AS "pk" FROM'))
+        self.assertNotIn('ORDER BY', statements[0])
+        self.assertTrue(statements[1].startswith('SELECT "products_product"."id" FROM'))
+        self.assertTrue(statements[2].startswith('DELETE FROM "products_stockreservation" WHERE'))
+        self.assertTrue(statements[3].startswith('DELETE FROM "products_product" WHERE'))
+        self.assertFalse(StockReservation.objects.exists())
+        self.assertEqual(self.signals, [('delete', sorted(extra))])
+
+        response = self.send('delete', {'ids': [self.kalem.pk, 999]})
+        self.assertEqual(response.json(), {'deleted': 1})
+        self.assertEqual(self.stock(), {'Silgi': 7})
+        self.assertEqual(self.signals[-1], ('delete', [self.kalem.pk]))
+        self.assertEqual(stats.read(), stats.compute())
+
+    def test_detail_delete_sends_signal_without_post_delete(self):
+        """post_delete dinleyicisi olmamalı (hızlı silme); detay DELETE sinyali kendisi göndermeli"""
+        self.assertFalse(post_delete.has_listeners(Product))
+        self.assertEqual(self.client.delete('/api/products/%d/' % self.silgi.pk).status_code, 204)
+        self.assertEqual(self.signals, [('delete', [self.silgi.pk])])
+
+    def test_batch_size_is_capped(self):
+        """?batch_size üst sınırla kırpılmalı; her parça ayrı bir bulk_create olmalı"""
+        rows = [{'name': 'Ürün %d' % index, 'price': '1.00', 'stock': 1} for index in range(5)]
+        with mock.patch.object(ProductBulkAPIView, 'max_batch_size', 2), \
+                mock.patch.object(QuerySet, 'bulk_create', autospec=True, side_effect=QuerySet.bulk_create) as bulk_create:
+            response = self.send('post', rows, query='?batch_size=1000')
+        self.assertEqual(response.json()['created'], 5)
+        self.assertEqual([len(call.args[1]) for call in bulk_create.call_args_list], [2, 2, 1])
+        self.assertEqual(Product.objects.count(), 7)
+
+        self.assertEqual(self.send('post', rows, query='?batch_size=abc').status_code, 400)
+
+
+# Stok rezervasyonu / iadesi: koşullu UPDATE, 404 / 409 ve hep-ya-hiç sipariş
+class ProductStockTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kalem, cls.silgi = create_products_from([('Kalem', '5.00', 5), ('Silgi', '2.50', 3)])
+
+    def post(self, path, data):
+        return self.client.post('/api/products/' + path, data, content_type='application/json')
+
+    def stock(self):
+        return dict(Product.objects.values_list('name', 'stock'))
+
+    def reserved(self, product):
+        return StockReservation.objects.filter(product=product).values_list('quantity', flat=True).first()
+
+    def test_reserve_and_release_are_capped(self):
+        """İade, ayrılmış ve henüz iade edilmemiş miktarı aşmamalı"""
+        response = self.post('%d/reserve/' % self.kalem.pk, {'quantity': 2})
+        self.assertEqual(response.json(), {'id': self.kalem.pk, 'quantity': 2, 'stock': 3})
+        self.assertEqual(self.post('%d/release/' % self.kalem.pk, {'quantity': 1}).json()['stock'], 4)
+
+        response = self.post('%d/release/' % self.kalem.pk, {'quantity': 2})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['lines'], [{'id': self.kalem.pk, 'requested': 2, 'reserved': 1}])
+        self.assertEqual((self.stock()['Kalem'], self.reserved(self.kalem)), (4, 1))
+
+        self.assertEqual(self.post('%d/release/' % self.kalem.pk, {'quantity': 1}).json()['stock'], 5)
+        self.assertEqual(self.reserved(self.kalem), 0)
+        response = self.post('%d/release/' % self.silgi.pk, {'quantity': 1})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['lines'], [{'id': self.silgi.pk, 'requested': 1, 'reserved': 0}])
+
+    def test_insufficient_stock_and_missing_product(self):
+        """Yetersiz stok 409, bilinmeyen ürün 404 döndürmeli; stok değişmemeli"""
+        response = self.post('%d/reserve/' % self.kalem.pk, {'quantity': 6})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json(), {
+            'detail': 'Yetersiz stok.', 'lines': [{'id': self.kalem.pk, 'requested': 6, 'available': 5}],
+        })
+        self.assertEqual(self.post('999/reserve/', {'quantity': 1}).status_code, 404)
+        self.assertEqual(self.post('999/release/', {'quantity': 1}).status_code, 404)
+        self.assertEqual(self.post('%d/reserve/' % self.kalem.pk, {'quantity': 0}).status_code, 400)
+        self.assertEqual(self.stock(), {'Kalem': 5, 'Silgi': 3})
+
+    def test_multi_line_order_is_all_or_nothing(self):
+        """Bir satır başarısızsa önceki satırlar da geri alınmalı"""
+        for lines, status_code in [
+            ([{'id': self.kalem.pk, 'quantity': 2}, {'id': self.silgi.pk, 'quantity': 4}], 409),
+            ([{'id': self.kalem.pk, 'quantity': 2}, {'id': 999, 'quantity': 1}], 404),
+        ]:
+            self.assertEqual(self.post('reserve/', {'lines': lines}).status_code, status_code)
+            self.assertEqual(self.stock(), {'Kalem': 5, 'Silgi': 3})
+            self.assertIsNone(self.reserved(self.kalem))
+
+        # Aynı ürünün satırları toplanır
+        response = self.post('reserve/', {'lines': [
+            {'id': self.kalem.pk, 'quantity': 1}, {'id': self.silgi.pk, 'quantity': 3}, {'id': self.kalem.pk, 'quantity': 1},
+        ]})
+        self.assertEqual(response.json()['lines'], [
+            {'id': self.kalem.pk, 'quantity': 2, 'stock': 3}, {'id': self.silgi.pk, 'quantity': 3, 'stock': 0},
+        ])
+        response = self.post('release/', {'lines': [{'id': self.kalem.pk, 'quantity': 2}, {'id': self.silgi.pk, 'quantity': 4}]})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.stock(), {'Kalem': 3, 'Silgi': 0})
+        self.assertEqual(self.reserved(self.kalem), 2)
+
+    def test_update_is_conditional_under_concurrent_writes(self):
+        """İstek ile UPDATE arasında başka bir sipariş stoğu düşürürse sonuç ona göre olmalı"""
+        def run_with_competitor(quantity, taken):
+            # Rezervasyon UPDATE'i çalışmadan hemen önce başka bir istek stoğu düşürür
+            fired = []
+
+            def competitor(execute, sql, params, many, context):
+                if sql.startswith('UPDATE "products_product"') and not fired:
+                    fired.append(sql)
+                    Product.objects.filter(pk=self.kalem.pk).update(stock=F('stock') - taken)
+                return execute(sql, params, many, context)
+
+            with connection.execute_wrapper(competitor):
+                response = self.post('%d/reserve/' % self.kalem.pk, {'quantity': quantity})
+            self.assertTrue(fired)
+            return response
+
+        # Güncelleme kaybı yok: 5 - 1 (diğer istek) - 2 = 2
+        self.assertEqual(run_with_competitor(2, taken=1).json()['stock'], 2)
+        # Diğer istek stoğu 1'e düşürdü: koşul sağlanmaz, stok negatife düşmez
+        # (testte diğer istek aynı bağlantıda çalıştığı için geri alma onu da kapsar)
+        response = run_with_competitor(2, taken=1)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual((self.stock()['Kalem'], self.reserved(self.kalem)), (2, 2))
+
+
+# Keyset sayfalama: eşit created_at değerlerinde kararlı sıra, bozuk cursor
+# için 400 ve COUNT sorgusu olmadan tek sorguluk sayfalar
+class ProductKeysetPaginationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_products(7)
+        # Hepsi aynı anda oluşturulmuş gibi: sıra sadece id ile belirlenir
+        Product.objects.update(created_at=timezone.now())
+        cls.ids = sorted(Product.objects.values_list('id', flat=True), reverse=True)
+
+    def setUp(self):
+        get_product_cache().clear()
+
+    def walk(self, url, link):
+        pages = []
+        while url:
+            data = self.client.get(url).json()
+            pages.append([row['id'] for row in data['results']])
+            url = data[link]
+        return pages
+
+    def test_ties_are_stable_in_both_directions(self):
+        """Eşit created_at değerlerinde sayfalar id ile tekrarsız ve eksiksiz gezilmeli"""
+        forward = self.walk('/api/products/?page_size=3', 'next')
+        self.assertEqual(forward, [self.ids[:3], self.ids[3:6], self.ids[6:]])
+
+        last = self.client.get('/api/products/?page_size=3').json()
+        while last['next']:
+            last = self.client.get(last['next']).json()
+        backward = self.walk(last['previous'], 'previous')
+        self.assertEqual(backward, [self.ids[3:6], self.ids[:3]])
+
+    def test_invalid_cursor_is_bad_request(self):
+        """Bozuk base64, bozuk konum ve başka sıralamaya ait cursor 400 döndürmeli"""
+        def encode(position):
+            return base64.b64encode(urlencode({'p': position}).encode()).decode()
+
+        for cursor in ['bozuk', encode('["x"]'), encode('[1,2,3]')]:
+            response = self.client.get('/api/products/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {'cursor': ['Invalid cursor']})
+        response = self.client.get('/api/products/search/', {'q': 'ürün', 'cursor': encode('["a","b"]')})
+        self.assertEqual(response.status_code, 400)
+
+    def test_pages_run_a_single_query_without_count(self):
+        """Her sayfa LIMIT'li tek bir sorgu olmalı; COUNT(*) çalışmamalı"""
+        url = '/api/products/?page_size=3'
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                url = self.client.get(url).json()['next']
+            self.assertEqual(len(queries), 1)
+            self.assertNotIn('COUNT(', queries[0]['sql'].upper())
+            self.assertIn('LIMIT 4', queries[0]['sql'])
+
+
+# FTS5 tabanlı ürün araması (tetikleyicilerle senkron indeks)
+class ProductSearchTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_products_from(
+            (name, Decimal('1.00'), 1)
+            for name in ['Kırmızı Kalem', 'Mavi Kalem', 'Kalemlik', 'Şeker Paketi', 'Silgi']
+        )
+
+    def search(self, q, **params):
+        response = self.client.get('/api/products/search/', dict(q=q, **params))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def names(self, data):
+        return [row['name'] for row in data['results']]
+
+    def test_prefix_and_diacritics(self):
+        """Ön ek ve aksansız yazım eşleşmeli; tam eşleşme önce gelmeli"""
+        self.assertEqual(set(self.names(self.search('kal'))), {'Kırmızı Kalem', 'Mavi Kalem', 'Kalemlik'})
+        self.assertEqual(self.names(self.search('kalem'))[-1], 'Kalemlik')
+        self.assertEqual(self.names(self.search('seker')), ['Şeker Paketi'])
+
+    def test_typo_fallback(self):
+        """Sonuç yoksa yazım hatası toleransı ile öneri dönmeli"""
+        data = self.search('kalme')
+        self.assertEqual(data['suggestion'], 'kalem')
+        self.assertIn('Mavi Kalem', self.names(data))
+
+    def test_index_follows_writes(self):
+        """update() ve delete() sonrası indeks güncel olmalı"""
+        Product.objects.filter(name='Silgi').update(name='Beyaz Silgi')
+        self.assertEqual(self.names(self.search('beyaz')), ['Beyaz Silgi'])
+        Product.objects.filter(name='Beyaz Silgi').delete()
+        self.assertEqual(self.names(self.search('beyaz')), [])
+
+    def test_cursor_pagination(self):
+        """(rank, id) cursor'ı ile sayfalar tekrarsız ve eksiksiz gezilmeli"""
+        first = self.search('kal', page_size=2)
+        second = self.client.get(first['next']).json()
+        self.assertIsNone(second['next'])
+        self.assertEqual(
+            sorted(self.names(first) + self.names(second)),
+            ['Kalemlik', 'Kırmızı Kalem', 'Mavi Kalem'],
+        )
+
+
+# Tetikleyicilerle güncel tutulan katalog istatistikleri (products/stats.py)
+class ProductStatsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_products_from([
+            ('Kalem', Decimal('5.00'), 10),
+            ('Silgi', Decimal('2.50'), 0),
+            ('Defter', Decimal('19.99'), 3),
+            ('Çanta', Decimal('750.00'), 1),
+        ])
+
+    def assertStatsInSync(self):
+        self.assertEqual(stats.read(), stats.compute())
+
+    def test_summary_follows_every_write_path(self):
+        """save(), bulk_create, update(), F() ve delete() sonrası özet tablo taramasıyla aynı olmalı"""
+        self.assertStatsInSync()
+        Product.objects.create(name='Cetvel', price=Decimal('0.99'), stock=0)
+        create_products(5, start=100)
+        Product.objects.filter(name='Kalem').update(stock=F('stock') - 10, price=Decimal('60.00'))
+        product = Product.objects.get(name='Defter')
+        product.created_at -= timedelta(days=3)
+        product.save()
+        Product.objects.filter(name__in=['Silgi', 'Çanta']).delete()
+        self.assertStatsInSync()
+
+        data = stats.read()
+        self.assertEqual(data['count'], 8)
+        self.assertEqual(data['out_of_stock'], 2)
+        self.assertEqual(len(data['created_per_day']), 2)
+
+    def test_endpoint_reads_summary_tables(self):
+        """Yanıt tutarları metin olarak döndürmeli; sorgu sayısı sabit olmalı"""
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/products/stats/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['inventory_value'], '859.97')
+        self.assertEqual((data['min_price'], data['max_price']), ('2.50', '750.00'))
+        self.assertEqual(
+            [bucket['count'] for bucket in data['price_buckets']], [2, 1, 0, 0, 1, 0, 0]
+        )
+        self.assertEqual(data['price_buckets'][0], {'min': None, 'max': '10.00', 'count': 2})
+        self.assertEqual(
+            data['created_per_day'], [{'date': timezone.now().date().isoformat(), 'count': 4}]
+        )
+        self.assertEqual(self.client.get('/api/products/stats/', {'days': 'x'}).status_code, 400)
+
+    def test_rebuild_command_repairs_drift(self):
+        """--check farkı raporlamalı; yeniden oluşturma özeti düzeltmeli"""
+        call_command('rebuild_product_stats', '--check', stdout=io.StringIO())
+        with connection.cursor() as cursor:
+            cursor.execute('UPDATE %s SET total_stock = 0' % stats.STATS_TABLE)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_product_stats', '--check', stdout=io.StringIO())
+        call_command('rebuild_product_stats', stdout=io.StringIO())
+        self.assertStatsInSync()
+
+
+# Değişiklik akışı (products/changes.py, /api/products/changes/)
+class ProductChangesTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kalem, cls.silgi = create_products_from([('Kalem', '5.00', 3), ('Silgi', '2.50', 7)])
+
+    def setUp(self):
+        self.since = changes.latest()
+
+    def feed(self, **params):
+        response = self.client.get('/api/products/changes/', {'since': self.since, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_every_write_path_is_recorded_in_order(self):
+        """save, bulk_create, update(), delete() kaydedilmeli; ürün başına son kayıt dönmeli"""
+        Product.objects.filter(pk=self.kalem.pk).update(stock=F('stock') - 1)
+        defter = Product.objects.create(name='Defter', price='9.90', stock=1)
+        silgi_pk = self.silgi.pk
+        self.silgi.delete()
+        (cetvel,) = create_products_from([('Cetvel', '1.00', 2)])
+        defter.stock = 5
+        defter.save()
+
+        data = self.feed()
+        self.assertEqual(
+            [(row['id'], row['action']) for row in data['results']],
+            [(self.kalem.pk, 'update'), (silgi_pk, 'delete'), (cetvel.pk, 'create'), (defter.pk, 'update')],
+        )
+        self.assertEqual(data['results'][0]['data']['stock'], 2)
+        self.assertIsNone(data['results'][1]['data'])
+        self.assertEqual(data['cursor'], changes.latest())
+        self.since = data['cursor']
+        self.assertEqual(self.feed(), {'results': [], 'cursor': self.since, 'has_more': False})
+
+    def test_batches_and_expired_cursor(self):
+        """limit ile partiler sıralı gelmeli; budanan cursor 410 almalı"""
+        create_products(5)
+        first = self.feed(limit=3)
+        self.assertTrue(first['has_more'])
+        self.since = first['cursor']
+        second = self.feed(limit=3)
+        self.assertFalse(second['has_more'])
+        self.assertEqual(len(first['results']) + len(second['results']), 5)
+
+        call_command('prune_product_changes', '--days', '0', stdout=io.StringIO())
+        response = self.client.get('/api/products/changes/', {'since': 0})
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.json()['cursor'], changes.latest())
+        self.assertEqual(self.client.get('/api/products/export/')['X-Change-Cursor'], str(changes.latest()))
+        self.assertEqual(
+            self.client.get('/api/products/changes/', {'since': changes.latest() + 1}).status_code, 410
+        )
+
+    # Bildirim gelmezse istek 30 sn sonra veritabanını kontrol ederdi
+    @override_settings(PRODUCT_CHANGES_POLL_INTERVAL=30)
+    async def test_long_poll_wakes_on_commit(self):
+        """Bekleyen istek commit sonrası hemen yeni kaydı almalı"""
+        request = asyncio.ensure_future(
+            self.async_client.get('/api/products/changes/', {'since': self.since, 'wait': 10})
+        )
+        await asyncio.sleep(0.05)
+        self.assertFalse(request.done())
+
+        def write():
+            with self.captureOnCommitCallbacks(execute=True):
+                return Product.objects.create(name='Defter', price='9.90', stock=1)
+
+        defter = await sync_to_async(write)()
+        response = await asyncio.wait_for(request, timeout=5)
+        self.assertEqual([row['id'] for row in response.json()['results']], [defter.pk])
+
+    async def test_event_stream(self):
+        """SSE olayları seq id'si ile gelmeli; WSGI'de 406 dönmeli"""
+        response = await self.async_client.get(
+            '/api/products/changes/', {'since': self.since - 2}, headers={'accept': 'text/event-stream'}
+        )
+        self.assertEqual(response['Content-Type'], 'text/event-stream; charset=utf-8')
+        events = response.streaming_content.__aiter__()
+        self.assertEqual(await anext(events), b'retry: 2000\n\n')
+        event = (await anext(events)).decode()
+        self.assertTrue(event.startswith('id: %d\nevent: change\ndata: ' % (self.since - 1)))
+        self.assertEqual(json.loads(event.split('data: ', 1)[1])['id'], self.kalem.pk)
+
+        response = await sync_to_async(self.client.get)(
+            '/api/products/changes/', headers={'accept': 'text/event-stream'}
+        )
+        self.assertEqual(response.status_code, 406)
+
+
+
+# Canlı stok akışı core/asgi.py üzerinden (Django view'ları dışında) sunulur
+class LiveStockTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kalem, cls.silgi = create_products_from([('Kalem', '5.00', 3), ('Silgi', '2.50', 7)])
+
+    def open_stream(self, query, host=b'testserver'):
+        disconnected = asyncio.Event()
+        sent = asyncio.Queue()
+        messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': '/api/products/live/', 'root_path': '',
+            'query_string': query.encode(), 'headers': [(b'host', host)],
+        }
+        task = asyncio.ensure_future(asgi_application(scope, receive, sent.put))
+        return task, sent, disconnected
+
+    async def next_events(self, sent):
+        message = await asyncio.wait_for(sent.get(), timeout=5)
+        return [
+            (block.split('\n')[0][len('event: '):], json.loads(block.split('data: ', 1)[1]))
+            for block in message['body'].decode().strip().split('\n\n')
+        ]
+
+    async def test_snapshot_then_pushed_changes(self):
+        """Açılışta anlık görüntü, sonra sadece stok / fiyatı değişen ürünler gelmeli"""
+        task, sent, disconnected = self.open_stream('ids=%d,%d,999999' % (self.kalem.pk, self.silgi.pk))
+        start = await sent.get()
+        self.assertEqual(start['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream; charset=utf-8'), start['headers'])
+        self.assertEqual((await sent.get())['body'], b'retry: 2000\n\n')
+        self.assertEqual(await self.next_events(sent), [
+            ('stock', {'id': self.kalem.pk, 'stock': 3, 'price': '5.00'}),
+            ('stock', {'id': self.silgi.pk, 'stock': 7, 'price': '2.50'}),
+            ('delete', {'id': 999999}),
+        ])
+
+        def write():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.silgi.name = 'Silgi (büyük)'
+                self.silgi.save()
+                Product.objects.filter(pk=self.kalem.pk).update(stock=F('stock') - 1)
+                products_changed.send(sender=Product, action='update', pks=[self.kalem.pk])
+
+        await sync_to_async(write)()
+        self.assertEqual(await self.next_events(sent), [('stock', {'id': self.kalem.pk, 'stock': 2, 'price': '5.00'})])
+
+        def bulk_write():
+            with self.captureOnCommitCallbacks(execute=True):
+                Product.objects.filter(stock__gt=5).update(stock=0)
+                products_changed.send(sender=Product, action='update', pks=None)
+
+        await sync_to_async(bulk_write)()
+        self.assertEqual(await self.next_events(sent), [
+            ('stock', {'id': self.kalem.pk, 'stock': 2, 'price': '5.00'}),
+            ('stock', {'id': self.silgi.pk, 'stock': 0, 'price': '2.50'}),
+            ('delete', {'id': 999999}),
+        ])
+
+        disconnected.set()
+        await asyncio.wait_for(task, timeout=5)
+        self.assertEqual(get_broker().subscriber_count(), 0)
+
+    async def test_invalid_requests(self):
+        """ids eksik / fazla veya host izinsizse 400 dönmeli"""
+        with override_settings(LIVE_STOCK_MAX_IDS=2):
+            for query, host in (('', b'testserver'), ('ids=a', b'testserver'),
+                                ('ids=1,2,3', b'testserver'), ('ids=1', b'evil.example')):
+                task, sent, _ = self.open_stream(query, host)
+                await asyncio.wait_for(task, timeout=5)
+                self.assertEqual((await sent.get())['status'], 400)
+        self.assertEqual(get_broker().subscriber_count(), 0)
+
+
+# Async view'lar senkron view'larla aynı yanıtı üretmeli
+class AsyncProductViewTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_products_from([
+            ('Kalem', Decimal('5.00'), 1), ('Silgi', Decimal('2.50'), 1), ('Defter', Decimal('12.00'), 1),
+        ])
+
+    def setUp(self):
+        get_product_cache().clear()
+
+    async def call(self, view, method, path, data=None, **kwargs):
+        factory = AsyncRequestFactory()
+        if method == 'get':
+            request = factory.get(path, data)
+        else:
+            request = getattr(factory, method)(path, data, content_type='application/json')
+        return await view.as_view()(request, **kwargs)
+
+    async def test_list_and_detail_match_sync_views(self):
+        """Liste, filtre, cursor ve detay gövdeleri senkron view ile aynı olmalı"""
+        pk = (await Product.objects.aget(name='Kalem')).pk
+        cases = [
+            (AsyncProductListCreateAPIView, ProductListCreateAPIView, '/api/products/', {'page_size': 2}, {}),
+            (AsyncProductListCreateAPIView, ProductListCreateAPIView, '/api/products/',
+             {'ordering': 'price', 'fields': 'id,name'}, {}),
+            (AsyncProductRetrieveUpdateDestroyAPIView, ProductRetrieveUpdateDestroyAPIView,
+             '/api/products/%s/' % pk, None, {'pk': pk}),
+        ]
+        cache = get_product_cache()
+        for async_view, sync_view, path, params, kwargs in cases:
+            response = await self.call(async_view, 'get', path, params, **kwargs)
+            # Yanıtlar silinir, nesiller korunur (liste ETag'i nesle bağlıdır)
+            generations = await aget_generations(cache)
+            await cache.aclear()
+            await cache.aset_many(generations, timeout=None)
+            request = RequestFactory().get(path, params, HTTP_ACCEPT='application/json')
+            expected = await sync_to_async(lambda: sync_view.as_view()(request, **kwargs).render())()
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.content), json.loads(expected.content))
+            self.assertEqual(response['ETag'], expected['ETag'])
+
+    async def test_write_methods(self):
+        """POST / PATCH / DELETE async ORM ile çalışmalı, 404 ve 400 korunmalı"""
+        response = await self.call(
+            AsyncProductListCreateAPIView, 'post', '/api/products/',
+            {'name': 'Cetvel', 'price': '3.00', 'stock': 4},
+        )
+        self.assertEqual(response.status_code, 201)
+        pk = json.loads(response.content)['id']
+        detail = AsyncProductRetrieveUpdateDestroyAPIView
+        response = await self.call(detail, 'patch', '/', {'stock': 9}, pk=pk)
+        self.assertEqual(json.loads(response.content)['stock'], 9)
+        self.assertEqual((await Product.objects.aget(pk=pk)).stock, 9)
+        response = await self.call(detail, 'patch', '/', {'price': 'abc'}, pk=pk)
+        self.assertEqual(response.status_code, 400)
+        deleted = []
+        products_changed.connect(
+            lambda sender, action, pks, **kwargs: deleted.append((action, pks)),
+            sender=Product, weak=False, dispatch_uid='async_delete_test',
+        )
+        self.addCleanup(products_changed.disconnect, sender=Product, dispatch_uid='async_delete_test')
+        self.assertEqual((await self.call(detail, 'delete', '/', pk=pk)).status_code, 204)
+        self.assertEqual(deleted, [('delete', [pk])])
+        self.assertEqual((await self.call(detail, 'get', '/', pk=pk)).status_code, 404)
+
+
+# Ana sayfa bir kez üretilip sıkıştırılmış olarak bellekten sunulmalı
+class HomeViewTest(TestCase):
+
+    def test_home_is_precomputed_and_compressed(self):
+        """Endpoint'ler URL desenlerinden listelenmeli; gzip, ETag ve 304 desteklenmeli"""
+        plain = self.client.get('/')
+        body = plain.content.decode()
+        self.assertIn('<a href="/api/products/">/api/products/</a> <small>GET, POST</small>', body)
+        self.assertIn('<code>/api/products/&lt;int:pk&gt;/</code>', body)
+        self.assertIn('/metrics', body)
+        self.assertIn('Admin Paneli', body)
+        self.assertNotIn('Content-Encoding', plain)
+
+        with self.assertNumQueries(0):
+            compressed = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertEqual(compressed['ETag'], plain['ETag'])
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+
+        self.assertNotIn('Content-Encoding', self.client.get('/', HTTP_ACCEPT_ENCODING='gzip;q=0'))
+        self.assertEqual(self.client.get('/', HTTP_IF_NONE_MATCH=plain['ETag']).status_code, 304)
+
+    def test_template_view_uses_same_endpoints(self):
+        """Şablonlu ana sayfa da URL desenlerinden üretilmeli"""
+        response = home_template_view(RequestFactory().get('/'))
+        self.assertContains(response, 'Ürün listeleme ve yeni ürün oluşturma endpointi')
+        self.assertContains(response, '<small>GET, PUT, PATCH, DELETE</small>')
+
+
+# Ölçüm paketi (products/benchmarks.py, benchmark_api komutu)
+class BenchmarkSuiteTest(TestCase):
+
+    def setUp(self):
+        get_product_cache().clear()
+
+    # Transport'lar gerçek sunucu gibi Host: localhost gönderir
+    @override_settings(ALLOWED_HOSTS=['localhost'])
+    def test_scenarios_run_against_seeded_rows(self):
+        """Tüm senaryolar hatasız çalışmalı; delete, create'in eklediklerini silmeli"""
+        seed_products(30)
+        self.assertEqual(Product.objects.count(), 30)
+        self.assertEqual(Product.objects.get(name='Ürün 7').price, Decimal('7.07'))
+
+        results = run_scenarios(ClientTransport(), SCENARIOS, iterations=3, warmup=1, page_size=5)
+        self.assertEqual(list(results), list(SCENARIOS))
+        for metrics in results.values():
+            self.assertEqual((metrics['requests'], metrics['errors']), (3, 0))
+            self.assertLessEqual(metrics['p50_ms'], metrics['p99_ms'])
+        # create (ısınma + ölçüm) ve delete için eklenenlerin hepsi silinir
+        self.assertEqual(Product.objects.count(), 30)
+
+    def test_compare_flags_regressions_beyond_threshold(self):
+        """req/s düşüşü ve gecikme artışı eşiği aşınca raporlanmalı"""
+        self.assertEqual([parse_scale(value) for value in ('1k', '100k', '1m', '2500')],
+                         [1000, 100000, 1000000, 2500])
+        baseline = {'results': {'wsgi': {'detail': {'rps': 100, 'p50_ms': 5, 'p99_ms': 10, 'errors': 0}}}}
+        current = {'results': {'wsgi': {'detail': {'rps': 95, 'p50_ms': 6, 'p99_ms': 10.5, 'errors': 0}}}}
+        regressions = compare_results(baseline, current, threshold=0.10)
+        self.assertEqual([item['metric'] for item in regressions], ['p50_ms'])
+        self.assertEqual(compare_results(baseline, current, threshold=0.25), [])
+
+
+# explain_queries komutu: planlar doldurulmuş geçici veritabanında çıkarılır
+# Test veritabanı zaten geçici olduğu için benchmark_database() burada
+# yeni bir veritabanı açmak yerine mevcut bağlantıyı döndürür
+@mock.patch(
+    'products.management.commands.explain_queries.benchmark_database',
+    lambda: contextlib.nullcontext(connection),
+)
+@override_settings(ALLOWED_HOSTS=['localhost'])
+class ExplainQueriesCommandTest(TestCase):
+
+    def setUp(self):
+        get_product_cache().clear()
+
+    def test_command_passes_on_seeded_database(self):
+        """Tüm senaryolar indeks kullanmalı; örnek ürünler eklenmiş olmalı"""
+        out = io.StringIO()
+        call_command('explain_queries', '--rows', '500', stdout=out)
+        self.assertEqual(Product.objects.count(), 500)
+        self.assertIn('tam tablo taraması yapmıyor (500 ürün)', out.getvalue())
+        self.assertIn('USING COVERING INDEX product_price_idx  (beklenen)', out.getvalue())
+
+    def test_covering_index_scan_without_limit_fails(self):
+        """COUNT(*) gibi LIMIT'siz indeks taramaları da tam tarama sayılmalı"""
+        with mock.patch.object(ExplainQueriesCommand, 'full_scan_allowed', {'Export'}):
+            with self.assertRaisesMessage(CommandError, 'Liste: sayfa numaralı'):
+                call_command('explain_queries', '--rows', '50', stdout=io.StringIO())
+
+    def test_scan_rules(self):
+        """SCAN sadece LIMIT'li ve indeks sıralı sorgularda kabul edilmeli"""
+        command = ExplainQueriesCommand()
+        covering = 'SCAN products_product USING COVERING INDEX product_price_idx'
+        self.assertTrue(command.is_full_scan('SELECT COUNT(*) FROM p', [covering], covering))
+        self.assertFalse(command.is_full_scan('SELECT * FROM p LIMIT 21', [covering], covering))
+        self.assertTrue(command.is_full_scan(
+            'SELECT * FROM p ORDER BY x LIMIT 21', [covering, 'USE TEMP B-TREE FOR ORDER BY'], covering,
+        ))
+        search = 'SEARCH products_product USING INDEX product_name_idx (name>? AND name<?)'
+        self.assertFalse(command.is_full_scan('SELECT * FROM p', [search], search))
+
+
+# Anlık görüntü anahtarı ve eski dosyaların temizlenmesi (products/testing.py)
+class SnapshotFileTest(TestCase):
+
+    class Catalog(SeededSnapshotTestCase):
+        snapshot_name = 'Catalog'
+
+    def snapshot_key(self):
+        connection.ensure_connection()
+        return testing._snapshot_key(self.Catalog, connection.connection)
+
+    def test_key_covers_factory_sources(self):
+        """Fabrika kodu değişince anahtar da değişmeli"""
+        key = self.snapshot_key()
+        self.assertTrue(key.startswith('Catalog-'))
+        self.assertEqual(self.snapshot_key(), key)
+        with mock.patch.object(testing, 'SNAPSHOT_FACTORIES', testing.SNAPSHOT_FACTORIES[:-1]):
+            self.assertNotEqual(self.snapshot_key(), key)
+        with mock.patch.object(self.Catalog, 'snapshot_factories', (parse_scale,)):
+            self.assertNotEqual(self.snapshot_key(), key)
+
+    def test_prune_removes_only_stale_files_of_same_name(self):
+        """Aynı adın eski dosyaları silinmeli; güncel ve başka adlı dosyalar kalmalı"""
+        key = 'Catalog-' + '1' * 16
+        names = [
+            key + '.sqlite3',
+            'Catalog-' + '2' * 16 + '.sqlite3',
+            'Catalog-' + '3' * 16 + '.sqlite3.' + 'a' * 32 + '.tmp',
+            'CatalogExtra-' + '4' * 16 + '.sqlite3',
+        ]
+        with tempfile.TemporaryDirectory() as directory, override_settings(TEST_SNAPSHOT_DIR=directory):
+            for name in names:
+                open(os.path.join(directory, name), 'w').close()
+            testing._prune_snapshots(self.Catalog, key)
+            self.assertEqual(sorted(os.listdir(directory)), [names[0], names[3]])
+
+    def test_seed_database_defaults_to_no_op(self):
+        """seed_database() tanımlamayan sınıf boş tablolarla çalışabilmeli"""
+        self.assertIsNone(self.Catalog.seed_database())
+
+
+# Büyük katalog (100.000 ürün): sayfalama, filtre ve arama ölçekte doğru çalışmalı
+# Veri products/testing.py anlık görüntüsünden yüklenir; sadece ilk
+# çalıştırmada üretilir
+class LargeCatalogTest(SeededSnapshotTestCase):
+    rows = 100_000
+
+    @classmethod
+    def seed_database(cls):
+        seed_products(cls.rows)
+
+    def setUp(self):
+        get_product_cache().clear()
+
+    def test_keyset_pages_do_not_overlap(self):
+        """Cursor sayfaları sabit sayıda sorgu ile ardışık ve çakışmasız olmalı"""
+        response = self.client.get('/api/products/', {'page_size': 100})
+        first = [row['id'] for row in response.json()['results']]
+        with self.assertNumQueries(1):
+            response = self.client.get(response.json()['next'])
+        second = [row['id'] for row in response.json()['results']]
+        self.assertEqual(first[:2], [self.rows, self.rows - 1])
+        self.assertEqual(second, list(range(self.rows - 100, self.rows - 200, -1)))
+
+    def test_page_number_count_and_last_page(self):
+        """Sayfa numaralı sayfalama toplam satırı ve son sayfayı doğru vermeli"""
+        response = self.client.get(
+            '/api/products/', {'pagination': 'page', 'page_size': 100, 'page': self.rows // 100}
+        )
+        body = response.json()
+        self.assertEqual(body['count'], self.rows)
+        self.assertIsNone(body['next'])
+        self.assertEqual(body['results'][-1]['id'], 1)
+
+    def test_filter_and_search_at_scale(self):
+        """Filtre ve tam metin arama büyük tabloda doğru satırları bulmalı"""
+        response = self.client.get('/api/products/', {'pagination': 'page', 'in_stock': 'false'})
+        self.assertEqual(response.json()['count'], self.rows // 250)
+        response = self.client.get('/api/products/search/', {'q': '99999'})
+        self.assertIn('Ürün 99999', [row['name'] for row in response.json()['results']])
+
+    def test_stats_are_read_from_summary_tables(self):
+        """İstatistikler tablo taranmadan, sabit sayıda sorguyla okunmalı"""
+        with self.assertNumQueries(3):
+            data = self.client.get('/api/products/stats/').json()
+        self.assertEqual(data['count'], self.rows)
+        self.assertEqual(data['out_of_stock'], self.rows // 250)
+        self.assertEqual(sum(bucket['count'] for bucket in data['price_buckets']), self.rows)
+
+    def test_write_is_rolled_back_between_tests(self):
+        """Testteki yazmalar sonraki testlere taşınmamalı"""
+        create_products(3, start=self.rows + 1)
+        Product.objects.filter(pk=1).delete()
+        self.assertEqual(Product.objects.count(), self.rows + 2)
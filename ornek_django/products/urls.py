@@ -1,13 +1,33 @@
 # Django URL yönlendirme için gerekli modülü import ediyoruz
 # path fonksiyonu, URL desenlerini tanımlamak için kullanılır
 # Bu modül, API endpoint'lerinin URL yapısını oluşturmak için gerekli
+from django.conf import settings
 from django.urls import path
 
 # Kendi uygulamamızdan view sınıflarını import ediyoruz
 # Bu view'lar, API endpoint'lerinin işlevselliğini sağlar
 # ProductListCreateAPIView: Ürün listesi ve oluşturma işlemleri
 # ProductRetrieveUpdateDestroyAPIView: Ürün detay, güncelleme ve silme işlemleri
-from .views import ProductListCreateAPIView, ProductRetrieveUpdateDestroyAPIView
+from .views import (
+    ProductBulkAPIView,
+    ProductExportAPIView,
+    ProductListCreateAPIView,
+    ProductRetrieveUpdateDestroyAPIView,
+    ProductSearchAPIView,
+    ProductStatsAPIView,
+    ProductStockAPIView,
+)
+
+# Değişiklik akışı long-poll ve SSE için her zaman async view'dır
+from .async_views import ProductChangesAPIView
+
+# PRODUCTS_ASYNC_VIEWS ayarı açıksa liste ve detay endpoint'leri async
+# view'larla (products/async_views.py) sunulur; URL'ler ve yanıtlar aynıdır
+if getattr(settings, 'PRODUCTS_ASYNC_VIEWS', False):
+    from .async_views import (
+        AsyncProductListCreateAPIView as ProductListCreateAPIView,
+        AsyncProductRetrieveUpdateDestroyAPIView as ProductRetrieveUpdateDestroyAPIView,
+    )
 
 # =============================================================================
 # DJANGO PRODUCTS URLS.PY API URL KONFİGÜRASYON DOSYASI
@@ -26,6 +46,13 @@ from .views import ProductListCreateAPIView, ProductRetrieveUpdateDestroyAPIView
 # Bu dosyada tanımlanan endpoint'ler:
 # - /api/products/ (GET: Liste, POST: Oluştur)
 # - /api/products/<id>/ (GET: Detay, PUT: Güncelle, DELETE: Sil)
+# - /api/products/export/ (GET: Tüm katalog, NDJSON veya CSV akışı)
+# - /api/products/search/?q= (GET: Tam metin arama, BM25 sıralı)
+# - /api/products/stats/ (GET: Envanter değeri, stok durumu, fiyat dağılımı)
+# - /api/products/changes/?since= (GET: Değişiklik akışı, long-poll / SSE)
+# - /api/products/bulk/ (POST: Toplu oluşturma / upsert, PATCH: Toplu güncelleme, DELETE: Toplu silme)
+# - /api/products/<id>/reserve/, /api/products/<id>/release/ (POST: Stok ayırma / iade)
+# - /api/products/reserve/, /api/products/release/ (POST: Çok satırlı sipariş)
 # =============================================================================
 
 # =============================================================================
@@ -64,7 +91,86 @@ urlpatterns = [
     #   - GET, PUT, PATCH ve DELETE metodlarını destekler
     #   - Tek bir nesne üzerinde işlem yapar
     #   - 404 hatası otomatik olarak döndürülür
-    path('products/<int:pk>/', ProductRetrieveUpdateDestroyAPIView.as_view())
+    path('products/<int:pk>/', ProductRetrieveUpdateDestroyAPIView.as_view()),
+
+    # Katalog dışa aktarma endpoint'i
+    # URL: /api/products/export/
+    # HTTP Metodları:
+    #   - GET: Tüm ürünleri akış (streaming) halinde döndürür
+    # Formatlar:
+    #   - NDJSON (varsayılan): satır başına bir JSON nesnesi
+    #   - CSV: ?format=csv veya Accept: text/csv
+    # View: ProductExportAPIView
+    #   - Liste endpoint'i ile aynı filtreleri kullanır
+    #   - Sayfalama yoktur, bellek kullanımı sabittir
+    path('products/export/', ProductExportAPIView.as_view()),
+
+    # Tam metin arama endpoint'i
+    # URL: /api/products/search/?q=kalem
+    # HTTP Metodları:
+    #   - GET: Sorguyla eşleşen ürünleri alaka düzeyine (BM25) göre döndürür
+    # Özellikler:
+    #   - SQLite FTS5 indeksi (tam tablo taraması yok)
+    #   - Ön ek eşleşmesi ("kal" -> "kalem") ve yazım hatası toleransı
+    #   - (rank, id) üzerinde cursor sayfalama
+    # View: ProductSearchAPIView
+    path('products/search/', ProductSearchAPIView.as_view()),
+
+    # Katalog istatistikleri endpoint'i
+    # URL: /api/products/stats/?days=30
+    # HTTP Metodları:
+    #   - GET: Ürün sayısı, toplam stok, stokta olmayan ürün sayısı,
+    #     envanter değeri (SUM(price * stock)), fiyat aralıkları ve
+    #     günlük oluşturulan ürün sayıları
+    # Özellikler:
+    #   - Tetikleyicilerle güncel tutulan özet tablolarından okunur
+    #     (products/stats.py); ürün tablosu taranmaz
+    #   - days: created_per_day listesinin kapsadığı gün sayısı (0: tümü)
+    # View: ProductStatsAPIView
+    path('products/stats/', ProductStatsAPIView.as_view()),
+
+    # Değişiklik akışı (delta senkronizasyonu) endpoint'i
+    # URL: /api/products/changes/?since=<cursor>
+    # HTTP Metodları:
+    #   - GET: Cursor'dan sonraki oluşturma / güncelleme / silme kayıtları
+    # Modlar:
+    #   - ?wait=N: Değişiklik yoksa en fazla N saniye bekler (long-poll)
+    #   - Accept: text/event-stream: Server-Sent Events akışı (ASGI)
+    # Yanıtlar:
+    #   - 200: {"results": [...], "cursor": 42, "has_more": false}
+    #   - 410: Cursor budanmış; /api/products/export/ ile tam senkronizasyon
+    # View: ProductChangesAPIView (products/async_views.py)
+    path('products/changes/', ProductChangesAPIView.as_view()),
+
+    # Toplu ürün işlemleri endpoint'i
+    # URL: /api/products/bulk/
+    # HTTP Metodları:
+    #   - POST: JSON dizisi veya NDJSON gövdesindeki ürünleri toplu oluşturur
+    #   - PATCH: Satır listesi (bulk_update) veya ids/filter + values (tek UPDATE)
+    #   - DELETE: ids veya filter ile eşleşen ürünleri siler
+    # Query Parametreleri:
+    #   - upsert=id: Çakışan kayıtları günceller (INSERT ... ON CONFLICT)
+    #   - batch_size=N: Her transaction'da yazılacak satır sayısı
+    # View: ProductBulkAPIView
+    #   - Hatalı satırlar tüm isteği iptal etmez, yanıtta raporlanır
+    path('products/bulk/', ProductBulkAPIView.as_view()),
+
+    # Stok rezervasyonu ve iadesi endpoint'leri
+    # URL: /api/products/<id>/reserve/ ve /api/products/<id>/release/
+    #   - Gövde: {"quantity": 2}
+    # URL: /api/products/reserve/ ve /api/products/release/
+    #   - Gövde: {"lines": [{"id": 1, "quantity": 2}, {"id": 7, "quantity": 1}]}
+    # HTTP Metodları:
+    #   - POST: Stoğu tek bir koşullu UPDATE ile azaltır / artırır
+    # Yanıtlar:
+    #   - 200: Yeni stok seviyeleri
+    #   - 404: Ürün bulunamadı
+    #   - 409: Yetersiz stok (hiçbir satır uygulanmaz)
+    # View: ProductStockAPIView
+    path('products/<int:pk>/reserve/', ProductStockAPIView.as_view(action='reserve')),
+    path('products/<int:pk>/release/', ProductStockAPIView.as_view(action='release')),
+    path('products/reserve/', ProductStockAPIView.as_view(action='reserve')),
+    path('products/release/', ProductStockAPIView.as_view(action='release')),
 ]
 
 # =============================================================================
@@ -79,7 +185,6 @@ urlpatterns = [
 #
 # # Farklı veri türleri için endpoint'ler
 # path('products/categories/', CategoryListAPIView.as_view(), name='category-list'),
-# path('products/search/', ProductSearchAPIView.as_view(), name='product-search'),
 #
 # # Nested (iç içe) URL'ler
 # path('categories/<int:category_id>/products/', CategoryProductsAPIView.as_view(), name='category-products'),
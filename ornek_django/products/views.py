@@ -1,19 +1,59 @@
+# Arama fonksiyonuna sabit argümanlar bağlamak için
+from functools import partial
+
+# İstatistiklerin gün aralığı için
+from datetime import timedelta
+
 # Django REST Framework generic view'ları için gerekli modülü import ediyoruz
 # generics modülü, yaygın API işlemleri için hazır view sınıfları sağlar
 # Bu sınıflar, CRUD işlemlerini otomatik olarak gerçekleştirir
-from rest_framework import generics
+from rest_framework import generics, status
+
+# Geçersiz istek parametreleri için 400 Bad Request döndüren hata sınıfı
+from rest_framework.exceptions import NotFound, ValidationError
+
+# API yanıtı ve proje genelindeki DRF ayarları (varsayılan parser'lar vb.)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
 # Django HTTP response ve template rendering için gerekli modülleri import ediyoruz
-# HttpResponse: Basit HTTP yanıtları oluşturmak için
-# render: Template'leri render etmek için
-from django.http import HttpResponse
-from django.shortcuts import render
+# StreamingHttpResponse: Parça parça gönderilen yanıtlar (export)
+# render_to_string: Template'leri metne render etmek için
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import format_html, format_html_join
+
+# Proje geneli sorgu optimizasyonu (core/optimizer.py)
+from core.optimizer import QueryOptimizerMixin
 
 # Kendi uygulamamızdan model ve serializer'ları import ediyoruz
 # Product: Veritabanı modeli
 # ProductSerializer: Model verilerini JSON formatına dönüştüren serializer
-from .models import Product
-from .serializers import ProductSerializer
+from .cache import CachedDetailMixin, CachedListMixin
+from .conditional import ConditionalDetailMixin, ConditionalListMixin
+from .exceptions import ExcessRelease, InsufficientStock
+from .filters import ProductFilterBackend, ProductOrderingFilter
+from .models import Product, StockReservation
+from .pagination import (
+    ProductKeysetPagination,
+    ProductPageNumberPagination,
+    ProductSearchPagination,
+)
+from .parsers import NDJSONParser
+from .renderers import CSVRenderer, NDJSONRenderer
+from .serializers import (
+    ProductReadSerializer,
+    ProductSerializer,
+    ProductStatsSerializer,
+    StockOrderSerializer,
+    StockQuantitySerializer,
+)
+from .signals import products_changed
+from . import changes, landing, search, stats
 
 # =============================================================================
 # DJANGO PRODUCTS VIEWS.PY DOSYASI
@@ -31,6 +71,11 @@ from .serializers import ProductSerializer
 # Bu dosyada tanımlanan view'lar:
 # - ProductListCreateAPIView: Ürün listesi ve oluşturma API'si
 # - ProductRetrieveUpdateDestroyAPIView: Ürün detay, güncelleme, silme API'si
+# - ProductExportAPIView: Tüm ürün kataloğunu akış (streaming) olarak dışa aktarma
+# - ProductSearchAPIView: FTS5 tabanlı tam metin ürün araması
+# - ProductBulkAPIView: Toplu ürün oluşturma, upsert, güncelleme ve silme
+# - ProductStockAPIView: Atomik stok rezervasyonu ve iadesi
+# - ProductStatsAPIView: Özet tablolarından katalog istatistikleri
 # - home_view: Ana sayfa görünümü
 # - home_template_view: Template kullanan ana sayfa (opsiyonel)
 # =============================================================================
@@ -42,10 +87,15 @@ from .serializers import ProductSerializer
 # Ürün listesi ve yeni ürün oluşturma endpoint'i
 # Bu sınıf, ListCreateAPIView'dan türetilmiştir
 # ListCreateAPIView, GET (liste) ve POST (oluştur) metodlarını otomatik olarak destekler
-class ProductListCreateAPIView(generics.ListCreateAPIView):
+# ConditionalListMixin: Liste nesline bağlı ETag ve 304 / 412 yanıtları (products/conditional.py)
+# CachedListMixin: GET yanıtlarını önbellekten döndürür (products/cache.py)
+class ProductListCreateAPIView(ConditionalListMixin, CachedListMixin, generics.ListCreateAPIView):
     """
     Ürün listeleme ve yeni ürün oluşturma endpointi
-    GET /api/products/ - Tüm ürünleri listeler
+    GET /api/products/ - Tüm ürünleri listeler (keyset/cursor sayfalama)
+    GET /api/products/?pagination=page&page=N - Sayfa numaralı eski mod
+    GET /api/products/?price_min=10&in_stock=true&ordering=-price - Filtre ve sıralama
+    GET /api/products/?fields=id,name,price - Sadece istenen alanlar
     POST /api/products/ - Yeni ürün oluşturur
     """
 
@@ -59,19 +109,102 @@ class ProductListCreateAPIView(generics.ListCreateAPIView):
     # Bu serializer, hem GET hem de POST isteklerinde kullanılır
     serializer_class = ProductSerializer
 
+    # Sayfalama modları
+    # 'cursor': (created_at, id) üzerinde keyset sayfalama (varsayılan)
+    #   - COUNT(*) ve OFFSET yok, sayfa gecikmesi derinlikten bağımsız
+    # 'page': Eski ?page=N sayfalama (geriye dönük uyumluluk için)
+    #   - ?pagination=page veya sadece ?page=N ile seçilir
+    pagination_classes = {
+        'cursor': ProductKeysetPagination,
+        'page': ProductPageNumberPagination,
+    }
+    pagination_query_param = 'pagination'
+
+    # Filtreleme ve sıralama (products/filters.py)
+    # Sadece indeksli alanlarla sıralamaya izin verilir; varsayılan sıralama
+    # keyset sayfalama ve Product.Meta.ordering ile aynıdır
+    filter_backends = [ProductFilterBackend, ProductOrderingFilter]
+    ordering_fields = ['created_at', 'price', 'name', 'id']
+    ordering = ('-created_at', '-id')
+
+    # Seyrek alan kümesi parametresi: ?fields=id,name,price
+    fields_query_param = 'fields'
+
+    # İstekteki parametrelere göre sayfalama sınıfını seçiyoruz
+    # GenericAPIView.paginator özelliğini ezerek (override) her istek için
+    # doğru sayfalama nesnesini oluşturuyoruz
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            mode = params.get(self.pagination_query_param)
+            if mode is None:
+                mode = 'page' if 'page' in params else 'cursor'
+            if mode not in self.pagination_classes:
+                raise ValidationError({
+                    self.pagination_query_param: [
+                        'Geçersiz sayfalama modu. Seçenekler: %s'
+                        % ', '.join(self.pagination_classes)
+                    ]
+                })
+            self._paginator = self.pagination_classes[mode]()
+        return self._paginator
+
+    # Hızlı okuma yolu
+    # GET isteklerinde satırlar values() ile dict olarak okunur ve
+    # ProductReadSerializer ile dönüştürülür (ProductSerializer ile aynı çıktı)
+    # POST ve Browsable API formları normal ProductSerializer'ı kullanır
+    def use_read_serializer(self):
+        return self.request.method == 'GET' and ProductReadSerializer.is_supported()
+
+    # ?fields= ile istenen alan adları (parametre yoksa None)
+    def get_requested_fields(self):
+        if self.request.method != 'GET':
+            return None
+        param = self.request.query_params.get(self.fields_query_param)
+        if not param:
+            return None
+        valid = [name for name, field in ProductSerializer().fields.items() if not field.write_only]
+        fields = [name.strip() for name in param.split(',') if name.strip()]
+        invalid = [name for name in fields if name not in valid]
+        if invalid or not fields:
+            raise ValidationError({
+                self.fields_query_param: [
+                    'Geçersiz alan(lar): %s. Seçenekler: %s' % (', '.join(invalid), ', '.join(valid))
+                ]
+            })
+        return fields
+
+    # Veritabanından sadece gerekli kolonlar okunur:
+    # istenen alanlar + sıralama alanları (keyset cursor'ı bu değerlerden üretilir)
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if not self.use_read_serializer() and fields is None:
+            return queryset
+
+        ordering = ProductOrderingFilter().get_ordering(self.request, queryset, self)
+        ordering_fields = [field.lstrip('-') for field in ordering]
+        if self.use_read_serializer():
+            columns = ProductReadSerializer.get_source_fields(fields) + ordering_fields
+            return queryset.values(*dict.fromkeys(columns))
+        return queryset.only(*dict.fromkeys(fields + ordering_fields))
+
+    def get_serializer_class(self):
+        if self.use_read_serializer():
+            return ProductReadSerializer
+        return super().get_serializer_class()
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
     # =============================================================================
     # OPSİYONEL ÖZELLİKLER (Şu anda kullanılmıyor)
     # =============================================================================
     #
     # Diğer yaygın ListCreateAPIView özellikleri:
     #
-    # # Filtreleme ve arama
-    # filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    # filterset_fields = ['name', 'price']
-    # search_fields = ['name', 'description']
-    # ordering_fields = ['name', 'price', 'created_at']
-    # ordering = ['-created_at']  # Varsayılan sıralama
-    #
     # # Sayfalama
     # pagination_class = PageNumberPagination
     #
@@ -91,7 +224,12 @@ class ProductListCreateAPIView(generics.ListCreateAPIView):
 # Tek bir ürün üzerinde işlem yapma endpoint'i
 # Bu sınıf, RetrieveUpdateDestroyAPIView'dan türetilmiştir
 # RetrieveUpdateDestroyAPIView, GET (detay), PUT/PATCH (güncelle) ve DELETE (sil) metodlarını destekler
-class ProductRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+# ConditionalDetailMixin: ETag / Last-Modified ve 304 yanıtları (products/conditional.py)
+# CachedDetailMixin: GET yanıtlarını önbellekten döndürür (products/cache.py)
+# QueryOptimizerMixin: Serializer alanlarına göre select_related / only() (core/optimizer.py)
+class ProductRetrieveUpdateDestroyAPIView(
+    ConditionalDetailMixin, CachedDetailMixin, QueryOptimizerMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     Tek bir ürün üzerinde işlem yapma endpointi
     GET /api/products/<id>/ - Tek ürün detayı
@@ -109,6 +247,13 @@ class ProductRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView)
     # Bu serializer, tüm HTTP metodlarında kullanılır
     serializer_class = ProductSerializer
 
+    # Product için post_delete dinleyicisi yoktur (products/signals.py);
+    # silme sinyali burada gönderilir
+    def perform_destroy(self, instance):
+        pk = instance.pk
+        instance.delete()
+        products_changed.send(sender=Product, action='delete', pks=[pk])
+
     # =============================================================================
     # OPSİYONEL ÖZELLİKLER (Şu anda kullanılmıyor)
     # =============================================================================
@@ -134,91 +279,612 @@ class ProductRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView)
     #     instance.save()
     # =============================================================================
 
+# Tüm ürün kataloğunu dışa aktarma endpoint'i
+# Senkronizasyon işleri /api/products/ üzerinden 10'ar satır sayfalamak yerine
+# tüm kataloğu tek bir istekte, akış (streaming) halinde indirir
+class ProductExportAPIView(generics.GenericAPIView):
+    """
+    Ürün kataloğunu dışa aktarma endpointi
+    GET /api/products/export/ - NDJSON (satır başına bir ürün)
+    GET /api/products/export/?format=csv - CSV
+    """
+
+    # Liste endpoint'i ile aynı queryset, serializer ve filtreler
+    # Böylece dışa aktarılan satırlar listede görülenlerle birebir aynıdır
+    # Sıralama filtresi yoktur: satırlar her zaman id sırasıyla yazılır
+    # (indeks üzerinden sıralı okuma); ?ordering= gönderilirse 400 döner
+    queryset = ProductListCreateAPIView.queryset
+    serializer_class = ProductSerializer
+    filter_backends = [ProductFilterBackend]
+
+    # Mümkünse hızlı okuma serializer'ı kullanılır (bkz. ProductReadSerializer)
+    def get_serializer_class(self):
+        if ProductReadSerializer.is_supported():
+            return ProductReadSerializer
+        return super().get_serializer_class()
+
+    # Desteklenen çıktı formatları (ilki varsayılandır)
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    # Veritabanından tek seferde okunacak satır sayısı
+    # QuerySet.iterator(chunk_size=...) sunucu tarafında imleç (cursor) kullanır,
+    # tüm tabloyu belleğe almaz; bellek kullanımı tablo boyutundan bağımsızdır
+    chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        # İstenen sıralama sessizce yok sayılmaz
+        if ProductOrderingFilter.ordering_param in request.query_params:
+            raise ValidationError({
+                ProductOrderingFilter.ordering_param: ['Dışa aktarma her zaman id sırasıyladır.'],
+            })
+        # Birincil anahtara göre sıralama, indeks üzerinden sıralı okuma sağlar
+        queryset = self.filter_queryset(self.get_queryset()).order_by('pk')
+        renderer = request.accepted_renderer
+        serializer = self.get_serializer()
+
+        # Hızlı okuma yolu: satırlar values() ile dict olarak okunur
+        if isinstance(serializer, ProductReadSerializer):
+            queryset = queryset.values(*ProductReadSerializer.get_source_fields())
+
+        response = StreamingHttpResponse(
+            self.stream(queryset, serializer, renderer),
+            content_type='%s; charset=%s' % (renderer.media_type, renderer.charset),
+        )
+        response['Content-Disposition'] = 'attachment; filename="products.%s"' % renderer.format
+        # Tam senkronizasyondan sonra değişiklik akışına bu cursor'dan devam
+        # edilir; satırlardan önce okunduğu için arada değişen ürünler akışta
+        # tekrar gelir (kayıp olmaz)
+        if connections[queryset.db].vendor == 'sqlite':
+            response['X-Change-Cursor'] = changes.latest(queryset.db)
+        return response
+
+    # Satırları parça parça üreten generator
+    # Her veritabanı parçası (chunk_size satır) okunduğunda bir parça gönderilir;
+    # böylece ilk byte, son satır okunmadan istemciye ulaşır
+    def stream(self, queryset, serializer, renderer):
+        header = renderer.encode_header(ProductSerializer().fields.keys())
+        if header:
+            yield header
+
+        convert = (
+            serializer.get_row_converter() if isinstance(serializer, ProductReadSerializer)
+            else serializer.to_representation
+        )
+        lines = []
+        for instance in queryset.iterator(chunk_size=self.chunk_size):
+            lines.append(renderer.encode_row(convert(instance)))
+            if len(lines) >= self.chunk_size:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+
+# Tam metin ürün arama endpoint'i
+# SQLite FTS5 indeksi üzerinden BM25 skoruna göre sıralı sonuçlar (products/search.py)
+class ProductSearchAPIView(generics.GenericAPIView):
+    """
+    Tam metin ürün araması
+    GET /api/products/search/?q=kalem - Alaka düzeyine göre sıralı sonuçlar
+    GET /api/products/search/?q=kal kır - Her kelime ön ek olarak aranır
+    GET /api/products/search/?q=kalme - Sonuç yoksa yazım hatası toleransı
+    """
+
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    pagination_class = ProductSearchPagination
+    search_query_param = 'q'
+
+    # Mümkünse hızlı okuma serializer'ı kullanılır (bkz. ProductReadSerializer)
+    def get_serializer_class(self):
+        if ProductReadSerializer.is_supported():
+            return ProductReadSerializer
+        return super().get_serializer_class()
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get(self.search_query_param, '').strip()
+        if not query:
+            raise ValidationError({self.search_query_param: ['Arama metni zorunludur.']})
+
+        # 1. Sorgu, FTS5 MATCH ifadesine çevrilir (gerekirse yazım hatası toleransıyla)
+        # 2. FTS indeksinden sadece sayfadaki (rank, id) değerleri okunur
+        # 3. Ürün satırları birincil anahtar ile okunur ve skor sırasına dizilir
+        queryset = self.get_queryset()
+        expression, suggestion = search.resolve_query(query, using=queryset.db)
+        if expression is None:
+            page = self.paginator.paginate_search(lambda **kwargs: [], request, self)
+        else:
+            page = self.paginator.paginate_search(
+                partial(search.search, expression, using=queryset.db), request, self
+            )
+
+        ids = [row['id'] for row in page]
+        queryset = queryset.filter(pk__in=ids).order_by()
+        if issubclass(self.get_serializer_class(), ProductReadSerializer):
+            queryset = queryset.values(*ProductReadSerializer.get_source_fields())
+            products = {row['id']: row for row in queryset}
+        else:
+            products = queryset.in_bulk()
+        serializer = self.get_serializer([products[pk] for pk in ids if pk in products], many=True)
+
+        response = self.paginator.get_paginated_response(serializer.data)
+        if suggestion:
+            response.data['suggestion'] = suggestion
+        return response
+
+# Toplu ürün işlemleri endpoint'i
+# Gece çalışan içe aktarma işleri yüz binlerce ürünü tek tek POST etmek yerine
+# tek istekte gönderir; satırlar bulk_create ile parçalar halinde yazılır
+class ProductBulkAPIView(generics.GenericAPIView):
+    """
+    Toplu ürün işlemleri endpointi
+    POST /api/products/bulk/ - JSON dizisi veya NDJSON ile toplu oluşturma
+    POST /api/products/bulk/?upsert=id - Varsa güncelle, yoksa oluştur
+    PATCH /api/products/bulk/ - Toplu kısmi güncelleme (fiyat/stok değişiklikleri)
+    DELETE /api/products/bulk/ - Toplu silme
+    """
+
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+
+    # JSON dizisine ek olarak NDJSON gövdesi de kabul edilir
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES + [NDJSONParser]
+
+    # Her transaction'da yazılacak satır sayısı (?batch_size=N ile değiştirilebilir)
+    batch_size = 1000
+    max_batch_size = 5000
+
+    # Upsert anahtarı olarak sadece benzersiz (unique) alanlar kullanılabilir
+    # Aksi halde veritabanı ON CONFLICT hedefini bulamaz
+    def get_upsert_field(self):
+        field = self.request.query_params.get('upsert')
+        if field is None:
+            return None
+        unique_fields = [
+            f.name for f in Product._meta.concrete_fields if f.unique
+        ]
+        if field not in unique_fields:
+            raise ValidationError({
+                'upsert': ['Upsert alanı benzersiz olmalıdır. Seçenekler: %s' % ', '.join(unique_fields)]
+            })
+        return field
+
+    def get_batch_size(self):
+        try:
+            batch_size = int(self.request.query_params.get('batch_size', self.batch_size))
+        except ValueError:
+            raise ValidationError({'batch_size': ['Geçerli bir tam sayı girin.']})
+        return max(1, min(batch_size, self.max_batch_size))
+
+    # "filter" nesnesinde izin verilen lookup'lar
+    # Örnek: {"filter": {"stock__lte": 0, "price__gte": "100"}}
+    filter_lookups = ('exact', 'in', 'lt', 'lte', 'gt', 'gte', 'startswith')
+
+    # PATCH (değer formu) ve DELETE isteklerinin hedef kayıtlarını belirler
+    # Gövdede ya "ids" listesi ya da "filter" nesnesi bulunmalıdır
+    # Dönüş: Her biri tek bir UPDATE/DELETE sorgusu olacak queryset listesi
+    # (id listeleri, SQLite'ın parametre sınırını aşmamak için parçalanır)
+    def get_target_querysets(self, data):
+        if not isinstance(data, dict) or ('ids' in data) == ('filter' in data):
+            raise ValidationError({
+                'non_field_errors': ['"ids" veya "filter" alanlarından tam olarak biri gönderilmelidir.']
+            })
+        queryset = self.get_queryset()
+
+        if 'ids' in data:
+            ids = data['ids']
+            if not isinstance(ids, list) or not ids:
+                raise ValidationError({'ids': ['Boş olmayan bir id listesi bekleniyor.']})
+            try:
+                ids = [Product._meta.pk.to_python(pk) for pk in ids]
+            except DjangoValidationError as exc:
+                raise ValidationError({'ids': exc.messages})
+            batch_size = self.get_batch_size()
+            return [
+                queryset.filter(pk__in=ids[start:start + batch_size])
+                for start in range(0, len(ids), batch_size)
+            ]
+
+        lookups = data['filter']
+        if not isinstance(lookups, dict) or not lookups:
+            raise ValidationError({'filter': ['Boş olmayan bir filtre nesnesi bekleniyor.']})
+        filters = {}
+        for key, value in lookups.items():
+            name, _, lookup = key.partition('__')
+            lookup = lookup or 'exact'
+            try:
+                field = Product._meta.get_field(name)
+                if lookup not in self.filter_lookups or not field.concrete:
+                    raise DjangoValidationError('Desteklenmeyen filtre.')
+                if lookup == 'in':
+                    if not isinstance(value, list):
+                        raise DjangoValidationError('Liste bekleniyor.')
+                    value = [field.to_python(item) for item in value]
+                else:
+                    value = field.to_python(value)
+            except (FieldDoesNotExist, DjangoValidationError) as exc:
+                messages = getattr(exc, 'messages', ['Bilinmeyen alan.'])
+                raise ValidationError({'filter': {key: messages}})
+            filters['%s__%s' % (name, lookup)] = value
+        return [queryset.filter(**filters)]
+
+    # Hedef satırların id'lerini okur; güncelleme / silme bu id'lerle yapılır
+    # Böylece products_changed sinyali (önbellek, canlı akış) filtre formunda da
+    # gerçekten değişen satırları bildirir; bilinmeyen id'ler düşer
+    # Transaction içinde çağrılmalıdır (okuma ile yazma arasında satır değişmesin)
+    # Dönüş: (tüm_idler, batch_size'lık id parçaları)
+    def get_target_pks(self, querysets):
+        pks = [pk for queryset in querysets for pk in queryset.order_by().values_list('pk', flat=True)]
+        batch_size = self.get_batch_size()
+        return pks, [pks[start:start + batch_size] for start in range(0, len(pks), batch_size)]
+
+    # Satır listesi formunda veritabanında olmayan id'leri satır hatası olarak ayırır
+    # Dönüş: (mevcut_satırlar, hatalar)
+    def split_missing_rows(self, rows):
+        ids = [attrs['id'] for index, attrs in rows]
+        batch_size = self.get_batch_size()
+        existing = set()
+        for start in range(0, len(ids), batch_size):
+            existing.update(
+                self.get_queryset().filter(pk__in=ids[start:start + batch_size]).values_list('pk', flat=True)
+            )
+        errors = [
+            {'index': index, 'errors': {'id': ['Ürün bulunamadı.']}}
+            for index, attrs in rows if attrs['id'] not in existing
+        ]
+        return [(index, attrs) for index, attrs in rows if attrs['id'] in existing], errors
+
+    def get_rows(self):
+        rows = self.request.data
+        if not isinstance(rows, list):
+            raise ValidationError({
+                'non_field_errors': ['Ürün listesi (JSON dizisi veya NDJSON) bekleniyor.']
+            })
+        return rows
+
+    def post(self, request, *args, **kwargs):
+        upsert_field = self.get_upsert_field()
+        serializer = self.get_serializer(data=self.get_rows(), many=True)
+
+        # Hatalı satırlar tüm isteği iptal etmez; sadece raporlanır
+        rows, errors = serializer.validate_rows(upsert_field)
+        saved, write_errors = serializer.bulk_save(rows, self.get_batch_size(), upsert_field)
+        errors = sorted(errors + write_errors, key=lambda error: error['index'])
+
+        # bulk_create post_save sinyali göndermez; önbellek gibi dinleyicileri
+        # products_changed sinyali ile biz haberdar ediyoruz
+        if saved:
+            products_changed.send(
+                sender=Product,
+                action='update' if upsert_field else 'create',
+                pks=[obj.pk for obj in saved if obj.pk is not None],
+            )
+
+        # 201: Tüm satırlar yazıldı
+        # 207: Bir kısmı yazıldı, bir kısmı hatalı
+        # 400: Hiçbir satır yazılamadı
+        if not errors:
+            status_code = status.HTTP_201_CREATED
+        elif saved:
+            status_code = status.HTTP_207_MULTI_STATUS
+        else:
+            status_code = status.HTTP_400_BAD_REQUEST
+        return Response({
+            'upserted' if upsert_field else 'created': len(saved),
+            'failed': len(errors),
+            'errors': errors,
+        }, status=status_code)
+
+    # Toplu kısmi güncelleme iki formu destekler:
+    # 1. Satır listesi: [{"id": 1, "price": "9.90"}, {"id": 2, "stock": 0}]
+    #    - Her satır kendi değerleriyle güncellenir (bulk_update)
+    # 2. Değer formu: {"ids": [1, 2, 3], "values": {"stock": 0}}
+    #    veya {"filter": {"stock__lt": 5}, "values": {"price": "19.90"}}
+    #    - Tüm hedef satırlara aynı değerler yazılır (tek UPDATE ... WHERE)
+    def patch(self, request, *args, **kwargs):
+        data = request.data
+        if isinstance(data, list):
+            serializer = self.get_serializer(data=data, many=True, partial=True)
+            rows, errors = serializer.validate_rows(Product._meta.pk.name)
+            rows, missing = self.split_missing_rows(rows)
+            errors = sorted(errors + missing, key=lambda error: error['index'])
+            updated = serializer.bulk_update(rows, self.get_batch_size())
+            if updated:
+                products_changed.send(
+                    sender=Product, action='update', pks=[attrs['id'] for index, attrs in rows]
+                )
+            if not errors:
+                status_code = status.HTTP_200_OK
+            elif rows:
+                status_code = status.HTTP_207_MULTI_STATUS
+            else:
+                status_code = status.HTTP_400_BAD_REQUEST
+            return Response({
+                'updated': updated,
+                'failed': len(errors),
+                'errors': errors,
+            }, status=status_code)
+
+        querysets = self.get_target_querysets(data)
+        serializer = self.get_serializer(data=data.get('values'), partial=True)
+        serializer.is_valid(raise_exception=True)
+        if not serializer.validated_data:
+            raise ValidationError({'values': ['Güncellenecek en az bir alan gönderilmelidir.']})
+
+        now = timezone.now()
+        with transaction.atomic():
+            pks, chunks = self.get_target_pks(querysets)
+            updated = sum(
+                Product.objects.filter(pk__in=chunk).update(updated_at=now, **serializer.validated_data)
+                for chunk in chunks
+            )
+        if updated:
+            products_changed.send(sender=Product, action='update', pks=pks)
+        return Response({'updated': updated})
+
+    # Toplu silme: {"ids": [1, 2, 3]} veya {"filter": {"stock": 0}}
+    # Önce sadece id'ler okunur; satırlar parça başına QuerySet.delete() ile
+    # silinir. Product için post_delete dinleyicisi bağlanmadığından
+    # (products/signals.py) Django satır başına sinyal göndermez; bağlı
+    # modeller (StockReservation) on_delete kuralıyla toplu silinir ve tek
+    # bir products_changed sinyali gönderilir. Bağlı model olduğu için
+    # Django silinecek satırları yükler; only('pk') ile sadece id okunur.
+    # Arama / istatistik / değişiklik kaydı tetikleyicilerle güncellenir.
+    def delete(self, request, *args, **kwargs):
+        querysets = self.get_target_querysets(request.data)
+        with transaction.atomic(using=router.db_for_write(Product)):
+            pks, chunks = self.get_target_pks(querysets)
+            deleted = sum(
+                Product.objects.filter(pk__in=chunk).only('pk').delete()[1].get(Product._meta.label, 0)
+                for chunk in chunks
+            )
+        if deleted:
+            products_changed.send(sender=Product, action='delete', pks=pks)
+        return Response({'deleted': deleted})
+
+# Atomik stok rezervasyonu / iadesi endpoint'i
+# Ödeme akışı ürünü GET edip stoğu istemcide değiştirip PUT etmek yerine
+# bu endpoint'i kullanır. Stok, veritabanında tek bir koşullu UPDATE ile
+# düşürülür; eşzamanlı isteklerde güncelleme kaybı (lost update) olmaz:
+#   UPDATE products_product SET stock = stock - n WHERE id = x AND stock >= n
+# Ayrılan miktar StockReservation tablosunda tutulur; iade de aynı şekilde
+# koşullu bir UPDATE ile bu miktardan düşülür ve onu aşamaz:
+#   UPDATE products_stockreservation SET quantity = quantity - n
+#   WHERE product_id = x AND quantity >= n
+class ProductStockAPIView(generics.GenericAPIView):
+    """
+    Stok rezervasyonu ve iadesi endpointi
+    POST /api/products/<id>/reserve/ - {"quantity": n} kadar stok ayırır
+    POST /api/products/<id>/release/ - {"quantity": n} kadar stoğu geri verir (en fazla ayrılan kadar)
+    POST /api/products/reserve/ - {"lines": [{"id": x, "quantity": n}, ...]}
+    POST /api/products/release/ - Çok satırlı iade
+    """
+
+    queryset = Product.objects.all()
+
+    # 'reserve' veya 'release' - urls.py'da as_view(action=...) ile verilir
+    action = 'reserve'
+
+    def get_serializer_class(self):
+        if 'pk' in self.kwargs:
+            return StockQuantitySerializer
+        return StockOrderSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if 'pk' in self.kwargs:
+            quantities = {self.kwargs['pk']: serializer.validated_data['quantity']}
+        else:
+            quantities = serializer.get_quantities()
+
+        stock = self.apply(quantities)
+        lines = [
+            {'id': pk, 'quantity': quantity, 'stock': stock[pk]}
+            for pk, quantity in quantities.items()
+        ]
+        if 'pk' in self.kwargs:
+            return Response(lines[0])
+        return Response({'lines': lines})
+
+    # Tüm satırları tek bir transaction içinde uygular
+    # Satırlar id sırasıyla işlenir; böylece aynı ürünleri içeren eşzamanlı
+    # siparişler kilitleri hep aynı sırayla alır
+    # Herhangi bir satır başarısız olursa transaction geri alınır (rollback)
+    # Dönüş: {ürün_id: yeni_stok}
+    def apply(self, quantities):
+        queryset = self.get_queryset()
+        now = timezone.now()
+        failed = []
+        with transaction.atomic():
+            for pk, quantity in sorted(quantities.items()):
+                if self.action == 'reserve':
+                    updated = queryset.filter(pk=pk, stock__gte=quantity).update(
+                        stock=F('stock') - quantity, updated_at=now
+                    )
+                    if updated:
+                        self.add_reservation(pk, quantity)
+                else:
+                    # İade önce ayrılmış miktardan düşülür; yetmezse stok değişmez
+                    updated = StockReservation.objects.filter(product_id=pk, quantity__gte=quantity).update(
+                        quantity=F('quantity') - quantity
+                    )
+                    if updated:
+                        updated = queryset.filter(pk=pk).update(
+                            stock=F('stock') + quantity, updated_at=now
+                        )
+                if not updated:
+                    failed.append(pk)
+            if not failed:
+                stock = dict(queryset.filter(pk__in=quantities).values_list('pk', 'stock'))
+            else:
+                transaction.set_rollback(True)
+
+        # F() ile yapılan UPDATE post_save sinyali göndermez
+        if not failed:
+            products_changed.send(sender=Product, action='update', pks=list(quantities))
+            return stock
+
+        # Başarısız satırların nedenini belirliyoruz: ürün yok (404) mu,
+        # yoksa stok / ayrılmış miktar mı yetersiz (409)?
+        available = dict(queryset.filter(pk__in=failed).values_list('pk', 'stock'))
+        missing = [pk for pk in failed if pk not in available]
+        if missing:
+            raise NotFound('Ürün bulunamadı: %s' % ', '.join(str(pk) for pk in missing))
+        if self.action == 'reserve':
+            raise InsufficientStock([
+                {'id': pk, 'requested': quantities[pk], 'available': available[pk]}
+                for pk in failed
+            ])
+        reserved = dict(
+            StockReservation.objects.filter(product_id__in=failed).values_list('product_id', 'quantity')
+        )
+        raise ExcessRelease([
+            {'id': pk, 'requested': quantities[pk], 'reserved': reserved.get(pk, 0)}
+            for pk in failed
+        ])
+
+    # Ayrılan miktarı ürünün rezervasyon satırına ekler
+    # Satır ilk rezervasyonda oluşturulur; get_or_create eşzamanlı ilk
+    # rezervasyonlarda benzersizlik hatasını yakalayıp mevcut satırı okur
+    def add_reservation(self, pk, quantity):
+        reservation = StockReservation.objects.filter(product_id=pk)
+        if not reservation.update(quantity=F('quantity') + quantity):
+            StockReservation.objects.get_or_create(product_id=pk)
+            reservation.update(quantity=F('quantity') + quantity)
+
+# Katalog istatistikleri endpoint'i
+# Panolar toplamları tüm sayfaları çekerek hesaplamak yerine tetikleyicilerle
+# güncel tutulan özet tablolarını okur (products/stats.py); yanıt süresi
+# katalog boyutundan bağımsızdır
+class ProductStatsAPIView(generics.GenericAPIView):
+    """
+    Katalog istatistikleri (envanter değeri, stok durumu, fiyat dağılımı)
+    GET /api/products/stats/ - Toplamlar ve son 30 günde oluşturulan ürün sayıları
+    GET /api/products/stats/?days=90 - Son 90 günün günlük sayıları
+    GET /api/products/stats/?days=0 - Tüm günler
+    """
+
+    queryset = Product.objects.all()
+    serializer_class = ProductStatsSerializer
+    pagination_class = None
+
+    # created_per_day listesinin kapsadığı gün sayısı (?days=N ile değiştirilebilir)
+    days = 30
+    max_days = 3660
+
+    # Günler created_at'in UTC tarihidir (bkz. products/stats.py)
+    def get_since(self):
+        try:
+            days = int(self.request.query_params.get('days', self.days))
+        except ValueError:
+            raise ValidationError({'days': ['Geçerli bir tam sayı girin.']})
+        if days < 0 or days > self.max_days:
+            raise ValidationError({'days': ['0 ile %d arasında olmalıdır.' % self.max_days]})
+        if days == 0:
+            return None
+        return timezone.now().date() - timedelta(days=days - 1)
+
+    def get(self, request, *args, **kwargs):
+        data = stats.read(since=self.get_since(), using=self.get_queryset().db)
+        return Response(self.get_serializer(data).data)
+
 # =============================================================================
 # GELENEKSEL DJANGO VIEW'LARI
 # =============================================================================
 
+# Ana sayfa HTML'i
+# Endpoint listesi URL desenlerinden gelir (products/landing.py); yeni bir
+# endpoint eklendiğinde bu sayfa elle güncellenmez
+def build_home_html(endpoints):
+    items = format_html_join(
+        '\n',
+        '                    <li>{}{} - {}</li>',
+        (
+            (
+                format_html('<a href="{}">{}</a>', endpoint['url'], endpoint['url'])
+                if endpoint['link'] else format_html('<code>{}</code>', endpoint['url']),
+                format_html(' <small>{}</small>', ', '.join(endpoint['methods'])) if endpoint['methods'] else '',
+                endpoint['description'],
+            )
+            for endpoint in endpoints
+        ),
+    )
+    return HOME_PAGE_HTML.replace('{endpoints}', items)
+
+
+# Ana sayfa şablonu; {endpoints} yerine <li> satırları yazılır
+HOME_PAGE_HTML = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Django REST API Ana Sayfa</title>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; margin: 40px; }
+        h1 { color: #333; }
+        ul { list-style-type: none; padding: 0; }
+        li { margin: 10px 0; }
+        a {
+            display: inline-block;
+            padding: 10px 15px;
+            background-color: #4CAF50;
+            color: white;
+            text-decoration: none;
+            border-radius: 4px;
+        }
+        a:hover { background-color: #45a049; }
+        small { color: #666; }
+        .container { max-width: 800px; margin: 0 auto; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Django REST API Ana Sayfa</h1>
+        <p>Mevcut API Endpointleri:</p>
+        <ul>
+{endpoints}
+        </ul>
+        <p>API kullanımı için Postman veya curl gibi araçları kullanabilirsiniz:</p>
+        <pre>
+# Tüm ürünleri listele
+curl http://127.0.0.1:8000/api/products/
+
+# Yeni ürün ekle
+curl -X POST -H "Content-Type: application/json" -d '{"name":"Örnek Ürün","price":99.99}' http://127.0.0.1:8000/api/products/
+        </pre>
+    </div>
+</body>
+</html>
+"""
+
+
 # Ana sayfa görünümü - Projenin kök URL'si için
-# Bu fonksiyon, kullanıcı siteye geldiğinde ilk karşılaşacağı sayfayı oluşturur
-# HttpResponse ile basit HTML içeriği döndürür
+# Bu fonksiyon, kullanıcı siteye geldiğinde ilk karşılaşacağı sayfayı döndürür
+# Sayfa süreç başına bir kez üretilir, sıkıştırılır ve bellekte tutulur;
+# her istekte sadece ETag / Accept-Encoding kontrolü yapılır
 def home_view(request):
     """
     Ana sayfa görünümü - Projenin kök URL'si için
     Bu view, kullanıcıya mevcut API endpoint'lerini gösterir
     ve nasıl kullanılacağı hakkında bilgi verir
     """
-
-    # HTML içeriği ile HTTP yanıtı döndürüyoruz
-    # Bu HTML, API endpoint'lerini listeleyen basit bir sayfa oluşturur
-    # CSS stilleri ile görsel olarak güzel bir görünüm sağlar
-    return HttpResponse("""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Django REST API Ana Sayfa</title>
-            <style>
-                body { font-family: Arial, sans-serif; line-height: 1.6; margin: 40px; }
-                h1 { color: #333; }
-                ul { list-style-type: none; padding: 0; }
-                li { margin: 10px 0; }
-                a {
-                    display: inline-block;
-                    padding: 10px 15px;
-                    background-color: #4CAF50;
-                    color: white;
-                    text-decoration: none;
-                    border-radius: 4px;
-                }
-                a:hover { background-color: #45a049; }
-                .container { max-width: 800px; margin: 0 auto; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Django REST API Ana Sayfa</h1>
-                <p>Mevcut API Endpointleri:</p>
-                <ul>
-                    <li><a href="/api/products/">/api/products/</a> - Ürün Listesi ve Ekleme</li>
-                    <li><a href="/api/products/1/">/api/products/&lt;id&gt;/</a> - Tek Ürün İşlemleri</li>
-                    <li><a href="/admin/">/admin/</a> - Admin Paneli</li>
-                </ul>
-                <p>API kullanımı için Postman veya curl gibi araçları kullanabilirsiniz:</p>
-                <pre>
-# Tüm ürünleri listele
-curl http://127.0.0.1:8000/api/products/
-
-# Yeni ürün ekle
-curl -X POST -H "Content-Type: application/json" -d '{"name":"Örnek Ürün","price":99.99}' http://127.0.0.1:8000/api/products/
-                </pre>
-            </div>
-        </body>
-        </html>
-    """)
+    return landing.cached_page('home', build_home_html).response(request)
 
 # Template kullanımı için alternatif view (opsiyonel)
 # Bu fonksiyon, template dosyası kullanarak ana sayfa oluşturur
-# render() fonksiyonu ile template'i context verisi ile render eder
+# Şablon bir kez render edilir (istekten bağımsız context ile) ve
+# home_view gibi sıkıştırılmış olarak bellekten sunulur
 def home_template_view(request):
     """
-    Template kullanarak ana sayfa oluşturma (templates/products/home.html gerektirir)
+    Template kullanarak ana sayfa oluşturma (templates/products/home.html)
     Bu view, template dosyası kullanarak daha esnek bir ana sayfa oluşturur
     Context verisi ile template'e dinamik veri gönderir
     """
 
-    # Template'e gönderilecek context verisi
-    # Bu veri, template'de kullanılabilir hale gelir
-    context = {
-        'endpoints': [
-            {'url': '/api/products/', 'description': 'Ürün Listesi ve Ekleme'},
-            {'url': '/api/products/1/', 'description': 'Tek Ürün İşlemleri'},
-            {'url': '/admin/', 'description': 'Admin Paneli'},
-        ]
-    }
+    # Template'e gönderilecek context verisi: URL desenlerinden endpoint listesi
+    # Sayfa tüm kullanıcılar için aynıdır; request'e bağlı veri kullanılmaz
+    def build(endpoints):
+        return render_to_string('products/home.html', {'endpoints': endpoints})
 
-    # Template'i context verisi ile render ediyoruz
-    # 'products/home.html' template dosyası gerekli
-    # Bu template, context'teki endpoints verisini kullanabilir
-    return render(request, 'products/home.html', context)
+    return landing.cached_page('home_template', build).response(request)
 
 # =============================================================================
 # OPSİYONEL VIEW TÜRLERİ (Şu anda kullanılmıyor)
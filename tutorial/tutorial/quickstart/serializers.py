@@ -1,14 +1,66 @@
+from urllib.parse import quote
+
 from django.contrib.auth.models import Group, User
+from django.utils.http import RFC3986_SUBDELIMS
 from rest_framework import serializers
 
+# Stands in for the lookup value when a URL is reversed once per field.
+URL_LOOKUP_PLACEHOLDER = '__lookup__'
+
+
+class TemplatedURLMixin:
+    """
+    Reverse the detail route once and fill in each object's lookup value,
+    instead of calling `reverse()` for every object in a list.
+    """
+
+    def get_url(self, obj, view_name, request, format):
+        # Unsaved objects will not yet have a valid URL.
+        if hasattr(obj, 'pk') and obj.pk in (None, ''):
+            return None
+
+        # A field instance belongs to a single serializer, but the same
+        # serializer class may be reused, so the cache is keyed per request.
+        key = (view_name, id(request), format)
+        cached = getattr(self, '_url_template', None)
+        if cached is None or cached[0] != key:
+            template = self.reverse(
+                view_name,
+                kwargs={self.lookup_url_kwarg: URL_LOOKUP_PLACEHOLDER},
+                request=request,
+                format=format,
+            )
+            cached = self._url_template = (key, template)
+
+        # Quote the value the same way Django's `reverse()` does.
+        lookup_value = quote(str(getattr(obj, self.lookup_field)), safe=RFC3986_SUBDELIMS + '~:@')
+        return cached[1].replace(URL_LOOKUP_PLACEHOLDER, lookup_value)
+
+
+class TemplatedHyperlinkedRelatedField(TemplatedURLMixin, serializers.HyperlinkedRelatedField):
+    pass
+
+
+class TemplatedHyperlinkedIdentityField(TemplatedURLMixin, serializers.HyperlinkedIdentityField):
+    pass
+
+
+class TemplatedHyperlinkedModelSerializer(serializers.HyperlinkedModelSerializer):
+    """
+    A `HyperlinkedModelSerializer` whose `url` and related hyperlinks are
+    built from a URL template that is reversed once per request.
+    """
+    serializer_related_field = TemplatedHyperlinkedRelatedField
+    serializer_url_field = TemplatedHyperlinkedIdentityField
+
 
-class UserSerializer(serializers.HyperlinkedModelSerializer):
+class UserSerializer(TemplatedHyperlinkedModelSerializer):
     class Meta:
         model = User
         fields = ['url', 'username', 'email', 'groups']
 
 
-class GroupSerializer(serializers.HyperlinkedModelSerializer):
+class GroupSerializer(TemplatedHyperlinkedModelSerializer):
     class Meta:
         model = Group
-        fields = ['url', 'name']
\ No newline at end of file
+        fields = ['url', 'name']
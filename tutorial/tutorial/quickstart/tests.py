@@ -1,3 +1,60 @@
+from django.contrib.auth.models import Group, User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+
+class UserViewSetQueryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.groups = [Group.objects.create(name='group-%d' % index) for index in range(3)]
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def add_users(self, count):
+        for index in range(count):
+            user = User.objects.create_user('user-%d-%d' % (User.objects.count(), index))
+            user.groups.set(self.groups[:index % 3 + 1])
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(captured.captured_queries), response.json()
+
+    def test_user_list_query_count_is_constant(self):
+        """Listing users costs the same number of queries for 2 or 10 rows."""
+        self.add_users(1)
+        small, small_data = self.count_queries(reverse('user-list'))
+        self.add_users(9)
+        large, large_data = self.count_queries(reverse('user-list'))
+        self.assertEqual(len(small_data['results']), 2)
+        self.assertEqual(len(large_data['results']), 10)
+        self.assertEqual(small, large)
+
+    def test_hyperlinks_match_reverse(self):
+        """Templated URLs are identical to the ones `reverse()` builds."""
+        self.add_users(1)
+        _, data = self.count_queries(reverse('user-list'))
+        user = User.objects.get(username=data['results'][0]['username'])
+        self.assertEqual(
+            data['results'][0]['url'],
+            'http://testserver' + reverse('user-detail', kwargs={'pk': user.pk}),
+        )
+        self.assertEqual(
+            sorted(data['results'][0]['groups']),
+            sorted('http://testserver' + reverse('group-detail', kwargs={'pk': group.pk})
+                   for group in user.groups.all()),
+        )
+
+    def test_group_list_query_count_is_constant(self):
+        """Listing groups does not add a query per group."""
+        small, _ = self.count_queries(reverse('group-list'))
+        for index in range(5):
+            Group.objects.create(name='extra-%d' % index)
+        large, data = self.count_queries(reverse('group-list'))
+        self.assertEqual(len(data['results']), 8)
+        self.assertEqual(small, large)
@@ -1,10 +1,55 @@
 from django.contrib.auth.models import Group, User
-from rest_framework import permissions, viewsets
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import permissions, relations, viewsets
 
 from tutorial.quickstart.serializers import GroupSerializer, UserSerializer
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class PrefetchRelatedMixin:
+    """
+    Add `select_related()` / `prefetch_related()` to the queryset for every
+    relation the serializer renders, so a page costs a fixed number of
+    queries however many rows it holds.
+    """
+
+    def get_relation_lookups(self, serializer):
+        model = serializer.Meta.model
+        select, prefetch = [], []
+        for field in serializer.fields.values():
+            if field.write_only or not isinstance(field, (relations.RelatedField, relations.ManyRelatedField)):
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                continue
+            if not model_field.is_relation:
+                continue
+            if model_field.many_to_many or model_field.one_to_many:
+                related = model_field.related_model._default_manager.all()
+                child = getattr(field, 'child_relation', field)
+                # Hyperlinks and primary keys only need the lookup column.
+                if child.use_pk_only_optimization():
+                    related = related.only(*{'pk', getattr(child, 'lookup_field', 'pk')})
+                prefetch.append(Prefetch(field.source, queryset=related))
+            elif not field.use_pk_only_optimization():
+                # A forward foreign key already holds the related primary key.
+                select.append(field.source)
+        return select, prefetch
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request is None or self.request.method not in permissions.SAFE_METHODS:
+            return queryset
+        select, prefetch = self.get_relation_lookups(self.get_serializer())
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+
+class UserViewSet(PrefetchRelatedMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows users to be viewed or edited.
     """
@@ -13,10 +58,10 @@ class UserViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class GroupViewSet(viewsets.ModelViewSet):
+class GroupViewSet(PrefetchRelatedMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows groups to be viewed or edited.
     """
     queryset = Group.objects.all().order_by('name')
     serializer_class = GroupSerializer
-    permission_classes = [permissions.IsAuthenticated]
\ No newline at end of file
+    permission_classes = [permissions.IsAuthenticated]